@@ -22,6 +22,8 @@ if utils_dir not in sys.path:
     sys.path.append(utils_dir)
 
 from utils.retry_helper import with_graceful_retry, SEARCH_API_RETRY_CONFIG
+# 与各 Engine 一样按 utils 目录导入，共用同一份进程内限流器
+from rate_limiter import estimate_tokens, rate_limited
 
 
 class ForumHost:
@@ -218,15 +220,18 @@ class ForumHost:
             else:
                 user_prompt = time_prefix
                 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.6,
-                top_p=0.9,
-            )
+            with rate_limited(self.base_url, self.model, estimate_tokens(system_prompt, user_prompt)) as lease:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.6,
+                    top_p=0.9,
+                )
+                if lease and response.usage:
+                    lease.report_tokens(response.usage.total_tokens)
 
             if response.choices:
                 content = response.choices[0].message.content
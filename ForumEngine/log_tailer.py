@@ -0,0 +1,204 @@
+"""
+日志增量读取器 - 为LogMonitor提供事件驱动的日志追踪
+
+- Linux上通过inotify监听日志目录，目标日志写入后立即唤醒；其他平台或inotify不可用时回退为短间隔轮询
+- 为每个日志保持常驻文件句柄，只记录字节偏移，每次检查只需一次stat，不再随日志大小增长
+- 通过inode与文件大小识别日志被清空、截断或被替换
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+
+from loguru import logger
+
+
+class _Inotify:
+    """基于ctypes的最小inotify封装，只关心目录下指定文件名是否有变化"""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    _EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, directory: Path, file_names: List[str]):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch failed for {directory}")
+        self.file_names = {os.fsencode(name) for name in file_names}
+
+    def wait(self, timeout: float) -> bool:
+        """等待目标文件发生变化，返回是否有相关事件"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        relevant = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            if not data:
+                break
+            offset = 0
+            while offset + self._EVENT_HEADER.size <= len(data):
+                _, _, _, name_len = self._EVENT_HEADER.unpack_from(data, offset)
+                start = offset + self._EVENT_HEADER.size
+                name = data[start:start + name_len].rstrip(b"\0")
+                relevant = relevant or name in self.file_names
+                offset = start + name_len
+        return relevant
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+@dataclass
+class TailResult:
+    """单个日志的一次读取结果"""
+    lines: List[str] = field(default_factory=list)  # 新增的完整行（已去除首尾空白并过滤空行）
+    grew: bool = False                             # 是否读到了新内容
+    truncated: bool = False                        # 日志是否被清空、截断或替换
+
+
+@dataclass
+class _TailState:
+    path: Path
+    handle: Optional[BinaryIO] = None
+    inode: Optional[int] = None
+    offset: int = 0
+    partial: bytes = b""
+
+
+class LogTailer:
+    """多日志文件的增量读取器"""
+
+    def __init__(self, files: Dict[str, Path], poll_interval: float = 0.2, use_inotify: bool = True):
+        """
+        Args:
+            files: 名称到日志路径的映射
+            poll_interval: 无inotify时的轮询间隔（秒）
+            use_inotify: 是否尝试使用inotify
+        """
+        self.poll_interval = poll_interval
+        self.states = {name: _TailState(Path(path)) for name, path in files.items()}
+        self._inotify: Optional[_Inotify] = None
+
+        directories = {state.path.parent for state in self.states.values()}
+        if use_inotify and sys.platform.startswith("linux") and len(directories) == 1:
+            try:
+                self._inotify = _Inotify(directories.pop(), [state.path.name for state in self.states.values()])
+            except (OSError, AttributeError) as e:
+                logger.warning(f"ForumEngine: inotify不可用，回退为轮询模式: {e}")
+
+    @property
+    def event_driven(self) -> bool:
+        return self._inotify is not None
+
+    def seek_to_end(self):
+        """以当前文件末尾作为基线，只读取之后新增的内容"""
+        for state in self.states.values():
+            self._close_handle(state)
+            self._open(state)
+            state.offset = os.fstat(state.handle.fileno()).st_size if state.handle else 0
+
+    def rewind(self, name: str):
+        """下次读取从文件开头开始（例如截断后需要读取重写的内容）"""
+        state = self.states[name]
+        state.offset, state.partial = 0, b""
+
+    def wait_for_change(self, timeout: float = 1.0) -> bool:
+        """阻塞直到日志可能发生变化或超时；返回是否由变化事件唤醒（轮询模式下总是返回False）"""
+        if self._inotify is not None:
+            try:
+                return self._inotify.wait(timeout)
+            except OSError as e:
+                logger.warning(f"ForumEngine: inotify读取失败，回退为轮询模式: {e}")
+                self._inotify.close()
+                self._inotify = None
+        time.sleep(min(self.poll_interval, timeout))
+        return False
+
+    def read(self, name: str) -> TailResult:
+        """读取指定日志自上次读取以来新增的完整行"""
+        state = self.states[name]
+        try:
+            stat = state.path.stat()
+        except FileNotFoundError:
+            # 日志被删除：此前已有内容则视为截断，之后重新出现时从头读取
+            truncated = state.offset > 0
+            self._close_handle(state)
+            state.inode, state.offset, state.partial = None, 0, b""
+            return TailResult(truncated=truncated)
+
+        if state.handle is None or stat.st_ino != state.inode:
+            replaced = state.handle is not None
+            self._close_handle(state)
+            self._open(state)
+            if replaced:
+                # 日志被替换（轮转或删除后重建）：与截断一样以新文件末尾为基线
+                state.offset, state.partial = stat.st_size, b""
+                return TailResult(truncated=True)
+
+        if stat.st_size < state.offset:
+            state.offset, state.partial = stat.st_size, b""
+            return TailResult(truncated=True)
+
+        if stat.st_size == state.offset or state.handle is None:
+            return TailResult()
+
+        state.handle.seek(state.offset)
+        data = state.handle.read(stat.st_size - state.offset)
+        state.offset += len(data)
+        chunks = (state.partial + data).split(b"\n")
+        # 最后一段没有换行符，说明该行尚未写完，留到下次读取
+        state.partial = chunks.pop()
+        lines = [line.decode("utf-8", errors="replace").strip() for line in chunks]
+        return TailResult(lines=[line for line in lines if line], grew=bool(data))
+
+    def close(self):
+        for state in self.states.values():
+            self._close_handle(state)
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    @staticmethod
+    def _open(state: _TailState):
+        try:
+            state.handle = open(state.path, "rb")
+            state.inode = os.fstat(state.handle.fileno()).st_ino
+        except FileNotFoundError:
+            state.handle, state.inode = None, None
+
+    @staticmethod
+    def _close_handle(state: _TailState):
+        if state.handle is not None:
+            try:
+                state.handle.close()
+            except OSError:
+                pass
+            state.handle = None
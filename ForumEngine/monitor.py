@@ -13,6 +13,9 @@ from typing import Dict, Optional, List
 from threading import Lock
 from loguru import logger
 
+from .log_tailer import LogTailer
+from utils.llm_stream import STREAM_PROGRESS_MARKER, parse_stream_progress
+
 # 导入论坛主持人模块
 try:
     from .llm_host import generate_host_speech
@@ -39,10 +42,10 @@ class LogMonitor:
         # 监控状态
         self.is_monitoring = False
         self.monitor_thread = None
-        self.file_positions = {}  # 记录每个文件的读取位置
-        self.file_line_counts = {}  # 记录每个文件的行数
+        self.tailer: Optional[LogTailer] = None  # 日志增量读取器（inotify事件驱动，不可用时轮询）
         self.is_searching = False  # 是否正在搜索
-        self.search_inactive_count = 0  # 搜索非活跃计数器
+        self.last_activity_time = 0.0  # 搜索会话最近一次有日志增长的时间（time.monotonic）
+        self.search_inactive_timeout = 900  # 15分钟无活动则结束论坛
         self.write_lock = Lock()  # 写入锁，防止并发写入冲突
         
         # 主持人相关状态
@@ -71,6 +74,9 @@ class LogMonitor:
         self.json_buffer = {}     # 每个app的JSON缓冲区
         self.json_start_line = {} # 每个app的JSON开始行
         self.in_error_block = {}  # 每个app是否在ERROR块中
+
+        # 各引擎LLM流式生成中的最新进度（节点、已输出字符数、首token耗时、末尾预览），不写入forum.log
+        self.partial_outputs: Dict[str, dict] = {}
        
         # 确保logs目录存在
         self.log_dir.mkdir(exist_ok=True)
@@ -95,6 +101,7 @@ class LogMonitor:
             self.json_buffer = {}
             self.json_start_line = {}
             self.in_error_block = {}
+            self.partial_outputs = {}
             
             # 重置主持人相关状态
             self.agent_speeches_buffer = []
@@ -190,7 +197,9 @@ class LogMonitor:
             "读取HOST发言失败",
             "未找到HOST发言",
             "调试输出",
-            "信息记录"
+            "信息记录",
+            STREAM_PROGRESS_MARKER,
+            "流式生成完成",
         ]
         
         for pattern in exclude_patterns:
@@ -369,58 +378,11 @@ class LogMonitor:
         
         return content.strip()
    
-    def get_file_size(self, file_path: Path) -> int:
-        """获取文件大小"""
-        try:
-            return file_path.stat().st_size if file_path.exists() else 0
-        except:
-            return 0
-   
-    def get_file_line_count(self, file_path: Path) -> int:
-        """获取文件行数"""
-        try:
-            if not file_path.exists():
-                return 0
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return sum(1 for _ in f)
-        except:
-            return 0
-   
-    def read_new_lines(self, file_path: Path, app_name: str) -> List[str]:
-        """读取文件中的新行"""
-        new_lines = []
-       
-        try:
-            if not file_path.exists():
-                return new_lines
-           
-            current_size = self.get_file_size(file_path)
-            last_position = self.file_positions.get(app_name, 0)
-           
-            # 如果文件变小了，说明被清空了，重新从头开始
-            if current_size < last_position:
-                last_position = 0
-                # 重置JSON捕获状态
-                self.capturing_json[app_name] = False
-                self.json_buffer[app_name] = []
-                self.in_error_block[app_name] = False
-           
-            if current_size > last_position:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    f.seek(last_position)
-                    new_content = f.read()
-                    new_lines = new_content.split('\n')
-                   
-                    # 更新位置
-                    self.file_positions[app_name] = f.tell()
-                   
-                    # 过滤空行
-                    new_lines = [line.strip() for line in new_lines if line.strip()]
-                   
-        except Exception as e:
-            logger.exception(f"ForumEngine: 读取{app_name}日志失败: {e}")
-       
-        return new_lines
+    def _reset_capture_state(self, app_name: str):
+        """重置指定日志的JSON捕获状态"""
+        self.capturing_json[app_name] = False
+        self.json_buffer[app_name] = []
+        self.in_error_block[app_name] = False
    
     def process_lines_for_json(self, lines: List[str], app_name: str) -> List[str]:
         """处理行以捕获多行JSON内容
@@ -464,6 +426,10 @@ class LogMonitor:
                     self.json_buffer[app_name] = []
                 # 跳过当前行，不处理
                 continue
+
+            # 流式生成进度只更新部分输出，不作为发言
+            if self.update_partial_output(line, app_name):
+                continue
                 
             # 检查是否是目标节点行和JSON开始标记
             is_target = self.is_target_log_line(line)
@@ -521,6 +487,20 @@ class LogMonitor:
         
         return captured_contents
     
+    def update_partial_output(self, line: str, app_name: str) -> bool:
+        """解析LLM流式进度行并记录为该引擎的最新部分输出，返回该行是否为进度行"""
+        if STREAM_PROGRESS_MARKER not in line:
+            return False
+        progress = parse_stream_progress(line)
+        if progress is not None:
+            progress["updated_at"] = datetime.now().strftime('%H:%M:%S')
+            self.partial_outputs[app_name] = progress
+        return True
+
+    def get_partial_outputs(self) -> Dict[str, dict]:
+        """获取各引擎正在流式生成的部分输出"""
+        return dict(self.partial_outputs)
+
     def _trigger_host_speech(self):
         """触发主持人发言（同步执行）"""
         if not HOST_AVAILABLE or self.is_host_generating:
@@ -585,31 +565,30 @@ class LogMonitor:
         """智能监控日志文件"""
         logger.info("ForumEngine: 论坛创建中...")
        
-        # 初始化文件行数和位置 - 记录当前状态作为基线
-        for app_name, log_file in self.monitored_logs.items():
-            self.file_line_counts[app_name] = self.get_file_line_count(log_file)
-            self.file_positions[app_name] = self.get_file_size(log_file)
-            self.capturing_json[app_name] = False
-            self.json_buffer[app_name] = []
-            self.in_error_block[app_name] = False
-            # logger.info(f"ForumEngine: {app_name} 基线行数: {self.file_line_counts[app_name]}")
+        # 以当前文件末尾作为基线，之后只按字节偏移增量读取
+        self.tailer = LogTailer(self.monitored_logs)
+        self.tailer.seek_to_end()
+        for app_name in self.monitored_logs:
+            self._reset_capture_state(app_name)
+        logger.info(f"ForumEngine: 日志追踪模式: {'inotify事件驱动' if self.tailer.event_driven else '轮询'}")
        
         while self.is_monitoring:
             try:
+                # 等待日志写入事件（最长1秒，保证停止信号和非活跃超时能及时处理）
+                self.tailer.wait_for_change(timeout=1.0)
+
                 # 同时检测三个log文件的变化
                 any_growth = False
                 any_shrink = False
                 captured_any = False
                
                 # 为每个log文件独立处理
-                for app_name, log_file in self.monitored_logs.items():
-                    current_lines = self.get_file_line_count(log_file)
-                    previous_lines = self.file_line_counts.get(app_name, 0)
+                for app_name in self.monitored_logs:
+                    result = self.tailer.read(app_name)
                    
-                    if current_lines > previous_lines:
+                    if result.grew:
                         any_growth = True
-                        # 立即读取新增内容
-                        new_lines = self.read_new_lines(log_file, app_name)
+                        new_lines = result.lines
                        
                         # 先检查是否需要触发搜索（只触发一次）
                         if not self.is_searching:
@@ -620,7 +599,7 @@ class LogMonitor:
                                     if 'FirstSummaryNode' in line or '正在生成首次段落总结' in line:
                                         logger.info(f"ForumEngine: 在{app_name}中检测到第一次论坛发表内容")
                                         self.is_searching = True
-                                        self.search_inactive_count = 0
+                                        self.last_activity_time = time.monotonic()
                                         # 清空forum.log开始新会话
                                         self.clear_forum_log()
                                         break  # 找到一个就够了，跳出循环
@@ -647,18 +626,10 @@ class LogMonitor:
                                     # 同步触发主持人发言
                                     self._trigger_host_speech()
                    
-                    elif current_lines < previous_lines:
+                    elif result.truncated:
                         any_shrink = True
-                        # logger.info(f"ForumEngine: 检测到 {app_name} 日志缩短，将重置基线")
-                        # 重置文件位置到新的文件末尾
-                        self.file_positions[app_name] = self.get_file_size(log_file)
-                        # 重置JSON捕获状态
-                        self.capturing_json[app_name] = False
-                        self.json_buffer[app_name] = []
-                        self.in_error_block[app_name] = False
-                   
-                    # 更新行数记录
-                    self.file_line_counts[app_name] = current_lines
+                        # 日志被清空或替换，读取器已将基线重置到新的文件末尾，这里重置JSON捕获状态
+                        self._reset_capture_state(app_name)
                
                 # 检查是否应该结束当前搜索会话
                 if self.is_searching:
@@ -666,7 +637,6 @@ class LogMonitor:
                         # log变短，结束当前搜索会话，重置为等待状态
                         # logger.info("ForumEngine: 日志缩短，结束当前搜索会话，回到等待状态")
                         self.is_searching = False
-                        self.search_inactive_count = 0
                         # 重置主持人相关状态
                         self.agent_speeches_buffer = []
                         self.is_host_generating = False
@@ -675,12 +645,10 @@ class LogMonitor:
                         self.write_to_forum_log(f"=== ForumEngine 论坛结束 - {end_time} ===", "SYSTEM")
                         # logger.info("ForumEngine: 已重置基线，等待下次FirstSummaryNode触发")
                     elif not any_growth and not captured_any:
-                        # 没有增长也没有捕获内容，增加非活跃计数
-                        self.search_inactive_count += 1
-                        if self.search_inactive_count >= 900:  # 15分钟无活动才结束
+                        # 没有增长也没有捕获内容，按实际经过时间判断是否超时
+                        if time.monotonic() - self.last_activity_time >= self.search_inactive_timeout:
                             logger.info("ForumEngine: 长时间无活动，结束论坛")
                             self.is_searching = False
-                            self.search_inactive_count = 0
                             # 重置主持人相关状态
                             self.agent_speeches_buffer = []
                             self.is_host_generating = False
@@ -688,10 +656,7 @@ class LogMonitor:
                             end_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                             self.write_to_forum_log(f"=== ForumEngine 论坛结束 - {end_time} ===", "SYSTEM")
                     else:
-                        self.search_inactive_count = 0  # 重置计数器
-               
-                # 短暂休眠
-                time.sleep(1)
+                        self.last_activity_time = time.monotonic()  # 重置非活跃计时
                
             except Exception as e:
                 logger.exception(f"ForumEngine: 论坛记录中出错: {e}")
@@ -699,6 +664,7 @@ class LogMonitor:
                 traceback.print_exc()
                 time.sleep(2)
        
+        self.tailer.close()
         logger.info("ForumEngine: 停止论坛日志文件")
    
     def start_monitoring(self):
@@ -856,4 +822,8 @@ def stop_forum_monitoring():
 
 def get_forum_log():
     """获取forum.log内容"""
-    return get_monitor().get_forum_log_content()
\ No newline at end of file
+    return get_monitor().get_forum_log_content()
+
+def get_partial_outputs():
+    """获取各引擎LLM流式生成中的部分输出"""
+    return get_monitor().get_partial_outputs()
\ No newline at end of file
@@ -8,7 +8,7 @@ import os
 import re
 import threading
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, Callable
 from loguru import logger
 
 from .llms import LLMClient
@@ -24,6 +24,7 @@ from .state import State
 from .tools import MediaCrawlerDB, DBResponse, keyword_optimizer, multilingual_sentiment_analyzer
 from .utils.config import settings, Settings
 from .utils import format_search_results_for_prompt
+from utils.paragraph_executor import ParagraphExecutor, ParagraphProgress
 
 
 class DeepSearchAgent:
@@ -171,44 +172,20 @@ class DeepSearchAgent:
         logger.info(f"  🔍 原始查询: '{query}'")
         logger.info(f"  ✨ 优化后关键词: {optimized_response.optimized_keywords}")
         
-        # 使用优化后的关键词进行多次查询并整合结果
+        # 使用优化后的关键词查询并整合结果：批量模式下所有关键词合并为每表一次查询，否则逐关键词查询
+        keywords = optimized_response.optimized_keywords
+        if self.config.BATCH_KEYWORD_SEARCH and len(keywords) > 1:
+            keyword_batches = [keywords]
+        else:
+            keyword_batches = [[keyword] for keyword in keywords]
         all_results = []
         total_count = 0
         
-        for keyword in optimized_response.optimized_keywords:
-            logger.info(f"    查询关键词: '{keyword}'")
+        for batch in keyword_batches:
+            logger.info(f"    查询关键词: {batch if len(batch) > 1 else repr(batch[0])}")
             
             try:
-                if tool_name == "search_topic_globally":
-                    # 使用配置文件中的默认值，忽略agent提供的limit_per_table参数
-                    limit_per_table = self.config.DEFAULT_SEARCH_TOPIC_GLOBALLY_LIMIT_PER_TABLE
-                    response = self.search_agency.search_topic_globally(topic=keyword, limit_per_table=limit_per_table)
-                elif tool_name == "search_topic_by_date":
-                    start_date = kwargs.get("start_date")
-                    end_date = kwargs.get("end_date")
-                    # 使用配置文件中的默认值，忽略agent提供的limit_per_table参数
-                    limit_per_table = self.config.DEFAULT_SEARCH_TOPIC_BY_DATE_LIMIT_PER_TABLE
-                    if not start_date or not end_date:
-                        raise ValueError("search_topic_by_date工具需要start_date和end_date参数")
-                    response = self.search_agency.search_topic_by_date(topic=keyword, start_date=start_date, end_date=end_date, limit_per_table=limit_per_table)
-                elif tool_name == "get_comments_for_topic":
-                    # 使用配置文件中的默认值，按关键词数量分配，但保证最小值
-                    limit = self.config.DEFAULT_GET_COMMENTS_FOR_TOPIC_LIMIT // len(optimized_response.optimized_keywords)
-                    limit = max(limit, 50)
-                    response = self.search_agency.get_comments_for_topic(topic=keyword, limit=limit)
-                elif tool_name == "search_topic_on_platform":
-                    platform = kwargs.get("platform")
-                    start_date = kwargs.get("start_date")
-                    end_date = kwargs.get("end_date")
-                    # 使用配置文件中的默认值，按关键词数量分配，但保证最小值
-                    limit = self.config.DEFAULT_SEARCH_TOPIC_ON_PLATFORM_LIMIT // len(optimized_response.optimized_keywords)
-                    limit = max(limit, 30)
-                    if not platform:
-                        raise ValueError("search_topic_on_platform工具需要platform参数")
-                    response = self.search_agency.search_topic_on_platform(platform=platform, topic=keyword, start_date=start_date, end_date=end_date, limit=limit)
-                else:
-                    logger.info(f"    未知的搜索工具: {tool_name}，使用默认全局搜索")
-                    response = self.search_agency.search_topic_globally(topic=keyword, limit_per_table=self.config.DEFAULT_SEARCH_TOPIC_GLOBALLY_LIMIT_PER_TABLE)
+                response = self._search_with_keywords(tool_name, batch, len(keywords), **kwargs)
                 
                 # 收集结果
                 if response.results:
@@ -219,7 +196,7 @@ class DeepSearchAgent:
                     logger.info(f"     未找到结果")
                     
             except Exception as e:
-                logger.error(f"      查询'{keyword}'时出错: {str(e)}")
+                logger.error(f"      查询{batch}时出错: {str(e)}")
                 continue
         
         # 去重和整合结果
@@ -251,6 +228,47 @@ class DeepSearchAgent:
         
         return integrated_response
     
+    def _search_with_keywords(self, tool_name: str, keywords: List[str], total_keywords: int, **kwargs) -> DBResponse:
+        """
+        以一组关键词调用话题类查询工具（多个关键词时每表只查询一次，结果以 matched_keyword 标记）
+        
+        Args:
+            tool_name: 工具名称
+            keywords: 本次查询的关键词
+            total_keywords: 优化后关键词总数，用于按关键词分配结果上限
+            
+        Returns:
+            DBResponse对象
+        """
+        # 上限按关键词数量线性放大，与逐关键词查询时的总返回量保持一致
+        topic = keywords if len(keywords) > 1 else keywords[0]
+        if tool_name == "search_topic_by_date":
+            start_date = kwargs.get("start_date")
+            end_date = kwargs.get("end_date")
+            # 使用配置文件中的默认值，忽略agent提供的limit_per_table参数
+            limit_per_table = self.config.DEFAULT_SEARCH_TOPIC_BY_DATE_LIMIT_PER_TABLE * len(keywords)
+            if not start_date or not end_date:
+                raise ValueError("search_topic_by_date工具需要start_date和end_date参数")
+            return self.search_agency.search_topic_by_date(topic=topic, start_date=start_date, end_date=end_date, limit_per_table=limit_per_table)
+        if tool_name == "get_comments_for_topic":
+            # 使用配置文件中的默认值，按关键词数量分配，但保证最小值
+            limit = max(self.config.DEFAULT_GET_COMMENTS_FOR_TOPIC_LIMIT // total_keywords, 50) * len(keywords)
+            return self.search_agency.get_comments_for_topic(topic=topic, limit=limit)
+        if tool_name == "search_topic_on_platform":
+            platform = kwargs.get("platform")
+            start_date = kwargs.get("start_date")
+            end_date = kwargs.get("end_date")
+            # 使用配置文件中的默认值，按关键词数量分配，但保证最小值
+            limit = max(self.config.DEFAULT_SEARCH_TOPIC_ON_PLATFORM_LIMIT // total_keywords, 30) * len(keywords)
+            if not platform:
+                raise ValueError("search_topic_on_platform工具需要platform参数")
+            return self.search_agency.search_topic_on_platform(platform=platform, topic=topic, start_date=start_date, end_date=end_date, limit=limit)
+        if tool_name != "search_topic_globally":
+            logger.info(f"    未知的搜索工具: {tool_name}，使用默认全局搜索")
+        # 使用配置文件中的默认值，忽略agent提供的limit_per_table参数
+        limit_per_table = self.config.DEFAULT_SEARCH_TOPIC_GLOBALLY_LIMIT_PER_TABLE * len(keywords)
+        return self.search_agency.search_topic_globally(topic=topic, limit_per_table=limit_per_table)
+    
     def _deduplicate_results(self, results: List) -> List:
         """
         去重搜索结果
@@ -425,31 +443,39 @@ class DeepSearchAgent:
             _message += f"\n  {i}. {paragraph.title}"
         logger.info(_message)
     
-    def _process_paragraphs(self):
-        """处理所有段落"""
-        total_paragraphs = len(self.state.paragraphs)
+    def _process_paragraphs(self, on_progress: Optional[Callable[[ParagraphProgress], None]] = None):
+        """
+        处理所有段落，最多 MAX_PARALLEL_PARAGRAPHS 个段落并行
+
+        Args:
+            on_progress: 段落开始和完成时的进度回调，默认只记录日志
+        """
+        executor = ParagraphExecutor(
+            max_workers=self.config.MAX_PARALLEL_PARAGRAPHS,
+            stop_event=self.stop_event,
+            on_progress=on_progress or self._log_paragraph_progress,
+        )
+        executor.run(self._process_paragraph, len(self.state.paragraphs))
+
+    def _process_paragraph(self, paragraph_index: int):
+        """处理单个段落：初始搜索和总结、反思循环"""
+        logger.info(f"\n[步骤 2.{paragraph_index+1}] 处理段落: {self.state.paragraphs[paragraph_index].title}")
+        logger.info("-" * 50)
         
-        for i in range(total_paragraphs):
-            # 检查停止信号
-            if self.stop_event and self.stop_event.is_set():
-                logger.info("检测到停止信号，中止段落处理")
-                from .llms.base import InterruptedError
-                raise InterruptedError("用户请求停止")
-            
-            logger.info(f"\n[步骤 2.{i+1}] 处理段落: {self.state.paragraphs[i].title}")
-            logger.info("-" * 50)
-            
-            # 初始搜索和总结
-            self._initial_search_and_summary(i)
-            
-            # 反思循环
-            self._reflection_loop(i)
-            
-            # 标记段落完成
-            self.state.paragraphs[i].research.mark_completed()
-            
-            progress = (i + 1) / total_paragraphs * 100
-            logger.info(f"段落处理完成 ({progress:.1f}%)")
+        # 初始搜索和总结
+        self._initial_search_and_summary(paragraph_index)
+        
+        # 反思循环
+        self._reflection_loop(paragraph_index)
+        
+        # 标记段落完成
+        self.state.paragraphs[paragraph_index].research.mark_completed()
+
+    @staticmethod
+    def _log_paragraph_progress(event: ParagraphProgress):
+        if event.status == "completed":
+            progress = event.completed / event.total * 100
+            logger.info(f"段落 {event.index + 1} 处理完成 ({progress:.1f}%)")
     
     def _initial_search_and_summary(self, paragraph_index: int):
         """执行初始搜索和总结"""
@@ -77,6 +77,7 @@ class ReportFormattingNode(BaseNode):
                 SYSTEM_PROMPT_REPORT_FORMATTING,
                 message,
                 max_tokens=32000,  # 32000 tokens ≈ 22000-25000 字中文
+                stream=True,
             )
 
             # 处理响应
@@ -100,7 +100,7 @@ class FirstSummaryNode(StateMutationNode):
             logger.info("正在生成首次段落总结")
             
             # 调用LLM
-            response = self.llm_client.invoke(SYSTEM_PROMPT_FIRST_SUMMARY, message)
+            response = self.llm_client.invoke(SYSTEM_PROMPT_FIRST_SUMMARY, message, stream=True)
             
             # 处理响应
             processed_response = self.process_output(response)
@@ -265,7 +265,7 @@ class ReflectionSummaryNode(StateMutationNode):
             logger.info("正在生成反思总结")
             
             # 调用LLM
-            response = self.llm_client.invoke(SYSTEM_PROMPT_REFLECTION_SUMMARY, message)
+            response = self.llm_client.invoke(SYSTEM_PROMPT_REFLECTION_SUMMARY, message, stream=True)
             
             # 处理响应
             processed_response = self.process_output(response)
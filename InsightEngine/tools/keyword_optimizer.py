@@ -23,6 +23,7 @@ if utils_dir not in sys.path:
     sys.path.append(utils_dir)
 
 from retry_helper import with_graceful_retry, SEARCH_API_RETRY_CONFIG
+from rate_limiter import estimate_tokens, rate_limited
 
 @dataclass
 class KeywordOptimizationResponse:
@@ -192,14 +193,17 @@ class KeywordOptimizer:
     def _call_qwen_api(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
         """调用Qwen API"""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-            )
+            with rate_limited(self.base_url, self.model, estimate_tokens(system_prompt, user_prompt)) as lease:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.7,
+                )
+                if lease and response.usage:
+                    lease.report_tokens(response.usage.total_tokens)
 
             if response.choices:
                 content = response.choices[0].message.content
@@ -24,14 +24,21 @@ V3.0 核心更新:
 """
 
 import os
+import sys
 import json
+from pathlib import Path
 from loguru import logger
 import asyncio
-from typing import List, Dict, Any, Optional, Literal
+from typing import List, Dict, Any, Optional, Literal, Union
 from dataclasses import dataclass, field
-from ..utils.db import fetch_all
+from ..utils.db import fetch_all, fetch_all_concurrently, run_sync
 from datetime import datetime, timedelta, date
 from InsightEngine.utils.config import settings
+from utils.hotness import HOTNESS_FIELDS, hotness_sql
+
+# 表结构以 MindSpider/schema 中的 ORM 模型为准（models_bigdata 的表与 daily_news 等注册在同一个 Base 上）
+sys.path.append(str(Path(__file__).resolve().parents[2] / "MindSpider" / "schema"))
+from models_bigdata import Base as SchemaBase
 
 # --- 1. 数据结构定义 ---
 
@@ -48,6 +55,7 @@ class QueryResult:
     source_keyword: Optional[str] = None
     hotness_score: float = 0.0
     source_table: str = ""
+    matched_keyword: Optional[str] = None
 
 @dataclass
 class DBResponse:
@@ -58,16 +66,37 @@ class DBResponse:
     results_count: int = 0
     error_message: Optional[str] = None
 
+# 查询结果转换时依次尝试的字段（顺序即回退顺序）：正文、发布时间、作者、链接与各互动指标
+CONTENT_COLUMNS = ('title', 'content', 'desc', 'content_text')
+TIME_COLUMNS = ('create_time', 'time', 'created_time', 'publish_time', 'crawl_date')
+AUTHOR_COLUMNS = ('nickname', 'user_nickname', 'user_name')
+URL_COLUMNS = ('video_url', 'note_url', 'content_url', 'url', 'aweme_url')
+ENGAGEMENT_COLUMNS: Dict[str, tuple] = {
+    'likes': ('liked_count', 'like_count', 'voteup_count', 'comment_like_count'),
+    'comments': ('video_comment', 'comments_count', 'comment_count', 'total_replay_num', 'sub_comment_count'),
+    'shares': ('video_share_count', 'shared_count', 'share_count', 'total_forwards'),
+    'views': ('video_play_count', 'viewd_count'),
+    'favorites': ('video_favorite_count', 'collected_count'),
+    'coins': ('video_coin_count',),
+    'danmaku': ('video_danmaku',),
+}
+# create_date_time 为 search_topic_on_platform 中微博内容的发布时间列
+PROJECTED_COLUMNS = frozenset(
+    CONTENT_COLUMNS + TIME_COLUMNS + AUTHOR_COLUMNS + URL_COLUMNS + ('source_keyword', 'create_date_time')
+    + tuple(col for cols in ENGAGEMENT_COLUMNS.values() for col in cols)
+)
+
+# 各表查询投影：由 ORM 模型的列筛选出上面实际用到的字段，替代 SELECT *；image_list、tag_list 等其余大字段不在投影内。
+# 运行时再与实际表结构取交集（兼容尚未迁移的旧库）
+TABLE_PROJECTIONS: Dict[str, tuple] = {
+    name: tuple(column.name for column in table.columns if column.name in PROJECTED_COLUMNS)
+    for name, table in SchemaBase.metadata.tables.items()
+}
+
 # --- 2. 核心客户端与专用工具集 ---
 
 class MediaCrawlerDB:
     """包含多种专用舆情数据库查询工具的客户端"""
-    # 权重定义
-    W_LIKE = 1.0
-    W_COMMENT = 5.0
-    W_SHARE = 10.0  # 分享/转发/收藏/投币等高价值互动
-    W_VIEW = 0.1
-    W_DANMAKU = 0.5
 
     def __init__(self):
         """
@@ -77,23 +106,21 @@ class MediaCrawlerDB:
         
     def _execute_query(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
         try:
-            # 获取或创建event loop
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_closed():
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            
-            # 直接运行协程
-            return loop.run_until_complete(fetch_all(query, params))
+            # 在常驻事件循环上运行协程，复用同一个引擎连接池
+            return run_sync(fetch_all(query, params))
         
         except Exception as e:
             logger.exception(f"数据库查询时发生错误: {e}")
             return []
 
+    def _execute_queries(self, queries: List[tuple]) -> List[List[Dict[str, Any]]]:
+        """并发执行多条 (query, params) 查询，结果顺序与输入一致，单条失败时对应位置为空列表"""
+        try:
+            return run_sync(fetch_all_concurrently(queries))
+        except Exception as e:
+            logger.exception(f"数据库并发查询时发生错误: {e}")
+            return [[] for _ in queries]
+
     @staticmethod
     def _to_datetime(ts: Any) -> Optional[datetime]:
         if not ts: return None
@@ -110,16 +137,31 @@ class MediaCrawlerDB:
     _table_columns_cache = {}
     def _get_table_columns(self, table_name: str) -> List[str]:
         if table_name in self._table_columns_cache: return self._table_columns_cache[table_name]
-        results = self._execute_query(f"SHOW COLUMNS FROM `{table_name}`")
-        columns = [row['Field'] for row in results] if results else []
-        self._table_columns_cache[table_name] = columns
-        return columns
+        # information_schema 在 MySQL 与 PostgreSQL 上均可用，仅当前库/模式的判定方式不同；一次读取全库表结构，避免逐表往返
+        schema_expr = 'current_schema()' if settings.DB_DIALECT == 'postgresql' else 'DATABASE()'
+        results = self._execute_query(f"SELECT TABLE_NAME AS table_name, COLUMN_NAME AS column_name FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = {schema_expr} ORDER BY TABLE_NAME, ORDINAL_POSITION")
+        columns = {}
+        for row in results: columns.setdefault(row['table_name'], []).append(row['column_name'])
+        self._table_columns_cache.update(columns)
+        # 查询失败或表不存在时不缓存，下次调用重试
+        return self._table_columns_cache.get(table_name, [])
+
+    _projection_cache = {}
+    def _get_projection(self, table_name: str) -> str:
+        """返回表的 SELECT 列清单：TABLE_PROJECTIONS 与实际表结构的交集，无法获取表结构时回退为 *"""
+        if table_name in self._projection_cache: return self._projection_cache[table_name]
+        columns, fields = self._get_table_columns(table_name), TABLE_PROJECTIONS.get(table_name)
+        if not columns or not fields: return '*'
+        missing = [f for f in fields if f not in columns]
+        if missing: logger.warning(f"表 {table_name} 缺少投影字段 {missing}，查询时将忽略")
+        projection = ", ".join(self._wrap_query_field_with_dialect(f) for f in fields if f in columns) or '*'
+        self._projection_cache[table_name] = projection
+        return projection
 
     def _extract_engagement(self, row: Dict[str, Any]) -> Dict[str, int]:
         """从数据行中提取并统一互动指标"""
         engagement = {}
-        mapping = { 'likes': ['liked_count', 'like_count', 'voteup_count', 'comment_like_count'], 'comments': ['video_comment', 'comments_count', 'comment_count', 'total_replay_num', 'sub_comment_count'], 'shares': ['video_share_count', 'shared_count', 'share_count', 'total_forwards'], 'views': ['video_play_count', 'viewd_count'], 'favorites': ['video_favorite_count', 'collected_count'], 'coins': ['video_coin_count'], 'danmaku': ['video_danmaku'], }
-        for key, potential_cols in mapping.items():
+        for key, potential_cols in ENGAGEMENT_COLUMNS.items():
             for col in potential_cols:
                 if col in row and row[col] is not None:
                     try: engagement[key] = int(row[col])
@@ -148,54 +190,140 @@ class MediaCrawlerDB:
         now = datetime.now()
         start_time = now - timedelta(days={'24h': 1, 'week': 7}.get(time_period, 365))
 
-        # 定义各平台的热度计算SQL片段
-        hotness_formulas = {
-            'bilibili_video': f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(video_comment AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(video_share_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(video_favorite_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(video_coin_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(video_danmaku AS UNSIGNED), 0) * {self.W_DANMAKU} + COALESCE(CAST(video_play_count AS DECIMAL(20,2)), 0) * {self.W_VIEW})",
-            'douyin_aweme':   f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comment_count AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(share_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(collected_count AS UNSIGNED), 0) * {self.W_SHARE})",
-            'weibo_note':     f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comments_count AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(shared_count AS UNSIGNED), 0) * {self.W_SHARE})",
-            'xhs_note':       f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comment_count AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(share_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(collected_count AS UNSIGNED), 0) * {self.W_SHARE})",
-            'kuaishou_video': f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(viewd_count AS DECIMAL(20,2)), 0) * {self.W_VIEW})",
-            'zhihu_content':  f"(COALESCE(CAST(voteup_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comment_count AS UNSIGNED), 0) * {self.W_COMMENT})",
-        }
+        # 各平台的热度计算SQL片段，与 MediaCrawler 写入 hotness_score 时共用 utils/hotness.py 中的权重表
+        hotness_formulas = {table: hotness_sql(table, self._wrap_query_field_with_dialect) for table in HOTNESS_FIELDS}
 
-        all_queries, params = [], []
-        for table, formula in hotness_formulas.items():
+        all_queries, params = [], {'limit': limit}
+        for idx, (table, formula) in enumerate(hotness_formulas.items()):
+            pname = f"start_{idx}"
             time_filter_sql, time_filter_param = "", None
-            if table == 'weibo_note': time_filter_sql, time_filter_param = "`create_date_time` >= %s", start_time.strftime('%Y-%m-%d %H:%M:%S')
-            elif table in ['kuaishou_video', 'xhs_note', 'douyin_aweme']: time_col = 'time' if table == 'xhs_note' else 'create_time'; time_filter_sql, time_filter_param = f"`{time_col}` >= %s", str(int(start_time.timestamp() * 1000))
-            elif table == 'zhihu_content': time_filter_sql, time_filter_param = "CAST(`created_time` AS UNSIGNED) >= %s", str(int(start_time.timestamp()))
-            else: time_filter_sql, time_filter_param = "`create_time` >= %s", str(int(start_time.timestamp()))
+            if table == 'weibo_note': time_filter_sql, time_filter_param = f"`create_date_time` >= :{pname}", start_time.strftime('%Y-%m-%d %H:%M:%S')
+            elif table in ['kuaishou_video', 'xhs_note', 'douyin_aweme']: time_col = 'time' if table == 'xhs_note' else 'create_time'; time_filter_sql, time_filter_param = f"`{time_col}` >= :{pname}", str(int(start_time.timestamp() * 1000))
+            elif table == 'zhihu_content': time_filter_sql, time_filter_param = f"CAST(`created_time` AS UNSIGNED) >= :{pname}", str(int(start_time.timestamp()))
+            else: time_filter_sql, time_filter_param = f"`create_time` >= :{pname}", str(int(start_time.timestamp()))
+
+            # 存储层已维护 hotness_score 列时直接按索引读取 Top-N；
+            # 未迁移的表以及列中尚为 NULL 的旧数据（升级后未回填）回退为实时计算加权公式，避免旧内容从结果中消失
+            if 'hotness_score' in self._get_table_columns(table):
+                variants = [('`hotness_score`', ' AND `hotness_score` IS NOT NULL'), (formula, ' AND `hotness_score` IS NULL')]
+            else:
+                variants = [(formula, '')]
 
             content_type = 'note' if table in ['weibo_note', 'xhs_note'] else 'content' if table == 'zhihu_content' else 'video'
-            query_template = "SELECT '{platform}' as p, '{type}' as t, {title} as title, {author} as author, {url} as url, {ts} as ts, {formula} as hotness_score, source_keyword, '{tbl}' as tbl FROM `{tbl}` WHERE {time_filter}"
+            query_template = "SELECT '{platform}' as p, '{type}' as t, {title} as title, {author} as author, {url} as url, {ts} as ts, {formula} as hotness_score, source_keyword, '{tbl}' as tbl FROM `{tbl}` WHERE {time_filter} ORDER BY hotness_score DESC LIMIT :limit"
             
-            field_subs = {'platform': table.split('_')[0], 'type': content_type, 'title': 'title', 'author': 'nickname', 'url': 'video_url', 'ts': 'create_time', 'formula': formula, 'tbl': table, 'time_filter': time_filter_sql}
+            field_subs = {'platform': table.split('_')[0], 'type': content_type, 'title': 'title', 'author': 'nickname', 'url': 'video_url', 'ts': 'create_time', 'tbl': table}
             if table == 'weibo_note': field_subs.update({'title': 'content', 'url': 'note_url', 'ts': 'create_date_time'})
             elif table == 'xhs_note': field_subs.update({'ts': 'time', 'url': 'note_url'})
             elif table == 'zhihu_content': field_subs.update({'author': 'user_nickname', 'url': 'content_url', 'ts': 'created_time'})
             elif table == 'douyin_aweme': field_subs.update({'url': 'aweme_url'})
 
-            all_queries.append(query_template.format(**field_subs))
-            params.append(time_filter_param)
+            for variant_formula, null_filter in variants:
+                all_queries.append(query_template.format(**field_subs, formula=variant_formula, time_filter=time_filter_sql + null_filter))
+            params[pname] = time_filter_param
         
-        final_query = f"({' ) UNION ALL ( '.join(all_queries)}) ORDER BY hotness_score DESC LIMIT %s"
-        raw_results = self._execute_query(final_query, tuple(params) + (limit,))
+        final_query = f"({' ) UNION ALL ( '.join(all_queries)}) ORDER BY hotness_score DESC LIMIT :limit"
+        raw_results = self._execute_query(final_query, params)
 
-        formatted_results = [QueryResult(platform=r['p'], content_type=r['t'], title_or_content=r['title'], author_nickname=r.get('author'), url=r['url'], publish_time=self._to_datetime(r['ts']), engagement=self._extract_engagement(r), hotness_score=r.get('hotness_score', 0.0), source_keyword=r.get('source_keyword'), source_table=r['tbl']) for r in raw_results]
+        formatted_results = [QueryResult(platform=r['p'], content_type=r['t'], title_or_content=r['title'], author_nickname=r.get('author'), url=r['url'], publish_time=self._to_datetime(r['ts']), engagement=self._extract_engagement(r), hotness_score=r.get('hotness_score') or 0.0, source_keyword=r.get('source_keyword'), source_table=r['tbl']) for r in raw_results]
         return DBResponse("search_hot_content", params_for_log, results=formatted_results, results_count=len(formatted_results))    
 
+    @staticmethod
+    def _first_value(row: Dict[str, Any], columns: tuple) -> Any:
+        """按顺序返回数据行中第一个非空字段的值"""
+        return next((row[col] for col in columns if row.get(col)), None)
+
+    def _rows_to_results(self, rows: List[Dict[str, Any]], table: str, content_type: str, topics: List[str]) -> List[QueryResult]:
+        """将单表查询返回的数据行统一转换为 QueryResult"""
+        results = []
+        for row in rows:
+            results.append(QueryResult(
+                platform=table.split('_')[0], content_type=content_type,
+                title_or_content=self._first_value(row, CONTENT_COLUMNS) or '',
+                author_nickname=self._first_value(row, AUTHOR_COLUMNS),
+                url=self._first_value(row, URL_COLUMNS),
+                publish_time=self._to_datetime(self._first_value(row, TIME_COLUMNS)),
+                engagement=self._extract_engagement(row),
+                source_keyword=row.get('source_keyword'),
+                source_table=table,
+                matched_keyword=row.get('matched_keyword') or topics[0]
+            ))
+        return results
+
     def _wrap_query_field_with_dialect(self, field: str) -> str:
         """根据数据库方言包装SQL查询"""
         if settings.DB_DIALECT == 'postgresql':
             return f'"{field}"'
         return f'`{field}`'
 
-    def search_topic_globally(self, topic: str, limit_per_table: int = 100) -> DBResponse:
+    _fulltext_index_cache = None
+    def _get_fulltext_indexes(self, table_name: str) -> List[frozenset]:
+        """返回表上各 FULLTEXT 索引覆盖的列集合（仅MySQL，索引由 MindSpider/schema/init_fulltext_index.py 创建）"""
+        if MediaCrawlerDB._fulltext_index_cache is None:
+            # 首次调用时一次性读取整个库的 FULLTEXT 索引信息
+            indexes = {}
+            if settings.DB_FULLTEXT_SEARCH and (settings.DB_DIALECT or 'mysql').lower() == 'mysql':
+                try:
+                    rows = run_sync(fetch_all(
+                        "SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS "
+                        "WHERE TABLE_SCHEMA = DATABASE() AND INDEX_TYPE = 'FULLTEXT'"
+                    ))
+                except Exception as e:
+                    # 查询失败时不缓存（否则会永久当作无索引），本次回退 LIKE，下次调用重试
+                    logger.warning(f"读取全文索引信息失败，本次使用LIKE匹配: {e}")
+                    return []
+                for row in rows:
+                    indexes.setdefault(row['TABLE_NAME'], {}).setdefault(row['INDEX_NAME'], set()).add(row['COLUMN_NAME'])
+            MediaCrawlerDB._fulltext_index_cache = {table: [frozenset(cols) for cols in table_indexes.values()] for table, table_indexes in indexes.items()}
+        return MediaCrawlerDB._fulltext_index_cache.get(table_name, [])
+
+    @staticmethod
+    def _normalize_topics(topic: Union[str, List[str]]) -> List[str]:
+        """将单个关键词或关键词列表统一为去重后的非空关键词列表"""
+        topics = [topic] if isinstance(topic, str) else list(topic or [])
+        return list(dict.fromkeys(t.strip() for t in topics if t and t.strip())) or ['']
+
+    def _build_topic_clause(self, table: str, fields: List[str], topic: Union[str, List[str]], param_prefix: str = "term") -> tuple:
+        """
+        构建话题匹配的 WHERE 子句及其参数，传入多个关键词时任一关键词命中即可（每表只需一次扫描）。
+
+        MySQL 上若存在恰好覆盖 fields 的 ngram FULLTEXT 索引，则使用 MATCH ... AGAINST 短语查询
+        （多个短语在布尔模式下为 OR 关系）；否则回退为逐字段 LIKE 匹配（PostgreSQL 的 pg_trgm GIN 索引可直接加速 LIKE）。
+        """
+        topics = self._normalize_topics(topic)
+        # ngram 默认 ngram_token_size=2，单字关键词无法命中全文索引
+        if all(len(t) >= 2 for t in topics) and frozenset(fields) in self._get_fulltext_indexes(table):
+            columns = ", ".join(self._wrap_query_field_with_dialect(field) for field in fields)
+            phrases = " ".join('"{}"'.format(t.replace('"', ' ')) for t in topics)
+            return f"MATCH({columns}) AGAINST (:{param_prefix} IN BOOLEAN MODE)", {param_prefix: phrases}
+
+        where_clauses, param_dict = [], {}
+        for idx, (t, field) in enumerate((t, field) for t in topics for field in fields):
+            pname = f"{param_prefix}_{idx}"
+            where_clauses.append(f'{self._wrap_query_field_with_dialect(field)} LIKE :{pname}')
+            param_dict[pname] = f"%{t}%"
+        return " OR ".join(where_clauses), param_dict
+
+    def _build_keyword_column(self, table: str, fields: List[str], topics: List[str], param_prefix: str = "kw") -> tuple:
+        """
+        构建标记命中关键词的 SELECT 列（CASE WHEN 按关键词顺序取第一个命中者）。
+        单个关键词时无需在数据库中计算，返回空片段，由 _rows_to_results 直接填充。
+        """
+        if len(topics) <= 1: return "", {}
+        cases, param_dict = [], {}
+        for idx, t in enumerate(topics):
+            clause, clause_params = self._build_topic_clause(table, fields, t, param_prefix=f"{param_prefix}_{idx}")
+            cases.append(f"WHEN ({clause}) THEN :{param_prefix}_{idx}_value")
+            param_dict.update(clause_params)
+            param_dict[f"{param_prefix}_{idx}_value"] = t
+        return f", CASE {' '.join(cases)} END AS matched_keyword", param_dict
+
+    def search_topic_globally(self, topic: Union[str, List[str]], limit_per_table: int = 100) -> DBResponse:
         """
         【工具】全局话题搜索: 在数据库中（内容、评论、标签、来源关键字）全面搜索指定话题。
 
         Args:
-            topic (str): 要搜索的话题关键词。
+            topic (Union[str, List[str]]): 要搜索的话题关键词；传入列表时所有关键词合并为每表一次查询，结果以 matched_keyword 标记命中的关键词。
             limit_per_table (int): 从每个相关表中返回的最大记录数，默认为 100。
 
         Returns:
@@ -204,41 +332,28 @@ class MediaCrawlerDB:
         params_for_log = {'topic': topic, 'limit_per_table': limit_per_table}
         logger.info(f"--- TOOL: 全局话题搜索 (params: {params_for_log}) ---")
         
-        search_term, all_results = f"%{topic}%", []
+        all_results = []
         search_configs = { 'bilibili_video': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video'}, 'bilibili_video_comment': {'fields': ['content'], 'type': 'comment'}, 'douyin_aweme': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video'}, 'douyin_aweme_comment': {'fields': ['content'], 'type': 'comment'}, 'kuaishou_video': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video'}, 'kuaishou_video_comment': {'fields': ['content'], 'type': 'comment'}, 'weibo_note': {'fields': ['content', 'source_keyword'], 'type': 'note'}, 'weibo_note_comment': {'fields': ['content'], 'type': 'comment'}, 'xhs_note': {'fields': ['title', 'desc', 'tag_list', 'source_keyword'], 'type': 'note'}, 'xhs_note_comment': {'fields': ['content'], 'type': 'comment'}, 'zhihu_content': {'fields': ['title', 'desc', 'content_text', 'source_keyword'], 'type': 'content'}, 'zhihu_comment': {'fields': ['content'], 'type': 'comment'}, 'tieba_note': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'note'}, 'tieba_comment': {'fields': ['content'], 'type': 'comment'}, 'daily_news': {'fields': ['title'], 'type': 'news'}, }
         
+        topics, queries = self._normalize_topics(topic), []
         for table, config in search_configs.items():
-            param_dict = {}
-            where_clauses = []
-            for idx, field in enumerate(config['fields']):
-                pname = f"term_{idx}"
-                where_clauses.append(f'{self._wrap_query_field_with_dialect(field)} LIKE :{pname}')
-                param_dict[pname] = search_term
+            where_clause, param_dict = self._build_topic_clause(table, config['fields'], topics)
+            keyword_column, keyword_params = self._build_keyword_column(table, config['fields'], topics)
+            param_dict.update(keyword_params)
             param_dict['limit'] = limit_per_table
-            where_clause = " OR ".join(where_clauses)
-            query = f'SELECT * FROM {self._wrap_query_field_with_dialect(table)} WHERE {where_clause} ORDER BY id DESC LIMIT :limit'
-            raw_results = self._execute_query(query, param_dict)
-            for row in raw_results:
-                content = (row.get('title') or row.get('content') or row.get('desc') or row.get('content_text', ''))
-                time_key = row.get('create_time') or row.get('time') or row.get('created_time') or row.get('publish_time') or row.get('crawl_date')
-                all_results.append(QueryResult(
-                    platform=table.split('_')[0], content_type=config['type'],
-                    title_or_content=content if content else '',
-                    author_nickname=row.get('nickname') or row.get('user_nickname') or row.get('user_name'),
-                    url=row.get('video_url') or row.get('note_url') or row.get('content_url') or row.get('url') or row.get('aweme_url'),
-                    publish_time=self._to_datetime(time_key),
-                    engagement=self._extract_engagement(row),
-                    source_keyword=row.get('source_keyword'),
-                    source_table=table
-                ))
+            query = f'SELECT {self._get_projection(table)}{keyword_column} FROM {self._wrap_query_field_with_dialect(table)} WHERE {where_clause} ORDER BY id DESC LIMIT :limit'
+            queries.append((query, param_dict))
+
+        for (table, config), raw_results in zip(search_configs.items(), self._execute_queries(queries)):
+            all_results.extend(self._rows_to_results(raw_results, table, config['type'], topics))
         return DBResponse("search_topic_globally", params_for_log, results=all_results, results_count=len(all_results))
 
-    def search_topic_by_date(self, topic: str, start_date: str, end_date: str, limit_per_table: int = 100) -> DBResponse:
+    def search_topic_by_date(self, topic: Union[str, List[str]], start_date: str, end_date: str, limit_per_table: int = 100) -> DBResponse:
         """
         【工具】按日期搜索话题: 在明确的历史时间段内，搜索与特定话题相关的内容。
 
         Args:
-            topic (str): 要搜索的话题关键词。
+            topic (Union[str, List[str]]): 要搜索的话题关键词；传入列表时所有关键词合并为每表一次查询。
             start_date (str): 开始日期，格式 'YYYY-MM-DD'。
             end_date (str): 结束日期，格式 'YYYY-MM-DD'。
             limit_per_table (int): 从每个相关表中返回的最大记录数，默认为 100。
@@ -254,7 +369,7 @@ class MediaCrawlerDB:
         except ValueError:
             return DBResponse("search_topic_by_date", params_for_log, error_message="日期格式错误，请使用 'YYYY-MM-DD' 格式。")
         
-        search_term, all_results = f"%{topic}%", []
+        all_results = []
         search_configs = {
             'bilibili_video': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video', 'time_col': 'create_time', 'time_type': 'sec'}, 'douyin_aweme': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video', 'time_col': 'create_time', 'time_type': 'ms'},
             'kuaishou_video': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video', 'time_col': 'create_time', 'time_type': 'ms'}, 'weibo_note': {'fields': ['content', 'source_keyword'], 'type': 'note', 'time_col': 'create_date_time', 'time_type': 'str'},
@@ -262,38 +377,25 @@ class MediaCrawlerDB:
             'tieba_note': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'note', 'time_col': 'publish_time', 'time_type': 'str'}, 'daily_news': {'fields': ['title'], 'type': 'news', 'time_col': 'crawl_date', 'time_type': 'date_str'},
         }
 
+        topics, queries = self._normalize_topics(topic), []
         for table, config in search_configs.items():
-            param_dict = {}
-            where_clauses = []
-            for idx, field in enumerate(config['fields']):
-                pname = f"term_{idx}"
-                where_clauses.append(f'{self._wrap_query_field_with_dialect(field)} LIKE :{pname}')
-                param_dict[pname] = search_term
+            where_clause, param_dict = self._build_topic_clause(table, config['fields'], topics)
+            keyword_column, keyword_params = self._build_keyword_column(table, config['fields'], topics)
+            param_dict.update(keyword_params)
             param_dict['limit'] = limit_per_table
-            where_clause = ' OR '.join(where_clauses)
-            query = f'SELECT * FROM {self._wrap_query_field_with_dialect(table)} WHERE {where_clause} ORDER BY id DESC LIMIT :limit'
-            raw_results = self._execute_query(query, param_dict)
-            for row in raw_results:
-                content = (row.get('title') or row.get('content') or row.get('desc') or row.get('content_text', ''))
-                time_key = row.get('create_time') or row.get('time') or row.get('created_time') or row.get('publish_time') or row.get('crawl_date')
-                all_results.append(QueryResult(
-                    platform=table.split('_')[0], content_type=config['type'],
-                    title_or_content=content if content else '',
-                    author_nickname=row.get('nickname') or row.get('user_nickname') or row.get('user_name'),
-                    url=row.get('video_url') or row.get('note_url') or row.get('content_url') or row.get('url') or row.get('aweme_url'),
-                    publish_time=self._to_datetime(time_key),
-                    engagement=self._extract_engagement(row),
-                    source_keyword=row.get('source_keyword'),
-                    source_table=table
-                ))
+            query = f'SELECT {self._get_projection(table)}{keyword_column} FROM {self._wrap_query_field_with_dialect(table)} WHERE {where_clause} ORDER BY id DESC LIMIT :limit'
+            queries.append((query, param_dict))
+
+        for (table, config), raw_results in zip(search_configs.items(), self._execute_queries(queries)):
+            all_results.extend(self._rows_to_results(raw_results, table, config['type'], topics))
         return DBResponse("search_topic_by_date", params_for_log, results=all_results, results_count=len(all_results))
         
-    def get_comments_for_topic(self, topic: str, limit: int = 500) -> DBResponse:
+    def get_comments_for_topic(self, topic: Union[str, List[str]], limit: int = 500) -> DBResponse:
         """
         【工具】获取话题评论: 专门搜索并返回所有平台中与特定话题相关的公众评论数据。
 
         Args:
-            topic (str): 要搜索的话题关键词。
+            topic (Union[str, List[str]]): 要搜索的话题关键词；传入列表时所有关键词合并为每表一次查询。
             limit (int): 返回评论的总数量上限，默认为 500。
 
         Returns:
@@ -302,33 +404,36 @@ class MediaCrawlerDB:
         params_for_log = {'topic': topic, 'limit': limit}
         logger.info(f"--- TOOL: 获取话题评论 (params: {params_for_log}) ---")
         
-        search_term = f"%{topic}%"
         comment_tables = ['bilibili_video_comment', 'douyin_aweme_comment', 'kuaishou_video_comment', 'weibo_note_comment', 'xhs_note_comment', 'zhihu_comment', 'tieba_comment']
         
-        all_queries = []
-        for table in comment_tables:
+        topics, all_queries, params = self._normalize_topics(topic), [], {}
+        for idx, table in enumerate(comment_tables):
             cols = self._get_table_columns(table)
             author_col = 'user_nickname' if 'user_nickname' in cols else 'nickname'
             like_col = 'comment_like_count' if 'comment_like_count' in cols else 'like_count' if 'like_count' in cols else None
             time_col = 'publish_time' if 'publish_time' in cols else 'create_date_time' if 'create_date_time' in cols else 'create_time'
             like_select = f"`{like_col}` as likes" if like_col else "'0' as likes"
+            topic_clause, topic_params = self._build_topic_clause(table, ['content'], topics, param_prefix=f"term_{idx}")
+            keyword_column, keyword_params = self._build_keyword_column(table, ['content'], topics, param_prefix=f"kw_{idx}")
+            params.update(topic_params)
+            params.update(keyword_params)
             
             query = (f"SELECT '{table.split('_')[0]}' as platform, `content`, `{author_col}` as author, "
-                     f"`{time_col}` as ts, {like_select}, '{table}' as source_table "
-                     f"FROM `{table}` WHERE `content` LIKE %s")
+                     f"`{time_col}` as ts, {like_select}, '{table}' as source_table{keyword_column} "
+                     f"FROM `{table}` WHERE {topic_clause}")
             all_queries.append(query)
 
-        final_query = f"({' ) UNION ALL ( '.join(all_queries)}) ORDER BY ts DESC LIMIT %s"
-        params = (search_term,) * len(comment_tables) + (limit,)
+        final_query = f"({' ) UNION ALL ( '.join(all_queries)}) ORDER BY ts DESC LIMIT :limit"
+        params['limit'] = limit
         raw_results = self._execute_query(final_query, params)
         
-        formatted = [QueryResult(platform=r['platform'], content_type='comment', title_or_content=r['content'], author_nickname=r['author'], publish_time=self._to_datetime(r['ts']), engagement={'likes': int(r['likes']) if str(r['likes']).isdigit() else 0}, source_table=r['source_table']) for r in raw_results]
+        formatted = [QueryResult(platform=r['platform'], content_type='comment', title_or_content=r['content'], author_nickname=r['author'], publish_time=self._to_datetime(r['ts']), engagement={'likes': int(r['likes']) if str(r['likes']).isdigit() else 0}, source_table=r['source_table'], matched_keyword=r.get('matched_keyword') or topics[0]) for r in raw_results]
         return DBResponse("get_comments_for_topic", params_for_log, results=formatted, results_count=len(formatted))
 
     def search_topic_on_platform(
         self,
         platform: Literal['bilibili', 'weibo', 'douyin', 'kuaishou', 'xhs', 'zhihu', 'tieba'],
-        topic: str,
+        topic: Union[str, List[str]],
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         limit: int = 20
@@ -338,7 +443,7 @@ class MediaCrawlerDB:
 
         Args:
             platform (Literal['bilibili', ...]): 要搜索的平台，必须是七个支持的平台之一。
-            topic (str): 要搜索的话题关键词。
+            topic (Union[str, List[str]]): 要搜索的话题关键词；传入列表时所有关键词合并为每表一次查询。
             start_date (Optional[str]): 开始日期，格式 'YYYY-MM-DD'。默认为None。
             end_date (Optional[str]): 结束日期，格式 'YYYY-MM-DD'。默认为None。
             limit (int): 返回结果的最大数量，默认为 20。
@@ -354,7 +459,7 @@ class MediaCrawlerDB:
         if platform not in all_configs:
             return DBResponse("search_topic_on_platform", params_for_log, error_message=f"不支持的平台: {platform}")
 
-        search_term, all_results = f"%{topic}%", []
+        all_results = []
         platform_configs = all_configs[platform]
 
         time_clause, time_params_tuple = "", ()
@@ -366,11 +471,13 @@ class MediaCrawlerDB:
         else:
             start_dt, end_dt = None, None
 
+        topics = self._normalize_topics(topic)
         for config in platform_configs:
             table = config['table']
-            topic_clause = " OR ".join([f"`{field}` LIKE %s" for field in config['fields']])
-            query = f"SELECT * FROM `{table}` WHERE {topic_clause}"
-            params = [search_term] * len(config['fields'])
+            topic_clause, params = self._build_topic_clause(table, config['fields'], topics)
+            keyword_column, keyword_params = self._build_keyword_column(table, config['fields'], topics)
+            params.update(keyword_params)
+            query = f"SELECT {self._get_projection(table)}{keyword_column} FROM `{table}` WHERE ({topic_clause})"
 
             if start_dt and end_dt and 'time_col' in config:
                 time_col, time_type = config['time_col'], config['time_type']
@@ -379,20 +486,19 @@ class MediaCrawlerDB:
                 elif time_type in ['str', 'date_str']: t_params = (start_dt.strftime('%Y-%m-%d'), end_dt.strftime('%Y-%m-%d'))
                 else: t_params = (str(int(start_dt.timestamp())), str(int(end_dt.timestamp())))
                 
-                t_clause = f"`{time_col}` >= %s AND `{time_col}` < %s"
-                if table == 'zhihu_content': t_clause = f"CAST(`{time_col}` AS UNSIGNED) >= %s AND CAST(`{time_col}` AS UNSIGNED) < %s"
+                t_clause = f"`{time_col}` >= :start_time AND `{time_col}` < :end_time"
+                if table == 'zhihu_content': t_clause = f"CAST(`{time_col}` AS UNSIGNED) >= :start_time AND CAST(`{time_col}` AS UNSIGNED) < :end_time"
                 
                 query += f" AND ({t_clause})"
-                params.extend(t_params)
+                params['start_time'], params['end_time'] = t_params
 
-            query += f" ORDER BY id DESC LIMIT %s"
-            params.append(limit)
+            query += f" ORDER BY id DESC LIMIT :limit"
+            params['limit'] = limit
 
-            raw_results = self._execute_query(query, tuple(params))
+            raw_results = self._execute_query(query, params)
             for row in raw_results:
-                content = (row.get('title') or row.get('content') or row.get('desc') or row.get('content_text', ''))
                 time_key = config.get('time_col') and row.get(config.get('time_col'))
-                all_results.append(QueryResult(platform=platform, content_type=config['type'], title_or_content=content if content else '', author_nickname=row.get('nickname') or row.get('user_nickname'), url=row.get('video_url') or row.get('note_url') or row.get('content_url') or row.get('url') or row.get('aweme_url'), publish_time=self._to_datetime(time_key), engagement=self._extract_engagement(row), source_keyword=row.get('source_keyword'), source_table=table))
+                all_results.append(QueryResult(platform=platform, content_type=config['type'], title_or_content=self._first_value(row, CONTENT_COLUMNS) or '', author_nickname=row.get('nickname') or row.get('user_nickname'), url=self._first_value(row, URL_COLUMNS), publish_time=self._to_datetime(time_key), engagement=self._extract_engagement(row), source_keyword=row.get('source_keyword'), source_table=table, matched_keyword=row.get('matched_keyword') or topics[0]))
         
         return DBResponse("search_topic_on_platform", params_for_log, results=all_results, results_count=len(all_results))
 
@@ -5,10 +5,15 @@
 
 import os
 import sys
+import threading
 from typing import List, Dict, Any, Optional, Union
 from dataclasses import dataclass
 import re
 
+from InsightEngine.utils.config import settings
+from InsightEngine.tools.sentiment_cache import SentimentCache
+from InsightEngine.tools import sentiment_onnx
+
 try:
     import torch
     TORCH_AVAILABLE = True
@@ -28,6 +33,8 @@ except ImportError:
 # INFO：若想跳过情感分析，可手动切换此开关为False
 SENTIMENT_ANALYSIS_ENABLED = True
 
+SENTIMENT_MODEL_NAME = "tabularisai/multilingual-sentiment-analysis"
+
 def _describe_missing_dependencies() -> str:
     missing = []
     if not TORCH_AVAILABLE:
@@ -78,6 +85,15 @@ class WeiboMultilingualSentimentAnalyzer:
         self.is_initialized = False
         self.is_disabled = False
         self.disable_reason: Optional[str] = None
+        # 段落并行研究时多个线程可能同时触发模型加载
+        self._init_lock = threading.Lock()
+        self.batch_size = max(1, settings.SENTIMENT_BATCH_SIZE)
+        self.max_length = settings.SENTIMENT_MAX_LENGTH
+        self.cache = self._create_cache()
+        # 推理后端：torch / onnx / onnx-int8，ONNX 后端下 model 为 None，由 onnx_session 推理
+        self.backend = "torch"
+        self.onnx_session = None
+        self.onnx_parity: Optional[Dict[str, Any]] = None
         
         # 情感标签映射（5级分类）
         self.sentiment_map = {
@@ -108,6 +124,8 @@ class WeiboMultilingualSentimentAnalyzer:
             self.model = None
             self.tokenizer = None
             self.device = None
+            self.onnx_session = None
+            self.backend = "torch"
             self.is_initialized = False
 
     def enable(self) -> bool:
@@ -123,6 +141,69 @@ class WeiboMultilingualSentimentAnalyzer:
         self.disable_reason = None
         return True
 
+    def _create_cache(self) -> SentimentCache:
+        """创建结果缓存；磁盘缓存不可用时退化为仅内存缓存"""
+        try:
+            return SentimentCache(settings.SENTIMENT_CACHE_SIZE, settings.SENTIMENT_CACHE_PATH or None)
+        except Exception as e:
+            print(f"情感分析磁盘缓存不可用，仅使用内存缓存: {e}")
+            return SentimentCache(settings.SENTIMENT_CACHE_SIZE)
+
+    def _model_identity(self) -> str:
+        """模型标识，作为缓存键的一部分；模型或推理配置变化时旧缓存自动失效"""
+        return f"{SENTIMENT_MODEL_NAME}|{self.backend}|max_length={self.max_length}"
+
+    def _onnx_requested(self, device) -> bool:
+        """配置要求使用 ONNX 后端且运行环境满足条件（仅CPU）"""
+        if (settings.SENTIMENT_BACKEND or "torch").lower() != "onnx":
+            return False
+        if not sentiment_onnx.ONNXRUNTIME_AVAILABLE:
+            print("未安装 onnx / onnxruntime，情感分析使用 PyTorch 后端")
+            return False
+        if device is None or device.type != "cpu":
+            print("ONNX 后端仅用于CPU推理，检测到GPU设备，继续使用 PyTorch 后端")
+            return False
+        return True
+
+    def _onnx_artifact(self) -> str:
+        return sentiment_onnx.artifact_path(os.path.join(weibo_sentiment_path, "model_onnx"), settings.SENTIMENT_ONNX_QUANTIZE)
+
+    def _activate_onnx(self, artifact: str, parity: Dict[str, Any]) -> None:
+        """切换到 ONNX 后端并释放 PyTorch 模型"""
+        self.onnx_session = sentiment_onnx.create_session(artifact, settings.SENTIMENT_NUM_THREADS)
+        self.onnx_parity = parity
+        self.backend = "onnx-int8" if settings.SENTIMENT_ONNX_QUANTIZE else "onnx"
+        self.model = None
+
+    def _load_cached_onnx(self) -> bool:
+        """已有通过一致性校验的导出产物时直接加载，无需加载 PyTorch 模型"""
+        artifact = self._onnx_artifact()
+        parity = sentiment_onnx.load_parity_report(artifact)
+        if not (os.path.exists(artifact) and parity and parity.get("passed")):
+            return False
+        self._activate_onnx(artifact, parity)
+        print(f"已加载缓存的 ONNX 模型: {artifact}")
+        return True
+
+    def _export_onnx(self) -> None:
+        """导出（及量化）ONNX 模型并与 PyTorch 结果校验，通过后切换后端，否则继续使用 PyTorch"""
+        try:
+            print("正在导出 ONNX 模型...")
+            artifact = sentiment_onnx.export_model(
+                self.model, self.tokenizer, os.path.dirname(self._onnx_artifact()), settings.SENTIMENT_ONNX_QUANTIZE
+            )
+            session = sentiment_onnx.create_session(artifact, settings.SENTIMENT_NUM_THREADS)
+            parity = sentiment_onnx.check_parity(self.model, session, self.tokenizer, self.max_length)
+            sentiment_onnx.save_parity_report(artifact, parity)
+            print(f"ONNX 一致性校验: 标签一致率 {parity['label_agreement']:.2%}，最大概率偏差 {parity['max_probability_diff']:.4f}")
+            if not parity["passed"]:
+                print("ONNX 模型未通过一致性校验，继续使用 PyTorch 后端")
+                self.onnx_parity = parity
+                return
+            self._activate_onnx(artifact, parity)
+        except Exception as e:
+            print(f"ONNX 模型导出失败，继续使用 PyTorch 后端: {e}")
+
     def _select_device(self):
         """Select the best available torch device."""
         if not TORCH_AVAILABLE:
@@ -141,6 +222,10 @@ class WeiboMultilingualSentimentAnalyzer:
         Returns:
             是否初始化成功
         """
+        with self._init_lock:
+            return self._initialize()
+
+    def _initialize(self) -> bool:
         if self.is_disabled:
             reason = self.disable_reason or "情感分析功能已禁用"
             print(f"情感分析功能已禁用，跳过模型加载：{reason}")
@@ -160,14 +245,18 @@ class WeiboMultilingualSentimentAnalyzer:
             print("正在加载多语言情感分析模型...")
             
             # 使用多语言情感分析模型
-            model_name = "tabularisai/multilingual-sentiment-analysis"
+            model_name = SENTIMENT_MODEL_NAME
             local_model_path = os.path.join(weibo_sentiment_path, "model")
             
+            device = self._select_device()
+            use_onnx = self._onnx_requested(device)
+
             # 检查本地是否已有模型
             if os.path.exists(local_model_path):
                 print("从本地加载模型...")
                 self.tokenizer = AutoTokenizer.from_pretrained(local_model_path)
-                self.model = AutoModelForSequenceClassification.from_pretrained(local_model_path)
+                if not (use_onnx and self._load_cached_onnx()):
+                    self.model = AutoModelForSequenceClassification.from_pretrained(local_model_path)
             else:
                 print("首次使用，正在下载模型到本地...")
                 # 下载并保存到本地
@@ -181,13 +270,17 @@ class WeiboMultilingualSentimentAnalyzer:
                 print(f"模型已保存到: {local_model_path}")
             
             # 设置设备
-            device = self._select_device()
             if device is None:
                 raise RuntimeError("未检测到可用的计算设备")
 
             self.device = device
-            self.model.to(self.device)
-            self.model.eval()
+            if device.type == "cpu" and settings.SENTIMENT_NUM_THREADS > 0:
+                torch.set_num_threads(settings.SENTIMENT_NUM_THREADS)
+            if self.model is not None:
+                self.model.to(self.device)
+                self.model.eval()
+                if use_onnx:
+                    self._export_onnx()
             self.is_initialized = True
             self.enable()
 
@@ -199,7 +292,7 @@ class WeiboMultilingualSentimentAnalyzer:
             else:
                 print("未检测到 GPU，自动使用 CPU 进行推理。")
             
-            print(f"模型加载成功! 使用设备: {self.device}")
+            print(f"模型加载成功! 使用设备: {self.device}，推理后端: {self.backend}")
             print("支持语言: 中文、英文、西班牙文、阿拉伯文、日文、韩文等22种语言")
             print("情感等级: 非常负面、负面、中性、正面、非常正面")
             
@@ -268,70 +361,123 @@ class WeiboMultilingualSentimentAnalyzer:
             processed_text = self._preprocess_text(text)
 
             if not processed_text:
-                return SentimentResult(
-                    text=text,
-                    sentiment_label="输入错误",
-                    confidence=0.0,
-                    probability_distribution={},
-                    success=False,
-                    error_message="输入文本为空或无效内容",
-                    analysis_performed=False
-                )
+                return self._build_result(text, None)
 
-            # 分词编码
-            inputs = self.tokenizer(
-                processed_text,
-                max_length=512,
-                padding=True,
-                truncation=True,
-                return_tensors='pt'
-            )
+            return self._build_result(text, self._infer_with_cache([processed_text])[0])
+
+        except Exception as e:
+            return self._build_result(text, e)
 
-            # 转移到设备
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+    def _infer_with_cache(self, processed_texts: List[str], batch_size: Optional[int] = None, show_progress: bool = False) -> List[Any]:
+        """
+        先查结果缓存，仅对未命中的文本执行推理（同一批中重复的文本只推理一次），成功结果写回缓存
+
+        Returns:
+            与输入顺序一致的推理输出，格式同 _run_inference
+        """
+        identity = self._model_identity()
+        keys = [SentimentCache.make_key(text, identity) for text in processed_texts]
+        outputs: Dict[str, Any] = self.cache.get_many(keys)
 
-            # 预测
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits = outputs.logits
-                probabilities = torch.softmax(logits, dim=1)
-                prediction = torch.argmax(probabilities, dim=1).item()
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, processed_texts):
+            if key not in outputs:
+                pending.setdefault(key, text)
 
-            # 构建结果
-            confidence = probabilities[0][prediction].item()
-            label = self.sentiment_map[prediction]
+        if pending:
+            if show_progress and outputs:
+                print(f"情感分析缓存命中 {len(outputs)} 条，需推理 {len(pending)} 条")
+            fresh = dict(zip(pending, self._run_inference(list(pending.values()), batch_size, show_progress)))
+            self.cache.put_many({key: output for key, output in fresh.items() if not isinstance(output, Exception)})
+            outputs.update(fresh)
 
-            # 构建概率分布字典
-            prob_dist = {}
-            for label_name, prob in zip(self.sentiment_map.values(), probabilities[0]):
-                prob_dist[label_name] = prob.item()
+        return [outputs[key] for key in keys]
 
+    def _run_inference(self, processed_texts: List[str], batch_size: Optional[int] = None, show_progress: bool = False) -> List[Any]:
+        """
+        按长度分桶的微批推理
+
+        先整体分词（不填充），再按 token 长度排序切分微批，每个微批只填充到批内最长文本，
+        避免短评论被补齐到 max_length 造成的无效计算。
+
+        Args:
+            processed_texts: 预处理后的非空文本
+            batch_size: 微批大小，默认使用 SENTIMENT_BATCH_SIZE
+            show_progress: 是否显示进度
+
+        Returns:
+            与输入顺序一致的列表，成功时为各情感等级的概率列表，所在微批失败时为对应的异常
+        """
+        batch_size = max(1, batch_size or self.batch_size)
+        encodings = self.tokenizer(processed_texts, max_length=self.max_length, truncation=True)
+        order = sorted(range(len(processed_texts)), key=lambda i: len(encodings["input_ids"][i]))
+        outputs: List[Any] = [None] * len(processed_texts)
+
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            try:
+                features = self.tokenizer.pad(
+                    {key: [encodings[key][i] for i in indices] for key in encodings.keys()},
+                    padding=True,
+                    return_tensors='np' if self.onnx_session is not None else 'pt'
+                )
+                if self.onnx_session is not None:
+                    probabilities = sentiment_onnx.run_session(self.onnx_session, features)
+                else:
+                    features = {k: v.to(self.device) for k, v in features.items()}
+                    with torch.inference_mode():
+                        probabilities = torch.softmax(self.model(**features).logits, dim=1).cpu().tolist()
+                for i, probs in zip(indices, probabilities):
+                    outputs[i] = probs
+            except Exception as e:
+                for i in indices:
+                    outputs[i] = e
+
+            if show_progress and len(processed_texts) > batch_size:
+                print(f"处理进度: {min(start + batch_size, len(order))}/{len(order)}")
+
+        return outputs
+
+    def _build_result(self, text: str, output: Any) -> SentimentResult:
+        """将单条推理输出（概率列表、异常或 None 表示空输入）转换为 SentimentResult"""
+        if output is None:
             return SentimentResult(
                 text=text,
-                sentiment_label=label,
-                confidence=confidence,
-                probability_distribution=prob_dist,
-                success=True
+                sentiment_label="输入错误",
+                confidence=0.0,
+                probability_distribution={},
+                success=False,
+                error_message="输入文本为空或无效内容",
+                analysis_performed=False
             )
-
-        except Exception as e:
+        if isinstance(output, Exception):
             return SentimentResult(
                 text=text,
                 sentiment_label="分析失败",
                 confidence=0.0,
                 probability_distribution={},
                 success=False,
-                error_message=f"预测时发生错误: {str(e)}",
+                error_message=f"预测时发生错误: {str(output)}",
                 analysis_performed=False
             )
 
-    def analyze_batch(self, texts: List[str], show_progress: bool = True) -> BatchSentimentResult:
+        prediction = max(range(len(output)), key=output.__getitem__)
+        return SentimentResult(
+            text=text,
+            sentiment_label=self.sentiment_map[prediction],
+            confidence=output[prediction],
+            probability_distribution=dict(zip(self.sentiment_map.values(), output)),
+            success=True
+        )
+
+    def analyze_batch(self, texts: List[str], show_progress: bool = True, batch_size: Optional[int] = None) -> BatchSentimentResult:
         """
-        批量情感分析
+        批量情感分析（按长度分桶的微批推理）
         
         Args:
             texts: 文本列表
             show_progress: 是否显示进度
+            batch_size: 微批大小，默认使用 SENTIMENT_BATCH_SIZE
             
         Returns:
             BatchSentimentResult对象
@@ -368,20 +514,20 @@ class WeiboMultilingualSentimentAnalyzer:
                 analysis_performed=False
             )
         
-        results = []
-        success_count = 0
-        total_confidence = 0.0
-        
-        for i, text in enumerate(texts):
-            if show_progress and len(texts) > 1:
-                print(f"处理进度: {i+1}/{len(texts)}")
-            
-            result = self.analyze_single_text(text)
-            results.append(result)
-            
-            if result.success:
-                success_count += 1
-                total_confidence += result.confidence
+        processed_texts = [self._preprocess_text(text) for text in texts]
+        valid_indices = [i for i, processed in enumerate(processed_texts) if processed]
+        outputs: List[Any] = [None] * len(texts)
+        if valid_indices:
+            try:
+                valid_outputs = self._infer_with_cache([processed_texts[i] for i in valid_indices], batch_size, show_progress)
+            except Exception as e:
+                valid_outputs = [e] * len(valid_indices)
+            for i, output in zip(valid_indices, valid_outputs):
+                outputs[i] = output
+
+        results = [self._build_result(text, output) for text, output in zip(texts, outputs)]
+        success_count = sum(1 for result in results if result.success)
+        total_confidence = sum(result.confidence for result in results if result.success)
         
         average_confidence = total_confidence / success_count if success_count > 0 else 0.0
         failed_count = len(texts) - success_count
@@ -554,7 +700,7 @@ class WeiboMultilingualSentimentAnalyzer:
             模型信息字典
         """
         return {
-            "model_name": "tabularisai/multilingual-sentiment-analysis",
+            "model_name": SENTIMENT_MODEL_NAME,
             "supported_languages": [
                 "中文", "英文", "西班牙文", "阿拉伯文", "日文", "韩文", 
                 "德文", "法文", "意大利文", "葡萄牙文", "俄文", "荷兰文",
@@ -563,7 +709,12 @@ class WeiboMultilingualSentimentAnalyzer:
             ],
             "sentiment_levels": list(self.sentiment_map.values()),
             "is_initialized": self.is_initialized,
-            "device": str(self.device) if self.device else "未设置"
+            "device": str(self.device) if self.device else "未设置",
+            "backend": self.backend,
+            "onnx_parity": self.onnx_parity,
+            "batch_size": self.batch_size,
+            "max_length": self.max_length,
+            "cache": self.cache.stats()
         }
 
 
@@ -0,0 +1,121 @@
+"""
+情感分析结果缓存
+以“模型标识 + 预处理后文本”的哈希为键缓存各情感等级的概率分布，
+内存中为有界LRU，可选SQLite磁盘层在重启后继续复用
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class SentimentCache:
+    """两级（内存LRU + 可选SQLite）情感分析结果缓存，线程安全"""
+
+    # SQLite 单条语句的参数个数有限，批量查询时分块
+    _SQLITE_CHUNK_SIZE = 500
+
+    def __init__(self, max_entries: int = 10000, db_path: Optional[str] = None):
+        """
+        Args:
+            max_entries: 内存层最多保留的条目数，<=0 表示不使用内存层
+            db_path: SQLite 缓存文件路径，为空表示不启用磁盘层
+        """
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if db_path:
+            directory = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache (key TEXT PRIMARY KEY, probabilities TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(text: str, model_identity: str) -> str:
+        """计算缓存键：模型标识变化（换模型、换后端、改截断长度）时自动失效"""
+        return hashlib.sha256(f"{model_identity}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """批量查询，返回命中的键及其概率分布；磁盘层命中的条目会回填到内存层"""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+
+            missing = [key for key in keys if key not in found]
+            if missing and self._conn is not None:
+                for start in range(0, len(missing), self._SQLITE_CHUNK_SIZE):
+                    chunk = missing[start:start + self._SQLITE_CHUNK_SIZE]
+                    rows = self._conn.execute(
+                        f"SELECT key, probabilities FROM sentiment_cache WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                    for key, probabilities in rows:
+                        found[key] = json.loads(probabilities)
+                        self._remember(key, found[key])
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]) -> None:
+        """批量写入内存层与磁盘层"""
+        if not items:
+            return
+        with self._lock:
+            for key, probabilities in items.items():
+                self._remember(key, probabilities)
+            if self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sentiment_cache (key, probabilities) VALUES (?, ?)",
+                    [(key, json.dumps(probabilities)) for key, probabilities in items.items()],
+                )
+                self._conn.commit()
+
+    def _remember(self, key: str, probabilities: List[float]) -> None:
+        """写入内存层并按LRU淘汰，调用方需持有锁"""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = probabilities
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空内存层与磁盘层，并重置命中统计"""
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM sentiment_cache")
+                self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计信息"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_path": self.db_path,
+            }
@@ -0,0 +1,143 @@
+"""
+情感分析模型的 ONNX Runtime 推理后端（仅CPU）
+将 PyTorch 模型导出为 ONNX（可选动态INT8量化），导出产物缓存在本地模型目录旁；
+首次导出时与 PyTorch 推理结果做一致性校验，校验报告与产物一同保存，未通过时调用方应回退 PyTorch
+"""
+
+import inspect
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    np = None  # type: ignore
+    ort = None  # type: ignore
+    ONNXRUNTIME_AVAILABLE = False
+
+try:
+    import torch
+except ImportError:
+    torch = None  # type: ignore
+
+
+# 一致性校验样本，覆盖多语言与不同情感强度
+PARITY_SAMPLE_TEXTS = [
+    "今天天气真好，心情特别棒！",
+    "这家餐厅的菜味道非常棒！",
+    "服务态度太差了，很失望",
+    "物流一般，东西还行吧",
+    "这是我用过最糟糕的产品，强烈不推荐",
+    "I absolutely love this product!",
+    "The customer service was disappointing.",
+    "It's okay, nothing special.",
+    "¡Me encanta este lugar!",
+    "この映画は本当に素晴らしかった",
+    "정말 최악의 경험이었어요",
+    "Das Essen war ganz in Ordnung.",
+]
+
+# 量化后允许的最低标签一致率
+PARITY_MIN_AGREEMENT = 0.9
+
+
+def artifact_path(onnx_dir: str, quantize: bool) -> str:
+    """导出产物路径"""
+    return os.path.join(onnx_dir, "model.int8.onnx" if quantize else "model.onnx")
+
+
+def load_parity_report(artifact: str) -> Optional[Dict[str, Any]]:
+    """读取产物对应的一致性校验报告，不存在或损坏时返回 None"""
+    try:
+        with open(f"{artifact}.parity.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_parity_report(artifact: str, report: Dict[str, Any]) -> None:
+    """保存一致性校验报告"""
+    with open(f"{artifact}.parity.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def export_model(model, tokenizer, onnx_dir: str, quantize: bool) -> str:
+    """
+    导出 ONNX 模型（batch 与 sequence 维度均为动态），按需做动态INT8量化
+
+    Returns:
+        最终产物路径
+    """
+    os.makedirs(onnx_dir, exist_ok=True)
+    fp32_path = artifact_path(onnx_dir, quantize=False)
+
+    sample = tokenizer(["示例文本"], return_tensors="pt")
+    # 图的输入顺序以 forward 签名为准
+    input_names = [name for name in inspect.signature(model.forward).parameters if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    export_kwargs = {}
+    # 新版 PyTorch 默认使用 dynamo 导出器，这里固定使用 TorchScript 导出器以兼容 dynamic_axes
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_kwargs["dynamo"] = False
+    with torch.inference_mode():
+        torch.onnx.export(
+            model,
+            ({name: sample[name] for name in input_names},),
+            fp32_path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            **export_kwargs,
+        )
+
+    if not quantize:
+        return fp32_path
+    int8_path = artifact_path(onnx_dir, quantize=True)
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+def create_session(path: str, num_threads: int = 0):
+    """创建 CPU 推理会话，num_threads > 0 时限制算子内线程数"""
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if num_threads > 0:
+        options.intra_op_num_threads = num_threads
+    return ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+
+def run_session(session, features: Dict[str, Any]) -> List[List[float]]:
+    """执行推理并返回 softmax 概率"""
+    input_names = {node.name for node in session.get_inputs()}
+    logits = session.run(["logits"], {k: np.asarray(v, dtype=np.int64) for k, v in features.items() if k in input_names})[0]
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return (exp / exp.sum(axis=1, keepdims=True)).tolist()
+
+
+def check_parity(model, session, tokenizer, max_length: int, texts: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    比较 ONNX 与 PyTorch 在样本文本上的预测结果
+
+    Returns:
+        校验报告：样本数、标签一致率、最大概率偏差、是否通过
+    """
+    texts = texts or PARITY_SAMPLE_TEXTS
+    features = tokenizer(texts, max_length=max_length, truncation=True, padding=True, return_tensors="pt")
+    with torch.inference_mode():
+        expected = torch.softmax(model(**features).logits, dim=1).cpu().numpy()
+    actual = np.array(run_session(session, {k: v.numpy() for k, v in features.items()}))
+
+    agreement = float((expected.argmax(axis=1) == actual.argmax(axis=1)).mean())
+    return {
+        "samples": len(texts),
+        "label_agreement": round(agreement, 4),
+        "max_probability_diff": round(float(np.abs(expected - actual).max()), 6),
+        "passed": agreement >= PARITY_MIN_AGREEMENT,
+    }
@@ -22,8 +22,12 @@ class Settings(BaseSettings):
     DB_PORT: int = Field(3306, description="数据库端口")
     DB_CHARSET: str = Field("utf8mb4", description="数据库字符集")
     DB_DIALECT: Optional[str] = Field("mysql", description="数据库方言，如mysql、postgresql等，SQLAlchemy后端选择")
+    DB_QUERY_CONCURRENCY: int = Field(8, description="多表查询的最大并发数（同时也是连接池大小）")
+    DB_FULLTEXT_SEARCH: bool = Field(True, description="话题搜索是否使用全文索引（需先运行 MindSpider/schema/init_fulltext_index.py），无索引时自动回退LIKE")
+    BATCH_KEYWORD_SEARCH: bool = Field(True, description="多个优化关键词是否合并为每表一次查询（否则逐关键词查询）")
     MAX_REFLECTIONS: int = Field(3, description="最大反思次数")
     MAX_PARAGRAPHS: int = Field(6, description="最大段落数")
+    MAX_PARALLEL_PARAGRAPHS: int = Field(3, description="同时研究的最大段落数，1表示逐段顺序处理")
     SEARCH_TIMEOUT: int = Field(240, description="单次搜索请求超时")
     MAX_CONTENT_LENGTH: int = Field(500000, description="搜索最大内容长度")
     DEFAULT_SEARCH_HOT_CONTENT_LIMIT: int = Field(100, description="热榜内容默认最大数")
@@ -33,6 +37,13 @@ class Settings(BaseSettings):
     DEFAULT_SEARCH_TOPIC_ON_PLATFORM_LIMIT: int = Field(200, description="平台搜索话题最大数")
     MAX_SEARCH_RESULTS_FOR_LLM: int = Field(0, description="供LLM用搜索结果最大数")
     MAX_HIGH_CONFIDENCE_SENTIMENT_RESULTS: int = Field(0, description="高置信度情感分析最大数")
+    SENTIMENT_BATCH_SIZE: int = Field(32, description="情感分析每个推理微批的文本数")
+    SENTIMENT_MAX_LENGTH: int = Field(512, description="情感分析单条文本的最大token数，超出部分截断")
+    SENTIMENT_NUM_THREADS: int = Field(0, description="CPU推理时PyTorch/ONNX Runtime使用的线程数，0表示保持默认值")
+    SENTIMENT_BACKEND: str = Field("torch", description="情感分析推理后端：torch 或 onnx（仅CPU，需安装 onnx 与 onnxruntime，首次使用时自动导出并校验）")
+    SENTIMENT_ONNX_QUANTIZE: bool = Field(True, description="ONNX 后端是否使用动态INT8量化")
+    SENTIMENT_CACHE_SIZE: int = Field(10000, description="情感分析结果内存缓存（LRU）的最大条目数，0表示不使用内存缓存")
+    SENTIMENT_CACHE_PATH: Optional[str] = Field(None, description="情感分析结果SQLite磁盘缓存路径，如 cache/sentiment_cache.sqlite3，为空则不启用")
     OUTPUT_DIR: str = Field("reports", description="输出路径")
     SAVE_INTERMEDIATE_STATES: bool = Field(True, description="是否保存中间状态")
 
@@ -10,19 +10,29 @@ from __future__ import annotations
 from urllib.parse import quote_plus
 import asyncio
 import os
-from typing import Any, Dict, Iterable, List, Optional, Union
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy import text
+from loguru import logger
 from InsightEngine.utils.config import settings
 
 __all__ = [
     "get_async_engine",
+    "get_event_loop",
+    "run_sync",
     "fetch_all",
+    "fetch_all_concurrently",
 ]
 
+T = TypeVar("T")
+QueryParams = Optional[Union[Iterable[Any], Dict[str, Any]]]
 
 _engine: Optional[AsyncEngine] = None
+# 常驻事件循环：异步引擎的连接池与创建它的事件循环绑定，必须在同一个循环上复用
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
 
 
 def _build_database_url() -> str:
@@ -50,15 +60,37 @@ def get_async_engine() -> AsyncEngine:
     global _engine
     if _engine is None:
         database_url: str = _build_database_url()
+        concurrency: int = max(1, settings.DB_QUERY_CONCURRENCY)
         _engine = create_async_engine(
             database_url,
             pool_pre_ping=True,
             pool_recycle=1800,
+            pool_size=concurrency,
+            max_overflow=concurrency,
         )
     return _engine
 
 
-async def fetch_all(query: str, params: Optional[Union[Iterable[Any], Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    获取后台常驻事件循环（守护线程中运行），首次调用时创建。
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="insight-db-loop", daemon=True).start()
+    return _loop
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    在常驻事件循环上执行协程并阻塞等待结果，供同步代码调用。
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+
+async def fetch_all(query: str, params: QueryParams = None) -> List[Dict[str, Any]]:
     """
     执行只读查询并返回字典列表。
     """
@@ -70,3 +102,29 @@ async def fetch_all(query: str, params: Optional[Union[Iterable[Any], Dict[str,
         return [dict(row) for row in rows]
 
 
+async def fetch_all_concurrently(
+    queries: Sequence[Tuple[str, QueryParams]],
+    max_concurrency: Optional[int] = None,
+    on_result: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None,
+) -> List[List[Dict[str, Any]]]:
+    """
+    以有限并发执行多条只读查询，返回与 queries 顺序一致的结果列表。
+
+    单条查询失败只记录日志并返回空列表，不影响其他查询；
+    on_result 在每条查询完成时（按完成先后）以 (序号, 结果) 回调。
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency or settings.DB_QUERY_CONCURRENCY))
+    results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+
+    async def _run(index: int, query: str, params: QueryParams) -> None:
+        async with semaphore:
+            try:
+                results[index] = await fetch_all(query, params)
+            except Exception as e:
+                logger.exception(f"数据库查询时发生错误: {e}")
+                return
+        if on_result is not None:
+            on_result(index, results[index])
+
+    await asyncio.gather(*(_run(i, q, p) for i, (q, p) in enumerate(queries)))
+    return results
@@ -2,11 +2,13 @@
 Unified OpenAI-compatible LLM client for the Media Engine, with retry support.
 """
 
+import copy
 import os
 import sys
 import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from openai import OpenAI
 
@@ -30,6 +32,28 @@ except ImportError:
     class InterruptedError(Exception):
         pass
 
+try:
+    from llm_cache import get_llm_cache
+except ImportError:
+
+    def get_llm_cache():
+        return None
+
+try:
+    from llm_stream import StreamAssembler, StreamStats, create_completion_stream, iter_completion_stream
+except ImportError:
+    # 缺少流式工具时 invoke 退回非流式调用
+    StreamAssembler = StreamStats = create_completion_stream = iter_completion_stream = None
+
+from rate_limiter import estimate_tokens, rate_limited
+
+try:
+    from llm_router import build_llm_router
+except ImportError:
+
+    def build_llm_router(client, base_url, model):
+        return None
+
 
 class LLMClient:
     """
@@ -47,6 +71,7 @@ class LLMClient:
         self.model_name = model_name
         self.provider = model_name
         self.stop_event = stop_event
+        self.node_name: Optional[str] = None
         timeout_fallback = os.getenv("LLM_REQUEST_TIMEOUT") or os.getenv("MEDIA_ENGINE_REQUEST_TIMEOUT") or "1800"
         try:
             self.timeout = float(timeout_fallback)
@@ -60,16 +85,57 @@ class LLMClient:
         if base_url:
             client_kwargs["base_url"] = base_url
         self.client = OpenAI(**client_kwargs)
-
-    def invoke(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        # 配置了 LLM_FALLBACK_* 并启用对冲时，请求经路由在主接口与备用接口间对冲和熔断
+        self.router = build_llm_router(self.client, base_url, model_name)
+
+    def for_node(self, node_name: str) -> "LLMClient":
+        """返回绑定节点名称的客户端副本（共享底层连接），用于按节点统计缓存命中率"""
+        client = copy.copy(self)
+        client.node_name = node_name
+        return client
+
+    def invoke(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        on_chunk: Optional[Callable[[str, StreamStats], None]] = None,
+        **kwargs,
+    ) -> str:
+        """
+        调用模型并返回完整输出；stream=True 时以流式接收，on_chunk 在首块到达后按间隔收到已拼接的文本和统计信息
+        """
         @with_retry(LLM_RETRY_CONFIG, stop_event=self.stop_event)
         def _invoke_with_retry():
             if self.stop_event and self.stop_event.is_set():
                 raise InterruptedError("用户请求停止")
-            return self._do_invoke(system_prompt, user_prompt, **kwargs)
-        return _invoke_with_retry()
+            # 经路由调用时总是流式接收，按首个文本块判定对冲胜负
+            if StreamAssembler is not None and (kwargs.get("stream") or self.router is not None):
+                content, stats = self._do_stream_invoke(system_prompt, user_prompt, on_chunk, **kwargs)
+                return content, stats.model
+            return self._do_invoke(system_prompt, user_prompt, **kwargs), self.model_name
+        cache = get_llm_cache()
+        if cache is None:
+            return _invoke_with_retry()[0]
+
+        # 缓存键不含调用时加入的当前时间前缀
+        cache_key = cache.make_key(
+            self.model_name,
+            [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+            kwargs,
+        )
+        cached = cache.get(cache_key, self.node_name)
+        if cached is not None:
+            return cached
+        result, model = _invoke_with_retry()
+        # 经路由由备用模型生成的输出不缓存到主模型的键下，回放时不会冒充主模型的结果
+        if model == self.model_name:
+            cache.put(cache_key, self.model_name, result)
+        return result
     
-    def _do_invoke(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+    def _build_request(
+        self, system_prompt: str, user_prompt: str, kwargs: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any], float]:
+        """组装消息、采样参数和超时，stream 参数由调用方式决定"""
         current_time = datetime.now().strftime("%Y年%m月%d日%H时%M分")
         time_prefix = f"今天的实际时间是{current_time}"
         if user_prompt:
@@ -81,7 +147,7 @@ class LLMClient:
             {"role": "user", "content": user_prompt},
         ]
 
-        allowed_keys = {"temperature", "top_p", "presence_penalty", "frequency_penalty", "stream", "max_tokens"}
+        allowed_keys = {"temperature", "top_p", "presence_penalty", "frequency_penalty", "max_tokens"}
         extra_params = {key: value for key, value in kwargs.items() if key in allowed_keys and value is not None}
         
         # 如果没有指定 max_tokens，设置一个合理的默认值
@@ -89,19 +155,64 @@ class LLMClient:
         if "max_tokens" not in extra_params:
             extra_params["max_tokens"] = 8000  # 默认值，约 5600-6400 字中文
 
-        timeout = kwargs.pop("timeout", self.timeout)
+        timeout = kwargs.get("timeout", self.timeout)
+        return messages, extra_params, timeout
 
-        response = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=messages,
-            timeout=timeout,
-            **extra_params,
-        )
+    def _do_invoke(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        messages, extra_params, timeout = self._build_request(system_prompt, user_prompt, kwargs)
+
+        prompt_tokens = estimate_tokens(*(message["content"] for message in messages))
+        with rate_limited(self.base_url, self.model_name, prompt_tokens, self.stop_event) as lease:
+            response = self.client.chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                timeout=timeout,
+                **extra_params,
+            )
+            if lease and response.usage:
+                lease.report_tokens(response.usage.total_tokens)
 
         if response.choices and response.choices[0].message:
             return self.validate_response(response.choices[0].message.content)
         return ""
 
+    def stream_invoke(
+        self, system_prompt: str, user_prompt: str, stats: Optional[StreamStats] = None, **kwargs
+    ) -> Iterator[str]:
+        """流式调用，逐块产出文本增量（不重试、不缓存）；传入 stats 可在结束后读取首token耗时和生成速度"""
+        messages, extra_params, timeout = self._build_request(system_prompt, user_prompt, kwargs)
+        stats = stats or StreamStats(self.model_name, self.node_name)
+        stats.started = time.monotonic()
+        if self.router is not None:
+            yield from self.router.stream(messages, extra_params, timeout, stats, self.stop_event)
+            return
+        prompt_tokens = estimate_tokens(*(message["content"] for message in messages))
+        with rate_limited(self.base_url, self.model_name, prompt_tokens, self.stop_event) as lease:
+            # 要求最后一块返回usage，供生成速度统计和限流的token上报使用
+            response = create_completion_stream(self.client, self.model_name, messages, timeout, **extra_params)
+            try:
+                yield from iter_completion_stream(response, stats)
+            finally:
+                response.close()
+                if lease:
+                    lease.report_tokens(prompt_tokens + stats.tokens)
+
+    def _do_stream_invoke(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        on_chunk: Optional[Callable[[str, StreamStats], None]] = None,
+        **kwargs,
+    ) -> Tuple[str, StreamStats]:
+        """流式调用并拼接完整输出，同时返回统计信息（stats.model 为实际生成输出的模型）"""
+        stats = StreamStats(self.model_name, self.node_name)
+        assembler = StreamAssembler(stats, on_chunk)
+        for delta in self.stream_invoke(system_prompt, user_prompt, stats=stats, **kwargs):
+            assembler.feed(delta)
+            if self.stop_event and self.stop_event.is_set():
+                raise InterruptedError("用户请求停止")
+        return self.validate_response(assembler.finish()), stats
+
     @staticmethod
     def validate_response(response: Optional[str]) -> str:
         if response is None:
@@ -83,6 +83,7 @@ class ReportFormattingNode(BaseNode):
                 SYSTEM_PROMPT_REPORT_FORMATTING,
                 message,
                 max_tokens=32000,  # qwen3-max 支持超大输出，32000 tokens ≈ 22000-25000 字中文
+                stream=True,
             )
 
             # 处理响应
@@ -42,6 +42,7 @@ if utils_dir not in sys.path:
     sys.path.append(utils_dir)
 
 from retry_helper import with_graceful_retry, SEARCH_API_RETRY_CONFIG
+from rate_limiter import rate_limited
 
 # --- 1. 数据结构定义 ---
 from dataclasses import dataclass, field
@@ -219,8 +220,9 @@ class BochaMultimodalSearch:
         payload.update(kwargs)
 
         try:
-            response = requests.post(self.BOCHA_BASE_URL, headers=self._headers, json=payload, timeout=30)
-            response.raise_for_status()  # 如果HTTP状态码是4xx或5xx，则抛出异常
+            with rate_limited(self.BOCHA_BASE_URL):
+                response = requests.post(self.BOCHA_BASE_URL, headers=self._headers, json=payload, timeout=30)
+                response.raise_for_status()  # 如果HTTP状态码是4xx或5xx，则抛出异常
 
             response_dict = response.json()
             
@@ -43,6 +43,7 @@ class Settings(BaseSettings):
     SEARCH_CONTENT_MAX_LENGTH: int = Field(20000, description="用于提示的最长内容长度")
     MAX_REFLECTIONS: int = Field(2, description="最大反思轮数")
     MAX_PARAGRAPHS: int = Field(5, description="最大段落数")
+    MAX_PARALLEL_PARAGRAPHS: int = Field(3, description="同时研究的最大段落数，1表示逐段顺序处理")
     
     MINDSPIDER_API_KEY: Optional[str] = Field(None, description="MindSpider API密钥")
     MINDSPIDER_BASE_URL: Optional[str] = Field("https://api.deepseek.com", description="MindSpider LLM接口BaseUrl")
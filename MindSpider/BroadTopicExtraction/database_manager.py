@@ -10,7 +10,7 @@ import json
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import List, Dict, Optional
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, create_engine, text
 from sqlalchemy.engine import Engine
 from loguru import logger
 
@@ -32,6 +32,8 @@ class DatabaseManager:
     def __init__(self):
         """初始化数据库管理器"""
         self.engine: Engine = None
+        # 最近一次 save_daily_news 中写入失败的记录（news_id 与错误信息）
+        self.last_save_failures: List[Dict] = []
         self.connect()
 
     def connect(self):
@@ -76,6 +78,10 @@ class DatabaseManager:
         """
         保存每日新闻数据，如果当天已有数据则覆盖
 
+        在同一事务内按 idx_daily_news_unique（news_id, source_platform, crawl_date）批量 upsert，
+        再删除当天不在本次结果中的旧记录，不会出现当天新闻已删除、尚未重新写入的窗口；
+        批量写入失败时回退为逐条写入，失败的记录保存在 self.last_save_failures 中
+
         Args:
             news_data: 新闻数据列表
             crawl_date: 爬取日期，默认为今天
@@ -87,58 +93,96 @@ class DatabaseManager:
             crawl_date = date.today()
 
         current_timestamp = int(datetime.now().timestamp())
-
+        self.last_save_failures = []
+
+        rows = []
+        for news_item in news_data:
+            # news_item.get('id') 已经是完整的 news_id（格式：source_item_id）
+            # 为了支持同一条新闻在不同日期出现，将 crawl_date 加入到 news_id 中
+            base_news_id = news_item.get(
+                'id') or f"{news_item.get('source', 'unknown')}_rank_{news_item.get('rank', 0)}"
+            # 将日期格式化为字符串并加入到 news_id 中，确保全局唯一性
+            news_id = f"{base_news_id}_{crawl_date.strftime('%Y%m%d')}"
+
+            title_val = (news_item.get("title", "") or "")
+            if len(title_val) > 500:
+                title_val = title_val[:500]
+            rows.append({
+                "news_id": news_id,
+                "source_platform": news_item.get("source", "unknown"),
+                "title": title_val,
+                "url": news_item.get("url", ""),
+                "crawl_date": crawl_date,
+                "rank_position": news_item.get("rank", None),
+                "add_ts": current_timestamp,
+                "last_modify_ts": current_timestamp,
+            })
+
+        upsert_sql = text(self._daily_news_upsert_sql())
         try:
-            saved_count = 0
-            # 先独立事务执行删除，防止后续插入失败导致无法清理
             with self.engine.begin() as conn:
-                deleted = conn.execute(text("DELETE FROM daily_news WHERE crawl_date = :d"), {"d": crawl_date}).rowcount
-                if deleted and deleted > 0:
-                    logger.info(f"覆盖模式：删除了当天已有的 {deleted} 条新闻记录")
-
-            # 逐条插入，单条失败不影响后续（每条独立事务）
-            for news_item in news_data:
-                try:
-                    # news_item.get('id') 已经是完整的 news_id（格式：source_item_id）
-                    # 为了支持同一条新闻在不同日期出现，将 crawl_date 加入到 news_id 中
-                    base_news_id = news_item.get(
-                        'id') or f"{news_item.get('source', 'unknown')}_rank_{news_item.get('rank', 0)}"
-                    # 将日期格式化为字符串并加入到 news_id 中，确保全局唯一性
-                    news_id = f"{base_news_id}_{crawl_date.strftime('%Y%m%d')}"
-
-                    title_val = (news_item.get("title", "") or "")
-                    if len(title_val) > 500:
-                        title_val = title_val[:500]
-                    with self.engine.begin() as conn:
-                        conn.execute(
-                            text(
-                                """
-                                INSERT INTO daily_news (
-                                    news_id, source_platform, title, url, crawl_date,
-                                    rank_position, add_ts, last_modify_ts
-                                ) VALUES (:news_id, :source_platform, :title, :url, :crawl_date, :rank_position, :add_ts, :last_modify_ts)
-                                """
-                            ),
-                            {
-                                "news_id": news_id,
-                                "source_platform": news_item.get("source", "unknown"),
-                                "title": title_val,
-                                "url": news_item.get("url", ""),
-                                "crawl_date": crawl_date,
-                                "rank_position": news_item.get("rank", None),
-                                "add_ts": current_timestamp,
-                                "last_modify_ts": current_timestamp,
-                            },
-                        )
-                    saved_count += 1
-                except Exception as e:
-                    logger.exception(f"保存单条新闻失败: {e}")
-                    continue
-            logger.info(f"成功保存 {saved_count} 条新闻记录")
-            return saved_count
+                if rows:
+                    conn.execute(upsert_sql, rows)
+                deleted = self._delete_stale_news(conn, crawl_date, [row["news_id"] for row in rows])
+            if deleted:
+                logger.info(f"覆盖模式：删除了当天已有的 {deleted} 条旧新闻记录")
+            logger.info(f"成功保存 {len(rows)} 条新闻记录")
+            return len(rows)
         except Exception as e:
-            logger.exception(f"保存新闻数据失败: {e}")
-            return 0
+            # 只记录底层数据库错误，避免把整批参数写进日志
+            logger.warning(f"批量保存新闻失败，回退为逐条保存: {getattr(e, 'orig', e)}")
+
+        # 逐条写入，单条失败不影响后续（每条独立事务）
+        saved_ids = []
+        for row in rows:
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(upsert_sql, row)
+                saved_ids.append(row["news_id"])
+            except Exception as e:
+                error = str(getattr(e, 'orig', e))
+                logger.error(f"保存单条新闻失败 {row['news_id']}: {error}")
+                self.last_save_failures.append({"news_id": row["news_id"], "error": error})
+
+        if self.last_save_failures:
+            logger.warning(f"{len(self.last_save_failures)}/{len(rows)} 条新闻保存失败")
+        if saved_ids:
+            try:
+                with self.engine.begin() as conn:
+                    deleted = self._delete_stale_news(conn, crawl_date, saved_ids)
+                if deleted:
+                    logger.info(f"覆盖模式：删除了当天已有的 {deleted} 条旧新闻记录")
+            except Exception as e:
+                logger.exception(f"清理当天旧新闻记录失败: {e}")
+        logger.info(f"成功保存 {len(saved_ids)} 条新闻记录")
+        return len(saved_ids)
+
+    def _daily_news_upsert_sql(self) -> str:
+        """按数据库方言生成基于 idx_daily_news_unique 的 upsert 语句"""
+        insert_sql = """
+            INSERT INTO daily_news (
+                news_id, source_platform, title, url, crawl_date,
+                rank_position, add_ts, last_modify_ts
+            ) VALUES (:news_id, :source_platform, :title, :url, :crawl_date, :rank_position, :add_ts, :last_modify_ts)
+        """
+        update_columns = ("title", "url", "rank_position", "last_modify_ts")
+        if self.engine.dialect.name == "mysql":
+            assignments = ", ".join(f"{col} = VALUES({col})" for col in update_columns)
+            return f"{insert_sql} ON DUPLICATE KEY UPDATE {assignments}"
+        assignments = ", ".join(f"{col} = EXCLUDED.{col}" for col in update_columns)
+        return f"{insert_sql} ON CONFLICT (news_id, source_platform, crawl_date) DO UPDATE SET {assignments}"
+
+    @staticmethod
+    def _delete_stale_news(conn, crawl_date: date, keep_news_ids: List[str]) -> int:
+        """删除当天不在本次结果中的新闻记录，返回删除数量"""
+        if keep_news_ids:
+            stmt = text(
+                "DELETE FROM daily_news WHERE crawl_date = :d AND news_id NOT IN :ids"
+            ).bindparams(bindparam("ids", expanding=True))
+            result = conn.execute(stmt, {"d": crawl_date, "ids": keep_news_ids})
+        else:
+            result = conn.execute(text("DELETE FROM daily_news WHERE crawl_date = :d"), {"d": crawl_date})
+        return result.rowcount or 0
 
     def get_daily_news(self, crawl_date: date = None) -> List[Dict]:
         """
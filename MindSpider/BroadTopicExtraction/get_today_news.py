@@ -9,9 +9,11 @@ import sys
 import asyncio
 import httpx
 import json
-from datetime import datetime, date
+from datetime import datetime, date, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
+from urllib.parse import urlsplit
 from loguru import logger
 
 # 添加项目根目录到路径
@@ -20,6 +22,7 @@ sys.path.append(str(project_root))
 
 try:
     from BroadTopicExtraction.database_manager import DatabaseManager
+    from config import settings
 except ImportError as e:
     raise ImportError(f"导入模块失败: {e}")
 
@@ -42,6 +45,69 @@ SOURCE_NAMES = {
     "xueqiu": "雪球热榜"
 }
 
+# 新闻API请求头
+REQUEST_HEADERS = {
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Referer": BASE_URL,
+    "Connection": "keep-alive",
+}
+
+
+class HostRateLimiter:
+    """按主机限制请求发起间隔，替代源之间固定的 sleep"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, url: str):
+        """等待直到可以向该URL所在主机发起请求"""
+        host = urlsplit(url).netloc
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def _parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """读取响应头 Retry-After（秒数或HTTP日期），没有或无法解析时返回 None"""
+    retry_after = response.headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """
+    第 attempt 次请求失败后重试前的等待秒数
+
+    按 NEWS_FETCH_RETRY_DELAY 指数退避，服务端给出 Retry-After 时以其为准，均不超过 NEWS_FETCH_RETRY_MAX_DELAY
+    """
+    delay = settings.NEWS_FETCH_RETRY_DELAY * (2 ** (attempt - 1))
+    retry_after = _parse_retry_after(response) if response is not None else None
+    if retry_after is not None:
+        delay = retry_after
+    return min(delay, settings.NEWS_FETCH_RETRY_MAX_DELAY)
+
+
 class NewsCollector:
     """新闻收集器 - 整合API调用和数据库存储"""
     
@@ -69,24 +135,27 @@ class NewsCollector:
     
     # ==================== 新闻API调用 ====================
     
-    async def fetch_news(self, source: str) -> dict:
-        """从指定源获取最新新闻"""
+    async def fetch_news(self, source: str, client: Optional[httpx.AsyncClient] = None,
+                         rate_limiter: Optional[HostRateLimiter] = None) -> dict:
+        """
+        从指定源获取最新新闻，超时、连接失败、429或5xx时指数退避后重试
+
+        Args:
+            source: 新闻源ID
+            client: 复用的HTTP客户端，为空时临时创建
+            rate_limiter: 按主机限速器，为空时不限速
+        """
+        if client is None:
+            async with self._create_client() as own_client:
+                return await self.fetch_news(source, own_client, rate_limiter)
+
         url = f"{BASE_URL}/api/s?id={source}&latest"
-        headers = {
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/124.0.0.0 Safari/537.36"
-            ),
-            "Referer": BASE_URL,
-            "Connection": "keep-alive",
-        }
-        
-        try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(url, headers=headers)
+        attempts = settings.NEWS_FETCH_RETRIES + 1
+        for attempt in range(1, attempts + 1):
+            if rate_limiter:
+                await rate_limiter.wait(url)
+            try:
+                response = await client.get(url, timeout=settings.NEWS_FETCH_TIMEOUT)
                 response.raise_for_status()
                 
                 # 解析JSON响应
@@ -97,57 +166,100 @@ class NewsCollector:
                     "data": data,
                     "timestamp": datetime.now().isoformat()
                 }
-        except httpx.TimeoutException:
-            return {
-                "source": source,
-                "status": "timeout",
-                "error": f"请求超时: {source}({url})",
-                "timestamp": datetime.now().isoformat()
-            }
-        except httpx.HTTPStatusError as e:
-            return {
-                "source": source,
-                "status": "http_error",
-                "error": f"HTTP错误: {source}({url}) - {e.response.status_code}",
-                "timestamp": datetime.now().isoformat()
-            }
-        except Exception as e:
-            return {
-                "source": source,
-                "status": "error",
-                "error": f"未知错误: {source}({url}) - {str(e)}",
-                "timestamp": datetime.now().isoformat()
-            }
+            except httpx.TimeoutException:
+                if attempt < attempts:
+                    await asyncio.sleep(_retry_delay(attempt))
+                    continue
+                return {
+                    "source": source,
+                    "status": "timeout",
+                    "error": f"请求超时: {source}({url})",
+                    "timestamp": datetime.now().isoformat()
+                }
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                if (status_code == 429 or status_code >= 500) and attempt < attempts:
+                    await asyncio.sleep(_retry_delay(attempt, e.response))
+                    continue
+                return {
+                    "source": source,
+                    "status": "http_error",
+                    "error": f"HTTP错误: {source}({url}) - {e.response.status_code}",
+                    "timestamp": datetime.now().isoformat()
+                }
+            except Exception as e:
+                if isinstance(e, httpx.TransportError) and attempt < attempts:
+                    await asyncio.sleep(_retry_delay(attempt))
+                    continue
+                return {
+                    "source": source,
+                    "status": "error",
+                    "error": f"未知错误: {source}({url}) - {str(e)}",
+                    "timestamp": datetime.now().isoformat()
+                }
     
-    async def get_popular_news(self, sources: List[str] = None) -> List[dict]:
-        """获取热门新闻"""
+    async def iter_popular_news(self, sources: List[str] = None) -> AsyncIterator[dict]:
+        """
+        并发获取热门新闻，按完成顺序逐个产出结果
+
+        所有新闻源共用一个连接池客户端，同时进行的请求数受 NEWS_FETCH_CONCURRENCY 限制，
+        同一主机的请求发起间隔受 NEWS_HOST_MIN_INTERVAL 限制
+        """
         if sources is None:
             sources = list(SOURCE_NAMES.keys())
         
         logger.info(f"正在获取 {len(sources)} 个新闻源的最新内容...")
         logger.info("=" * 80)
         
-        results = []
-        for source in sources:
-            source_name = SOURCE_NAMES.get(source, source)
-            logger.info(f"正在获取 {source_name} 的新闻...")
-            result = await self.fetch_news(source)
-            results.append(result)
-            
-            if result["status"] == "success":
-                data = result["data"]
-                if 'items' in data and isinstance(data['items'], list):
-                    count = len(data['items'])
-                    logger.info(f"✓ {source_name}: 获取成功，共 {count} 条新闻")
-                else:
-                    logger.info(f"✓ {source_name}: 获取成功")
+        semaphore = asyncio.Semaphore(settings.NEWS_FETCH_CONCURRENCY)
+        rate_limiter = HostRateLimiter(settings.NEWS_HOST_MIN_INTERVAL)
+
+        async with self._create_client() as client:
+            async def _fetch(source: str) -> dict:
+                async with semaphore:
+                    logger.info(f"正在获取 {SOURCE_NAMES.get(source, source)} 的新闻...")
+                    return await self.fetch_news(source, client, rate_limiter)
+
+            tasks = [asyncio.create_task(_fetch(source)) for source in sources]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    result = await next_done
+                    self._log_fetch_result(result)
+                    yield result
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_popular_news(self, sources: List[str] = None) -> List[dict]:
+        """获取热门新闻（并发获取，按完成顺序返回）"""
+        return [result async for result in self.iter_popular_news(sources)]
+
+    @staticmethod
+    def _create_client() -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.NEWS_FETCH_CONCURRENCY,
+            max_keepalive_connections=settings.NEWS_FETCH_CONCURRENCY,
+        )
+        return httpx.AsyncClient(
+            headers=REQUEST_HEADERS,
+            timeout=settings.NEWS_FETCH_TIMEOUT,
+            follow_redirects=True,
+            limits=limits,
+        )
+
+    @staticmethod
+    def _log_fetch_result(result: dict):
+        source_name = SOURCE_NAMES.get(result["source"], result["source"])
+        if result["status"] == "success":
+            data = result["data"]
+            if 'items' in data and isinstance(data['items'], list):
+                count = len(data['items'])
+                logger.info(f"✓ {source_name}: 获取成功，共 {count} 条新闻")
             else:
-                logger.error(f"✗ {source_name}: {result.get('error', '获取失败')}")
-            
-            # 避免请求过快
-            await asyncio.sleep(0.5)
-        
-        return results
+                logger.info(f"✓ {source_name}: 获取成功")
+        else:
+            logger.error(f"✗ {source_name}: {result.get('error', '获取失败')}")
     
     # ==================== 数据处理和存储 ====================
     
@@ -178,11 +290,8 @@ class NewsCollector:
         logger.info(collection_summary_message)
         
         try:
-            # 获取新闻数据
-            results = await self.get_popular_news(sources)
-            
-            # 处理结果
-            processed_data = self._process_news_results(results)
+            # 获取新闻数据，每个源完成后立即处理
+            processed_data = await self._process_news_results(self.iter_popular_news(sources))
             
             # 保存到数据库（覆盖模式）
             if processed_data['news_list']:
@@ -206,13 +315,23 @@ class NewsCollector:
                 'total_news': 0
             }
     
-    def _process_news_results(self, results: List[Dict]) -> Dict:
-        """处理新闻获取结果"""
+    async def _process_news_results(self, results) -> Dict:
+        """
+        处理新闻获取结果
+
+        Args:
+            results: 结果列表，或按完成顺序产出结果的异步迭代器
+        """
         news_list = []
         successful_sources = 0
+        total_sources = 0
         total_news = 0
         
-        for result in results:
+        if not hasattr(results, '__aiter__'):
+            results = self._as_async_iter(results)
+
+        async for result in results:
+            total_sources += 1
             source = result['source']
             status = result['status']
             
@@ -234,10 +353,15 @@ class NewsCollector:
             'success': True,
             'news_list': news_list,
             'successful_sources': successful_sources,
-            'total_sources': len(results),
+            'total_sources': total_sources,
             'total_news': total_news,
             'collection_time': datetime.now().isoformat()
         }
+
+    @staticmethod
+    async def _as_async_iter(items: List[Dict]) -> AsyncIterator[Dict]:
+        for item in items:
+            yield item
     
     def _process_news_item(self, item: Dict, source: str, rank: int) -> Optional[Dict]:
         """处理单条新闻"""
@@ -13,6 +13,9 @@ from typing import Dict, Optional
 
 from playwright.async_api import BrowserContext, BrowserType, Playwright
 
+from tools.adaptive_concurrency import AdaptiveConcurrencyController, get_concurrency_controller
+from tools.http_client_pool import get_http_client_pool
+
 
 class AbstractCrawler(ABC):
 
@@ -116,3 +119,18 @@ class AbstractApiClient(ABC):
     @abstractmethod
     async def update_cookies(self, browser_context: BrowserContext):
         pass
+
+    def http_client(self, **client_kwargs):
+        """
+        获取按平台和当前代理复用的 httpx 客户端
+        :param client_kwargs: 其他 AsyncClient 参数，如 follow_redirects
+        :return: 异步上下文管理器，退出时不关闭连接
+        """
+        return get_http_client_pool().client(type(self).__name__, getattr(self, "proxy", None), **client_kwargs)
+
+    @property
+    def concurrency(self) -> AdaptiveConcurrencyController:
+        """
+        当前平台和代理的自适应并发控制器，可替代 asyncio.Semaphore 使用，delay 为当前请求间隔
+        """
+        return get_concurrency_controller(type(self).__name__, getattr(self, "proxy", None))
@@ -31,7 +31,10 @@ class CacheFactory:
         :return:
         """
         if cache_type == 'memory':
+            import config
             from .local_cache import ExpiringLocalCache
+            kwargs.setdefault('max_entries', config.CACHE_MEMORY_MAX_ENTRIES)
+            kwargs.setdefault('max_bytes', config.CACHE_MEMORY_MAX_BYTES)
             return ExpiringLocalCache(*args, **kwargs)
         elif cache_type == 'redis':
             from .redis_cache import RedisCache
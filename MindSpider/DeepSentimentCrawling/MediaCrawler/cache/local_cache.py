@@ -16,22 +16,112 @@
 # @Desc    : 本地缓存
 
 import asyncio
+import heapq
+import sys
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from cache.abs_cache import AbstractCache
 
+# glob 中的通配字符，模式在第一个通配字符之前的部分作为前缀索引的查询范围
+_GLOB_CHARS = '*?['
+
+
+class _Entry:
+    __slots__ = ('value', 'expire_at', 'size', 'version')
+
+    def __init__(self, value: Any, expire_at: float, size: int, version: int):
+        self.value = value
+        self.expire_at = expire_at
+        self.size = size
+        self.version = version
+
+
+class _PrefixTrie:
+    """
+    按字符组织的前缀树，作为 keys(pattern) 的前缀索引
+    add/discard 为 O(键长)，与缓存中的条目数无关；iter_prefix 定位前缀节点后按字典序遍历其子树
+    """
+    __slots__ = ('_root',)
+
+    # 键的终止标记：单个字符的子节点键不会是空串
+    _END = ''
+
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+
+    def add(self, key: str) -> None:
+        node = self._root
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[self._END] = None
+
+    def discard(self, key: str) -> None:
+        """删除键，并自底向上剪掉不再有键经过的空节点"""
+        path = []
+        node = self._root
+        for ch in key:
+            child = node.get(ch)
+            if child is None:
+                return
+            path.append((node, ch))
+            node = child
+        if self._END not in node:
+            return
+        del node[self._END]
+        for parent, ch in reversed(path):
+            if parent[ch]:
+                break
+            del parent[ch]
+
+    def iter_prefix(self, prefix: str) -> Iterator[str]:
+        """按字典序产出以 prefix 开头的所有键"""
+        node = self._root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return
+        stack = [(prefix, node)]
+        while stack:
+            key, node = stack.pop()
+            if self._END in node:
+                yield key
+            for ch in sorted((ch for ch in node if ch != self._END), reverse=True):
+                stack.append((key + ch, node[ch]))
+
 
 class ExpiringLocalCache(AbstractCache):
+    """
+    带过期时间的本地缓存
+    - 过期索引：最小堆按过期时间排列 (expire_at, version, key)，清理时只弹出已过期的堆顶，覆盖写入留下的旧堆项按 version 惰性丢弃
+    - 容量上限：可按条目数和估算字节数限制，超出时先清理过期项，再按 LRU 淘汰
+    - keys(pattern)：glob 匹配（与 Redis KEYS 一致的 * ? [] 语义），借助前缀树按字面前缀定位候选键
+    get 为 O(1)；set/delete/过期清理/LRU 淘汰为 O(log n + 键长)（过期堆为 O(log n)，前缀树与缓存大小无关）；
+    keys 为 O(前缀长度 + 匹配前缀的键数)
+    """
 
-    def __init__(self, cron_interval: int = 10):
+    def __init__(self, cron_interval: int = 10, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
         """
         初始化本地缓存
         :param cron_interval: 定时清楚cache的时间间隔
+        :param max_entries: 最多保留的条目数，None 表示不限制
+        :param max_bytes: 键和值估算占用（sys.getsizeof，浅层）的总字节上限，None 表示不限制
         :return:
         """
         self._cron_interval = cron_interval
-        self._cache_container: Dict[str, Tuple[Any, float]] = {}
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        # 按访问顺序排列，最久未使用的在最前
+        self._cache_container: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, int, str]] = []
+        self._prefix_index = _PrefixTrie()
+        self._version = 0
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
         self._cron_task: Optional[asyncio.Task] = None
         # 开启定时清理任务
         self._schedule_clear()
@@ -50,16 +140,22 @@ class ExpiringLocalCache(AbstractCache):
         :param key:
         :return:
         """
-        value, expire_time = self._cache_container.get(key, (None, 0))
-        if value is None:
-            return None
+        with self._lock:
+            entry = self._cache_container.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
 
-        # 如果键已过期，则删除键并返回None
-        if expire_time < time.time():
-            del self._cache_container[key]
-            return None
+            # 如果键已过期，则删除键并返回None
+            if entry.expire_at < time.time():
+                self._remove(key)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
 
-        return value
+            self._cache_container.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry.value
 
     def set(self, key: str, value: Any, expire_time: int) -> None:
         """
@@ -69,22 +165,77 @@ class ExpiringLocalCache(AbstractCache):
         :param expire_time:
         :return:
         """
-        self._cache_container[key] = (value, time.time() + expire_time)
+        with self._lock:
+            if key in self._cache_container:
+                self._remove(key)
+            self._version += 1
+            entry = _Entry(value, time.time() + expire_time, sys.getsizeof(key) + sys.getsizeof(value), self._version)
+            self._cache_container[key] = entry
+            self._total_bytes += entry.size
+            self._prefix_index.add(key)
+            heapq.heappush(self._expiry_heap, (entry.expire_at, entry.version, key))
+            self._enforce_limits()
+
+    def delete(self, key: str) -> None:
+        """
+        删除键
+        :param key:
+        :return:
+        """
+        with self._lock:
+            if key in self._cache_container:
+                self._remove(key)
 
     def keys(self, pattern: str) -> List[str]:
         """
         获取所有符合pattern的key
-        :param pattern: 匹配模式
+        :param pattern: 匹配模式（glob）
+        :return:
+        """
+        with self._lock:
+            self._clear()
+            prefix_end = min((i for i, ch in enumerate(pattern) if ch in _GLOB_CHARS), default=len(pattern))
+            prefix = pattern[:prefix_end]
+            return [key for key in self._prefix_index.iter_prefix(prefix) if fnmatchcase(key, pattern)]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        命中、未命中、容量淘汰、过期清理的次数，以及当前条目数和估算字节数
         :return:
         """
-        if pattern == '*':
-            return list(self._cache_container.keys())
+        with self._lock:
+            return {**self._stats, 'entries': len(self._cache_container), 'bytes': self._total_bytes}
 
-        # 本地缓存通配符暂时将*替换为空
-        if '*' in pattern:
-            pattern = pattern.replace('*', '')
+    def _remove(self, key: str) -> None:
+        """
+        删除键及其前缀索引，堆中对应项在弹出时按 version 丢弃
+        :param key:
+        :return:
+        """
+        entry = self._cache_container.pop(key)
+        self._total_bytes -= entry.size
+        self._prefix_index.discard(key)
+
+    def _enforce_limits(self) -> None:
+        """
+        超出容量上限时先清理过期项，再按 LRU 淘汰；堆中旧项过多时重建堆
+        :return:
+        """
+        if self._over_limit():
+            self._clear()
+        while self._over_limit():
+            key = next(iter(self._cache_container))
+            self._remove(key)
+            self._stats['evictions'] += 1
+        if len(self._expiry_heap) > 2 * len(self._cache_container) + 64:
+            self._expiry_heap = [(e.expire_at, e.version, k) for k, e in self._cache_container.items()]
+            heapq.heapify(self._expiry_heap)
 
-        return [key for key in self._cache_container.keys() if pattern in key]
+    def _over_limit(self) -> bool:
+        if not self._cache_container:
+            return False
+        return ((self._max_entries is not None and len(self._cache_container) > self._max_entries)
+                or (self._max_bytes is not None and self._total_bytes > self._max_bytes))
 
     def _schedule_clear(self):
         """
@@ -102,12 +253,17 @@ class ExpiringLocalCache(AbstractCache):
 
     def _clear(self):
         """
-        根据过期时间清理缓存
+        根据过期时间清理缓存：只弹出堆顶已过期的项
         :return:
         """
-        for key, (value, expire_time) in self._cache_container.items():
-            if expire_time < time.time():
-                del self._cache_container[key]
+        with self._lock:
+            now = time.time()
+            while self._expiry_heap and self._expiry_heap[0][0] < now:
+                _, version, key = heapq.heappop(self._expiry_heap)
+                entry = self._cache_container.get(key)
+                if entry is not None and entry.version == version:
+                    self._remove(key)
+                    self._stats['expirations'] += 1
 
     async def _start_clear_cron(self):
         """
@@ -207,6 +207,14 @@ async def parse_cmd(argv: Optional[Sequence[str]] = None):
                 rich_help_panel="存储配置",
             ),
         ] = None,
+        rebuild_hotness: Annotated[
+            bool,
+            typer.Option(
+                "--rebuild_hotness",
+                help="按当前热度权重重算内容表的 hotness_score（使用 --save_data_option 指定的数据库）",
+                rich_help_panel="存储配置",
+            ),
+        ] = False,
         cookies: Annotated[
             str,
             typer.Option(
@@ -215,6 +223,31 @@ async def parse_cmd(argv: Optional[Sequence[str]] = None):
                 rich_help_panel="账号配置",
             ),
         ] = config.COOKIES,
+        max_notes: Annotated[
+            int,
+            typer.Option(
+                "--max_notes",
+                help="最大爬取帖子数量",
+                rich_help_panel="基础配置",
+            ),
+        ] = config.CRAWLER_MAX_NOTES_COUNT,
+        max_comments: Annotated[
+            int,
+            typer.Option(
+                "--max_comments",
+                help="单帖子最大爬取一级评论数量",
+                rich_help_panel="评论配置",
+            ),
+        ] = config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
+        headless: Annotated[
+            str,
+            typer.Option(
+                "--headless",
+                help="是否以无头模式启动浏览器，支持 yes/true/t/y/1 或 no/false/f/n/0",
+                rich_help_panel="基础配置",
+                show_default=True,
+            ),
+        ] = str(config.HEADLESS),
     ) -> SimpleNamespace:
         """MediaCrawler 命令行入口"""
 
@@ -232,6 +265,9 @@ async def parse_cmd(argv: Optional[Sequence[str]] = None):
         config.ENABLE_GET_SUB_COMMENTS = enable_sub_comment
         config.SAVE_DATA_OPTION = save_data_option.value
         config.COOKIES = cookies
+        config.CRAWLER_MAX_NOTES_COUNT = max_notes
+        config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES = max_comments
+        config.HEADLESS = _to_bool(headless)
 
         return SimpleNamespace(
             platform=config.PLATFORM,
@@ -243,7 +279,11 @@ async def parse_cmd(argv: Optional[Sequence[str]] = None):
             get_sub_comment=config.ENABLE_GET_SUB_COMMENTS,
             save_data_option=config.SAVE_DATA_OPTION,
             init_db=init_db_value,
+            rebuild_hotness=rebuild_hotness,
             cookies=config.COOKIES,
+            max_notes=config.CRAWLER_MAX_NOTES_COUNT,
+            max_comments=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
+            headless=config.HEADLESS,
         )
 
     command = typer.main.get_command(app)
@@ -24,6 +24,16 @@ IP_PROXY_POOL_COUNT = 2
 # 代理IP提供商名称
 IP_PROXY_PROVIDER_NAME = "kuaidaili"  # kuaidaili | wandouhttp
 
+# 代理IP并发验证的超时时间（秒）和并发数
+IP_PROXY_VALIDATE_TIMEOUT = 5.0
+IP_PROXY_VALIDATE_CONCURRENCY = 10
+
+# 可用代理数低于该值时在后台补充代理
+IP_PROXY_LOW_WATER_MARK = 1
+
+# 代理连续失败次数达到该值后移出代理池
+IP_PROXY_MAX_CONSECUTIVE_FAILURES = 3
+
 # 设置为True不会打开浏览器（无头浏览器）
 # 设置False会打开一个浏览器
 # 小红书如果一直扫码登录不通过，打开浏览器手动过一下滑动验证码
@@ -63,6 +73,13 @@ AUTO_CLOSE_BROWSER = True
 # 数据保存类型选项配置,支持五种类型：csv、db、json、sqlite、postgresql, 最好保存到DB，有排重的功能。
 SAVE_DATA_OPTION = "postgresql"  # csv or db or json or sqlite or postgresql
 
+# json 保存方式下数据逐条追加到 .jsonl 文件（JSON Lines），爬取结束时合并转换为 .json 数组文件以兼容旧格式
+# 设置为 False 则只保留 .jsonl 文件
+SAVE_JSON_ARRAY_ON_CLOSE = True
+
+# csv/jsonl 文件写入缓冲的刷新间隔（秒），进程异常退出时最多丢失这段时间内的数据
+FILE_WRITER_FLUSH_INTERVAL = 1.0
+
 # 用户浏览器缓存的浏览器文件配置
 USER_DATA_DIR = "%s_user_data_dir"  # %s will be replaced by platform name
 
@@ -107,11 +124,49 @@ FONT_PATH = "./docs/STZHONGS.TTF"
 # 爬取间隔时间
 CRAWLER_MAX_SLEEP_SEC = 2
 
+# 自适应并发（AIMD）：以 MAX_CONCURRENCY_NUM 和 CRAWLER_MAX_SLEEP_SEC 为起点，按平台和代理分别调整，
+# 请求正常时加性提高并发、缩短间隔，出错或被限流时乘性降低并发、加长间隔；关闭后使用固定并发和间隔
+ENABLE_ADAPTIVE_CONCURRENCY = True
+ADAPTIVE_MAX_CONCURRENCY = 4
+ADAPTIVE_MIN_SLEEP_SEC = 0.5
+ADAPTIVE_MAX_SLEEP_SEC = 30.0
+# 每次加性调整缩短的间隔（秒）
+ADAPTIVE_SLEEP_STEP_SEC = 0.1
+# 乘性降低系数：并发乘以该系数，间隔除以该系数
+ADAPTIVE_DECREASE_FACTOR = 0.5
+# 两次降低之间的最短间隔（秒），避免同一批并发请求的失败连续降低
+ADAPTIVE_DECREASE_COOLDOWN_SEC = 1.0
+# 延迟 EWMA 超过基线的倍数时停止提速
+ADAPTIVE_LATENCY_TOLERANCE = 2.0
+# 视为限流或验证码的状态码：429 通用限流，461/471 小红书验证码，432 微博限流
+ADAPTIVE_THROTTLE_STATUS_CODES = [429, 432, 461, 471]
+
 # HTTP 请求重试配置
 HTTP_RETRY_MAX_ATTEMPTS = 3
 HTTP_RETRY_BASE_DELAY = 2.0
 HTTP_RETRY_JITTER = 1.0
 
+# HTTP 连接池配置：各平台客户端按代理复用长连接
+HTTP_POOL_MAX_CONNECTIONS = 20
+HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS = 10
+# 空闲长连接保留时间（秒）
+HTTP_POOL_KEEPALIVE_EXPIRY = 30.0
+# 是否启用 HTTP/2，需要安装 httpx[http2]
+HTTP_ENABLE_HTTP2 = False
+
+# 已抓取内容索引：搜索时跳过近期已抓取内容的详情和评论，仅数据库存储时生效
+ENABLE_SEEN_CONTENT_INDEX = True
+# 已抓取内容超过该小时数后视为过期，重新抓取详情和评论
+SEEN_CONTENT_STALE_HOURS = 24
+# 布隆过滤器索引文件目录、预期容量和误判率
+SEEN_INDEX_DIR = "data/.seen_index"
+SEEN_INDEX_BLOOM_CAPACITY = 1000000
+SEEN_INDEX_BLOOM_ERROR_RATE = 0.001
+# 评论水位线：评论翻页时过滤掉库中已存的评论
+ENABLE_COMMENT_WATERMARK = True
+# 评论接口按热度排序，连续这么多整页都是已存评论时才停止翻页
+COMMENT_WATERMARK_STALE_PAGES = 3
+
 from .bilibili_config import *
 from .xhs_config import *
 from .dy_config import *
@@ -27,6 +27,11 @@ mysql_db_config = {
 }
 
 
+# 数据库写后缓冲：单表累积多少条后批量写入，以及定时刷新间隔（秒）
+DB_WRITE_BATCH_SIZE = int(os.getenv("DB_WRITE_BATCH_SIZE", "200"))
+DB_WRITE_FLUSH_INTERVAL = float(os.getenv("DB_WRITE_FLUSH_INTERVAL", "2"))
+
+
 # redis config
 REDIS_DB_HOST = "127.0.0.1"  # your redis host
 REDIS_DB_PWD = os.getenv("REDIS_DB_PWD", "123456")  # your redis password
@@ -37,6 +42,10 @@ REDIS_DB_NUM = os.getenv("REDIS_DB_NUM", 0)  # your redis db num
 CACHE_TYPE_REDIS = "redis"
 CACHE_TYPE_MEMORY = "memory"
 
+# memory cache bounds, least recently used entries are evicted beyond these
+CACHE_MEMORY_MAX_ENTRIES = int(os.getenv("CACHE_MEMORY_MAX_ENTRIES", 10000))
+CACHE_MEMORY_MAX_BYTES = int(os.getenv("CACHE_MEMORY_MAX_BYTES", 64 * 1024 * 1024))
+
 # sqlite config
 SQLITE_DB_PATH = os.path.join(
     os.path.dirname(os.path.dirname(__file__)), "database", "sqlite_tables.db"
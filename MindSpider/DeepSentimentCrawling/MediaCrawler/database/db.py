@@ -13,6 +13,9 @@ if str(project_root) not in sys.path:
 
 from tools import utils
 from database.db_session import create_tables
+from database.hotness import rebuild_hotness_scores
+from database.seen_index import close_seen_indexes
+from database.write_buffer import close_write_buffer
 
 async def init_table_schema(db_type: str):
     """
@@ -28,8 +31,18 @@ async def init_table_schema(db_type: str):
 async def init_db(db_type: str = None):
     await init_table_schema(db_type)
 
+async def rebuild_hotness(db_type: str = None):
+    """
+    Recomputes hotness_score of all content rows with the current weights.
+    Args:
+        db_type: The type of database, defaults to config.SAVE_DATA_OPTION.
+    """
+    utils.logger.info("[rebuild_hotness] begin rebuild hotness scores ...")
+    await rebuild_hotness_scores(db_type)
+
 async def close():
     """
-    Placeholder for closing database connections if needed in the future.
+    Flushes rows still held by the write-behind buffer of the DB stores and saves the seen content indexes.
     """
-    pass
+    await close_write_buffer()
+    await close_seen_indexes()
@@ -0,0 +1,108 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 内容热度分值（hotness_score）的计算与重建
+#            存储层在 upsert 内容时写入 hotness_score，InsightEngine 的 search_hot_content
+#            直接按该列做索引化的 Top-N 读取；权重变化后运行 `python main.py --rebuild_hotness` 重算。
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from sqlalchemy import Float, bindparam, inspect, select, text, update
+
+import config
+from database.db_session import get_async_engine
+from database.models import (BilibiliVideo, DouyinAweme, KuaishouVideo, WeiboNote,
+                             XhsNote, ZhihuContent)
+from tools import utils
+
+# 权重表与计算规则统一定义在仓库根目录的 utils/hotness.py，与 InsightEngine 共用
+repo_root = Path(__file__).resolve().parents[4]
+if str(repo_root) not in sys.path:
+    sys.path.append(str(repo_root))
+
+from utils.hotness import HOTNESS_FIELDS, calculate_hotness_score
+
+HOTNESS_MODELS = {
+    "bilibili_video": BilibiliVideo,
+    "douyin_aweme": DouyinAweme,
+    "weibo_note": WeiboNote,
+    "xhs_note": XhsNote,
+    "kuaishou_video": KuaishouVideo,
+    "zhihu_content": ZhihuContent,
+}
+
+REBUILD_BATCH_SIZE = 1000
+
+
+async def _ensure_hotness_column(engine, table_name: str) -> bool:
+    """旧库中缺少 hotness_score 列时自动补齐列与索引；表不存在时返回 False"""
+
+    def _inspect(sync_conn):
+        inspector = inspect(sync_conn)
+        if not inspector.has_table(table_name):
+            return None
+        return [column["name"] for column in inspector.get_columns(table_name)]
+
+    async with engine.begin() as conn:
+        columns = await conn.run_sync(_inspect)
+        if columns is None:
+            return False
+        if "hotness_score" not in columns:
+            float_type = Float().compile(dialect=conn.dialect)
+            quote = conn.dialect.identifier_preparer.quote
+            await conn.execute(text(f"ALTER TABLE {quote(table_name)} ADD COLUMN hotness_score {float_type}"))
+            await conn.execute(text(
+                f"CREATE INDEX {quote(f'ix_{table_name}_hotness_score')} ON {quote(table_name)} (hotness_score)"
+            ))
+            utils.logger.info(f"[rebuild_hotness] added hotness_score column to {table_name}")
+    return True
+
+
+async def rebuild_hotness_scores(db_type: str = None, tables: List[str] = None) -> Dict[str, int]:
+    """
+    按当前权重重新计算已有内容的 hotness_score（按主键分批，避免长事务）
+    Args:
+        db_type: 数据库类型，默认使用 config.SAVE_DATA_OPTION
+        tables: 需要重建的表，默认全部
+
+    Returns:
+        各表更新的行数
+    """
+    engine = get_async_engine(db_type or config.SAVE_DATA_OPTION)
+    if engine is None:
+        raise ValueError("[rebuild_hotness] hotness rebuild requires a database save option")
+
+    updated: Dict[str, int] = {}
+    for table_name in tables or list(HOTNESS_FIELDS):
+        if not await _ensure_hotness_column(engine, table_name):
+            utils.logger.warning(f"[rebuild_hotness] table {table_name} not found, skipped")
+            continue
+
+        model = HOTNESS_MODELS[table_name]
+        columns = [getattr(model, field) for field, _ in HOTNESS_FIELDS[table_name]]
+        last_id, count = 0, 0
+        while True:
+            async with engine.begin() as conn:
+                rows = (await conn.execute(
+                    select(model.id, *columns).where(model.id > last_id).order_by(model.id).limit(REBUILD_BATCH_SIZE)
+                )).mappings().all()
+                if not rows:
+                    break
+                await conn.execute(
+                    update(model).where(model.id == bindparam("row_id")).values(hotness_score=bindparam("score")),
+                    [{"row_id": row["id"], "score": calculate_hotness_score(table_name, row)} for row in rows],
+                )
+            last_id, count = rows[-1]["id"], count + len(rows)
+        updated[table_name] = count
+        utils.logger.info(f"[rebuild_hotness] {table_name}: {count} rows rebuilt")
+    return updated
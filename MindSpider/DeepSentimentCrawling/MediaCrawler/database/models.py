@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, Text, String, BigInteger
+from sqlalchemy import create_engine, Column, Integer, Text, String, BigInteger, Float
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -29,6 +29,7 @@ class BilibiliVideo(Base):
     video_comment = Column(Text)
     video_cover_url = Column(Text)
     source_keyword = Column(Text, default="")
+    hotness_score = Column(Float, index=True)
 
 
 class BilibiliVideoComment(Base):
@@ -125,6 +126,7 @@ class DouyinAweme(Base):
     music_download_url = Column(Text)
     note_download_url = Column(Text)
     source_keyword = Column(Text, default="")
+    hotness_score = Column(Float, index=True)
 
 
 class DouyinAwemeComment(Base):
@@ -186,6 +188,7 @@ class KuaishouVideo(Base):
     video_cover_url = Column(Text)
     video_play_url = Column(Text)
     source_keyword = Column(Text, default="")
+    hotness_score = Column(Float, index=True)
 
 
 class KuaishouVideoComment(Base):
@@ -223,6 +226,7 @@ class WeiboNote(Base):
     shared_count = Column(Text)
     note_url = Column(Text)
     source_keyword = Column(Text, default="")
+    hotness_score = Column(Float, index=True)
 
 
 class WeiboNoteComment(Base):
@@ -304,6 +308,7 @@ class XhsNote(Base):
     note_url = Column(Text)
     source_keyword = Column(Text, default="")
     xsec_token = Column(Text)
+    hotness_score = Column(Float, index=True)
 
 
 class XhsNoteComment(Base):
@@ -406,6 +411,7 @@ class ZhihuContent(Base):
     user_url_token = Column(Text)
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
+    hotness_score = Column(Float, index=True)
 
     # persist-1<persist1@126.com>
     # 原因：修复 ORM 模型定义错误，确保与数据库表结构一致。
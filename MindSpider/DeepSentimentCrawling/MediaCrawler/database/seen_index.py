@@ -0,0 +1,307 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 按平台持久化的已抓取内容索引
+#            - 布隆过滤器（落盘到 SEEN_INDEX_DIR）快速判断内容 ID 是否一定没见过，绝大多数新内容不必查库
+#            - 布隆过滤器命中时再以数据库中的 ID 和 last_modify_ts 精确确认，未超过 SEEN_CONTENT_STALE_HOURS 的内容视为新鲜，
+#              搜索时跳过其详情和评论抓取
+#            - 评论水位线：取库中该内容已存评论的最大 create_time，评论接口按热度而非时间排序，
+#              翻页时过滤掉不新于水位线的评论，连续 COMMENT_WATERMARK_STALE_PAGES 整页都已入库时才停止
+#            只在数据库存储（sqlite/mysql/postgresql）下启用，索引文件在爬虫结束时由 db.close() 保存。
+import asyncio
+import hashlib
+import math
+import os
+import struct
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import Integer, func, select
+
+import config
+from database.db_session import get_async_engine
+from database.models import DouyinAweme, DouyinAwemeComment, XhsNote, XhsNoteComment
+from tools import utils
+
+# 平台 -> (内容表, 内容 ID 字段, 评论表, 评论表中的内容 ID 字段)
+PLATFORM_SEEN_MODELS = {
+    "xhs": (XhsNote, "note_id", XhsNoteComment, "note_id"),
+    "dy": (DouyinAweme, "aweme_id", DouyinAwemeComment, "aweme_id"),
+}
+
+# 精确确认时单条 IN 语句的最大参数个数
+ID_LOOKUP_CHUNK_SIZE = 500
+
+
+class BloomFilter:
+    """定长位数组的布隆过滤器，使用 blake2b 双重哈希生成各位置"""
+
+    _HEADER = struct.Struct("<QQQ")
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Args:
+            capacity: 预期容纳的元素个数
+            error_rate: 达到容量时的期望误判率
+        """
+        self.capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    @property
+    def saturated(self) -> bool:
+        return self.count > self.capacity
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        added = False
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def save(self, path: str) -> None:
+        """写入临时文件后原子替换，中途崩溃不会留下损坏的索引文件"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self._HEADER.pack(self.size, self.hash_count, self.count))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, capacity: int, error_rate: float) -> Optional["BloomFilter"]:
+        """读取索引文件，参数与当前配置不一致或文件损坏时返回 None"""
+        bloom = cls(capacity, error_rate)
+        try:
+            with open(path, "rb") as f:
+                size, hash_count, count = cls._HEADER.unpack(f.read(cls._HEADER.size))
+                bits = f.read()
+        except (OSError, struct.error):
+            return None
+        if size != bloom.size or hash_count != bloom.hash_count or len(bits) != len(bloom.bits):
+            return None
+        bloom.bits = bytearray(bits)
+        bloom.count = count
+        return bloom
+
+
+class SeenContentIndex:
+    """单个平台的已抓取内容索引"""
+
+    def __init__(self, platform: str, content_model, id_column: str, comment_model=None,
+                 comment_id_column: Optional[str] = None, engine=None, index_dir: Optional[str] = None):
+        """
+        Args:
+            platform: 平台标识，决定索引文件名
+            content_model: 内容表 ORM 模型
+            id_column: 内容表中的内容 ID 字段
+            comment_model: 评论表 ORM 模型，为空时不提供评论水位线
+            comment_id_column: 评论表中的内容 ID 字段
+            engine: 使用的 AsyncEngine，默认按 config.SAVE_DATA_OPTION 获取
+            index_dir: 索引文件目录，默认 config.SEEN_INDEX_DIR
+        """
+        self.platform = platform
+        self.content_model = content_model
+        self.id_column = getattr(content_model, id_column)
+        self.comment_model = comment_model
+        self.comment_id_column = getattr(comment_model, comment_id_column) if comment_model is not None else None
+        self.path = os.path.join(index_dir or config.SEEN_INDEX_DIR, f"{platform}.bloom")
+        self._engine = engine
+        self._bloom: Optional[BloomFilter] = None
+        # 本次运行中已抓取的内容 ID；数据库写后缓冲可能尚未落库，这里直接视为新鲜
+        self._marked: Set[str] = set()
+        self.skipped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._bloom is not None
+
+    def _to_db_id(self, content_id: Any, column) -> Any:
+        if isinstance(column.type, Integer):
+            try:
+                return int(content_id)
+            except (TypeError, ValueError):
+                return content_id
+        return str(content_id)
+
+    async def load(self) -> None:
+        """读取索引文件；文件不存在、损坏或已饱和时从数据库中的内容 ID 重建"""
+        if self._engine is None:
+            self._engine = get_async_engine()
+        if self._engine is None:
+            utils.logger.info(f"[SeenContentIndex.load] {self.platform} seen index disabled for non-database storage")
+            return
+
+        bloom = await asyncio.to_thread(
+            BloomFilter.load, self.path, config.SEEN_INDEX_BLOOM_CAPACITY, config.SEEN_INDEX_BLOOM_ERROR_RATE
+        )
+        if bloom is not None and not bloom.saturated:
+            self._bloom = bloom
+            utils.logger.info(f"[SeenContentIndex.load] {self.platform} seen index loaded, {bloom.count} ids")
+            return
+
+        bloom = BloomFilter(config.SEEN_INDEX_BLOOM_CAPACITY, config.SEEN_INDEX_BLOOM_ERROR_RATE)
+        async with self._engine.connect() as conn:
+            result = await conn.stream(select(self.id_column).where(self.id_column.is_not(None)).distinct())
+            async for (content_id,) in result:
+                bloom.add(str(content_id))
+        self._bloom = bloom
+        if bloom.saturated:
+            utils.logger.warning(
+                f"[SeenContentIndex.load] {self.platform} has {bloom.count} ids, exceeds SEEN_INDEX_BLOOM_CAPACITY, "
+                f"false positives only cost an extra DB lookup"
+            )
+        utils.logger.info(f"[SeenContentIndex.load] {self.platform} seen index rebuilt from database, {bloom.count} ids")
+
+    async def fresh_ids(self, content_ids: Iterable[Any]) -> Set[str]:
+        """
+        返回已抓取且未过期、可以跳过的内容 ID（字符串形式）
+        Args:
+            content_ids: 待抓取的内容 ID
+        """
+        if not self.enabled:
+            return set()
+        candidates = {str(content_id) for content_id in content_ids if content_id and str(content_id) in self._bloom}
+        fresh = candidates & self._marked
+        remaining = list(candidates - fresh)
+        if remaining:
+            stale_before = utils.get_current_timestamp() - int(config.SEEN_CONTENT_STALE_HOURS * 3600 * 1000)
+            async with self._engine.connect() as conn:
+                for i in range(0, len(remaining), ID_LOOKUP_CHUNK_SIZE):
+                    chunk = [self._to_db_id(content_id, self.id_column) for content_id in remaining[i:i + ID_LOOKUP_CHUNK_SIZE]]
+                    rows = await conn.execute(
+                        select(self.id_column)
+                        .where(self.id_column.in_(chunk))
+                        .group_by(self.id_column)
+                        .having(func.max(self.content_model.last_modify_ts) >= stale_before)
+                    )
+                    fresh.update(str(row[0]) for row in rows)
+        self.skipped += len(fresh)
+        return fresh
+
+    def mark(self, content_id: Any) -> None:
+        """记录本次运行已抓取的内容"""
+        if not self.enabled or not content_id:
+            return
+        self._bloom.add(str(content_id))
+        self._marked.add(str(content_id))
+
+    async def comment_watermark(self, content_id: Any) -> Optional[int]:
+        """
+        返回库中该内容已存评论的最大 create_time（与平台原始数据单位一致），没有评论时返回 None
+        Args:
+            content_id: 内容 ID
+        """
+        if not self.enabled or self.comment_model is None or not config.ENABLE_COMMENT_WATERMARK:
+            return None
+        async with self._engine.connect() as conn:
+            watermark = await conn.scalar(
+                select(func.max(self.comment_model.create_time))
+                .where(self.comment_id_column == self._to_db_id(content_id, self.comment_id_column))
+            )
+        return int(watermark) if watermark else None
+
+    def save(self) -> None:
+        if self.enabled:
+            self._bloom.save(self.path)
+
+
+class CommentWatermark:
+    """
+    按评论水位线过滤一页页评论
+    评论接口按热度排序，旧的热门评论可能排在新评论之前，单独一整页旧评论不能说明后面没有新评论，
+    连续 stale_pages 整页都不新于水位线时才认为已翻到已存评论
+    """
+
+    def __init__(self, since_ts: Optional[int], stale_pages: Optional[int] = None):
+        """
+        Args:
+            since_ts: 评论水位线，为空时不过滤
+            stale_pages: 连续多少整页已入库后停止翻页，默认 config.COMMENT_WATERMARK_STALE_PAGES
+        """
+        self.since_ts = since_ts
+        self.stale_pages = max(1, stale_pages if stale_pages is not None else config.COMMENT_WATERMARK_STALE_PAGES)
+        self._stale_streak = 0
+
+    @property
+    def exhausted(self) -> bool:
+        """是否已连续翻到足够多的已入库整页，应停止翻页"""
+        return bool(self.since_ts) and self._stale_streak >= self.stale_pages
+
+    def filter(self, comments: List[Dict]) -> List[Dict]:
+        """
+        返回一页中新于水位线的评论，并更新连续已入库整页计数；空页不计数
+        Args:
+            comments: 一页评论
+        """
+        if not self.since_ts or not comments:
+            return comments
+        new_comments = [comment for comment in comments if (comment.get("create_time") or 0) > self.since_ts]
+        self._stale_streak = 0 if new_comments else self._stale_streak + 1
+        return new_comments
+
+
+_seen_indexes: Dict[str, Optional[SeenContentIndex]] = {}
+_seen_index_lock: Optional[asyncio.Lock] = None
+
+
+async def get_seen_index(platform: str) -> Optional[SeenContentIndex]:
+    """
+    获取平台的已抓取内容索引，首次调用时加载
+    未开启 ENABLE_SEEN_CONTENT_INDEX、平台未接入或非数据库存储时返回 None
+    """
+    global _seen_index_lock
+    if not config.ENABLE_SEEN_CONTENT_INDEX or platform not in PLATFORM_SEEN_MODELS:
+        return None
+    if platform in _seen_indexes:
+        return _seen_indexes[platform]
+    if _seen_index_lock is None:
+        _seen_index_lock = asyncio.Lock()
+    async with _seen_index_lock:
+        if platform not in _seen_indexes:
+            index = SeenContentIndex(platform, *PLATFORM_SEEN_MODELS[platform])
+            try:
+                await index.load()
+            except Exception as e:
+                utils.logger.error(f"[get_seen_index] load {platform} seen index failed, disabled: {e}")
+            _seen_indexes[platform] = index if index.enabled else None
+    return _seen_indexes[platform]
+
+
+async def close_seen_indexes() -> None:
+    """保存所有已加载的索引文件"""
+    global _seen_index_lock
+    for platform, index in list(_seen_indexes.items()):
+        if index is None:
+            continue
+        try:
+            await asyncio.to_thread(index.save)
+            utils.logger.info(f"[close_seen_indexes] {platform} seen index saved, skipped {index.skipped} fresh contents")
+        except OSError as e:
+            utils.logger.error(f"[close_seen_indexes] save {platform} seen index failed: {e}")
+    _seen_indexes.clear()
+    _seen_index_lock = None
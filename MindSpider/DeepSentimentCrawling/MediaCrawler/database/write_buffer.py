@@ -0,0 +1,326 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 数据库存储的写后缓冲（write-behind）
+#            各平台 DbStoreImplement 不再逐条 SELECT + INSERT/UPDATE + COMMIT，而是把数据按表攒批，
+#            达到条数阈值或定时到期时在一个事务内批量写入：
+#            - 业务键在库中有唯一约束时使用方言原生 upsert（MySQL ON DUPLICATE KEY UPDATE，
+#              PostgreSQL/SQLite ON CONFLICT DO UPDATE）
+#            - 否则（多数表的 note_id/comment_id 只有普通索引）一次 IN 查询取出已存在的键，再批量 UPDATE / INSERT
+#            爬虫结束时由 db.close() 刷新剩余数据。
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, and_, bindparam, insert, inspect, select, tuple_, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+import config
+from database.db_session import get_async_engine
+from tools import utils
+
+NATIVE_UPSERT_DIALECTS = {
+    "mysql": mysql_insert,
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+# 查询已存在业务键时单条 IN 语句的最大参数个数
+KEY_LOOKUP_CHUNK_SIZE = 500
+
+
+class _PendingRow:
+    """一条待写入的数据：values 插入和更新时都写入，on_insert 只在插入新行时写入"""
+
+    __slots__ = ("values", "on_insert", "insert")
+
+    def __init__(self, values: Dict[str, Any], on_insert: Dict[str, Any], insert: bool):
+        self.values = values
+        self.on_insert = on_insert
+        self.insert = insert
+
+    def merge(self, other: "_PendingRow"):
+        """同一业务键在一批内多次出现时合并，后到的数据覆盖先到的"""
+        self.values.update(other.values)
+        self.on_insert.update(other.on_insert)
+        self.insert = self.insert or other.insert
+
+
+class BulkUpsertBuffer:
+    """按表攒批的异步写后缓冲"""
+
+    def __init__(self, batch_size: int = None, flush_interval: float = None, engine=None):
+        """
+        Args:
+            batch_size: 单表累积多少条后立即刷新
+            flush_interval: 定时刷新间隔（秒），<=0 表示只按条数和关闭时刷新
+            engine: 使用的 AsyncEngine，默认按 config.SAVE_DATA_OPTION 获取
+        """
+        self.batch_size = batch_size or config.DB_WRITE_BATCH_SIZE
+        self.flush_interval = config.DB_WRITE_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self._engine = engine
+        # model -> (业务键字段, 业务键 -> 待写入数据)
+        self._pending: Dict[Any, Tuple[Tuple[str, ...], "OrderedDict[Any, _PendingRow]"]] = {}
+        self._unique_keys: Dict[Tuple[str, Tuple[str, ...]], bool] = {}
+        # _lock 只保护 _pending，加入数据不会等待正在进行的数据库写入；
+        # _flush_lock 让各次刷新按取出待写入数据的先后顺序写库，同一业务键的旧数据不会覆盖新数据
+        self._lock: Optional[asyncio.Lock] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._timer: Optional[asyncio.Task] = None
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(rows) for _, rows in self._pending.values())
+
+    async def upsert(self, model, key_columns: Sequence[str], values: Dict[str, Any],
+                     on_insert: Optional[Dict[str, Any]] = None, insert: bool = True):
+        """
+        加入一条待写入数据，按业务键插入或更新
+        Args:
+            model: ORM 模型
+            key_columns: 业务键字段，如 ("note_id",)
+            values: 插入和更新时都写入的字段，不属于该表的字段会被忽略
+            on_insert: 只在插入新行时写入的字段（如 add_ts）
+            insert: 为 False 时只更新已存在的行，不插入新行
+        """
+        key_columns = tuple(key_columns)
+        table = model.__table__
+        row = _PendingRow(
+            self._filter_columns(table, values),
+            self._filter_columns(table, on_insert or {}),
+            insert,
+        )
+        for column in key_columns:
+            row.values[column] = self._coerce_key(table.c[column], row.values.get(column))
+        key = tuple(row.values.get(column) for column in key_columns)
+        if any(value is None for value in key):
+            # 业务键缺失时无法判重，与逐条写入时一样直接插入
+            key = object()
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+            self._flush_lock = asyncio.Lock()
+        self._ensure_timer()
+
+        async with self._lock:
+            registered_keys, rows = self._pending.setdefault(model, (key_columns, OrderedDict()))
+            if registered_keys != key_columns:
+                raise ValueError(f"[BulkUpsertBuffer] {table.name} 的业务键不一致: {registered_keys} != {key_columns}")
+            if key in rows:
+                rows[key].merge(row)
+            else:
+                rows[key] = row
+            should_flush = len(rows) >= self.batch_size
+
+        if should_flush:
+            await self.flush(model)
+
+    async def flush(self, model=None):
+        """刷新指定表（默认全部表）的待写入数据"""
+        if self._lock is None:
+            return
+        async with self._flush_lock:
+            async with self._lock:
+                models = [model] if model is not None else list(self._pending)
+                batches = [(m, *self._pending.pop(m)) for m in models if m in self._pending]
+            for batch_model, key_columns, rows in batches:
+                await self._write(batch_model, key_columns, list(rows.values()))
+
+    async def close(self):
+        """停止定时刷新并写入剩余数据，爬虫结束时调用"""
+        if self._timer is not None:
+            self._timer.cancel()
+            try:
+                await self._timer
+            except asyncio.CancelledError:
+                pass
+            self._timer = None
+        await self.flush()
+
+    def _ensure_timer(self):
+        if self.flush_interval > 0 and (self._timer is None or self._timer.done()):
+            self._timer = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                utils.logger.error(f"[BulkUpsertBuffer] periodic flush failed: {e}")
+
+    async def _write(self, model, key_columns: Tuple[str, ...], rows: List[_PendingRow]):
+        """在一个事务内写入一批数据；整批失败时逐条重试，只丢弃确实写不进去的行"""
+        if not rows:
+            return
+        engine = self._engine or get_async_engine(config.SAVE_DATA_OPTION)
+        table_name = model.__table__.name
+        try:
+            async with engine.begin() as conn:
+                await self._write_batch(conn, model.__table__, key_columns, rows)
+            utils.logger.debug(f"[BulkUpsertBuffer] flushed {len(rows)} rows into {table_name}")
+            return
+        except Exception as e:
+            if len(rows) == 1:
+                utils.logger.error(f"[BulkUpsertBuffer] write into {table_name} failed: {e}")
+                return
+            utils.logger.warning(f"[BulkUpsertBuffer] batch write into {table_name} failed, retrying row by row: {e}")
+
+        for row in rows:
+            try:
+                async with engine.begin() as conn:
+                    await self._write_batch(conn, model.__table__, key_columns, [row])
+            except Exception as e:
+                utils.logger.error(f"[BulkUpsertBuffer] write into {table_name} failed: {e}, row: {row.values}")
+
+    async def _write_batch(self, conn, table, key_columns: Tuple[str, ...], rows: List[_PendingRow]):
+        dialect_insert = NATIVE_UPSERT_DIALECTS.get(conn.dialect.name)
+        if dialect_insert is not None and await self._has_unique_key(conn, table, key_columns):
+            await self._native_upsert(conn, dialect_insert, table, key_columns, [row for row in rows if row.insert])
+            await self._update_rows(conn, table, key_columns, [row for row in rows if not row.insert])
+            return
+
+        existing = await self._existing_keys(conn, table, key_columns, rows)
+        updates, inserts = [], []
+        for row in rows:
+            if self._key_of(row, key_columns) in existing:
+                updates.append(row)
+            elif row.insert:
+                inserts.append(row)
+        await self._update_rows(conn, table, key_columns, updates)
+        for _, group in self._group_for_insert(inserts).items():
+            await conn.execute(insert(table), group)
+
+    async def _native_upsert(self, conn, dialect_insert, table, key_columns, rows: List[_PendingRow]):
+        for (value_columns, _), group in self._group_for_insert(rows).items():
+            stmt = dialect_insert(table)
+            # 冲突时只更新 values 中的字段，on_insert 中的字段（如 add_ts）保留原值
+            update_columns = [c for c in value_columns if c not in key_columns]
+            if conn.dialect.name == "mysql":
+                if update_columns:
+                    stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_columns})
+                else:
+                    stmt = stmt.prefix_with("IGNORE")
+            elif update_columns:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(key_columns), set_={c: stmt.excluded[c] for c in update_columns}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=list(key_columns))
+            await conn.execute(stmt, group)
+
+    async def _update_rows(self, conn, table, key_columns, rows: List[_PendingRow]):
+        """按业务键批量更新（同一业务键若有多行重复数据会一并更新）"""
+        groups: Dict[Tuple[str, ...], List[Dict]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row.values)), []).append(row.values)
+        for columns, group in groups.items():
+            set_columns = [c for c in columns if c not in key_columns]
+            if not set_columns:
+                continue
+            stmt = (
+                update(table)
+                .where(and_(*[table.c[c] == bindparam(f"_key_{c}") for c in key_columns]))
+                .values({c: bindparam(f"_value_{c}") for c in set_columns})
+            )
+            params = [
+                {**{f"_key_{c}": item[c] for c in key_columns}, **{f"_value_{c}": item[c] for c in set_columns}}
+                for item in group
+            ]
+            await conn.execute(stmt, params)
+
+    async def _existing_keys(self, conn, table, key_columns, rows: List[_PendingRow]) -> set:
+        keys = [key for key in {self._key_of(row, key_columns) for row in rows} if None not in key]
+        existing = set()
+        if len(key_columns) == 1:
+            column = table.c[key_columns[0]]
+            keys = [key[0] for key in keys]
+            condition = column.in_
+            select_columns = [column]
+        else:
+            select_columns = [table.c[c] for c in key_columns]
+            condition = tuple_(*select_columns).in_
+        for start in range(0, len(keys), KEY_LOOKUP_CHUNK_SIZE):
+            chunk = keys[start:start + KEY_LOOKUP_CHUNK_SIZE]
+            result = await conn.execute(select(*select_columns).where(condition(chunk)))
+            existing.update(tuple(record) for record in result)
+        return existing
+
+    async def _has_unique_key(self, conn, table, key_columns: Tuple[str, ...]) -> bool:
+        """业务键在实际库表（而非 ORM 模型）上是否有唯一约束，结果按表缓存"""
+        cache_key = (table.name, key_columns)
+        if cache_key not in self._unique_keys:
+            def _inspect(sync_conn) -> bool:
+                inspector = inspect(sync_conn)
+                if not inspector.has_table(table.name):
+                    return False
+                candidates = [c["column_names"] for c in inspector.get_unique_constraints(table.name)]
+                candidates += [i["column_names"] for i in inspector.get_indexes(table.name) if i.get("unique")]
+                candidates.append(inspector.get_pk_constraint(table.name).get("constrained_columns") or [])
+                return any(set(columns) == set(key_columns) for columns in candidates)
+
+            self._unique_keys[cache_key] = await conn.run_sync(_inspect)
+        return self._unique_keys[cache_key]
+
+    @staticmethod
+    def _group_for_insert(rows: List[_PendingRow]) -> Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], List[Dict]]:
+        """executemany 要求每组参数字段一致，按 (values 字段, on_insert 字段) 分组并合并为插入参数"""
+        groups: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], List[Dict]] = {}
+        for row in rows:
+            columns = (tuple(sorted(row.values)), tuple(sorted(set(row.on_insert) - set(row.values))))
+            groups.setdefault(columns, []).append({**row.on_insert, **row.values})
+        return groups
+
+    @staticmethod
+    def _key_of(row: _PendingRow, key_columns: Tuple[str, ...]) -> tuple:
+        return tuple(row.values.get(c) for c in key_columns)
+
+    @staticmethod
+    def _filter_columns(table, values: Dict[str, Any]) -> Dict[str, Any]:
+        # 自增主键由数据库生成
+        return {k: v for k, v in values.items() if k in table.c and not table.c[k].primary_key}
+
+    @staticmethod
+    def _coerce_key(column, value):
+        """业务键按列类型转换（如 BigInteger 列收到字符串 ID），保证判重与查询一致"""
+        if isinstance(value, str) and isinstance(column.type, Integer):
+            stripped = value.strip()
+            if stripped.lstrip("-").isdigit():
+                return int(stripped)
+        return value
+
+
+_write_buffer: Optional[BulkUpsertBuffer] = None
+
+
+def get_write_buffer() -> BulkUpsertBuffer:
+    """进程内共享的写后缓冲"""
+    global _write_buffer
+    if _write_buffer is None:
+        _write_buffer = BulkUpsertBuffer()
+    return _write_buffer
+
+
+async def buffered_upsert(model, key_columns: Sequence[str], values: Dict[str, Any],
+                          on_insert: Optional[Dict[str, Any]] = None, insert: bool = True):
+    """写入共享缓冲，参数同 BulkUpsertBuffer.upsert"""
+    await get_write_buffer().upsert(model, key_columns, values, on_insert=on_insert, insert=insert)
+
+
+async def close_write_buffer():
+    """刷新并关闭共享缓冲"""
+    global _write_buffer
+    if _write_buffer is not None:
+        buffer, _write_buffer = _write_buffer, None
+        await buffer.close()
@@ -26,6 +26,8 @@ from media_platform.xhs import XiaoHongShuCrawler
 from media_platform.zhihu import ZhihuCrawler
 from media_platform.xueqiu import XueQiuCrawler
 from tools.async_file_writer import AsyncFileWriter
+from tools.adaptive_concurrency import log_concurrency_stats
+from tools.http_client_pool import close_http_clients
 from var import crawler_type_var
 
 
@@ -71,8 +73,24 @@ async def main():
         print(f"Database {args.init_db} initialized successfully.")
         return  # Exit the main function cleanly
 
+    # rebuild precomputed hotness scores, e.g. after the weights change
+    if args.rebuild_hotness:
+        await db.rebuild_hotness()
+        print("Hotness scores rebuilt successfully.")
+        return
+
     crawler = CrawlerFactory.create_crawler(platform=config.PLATFORM)
-    await crawler.start()
+    try:
+        await crawler.start()
+    finally:
+        # DB 存储采用写后缓冲，需在事件循环结束前写入剩余数据
+        await db.close()
+        # 关闭 csv/jsonl 文件句柄，并将 jsonl 转换为 json 数组
+        await AsyncFileWriter.close_all()
+        # 关闭各平台复用的 HTTP 长连接
+        await close_http_clients()
+        # 输出各平台/代理的自适应并发指标
+        log_concurrency_stats()
 
     # Generate wordcloud after crawling is complete
     # Only for JSON save mode
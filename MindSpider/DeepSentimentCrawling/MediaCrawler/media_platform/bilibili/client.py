@@ -51,7 +51,7 @@ class BilibiliClient(AbstractApiClient):
 
     async def request(self, method, url, **kwargs) -> Any:
         async def _send():
-            async with httpx.AsyncClient(proxy=self.proxy) as client:
+            async with self.http_client() as client:
                 return await client.request(method, url, timeout=self.timeout, **kwargs)
 
         try:
@@ -229,7 +229,7 @@ class BilibiliClient(AbstractApiClient):
 
     async def get_video_media(self, url: str) -> Union[bytes, None]:
         # Follow CDN 302 redirects and treat any 2xx as success (some endpoints return 206)
-        async with httpx.AsyncClient(proxy=self.proxy, follow_redirects=True) as client:
+        async with self.http_client(follow_redirects=True) as client:
             try:
                 response = await client.request(
                     "GET", url, timeout=self.timeout, headers=self.headers
@@ -18,6 +18,7 @@ import httpx
 from playwright.async_api import BrowserContext
 
 from base.base_crawler import AbstractApiClient
+from database.seen_index import CommentWatermark
 from tools import utils
 from tools.http_retry import request_with_retry
 from var import request_keyword_var
@@ -99,7 +100,7 @@ class DouYinClient(AbstractApiClient):
 
     async def request(self, method, url, **kwargs):
         async def _send():
-            async with httpx.AsyncClient(proxy=self.proxy) as client:
+            async with self.http_client() as client:
                 return await client.request(method, url, timeout=self.timeout, **kwargs)
 
         try:
@@ -261,6 +262,7 @@ class DouYinClient(AbstractApiClient):
         is_fetch_sub_comments=False,
         callback: Optional[Callable] = None,
         max_count: int = 10,
+        since_ts: Optional[int] = None,
     ):
         """
         获取帖子的所有评论，包括子评论
@@ -269,11 +271,13 @@ class DouYinClient(AbstractApiClient):
         :param is_fetch_sub_comments: 是否抓取子评论
         :param callback: 回调函数，用于处理抓取到的评论
         :param max_count: 一次帖子爬取的最大评论数量
+        :param since_ts: 评论水位线（秒），不晚于它的评论已经入库，连续多页都已入库时停止翻页
         :return: 评论列表
         """
         result = []
         comments_has_more = 1
         comments_cursor = 0
+        watermark = CommentWatermark(since_ts)
         while comments_has_more and len(result) < max_count:
             comments_res = await self.get_aweme_comments(aweme_id, comments_cursor)
             comments_has_more = comments_res.get("has_more", 0)
@@ -281,6 +285,13 @@ class DouYinClient(AbstractApiClient):
             comments = comments_res.get("comments", [])
             if not comments:
                 continue
+            comments = watermark.filter(comments)
+            if watermark.exhausted:
+                utils.logger.info(f"[DouYinClient.get_aweme_all_comments] aweme {aweme_id} reached stored comments, stop")
+                break
+            if not comments:
+                await asyncio.sleep(crawl_interval)
+                continue
             if len(result) + len(comments) > max_count:
                 comments = comments[: max_count - len(result)]
             result.extend(comments)
@@ -363,7 +374,7 @@ class DouYinClient(AbstractApiClient):
         return result
 
     async def get_aweme_media(self, url: str) -> Union[bytes, None]:
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
+        async with self.http_client() as client:
             try:
                 response = await client.request(
                     "GET", url, timeout=self.timeout, follow_redirects=True
@@ -392,9 +403,7 @@ class DouYinClient(AbstractApiClient):
         Returns:
             重定向后的完整URL
         """
-        async with httpx.AsyncClient(
-            proxy=self.proxy, follow_redirects=False
-        ) as client:
+        async with self.http_client(follow_redirects=False) as client:
             try:
                 utils.logger.info(
                     f"[DouYinClient.resolve_short_url] Resolving short URL: {short_url}"
@@ -24,6 +24,7 @@ from playwright.async_api import (
 
 import config
 from base.base_crawler import AbstractCrawler
+from database.seen_index import get_seen_index
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import douyin as douyin_store
 from tools import utils
@@ -141,17 +142,28 @@ class DouYinCrawler(AbstractCrawler):
                     utils.logger.error(f"[DouYinCrawler.search] search douyin keyword: {keyword} failed，账号也许被风控了。")
                     break
                 dy_search_id = posts_res.get("extra", {}).get("logid", "")
+                aweme_infos: List[Dict] = []
                 for post_item in posts_res.get("data"):
                     try:
-                        aweme_info: Dict = (post_item.get("aweme_info") or post_item.get("aweme_mix_info", {}).get("mix_items")[0])
+                        aweme_infos.append(post_item.get("aweme_info") or post_item.get("aweme_mix_info", {}).get("mix_items")[0])
                     except TypeError:
                         continue
+                # 跳过近期已抓取的视频，不再更新和抓取评论，避免刷新 last_modify_ts 后永远不过期
+                seen_index = await get_seen_index("dy")
+                if seen_index:
+                    fresh_ids = await seen_index.fresh_ids(aweme_info.get("aweme_id") for aweme_info in aweme_infos)
+                    if fresh_ids:
+                        utils.logger.info(f"[DouYinCrawler.search] Skip {len(fresh_ids)} recently crawled awemes")
+                        aweme_infos = [aweme_info for aweme_info in aweme_infos if str(aweme_info.get("aweme_id")) not in fresh_ids]
+                for aweme_info in aweme_infos:
                     aweme_list.append(aweme_info.get("aweme_id", ""))
                     await douyin_store.update_douyin_aweme(aweme_item=aweme_info)
+                    if seen_index:
+                        seen_index.mark(aweme_info.get("aweme_id"))
                     await self.get_aweme_media(aweme_item=aweme_info)
                 # Sleep after each page navigation
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[DouYinCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
+                await self.dy_client.concurrency.pace()
+                utils.logger.info(f"[DouYinCrawler.search] Sleeping for {self.dy_client.concurrency.delay} seconds after page {page-1}")
             utils.logger.info(f"[DouYinCrawler.search] keyword:{keyword}, aweme_list:{aweme_list}")
             await self.batch_get_note_comments(aweme_list)
 
@@ -181,7 +193,7 @@ class DouYinCrawler(AbstractCrawler):
                 utils.logger.error(f"[DouYinCrawler.get_specified_awemes] Failed to parse video URL: {e}")
                 continue
 
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = self.dy_client.concurrency
         task_list = [self.get_aweme_detail(aweme_id=aweme_id, semaphore=semaphore) for aweme_id in aweme_id_list]
         aweme_details = await asyncio.gather(*task_list)
         for aweme_detail in aweme_details:
@@ -196,8 +208,8 @@ class DouYinCrawler(AbstractCrawler):
             try:
                 result = await self.dy_client.get_video_by_id(aweme_id)
                 # Sleep after fetching aweme detail
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[DouYinCrawler.get_aweme_detail] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after fetching aweme {aweme_id}")
+                await self.dy_client.concurrency.pace()
+                utils.logger.info(f"[DouYinCrawler.get_aweme_detail] Sleeping for {self.dy_client.concurrency.delay} seconds after fetching aweme {aweme_id}")
                 return result
             except DataFetchError as ex:
                 utils.logger.error(f"[DouYinCrawler.get_aweme_detail] Get aweme detail error: {ex}")
@@ -215,7 +227,7 @@ class DouYinCrawler(AbstractCrawler):
             return
 
         task_list: List[Task] = []
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = self.dy_client.concurrency
         for aweme_id in aweme_list:
             task = asyncio.create_task(self.get_comments(aweme_id, semaphore), name=aweme_id)
             task_list.append(task)
@@ -227,13 +239,17 @@ class DouYinCrawler(AbstractCrawler):
             try:
                 # 将关键词列表传递给 get_aweme_all_comments 方法
                 # Use fixed crawling interval
-                crawl_interval = config.CRAWLER_MAX_SLEEP_SEC
+                crawl_interval = self.dy_client.concurrency.delay
+                # 已存评论的最新时间，翻页时跳过已存评论，连续多页都是已存评论时停止
+                seen_index = await get_seen_index("dy")
+                since_ts = await seen_index.comment_watermark(aweme_id) if seen_index else None
                 await self.dy_client.get_aweme_all_comments(
                     aweme_id=aweme_id,
                     crawl_interval=crawl_interval,
                     is_fetch_sub_comments=config.ENABLE_GET_SUB_COMMENTS,
                     callback=douyin_store.batch_update_dy_aweme_comments,
                     max_count=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
+                    since_ts=since_ts,
                 )
                 # Sleep after fetching comments
                 await asyncio.sleep(crawl_interval)
@@ -272,7 +288,7 @@ class DouYinCrawler(AbstractCrawler):
         """
         Concurrently obtain the specified post list and save the data
         """
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = self.dy_client.concurrency
         task_list = [self.get_aweme_detail(post_item.get("aweme_id"), semaphore) for post_item in video_list]
 
         note_details = await asyncio.gather(*task_list)
@@ -47,7 +47,7 @@ class KuaiShouClient(AbstractApiClient):
 
     async def request(self, method, url, **kwargs) -> Any:
         async def _send():
-            async with httpx.AsyncClient(proxy=self.proxy) as client:
+            async with self.http_client() as client:
                 return await client.request(method, url, timeout=self.timeout, **kwargs)
 
         try:
@@ -165,8 +165,8 @@ class KuaishouCrawler(AbstractCrawler):
                 page += 1
                 
                 # Sleep after page navigation
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[KuaishouCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
+                await self.ks_client.concurrency.pace()
+                utils.logger.info(f"[KuaishouCrawler.search] Sleeping for {self.ks_client.concurrency.delay} seconds after page {page-1}")
                 
                 await self.batch_get_video_comments(video_id_list)
 
@@ -183,7 +183,7 @@ class KuaishouCrawler(AbstractCrawler):
                 utils.logger.error(f"Failed to parse video URL: {e}")
                 continue
 
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = self.ks_client.concurrency
         task_list = [
             self.get_video_info_task(video_id=video_id, semaphore=semaphore)
             for video_id in video_ids
@@ -203,8 +203,8 @@ class KuaishouCrawler(AbstractCrawler):
                 result = await self.ks_client.get_video_info(video_id)
                 
                 # Sleep after fetching video details
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[KuaishouCrawler.get_video_info_task] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after fetching video details {video_id}")
+                await self.ks_client.concurrency.pace()
+                utils.logger.info(f"[KuaishouCrawler.get_video_info_task] Sleeping for {self.ks_client.concurrency.delay} seconds after fetching video details {video_id}")
                 
                 utils.logger.info(
                     f"[KuaishouCrawler.get_video_info_task] Get video_id:{video_id} info result: {result} ..."
@@ -236,7 +236,7 @@ class KuaishouCrawler(AbstractCrawler):
         utils.logger.info(
             f"[KuaishouCrawler.batch_get_video_comments] video ids:{video_id_list}"
         )
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = self.ks_client.concurrency
         task_list: List[Task] = []
         for video_id in video_id_list:
             task = asyncio.create_task(
@@ -261,12 +261,12 @@ class KuaishouCrawler(AbstractCrawler):
                 )
                 
                 # Sleep before fetching comments
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[KuaishouCrawler.get_comments] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds before fetching comments for video {video_id}")
+                await self.ks_client.concurrency.pace()
+                utils.logger.info(f"[KuaishouCrawler.get_comments] Sleeping for {self.ks_client.concurrency.delay} seconds before fetching comments for video {video_id}")
                 
                 await self.ks_client.get_video_all_comments(
                     photo_id=video_id,
-                    crawl_interval=config.CRAWLER_MAX_SLEEP_SEC,
+                    crawl_interval=self.ks_client.concurrency.delay,
                     callback=kuaishou_store.batch_update_ks_video_comments,
                     max_count=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
                 )
@@ -400,7 +400,7 @@ class KuaishouCrawler(AbstractCrawler):
             # Get all video information of the creator
             all_video_list = await self.ks_client.get_all_videos_by_creator(
                 user_id=user_id,
-                crawl_interval=config.CRAWLER_MAX_SLEEP_SEC,
+                crawl_interval=self.ks_client.concurrency.delay,
                 callback=self.fetch_creator_video_detail,
             )
 
@@ -413,7 +413,7 @@ class KuaishouCrawler(AbstractCrawler):
         """
         Concurrently obtain the specified post list and save the data
         """
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = self.ks_client.concurrency
         task_list = [
             self.get_video_info_task(post_item.get("photo", {}).get("id"), semaphore)
             for post_item in video_list
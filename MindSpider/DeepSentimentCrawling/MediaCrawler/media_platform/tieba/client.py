@@ -120,6 +120,8 @@ class BaiduTieBaClient(AbstractApiClient):
             response = await _request_with_proxy(actual_proxy)
         except requests.RequestException as exc:
             if self.ip_pool:
+                if actual_proxy:
+                    self.ip_pool.report_result(actual_proxy, ok=False)
                 proxy_model = await self.ip_pool.get_proxy()
                 _, new_proxy = utils.format_proxy_info(proxy_model)
                 self.default_ip_proxy = new_proxy
@@ -295,7 +297,7 @@ class BaiduTieBaClient(AbstractApiClient):
             await self.playwright_page.goto(full_url, wait_until="domcontentloaded")
 
             # 等待页面加载,使用配置文件中的延时设置
-            await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
+            await self.concurrency.pace()
 
             # 获取页面HTML内容
             page_content = await self.playwright_page.content()
@@ -342,7 +344,7 @@ class BaiduTieBaClient(AbstractApiClient):
             await self.playwright_page.goto(note_url, wait_until="domcontentloaded")
 
             # 等待页面加载,使用配置文件中的延时设置
-            await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
+            await self.concurrency.pace()
 
             # 获取页面HTML内容
             page_content = await self.playwright_page.content()
@@ -402,7 +404,7 @@ class BaiduTieBaClient(AbstractApiClient):
                 )
 
                 # 等待页面加载,使用配置文件中的延时设置
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
+                await self.concurrency.pace()
 
                 # 获取页面HTML内容
                 page_content = await self.playwright_page.content()
@@ -502,7 +504,7 @@ class BaiduTieBaClient(AbstractApiClient):
                     )
 
                     # 等待页面加载,使用配置文件中的延时设置
-                    await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
+                    await self.concurrency.pace()
 
                     # 获取页面HTML内容
                     page_content = await self.playwright_page.content()
@@ -569,7 +571,7 @@ class BaiduTieBaClient(AbstractApiClient):
             await self.playwright_page.goto(tieba_url, wait_until="domcontentloaded")
 
             # 等待页面加载,使用配置文件中的延时设置
-            await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
+            await self.concurrency.pace()
 
             # 获取页面HTML内容
             page_content = await self.playwright_page.content()
@@ -616,7 +618,7 @@ class BaiduTieBaClient(AbstractApiClient):
             await self.playwright_page.goto(creator_url, wait_until="domcontentloaded")
 
             # 等待页面加载,使用配置文件中的延时设置
-            await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
+            await self.concurrency.pace()
 
             # 获取页面HTML内容
             page_content = await self.playwright_page.content()
@@ -661,7 +663,7 @@ class BaiduTieBaClient(AbstractApiClient):
             await self.playwright_page.goto(creator_url, wait_until="domcontentloaded")
 
             # 等待页面加载,使用配置文件中的延时设置
-            await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
+            await self.concurrency.pace()
 
             # 获取页面内容(这个接口返回JSON)
             page_content = await self.playwright_page.content()
@@ -184,8 +184,8 @@ class TieBaCrawler(AbstractCrawler):
                     )
                     
                     # Sleep after page navigation
-                    await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                    utils.logger.info(f"[TieBaCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page}")
+                    await self.tieba_client.concurrency.pace()
+                    utils.logger.info(f"[TieBaCrawler.search] Sleeping for {self.tieba_client.concurrency.delay} seconds after page {page}")
                     
                     page += 1
                 except Exception as ex:
@@ -226,8 +226,8 @@ class TieBaCrawler(AbstractCrawler):
                 await self.get_specified_notes([note.note_id for note in note_list])
                 
                 # Sleep after processing notes
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[TieBaCrawler.get_specified_tieba_notes] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after processing notes from page {page_number}")
+                await self.tieba_client.concurrency.pace()
+                utils.logger.info(f"[TieBaCrawler.get_specified_tieba_notes] Sleeping for {self.tieba_client.concurrency.delay} seconds after processing notes from page {page_number}")
                 
                 page_number += tieba_limit_count
 
@@ -242,7 +242,7 @@ class TieBaCrawler(AbstractCrawler):
         Returns:
 
         """
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = self.tieba_client.concurrency
         task_list = [
             self.get_note_detail_async_task(note_id=note_id, semaphore=semaphore)
             for note_id in note_id_list
@@ -275,8 +275,8 @@ class TieBaCrawler(AbstractCrawler):
                 note_detail: TiebaNote = await self.tieba_client.get_note_by_id(note_id)
                 
                 # Sleep after fetching note details
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[TieBaCrawler.get_note_detail_async_task] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after fetching note details {note_id}")
+                await self.tieba_client.concurrency.pace()
+                utils.logger.info(f"[TieBaCrawler.get_note_detail_async_task] Sleeping for {self.tieba_client.concurrency.delay} seconds after fetching note details {note_id}")
                 
                 if not note_detail:
                     utils.logger.error(
@@ -307,7 +307,7 @@ class TieBaCrawler(AbstractCrawler):
         if not config.ENABLE_GET_COMMENTS:
             return
 
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = self.tieba_client.concurrency
         task_list: List[Task] = []
         for note_detail in note_detail_list:
             task = asyncio.create_task(
@@ -335,12 +335,12 @@ class TieBaCrawler(AbstractCrawler):
             )
             
             # Sleep before fetching comments
-            await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-            utils.logger.info(f"[TieBaCrawler.get_comments_async_task] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds before fetching comments for note {note_detail.note_id}")
+            await self.tieba_client.concurrency.pace()
+            utils.logger.info(f"[TieBaCrawler.get_comments_async_task] Sleeping for {self.tieba_client.concurrency.delay} seconds before fetching comments for note {note_detail.note_id}")
             
             await self.tieba_client.get_note_all_comments(
                 note_detail=note_detail,
-                crawl_interval=config.CRAWLER_MAX_SLEEP_SEC,
+                crawl_interval=self.tieba_client.concurrency.delay,
                 callback=tieba_store.batch_update_tieba_note_comments,
                 max_count=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
             )
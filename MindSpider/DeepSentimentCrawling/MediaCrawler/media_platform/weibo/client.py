@@ -25,6 +25,7 @@ from httpx import Response
 from playwright.async_api import BrowserContext, Page
 
 import config
+from base.base_crawler import AbstractApiClient
 from tools import utils
 from tools.http_retry import request_with_retry
 
@@ -32,7 +33,7 @@ from .exception import DataFetchError
 from .field import SearchType
 
 
-class WeiboClient:
+class WeiboClient(AbstractApiClient):
 
     def __init__(
         self,
@@ -55,7 +56,7 @@ class WeiboClient:
         enable_return_response = kwargs.pop("return_response", False)
 
         async def _send():
-            async with httpx.AsyncClient(proxy=self.proxy) as client:
+            async with self.http_client() as client:
                 return await client.request(method, url, timeout=self.timeout, **kwargs)
 
         try:
@@ -296,7 +297,7 @@ class WeiboClient:
         :return:
         """
         url = f"{self._host}/detail/{note_id}"
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
+        async with self.http_client() as client:
             response = await client.request(
                 "GET", url, timeout=self.timeout, headers=self.headers
             )
@@ -331,7 +332,7 @@ class WeiboClient:
         # 微博图床对外存在防盗链，所以需要代理访问
         # 由于微博图片是通过 i1.wp.com 来访问的，所以需要拼接一下
         final_uri = f"{self._image_agent_host}" f"{image_url}"
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
+        async with self.http_client() as client:
             try:
                 response = await client.request("GET", final_uri, timeout=self.timeout)
                 response.raise_for_status()
@@ -19,6 +19,7 @@ from playwright.async_api import BrowserContext, Page
 
 import config
 from base.base_crawler import AbstractApiClient
+from database.seen_index import CommentWatermark
 from tools import utils
 from tools.http_retry import request_with_retry
 
@@ -97,7 +98,7 @@ class XiaoHongShuClient(AbstractApiClient):
         return_response = kwargs.pop("return_response", False)
 
         async def _send():
-            async with httpx.AsyncClient(proxy=self.proxy) as client:
+            async with self.http_client() as client:
                 return await client.request(method, url, timeout=self.timeout, **kwargs)
 
         try:
@@ -168,7 +169,7 @@ class XiaoHongShuClient(AbstractApiClient):
         )
 
     async def get_note_media(self, url: str) -> Union[bytes, None]:
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
+        async with self.http_client() as client:
             try:
                 response = await client.request("GET", url, timeout=self.timeout)
                 response.raise_for_status()
@@ -354,6 +355,7 @@ class XiaoHongShuClient(AbstractApiClient):
         crawl_interval: float = 1.0,
         callback: Optional[Callable] = None,
         max_count: int = 10,
+        since_ts: Optional[int] = None,
     ) -> List[Dict]:
         """
         获取指定笔记下的所有一级评论，该方法会一直查找一个帖子下的所有评论信息
@@ -363,12 +365,14 @@ class XiaoHongShuClient(AbstractApiClient):
             crawl_interval: 爬取一次笔记的延迟单位（秒）
             callback: 一次笔记爬取结束后
             max_count: 一次笔记爬取的最大评论数量
+            since_ts: 评论水位线（毫秒），不晚于它的评论已经入库，连续多页都已入库时停止翻页
         Returns:
 
         """
         result = []
         comments_has_more = True
         comments_cursor = ""
+        watermark = CommentWatermark(since_ts)
         while comments_has_more and len(result) < max_count:
             comments_res = await self.get_note_comments(
                 note_id=note_id, xsec_token=xsec_token, cursor=comments_cursor
@@ -380,7 +384,10 @@ class XiaoHongShuClient(AbstractApiClient):
                     f"[XiaoHongShuClient.get_note_all_comments] No 'comments' key found in response: {comments_res}"
                 )
                 break
-            comments = comments_res["comments"]
+            comments = watermark.filter(comments_res["comments"])
+            if watermark.exhausted:
+                utils.logger.info(f"[XiaoHongShuClient.get_note_all_comments] note {note_id} reached stored comments, stop")
+                break
             if len(result) + len(comments) > max_count:
                 comments = comments[: max_count - len(result)]
             if callback:
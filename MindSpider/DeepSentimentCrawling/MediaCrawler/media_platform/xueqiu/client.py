@@ -41,7 +41,7 @@ class XueQiuClient(AbstractApiClient):
         headers = kwargs.pop("headers", self.headers)
         waf_retry = 3
         for attempt in range(waf_retry):
-            async with httpx.AsyncClient(proxy=self.proxy) as client:
+            async with self.http_client() as client:
                 response = await client.request(
                     method,
                     url,
@@ -144,7 +144,7 @@ class XueQiuCrawler(AbstractCrawler):
                     if collected >= max_notes:
                         break
 
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
+                await self.xq_client.concurrency.pace()
                 await self.batch_get_comments(status_id_list)
 
                 page += 1
@@ -345,7 +345,7 @@ class XueQiuCrawler(AbstractCrawler):
                     if status_id:
                         status_id_list.append(status_id)
                 page += 1
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
+                await self.xq_client.concurrency.pace()
 
             await self.batch_get_comments(status_id_list)
 
@@ -358,7 +358,7 @@ class XueQiuCrawler(AbstractCrawler):
         if not status_id_list:
             return
 
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = self.xq_client.concurrency
         tasks: List[Task] = []
         for status_id in status_id_list:
             if not status_id:
@@ -407,7 +407,7 @@ class XueQiuCrawler(AbstractCrawler):
                     await xueqiu_store.batch_update_comments(status_id, parsed_comments)
                 fetched += len(parsed_comments)
 
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
+                await self.xq_client.concurrency.pace()
                 if len(comment_list) < page_size:
                     break
                 page += 1
@@ -427,7 +427,7 @@ class XueQiuCrawler(AbstractCrawler):
             return None
         try:
             detail = await self.xq_client.get_status_detail(status_id)
-            await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
+            await self.xq_client.concurrency.pace()
             return detail
         except DataFetchError as exc:
             utils.logger.error(
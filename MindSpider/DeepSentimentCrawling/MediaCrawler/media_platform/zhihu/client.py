@@ -79,7 +79,7 @@ class ZhiHuClient(AbstractApiClient):
         return_response = kwargs.pop("return_response", False)
 
         async def _send():
-            async with httpx.AsyncClient(proxy=self.proxy) as client:
+            async with self.http_client() as client:
                 return await client.request(method, url, timeout=self.timeout, **kwargs)
 
         try:
@@ -171,8 +171,8 @@ class ZhihuCrawler(AbstractCrawler):
                         break
 
                     # Sleep after page navigation
-                    await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                    utils.logger.info(f"[ZhihuCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
+                    await self.zhihu_client.concurrency.pace()
+                    utils.logger.info(f"[ZhihuCrawler.search] Sleeping for {self.zhihu_client.concurrency.delay} seconds after page {page-1}")
                     
                     page += 1
                     for content in content_list:
@@ -198,7 +198,7 @@ class ZhihuCrawler(AbstractCrawler):
             )
             return
 
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = self.zhihu_client.concurrency
         task_list: List[Task] = []
         for content_item in content_list:
             task = asyncio.create_task(
@@ -225,12 +225,12 @@ class ZhihuCrawler(AbstractCrawler):
             )
             
             # Sleep before fetching comments
-            await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-            utils.logger.info(f"[ZhihuCrawler.get_comments] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds before fetching comments for content {content_item.content_id}")
+            await self.zhihu_client.concurrency.pace()
+            utils.logger.info(f"[ZhihuCrawler.get_comments] Sleeping for {self.zhihu_client.concurrency.delay} seconds before fetching comments for content {content_item.content_id}")
             
             await self.zhihu_client.get_note_all_comments(
                 content=content_item,
-                crawl_interval=config.CRAWLER_MAX_SLEEP_SEC,
+                crawl_interval=self.zhihu_client.concurrency.delay,
                 callback=zhihu_store.batch_update_zhihu_note_comments,
             )
 
@@ -268,7 +268,7 @@ class ZhihuCrawler(AbstractCrawler):
             # Get all anwser information of the creator
             all_content_list = await self.zhihu_client.get_all_anwser_by_creator(
                 creator=createor_info,
-                crawl_interval=config.CRAWLER_MAX_SLEEP_SEC,
+                crawl_interval=self.zhihu_client.concurrency.delay,
                 callback=zhihu_store.batch_update_zhihu_contents,
             )
 
@@ -316,8 +316,8 @@ class ZhihuCrawler(AbstractCrawler):
                 result = await self.zhihu_client.get_answer_info(question_id, answer_id)
                 
                 # Sleep after fetching answer details
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[ZhihuCrawler.get_note_detail] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after fetching answer details {answer_id}")
+                await self.zhihu_client.concurrency.pace()
+                utils.logger.info(f"[ZhihuCrawler.get_note_detail] Sleeping for {self.zhihu_client.concurrency.delay} seconds after fetching answer details {answer_id}")
                 
                 return result
 
@@ -329,8 +329,8 @@ class ZhihuCrawler(AbstractCrawler):
                 result = await self.zhihu_client.get_article_info(article_id)
                 
                 # Sleep after fetching article details
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[ZhihuCrawler.get_note_detail] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after fetching article details {article_id}")
+                await self.zhihu_client.concurrency.pace()
+                utils.logger.info(f"[ZhihuCrawler.get_note_detail] Sleeping for {self.zhihu_client.concurrency.delay} seconds after fetching article details {article_id}")
                 
                 return result
 
@@ -342,8 +342,8 @@ class ZhihuCrawler(AbstractCrawler):
                 result = await self.zhihu_client.get_video_info(video_id)
                 
                 # Sleep after fetching video details
-                await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
-                utils.logger.info(f"[ZhihuCrawler.get_note_detail] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after fetching video details {video_id}")
+                await self.zhihu_client.concurrency.pace()
+                utils.logger.info(f"[ZhihuCrawler.get_note_detail] Sleeping for {self.zhihu_client.concurrency.delay} seconds after fetching video details {video_id}")
                 
                 return result
 
@@ -359,7 +359,7 @@ class ZhihuCrawler(AbstractCrawler):
             full_note_url = full_note_url.split("?")[0]
             crawler_task = self.get_note_detail(
                 full_note_url=full_note_url,
-                semaphore=asyncio.Semaphore(config.MAX_CONCURRENCY_NUM),
+                semaphore=self.zhihu_client.concurrency,
             )
             get_note_detail_task_list.append(crawler_task)
 
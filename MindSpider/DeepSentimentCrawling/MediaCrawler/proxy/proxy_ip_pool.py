@@ -12,8 +12,12 @@
 # @Author  : relakkes@gmail.com
 # @Time    : 2023/12/2 13:45
 # @Desc    : ip代理池实现
+import asyncio
 import random
-from typing import Dict, List
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
 
 import httpx
 from tenacity import retry, stop_after_attempt, wait_fixed
@@ -24,15 +28,61 @@ from proxy.providers import (
     new_wandou_http_proxy,
 )
 from tools import utils
+from tools.http_client_pool import get_http_client_pool
 
 from .base_proxy import ProxyProvider
 from .types import IpInfoModel, ProviderNameEnum
 
+# 没有延迟样本时使用的默认延迟（秒）
+_DEFAULT_LATENCY = 1.0
+# 延迟指数移动平均的权重
+_LATENCY_ALPHA = 0.3
+
+
+@dataclass
+class ProxyHealth:
+    """代理的健康状况，由验证结果和实际请求结果共同更新"""
+
+    latency: Optional[float] = None  # 延迟的指数移动平均（秒）
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+
+    def record(self, ok: bool, latency: Optional[float] = None) -> None:
+        if ok:
+            self.successes += 1
+            self.consecutive_failures = 0
+            if latency is not None:
+                self.latency = latency if self.latency is None else (
+                    _LATENCY_ALPHA * latency + (1 - _LATENCY_ALPHA) * self.latency
+                )
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+
+    @property
+    def score(self) -> float:
+        """期望代价：平均延迟 / 成功率（拉普拉斯平滑），越小越好"""
+        success_rate = (self.successes + 1) / (self.successes + self.failures + 2)
+        return (self.latency if self.latency is not None else _DEFAULT_LATENCY) / success_rate
+
+
+def _proxy_key(proxy: Union[IpInfoModel, str]) -> str:
+    """代理的唯一标识 ip:port，兼容 IpInfoModel 和 httpx 代理地址"""
+    if isinstance(proxy, IpInfoModel):
+        return f"{proxy.ip}:{proxy.port}"
+    url = httpx.URL(proxy)
+    return f"{url.host}:{url.port}"
+
 
 class ProxyIpPool:
 
     def __init__(
-        self, ip_pool_count: int, enable_validate_ip: bool, ip_provider: ProxyProvider
+        self,
+        ip_pool_count: int,
+        enable_validate_ip: bool,
+        ip_provider: ProxyProvider,
+        valid_ip_url: str = "https://echo.apifox.cn/",
     ) -> None:
         """
 
@@ -40,74 +90,142 @@ class ProxyIpPool:
             ip_pool_count:
             enable_validate_ip:
             ip_provider:
+            valid_ip_url: 验证 IP 是否有效的地址
         """
-        self.valid_ip_url = "https://echo.apifox.cn/"  # 验证 IP 是否有效的地址
+        self.valid_ip_url = valid_ip_url
         self.ip_pool_count = ip_pool_count
         self.enable_validate_ip = enable_validate_ip
         self.proxy_list: List[IpInfoModel] = []
         self.ip_provider: ProxyProvider = ip_provider
+        self.health: Dict[str, ProxyHealth] = {}
+        self._refill_task: Optional[asyncio.Task] = None
 
     async def load_proxies(self) -> None:
         """
-        加载IP代理
+        加载IP代理，开启验证时并发验证并只保留可用的代理
         Returns:
 
         """
-        self.proxy_list = await self.ip_provider.get_proxy(self.ip_pool_count)
+        proxies = await self.ip_provider.get_proxy(self.ip_pool_count)
+        known = {_proxy_key(proxy) for proxy in self.proxy_list}
+        proxies = [proxy for proxy in proxies if _proxy_key(proxy) not in known and not self._is_expired(proxy)]
+        if self.enable_validate_ip:
+            proxies = await self._validate_proxies(proxies)
+        for proxy in proxies:
+            self.health.setdefault(_proxy_key(proxy), ProxyHealth())
+        self.proxy_list.extend(proxies)
+
+    async def _validate_proxies(self, proxies: List[IpInfoModel]) -> List[IpInfoModel]:
+        """
+        并发验证一批代理IP，每个代理的验证受 IP_PROXY_VALIDATE_TIMEOUT 限制
+        :param proxies:
+        :return: 可用的代理
+        """
+        semaphore = asyncio.Semaphore(config.IP_PROXY_VALIDATE_CONCURRENCY)
+
+        async def _validate(proxy: IpInfoModel) -> bool:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(self._is_valid_proxy(proxy), config.IP_PROXY_VALIDATE_TIMEOUT)
+                except Exception as e:
+                    utils.logger.info(f"[ProxyIpPool._validate_proxies] {proxy.ip} invalid: {e!r}")
+                    return False
+
+        results = await asyncio.gather(*(_validate(proxy) for proxy in proxies))
+        valid = [proxy for proxy, ok in zip(proxies, results) if ok]
+        for proxy, ok in zip(proxies, results):
+            if not ok:
+                self.health.pop(_proxy_key(proxy), None)
+        utils.logger.info(f"[ProxyIpPool._validate_proxies] {len(valid)}/{len(proxies)} proxies valid")
+        return valid
 
     async def _is_valid_proxy(self, proxy: IpInfoModel) -> bool:
         """
-        验证代理IP是否有效
+        验证代理IP是否有效，并记录验证请求的延迟
         :param proxy:
         :return:
         """
         utils.logger.info(
             f"[ProxyIpPool._is_valid_proxy] testing {proxy.ip} is it valid "
         )
+        _, proxy_url = utils.format_proxy_info(proxy)
+        health = self.health.setdefault(_proxy_key(proxy), ProxyHealth())
+        started = time.monotonic()
         try:
-            # httpx 0.28.1 需要直接传入代理URL字符串，而不是字典
-            if proxy.user and proxy.password:
-                proxy_url = f"http://{proxy.user}:{proxy.password}@{proxy.ip}:{proxy.port}"
-            else:
-                proxy_url = f"http://{proxy.ip}:{proxy.port}"
-            
             async with httpx.AsyncClient(proxy=proxy_url) as client:
                 response = await client.get(self.valid_ip_url)
-            if response.status_code == 200:
-                return True
-            else:
-                return False
-        except Exception as e:
-            utils.logger.info(
-                f"[ProxyIpPool._is_valid_proxy] testing {proxy.ip} err: {e}"
-            )
-            raise e
+        except Exception:
+            health.record(False)
+            raise
+        ok = response.status_code == 200
+        health.record(ok, time.monotonic() - started)
+        return ok
+
+    def report_result(self, proxy: Union[IpInfoModel, str], ok: bool, latency: Optional[float] = None) -> None:
+        """
+        记录一次实际请求的结果，连续失败过多的代理移出代理池
+        :param proxy: 代理IP或 httpx 代理地址
+        :param ok: 请求是否成功（收到响应即视为成功，连接/超时错误视为失败）
+        :param latency: 请求耗时（秒）
+        :return:
+        """
+        key = _proxy_key(proxy)
+        health = self.health.get(key)
+        if health is None:
+            return
+        health.record(ok, latency)
+        if health.consecutive_failures >= config.IP_PROXY_MAX_CONSECUTIVE_FAILURES:
+            utils.logger.warning(f"[ProxyIpPool.report_result] {key} failed {health.consecutive_failures} times, removed")
+            self.proxy_list = [p for p in self.proxy_list if _proxy_key(p) != key]
+            del self.health[key]
+            self._schedule_refill()
 
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
     async def get_proxy(self) -> IpInfoModel:
         """
-        从代理池中随机提取一个代理IP
+        从代理池中提取一个代理IP：随机取两个，选期望代价更低的一个（power of two choices）
         :return:
         """
+        self.proxy_list = [proxy for proxy in self.proxy_list if not self._is_expired(proxy)]
         if len(self.proxy_list) == 0:
             await self._reload_proxies()
+        if len(self.proxy_list) == 0:
+            raise Exception("[ProxyIpPool.get_proxy] no valid proxy, again get it")
 
-        proxy = random.choice(self.proxy_list)
-        self.proxy_list.remove(proxy)  # 取出来一个IP就应该移出掉
-        if self.enable_validate_ip:
-            if not await self._is_valid_proxy(proxy):
-                raise Exception(
-                    "[ProxyIpPool.get_proxy] current ip invalid and again get it"
-                )
+        candidates = random.sample(self.proxy_list, min(2, len(self.proxy_list)))
+        proxy = min(candidates, key=lambda p: self.health[_proxy_key(p)].score)
+        if len(self.proxy_list) <= config.IP_PROXY_LOW_WATER_MARK:
+            self._schedule_refill()
         return proxy
 
     async def _reload_proxies(self):
         """
-        # 重新加载代理池
+        # 重新加载代理池，后台补充任务正在运行时等待其完成
         :return:
         """
-        self.proxy_list = []
-        await self.load_proxies()
+        if self._refill_task is not None and not self._refill_task.done():
+            await asyncio.shield(self._refill_task)
+        else:
+            await self.load_proxies()
+
+    def _schedule_refill(self) -> None:
+        """可用代理不足时在后台补充，避免代理池耗尽后再同步等待"""
+        if self._refill_task is not None and not self._refill_task.done():
+            return
+        try:
+            self._refill_task = asyncio.get_running_loop().create_task(self._refill())
+        except RuntimeError:
+            return
+
+    async def _refill(self) -> None:
+        try:
+            await self.load_proxies()
+        except Exception as e:
+            utils.logger.error(f"[ProxyIpPool._refill] refill proxies failed: {e}")
+
+    @staticmethod
+    def _is_expired(proxy: IpInfoModel) -> bool:
+        return bool(proxy.expired_time_ts) and proxy.expired_time_ts <= time.time()
 
 
 IpProxyProvider: Dict[str, ProxyProvider] = {
@@ -129,6 +247,18 @@ async def create_ip_pool(ip_pool_count: int, enable_validate_ip: bool) -> ProxyI
         ip_provider=IpProxyProvider.get(config.IP_PROXY_PROVIDER_NAME),
     )
     await pool.load_proxies()
+    # 复用连接池中经过代理的请求结果实时更新代理健康度；
+    # 回调只弱引用代理池，代理池被丢弃后自动从全局连接池注销，不会被一直保留
+    http_client_pool = get_http_client_pool()
+    report_result = weakref.WeakMethod(pool.report_result)
+
+    def listener(proxy: str, ok: bool, latency: float) -> None:
+        report = report_result()
+        if report is not None:
+            report(proxy, ok, latency)
+
+    http_client_pool.add_outcome_listener(listener)
+    weakref.finalize(pool, http_client_pool.remove_outcome_listener, listener)
     return pool
 
 
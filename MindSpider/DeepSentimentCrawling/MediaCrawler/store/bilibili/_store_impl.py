@@ -21,12 +21,11 @@ import pathlib
 from typing import Dict
 
 import aiofiles
-from sqlalchemy import select
-from sqlalchemy.orm import sessionmaker
 
 import config
 from base.base_crawler import AbstractStore
-from database.db_session import get_session
+from database.write_buffer import buffered_upsert
+from database.hotness import calculate_hotness_score
 from database.models import BilibiliVideoComment, BilibiliVideo, BilibiliUpInfo, BilibiliUpDynamic, BilibiliContactInfo
 from tools.async_file_writer import AsyncFileWriter
 from tools import utils, words
@@ -118,22 +117,9 @@ class BiliDbStoreImplement(AbstractStore):
         Args:
             content_item: content item dict
         """
-        video_id = content_item.get("video_id")
-        # 确保 video_id 为整数类型，匹配数据库 BigInteger 字段
-        if video_id is not None:
-            video_id = int(video_id) if not isinstance(video_id, int) else video_id
-        async with get_session() as session:
-            result = await session.execute(select(BilibiliVideo).where(BilibiliVideo.video_id == video_id))
-            video_detail = result.scalar_one_or_none()
-
-            if not video_detail:
-                content_item["add_ts"] = utils.get_current_timestamp()
-                new_content = BilibiliVideo(**content_item)
-                session.add(new_content)
-            else:
-                for key, value in content_item.items():
-                    setattr(video_detail, key, value)
-            await session.commit()
+        # video_id 在写入缓冲时按 BigInteger 字段转换为整数
+        content_item["hotness_score"] = calculate_hotness_score(BilibiliVideo.__tablename__, content_item)
+        await buffered_upsert(BilibiliVideo, ("video_id",), content_item, on_insert={"add_ts": utils.get_current_timestamp()})
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -141,22 +127,9 @@ class BiliDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-        # 确保 comment_id 为整数类型，匹配数据库 BigInteger 字段
-        if comment_id is not None:
-            comment_id = int(comment_id) if not isinstance(comment_id, int) else comment_id
-        async with get_session() as session:
-            result = await session.execute(select(BilibiliVideoComment).where(BilibiliVideoComment.comment_id == comment_id))
-            comment_detail = result.scalar_one_or_none()
-
-            if not comment_detail:
-                comment_item["add_ts"] = utils.get_current_timestamp()
-                new_comment = BilibiliVideoComment(**comment_item)
-                session.add(new_comment)
-            else:
-                for key, value in comment_item.items():
-                    setattr(comment_detail, key, value)
-            await session.commit()
+        await buffered_upsert(
+            BilibiliVideoComment, ("comment_id",), comment_item, on_insert={"add_ts": utils.get_current_timestamp()}
+        )
 
     async def store_creator(self, creator: Dict):
         """
@@ -164,22 +137,7 @@ class BiliDbStoreImplement(AbstractStore):
         Args:
             creator: creator item dict
         """
-        creator_id = creator.get("user_id")
-        # 确保 creator_id 为整数类型，匹配数据库 BigInteger 字段
-        if creator_id is not None:
-            creator_id = int(creator_id) if not isinstance(creator_id, int) else creator_id
-        async with get_session() as session:
-            result = await session.execute(select(BilibiliUpInfo).where(BilibiliUpInfo.user_id == creator_id))
-            creator_detail = result.scalar_one_or_none()
-
-            if not creator_detail:
-                creator["add_ts"] = utils.get_current_timestamp()
-                new_creator = BilibiliUpInfo(**creator)
-                session.add(new_creator)
-            else:
-                for key, value in creator.items():
-                    setattr(creator_detail, key, value)
-            await session.commit()
+        await buffered_upsert(BilibiliUpInfo, ("user_id",), creator, on_insert={"add_ts": utils.get_current_timestamp()})
 
     async def store_contact(self, contact_item: Dict):
         """
@@ -187,27 +145,9 @@ class BiliDbStoreImplement(AbstractStore):
         Args:
             contact_item: contact item dict
         """
-        up_id = contact_item.get("up_id")
-        fan_id = contact_item.get("fan_id")
-        # 确保 up_id 和 fan_id 为整数类型，匹配数据库 BigInteger 字段
-        if up_id is not None:
-            up_id = int(up_id) if not isinstance(up_id, int) else up_id
-        if fan_id is not None:
-            fan_id = int(fan_id) if not isinstance(fan_id, int) else fan_id
-        async with get_session() as session:
-            result = await session.execute(
-                select(BilibiliContactInfo).where(BilibiliContactInfo.up_id == up_id, BilibiliContactInfo.fan_id == fan_id)
-            )
-            contact_detail = result.scalar_one_or_none()
-
-            if not contact_detail:
-                contact_item["add_ts"] = utils.get_current_timestamp()
-                new_contact = BilibiliContactInfo(**contact_item)
-                session.add(new_contact)
-            else:
-                for key, value in contact_item.items():
-                    setattr(contact_detail, key, value)
-            await session.commit()
+        await buffered_upsert(
+            BilibiliContactInfo, ("up_id", "fan_id"), contact_item, on_insert={"add_ts": utils.get_current_timestamp()}
+        )
 
     async def store_dynamic(self, dynamic_item):
         """
@@ -215,19 +155,9 @@ class BiliDbStoreImplement(AbstractStore):
         Args:
             dynamic_item: dynamic item dict
         """
-        dynamic_id = dynamic_item.get("dynamic_id")
-        async with get_session() as session:
-            result = await session.execute(select(BilibiliUpDynamic).where(BilibiliUpDynamic.dynamic_id == dynamic_id))
-            dynamic_detail = result.scalar_one_or_none()
-
-            if not dynamic_detail:
-                dynamic_item["add_ts"] = utils.get_current_timestamp()
-                new_dynamic = BilibiliUpDynamic(**dynamic_item)
-                session.add(new_dynamic)
-            else:
-                for key, value in dynamic_item.items():
-                    setattr(dynamic_detail, key, value)
-            await session.commit()
+        await buffered_upsert(
+            BilibiliUpDynamic, ("dynamic_id",), dynamic_item, on_insert={"add_ts": utils.get_current_timestamp()}
+        )
 
 
 class BiliJsonStoreImplement(AbstractStore):
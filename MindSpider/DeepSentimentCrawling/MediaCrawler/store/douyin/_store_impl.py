@@ -19,11 +19,11 @@ import os
 import pathlib
 from typing import Dict
 
-from sqlalchemy import select
 
 import config
 from base.base_crawler import AbstractStore
-from database.db_session import get_session
+from database.write_buffer import buffered_upsert
+from database.hotness import calculate_hotness_score
 from database.models import DouyinAweme, DouyinAwemeComment, DyCreator
 from tools import utils, words
 from tools.async_file_writer import AsyncFileWriter
@@ -87,20 +87,12 @@ class DouyinDbStoreImplement(AbstractStore):
         Args:
             content_item: content item dict
         """
-        aweme_id = content_item.get("aweme_id")
-        async with get_session() as session:
-            result = await session.execute(select(DouyinAweme).where(DouyinAweme.aweme_id == aweme_id))
-            aweme_detail = result.scalar_one_or_none()
-
-            if not aweme_detail:
-                content_item["add_ts"] = utils.get_current_timestamp()
-                if content_item.get("title"):
-                    new_content = DouyinAweme(**content_item)
-                    session.add(new_content)
-            else:
-                for key, value in content_item.items():
-                    setattr(aweme_detail, key, value)
-            await session.commit()
+        content_item["hotness_score"] = calculate_hotness_score(DouyinAweme.__tablename__, content_item)
+        # 没有标题的作品只更新已有记录，不新增
+        await buffered_upsert(
+            DouyinAweme, ("aweme_id",), content_item,
+            on_insert={"add_ts": utils.get_current_timestamp()}, insert=bool(content_item.get("title")),
+        )
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -108,19 +100,9 @@ class DouyinDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-        async with get_session() as session:
-            result = await session.execute(select(DouyinAwemeComment).where(DouyinAwemeComment.comment_id == comment_id))
-            comment_detail = result.scalar_one_or_none()
-
-            if not comment_detail:
-                comment_item["add_ts"] = utils.get_current_timestamp()
-                new_comment = DouyinAwemeComment(**comment_item)
-                session.add(new_comment)
-            else:
-                for key, value in comment_item.items():
-                    setattr(comment_detail, key, value)
-            await session.commit()
+        await buffered_upsert(
+            DouyinAwemeComment, ("comment_id",), comment_item, on_insert={"add_ts": utils.get_current_timestamp()}
+        )
 
     async def store_creator(self, creator: Dict):
         """
@@ -128,19 +110,7 @@ class DouyinDbStoreImplement(AbstractStore):
         Args:
             creator: creator dict
         """
-        user_id = creator.get("user_id")
-        async with get_session() as session:
-            result = await session.execute(select(DyCreator).where(DyCreator.user_id == user_id))
-            user_detail = result.scalar_one_or_none()
-
-            if not user_detail:
-                creator["add_ts"] = utils.get_current_timestamp()
-                new_creator = DyCreator(**creator)
-                session.add(new_creator)
-            else:
-                for key, value in creator.items():
-                    setattr(user_detail, key, value)
-            await session.commit()
+        await buffered_upsert(DyCreator, ("user_id",), creator, on_insert={"add_ts": utils.get_current_timestamp()})
 
 
 class DouyinJsonStoreImplement(AbstractStore):
@@ -22,11 +22,11 @@ from typing import Dict
 from tools.async_file_writer import AsyncFileWriter
 
 import aiofiles
-from sqlalchemy import select
 
 import config
 from base.base_crawler import AbstractStore
-from database.db_session import get_session
+from database.write_buffer import buffered_upsert
+from database.hotness import calculate_hotness_score
 from database.models import KuaishouVideo, KuaishouVideoComment
 from tools import utils, words
 from var import crawler_type_var
@@ -88,19 +88,8 @@ class KuaishouDbStoreImplement(AbstractStore):
         Args:
             content_item: content item dict
         """
-        video_id = content_item.get("video_id")
-        async with get_session() as session:
-            result = await session.execute(select(KuaishouVideo).where(KuaishouVideo.video_id == video_id))
-            video_detail = result.scalar_one_or_none()
-
-            if not video_detail:
-                content_item["add_ts"] = utils.get_current_timestamp()
-                new_content = KuaishouVideo(**content_item)
-                session.add(new_content)
-            else:
-                for key, value in content_item.items():
-                    setattr(video_detail, key, value)
-            await session.commit()
+        content_item["hotness_score"] = calculate_hotness_score(KuaishouVideo.__tablename__, content_item)
+        await buffered_upsert(KuaishouVideo, ("video_id",), content_item, on_insert={"add_ts": utils.get_current_timestamp()})
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -108,20 +97,9 @@ class KuaishouDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-        async with get_session() as session:
-            result = await session.execute(
-                select(KuaishouVideoComment).where(KuaishouVideoComment.comment_id == comment_id))
-            comment_detail = result.scalar_one_or_none()
-
-            if not comment_detail:
-                comment_item["add_ts"] = utils.get_current_timestamp()
-                new_comment = KuaishouVideoComment(**comment_item)
-                session.add(new_comment)
-            else:
-                for key, value in comment_item.items():
-                    setattr(comment_detail, key, value)
-            await session.commit()
+        await buffered_upsert(
+            KuaishouVideoComment, ("comment_id",), comment_item, on_insert={"add_ts": utils.get_current_timestamp()}
+        )
 
 
 class KuaishouJsonStoreImplement(AbstractStore):
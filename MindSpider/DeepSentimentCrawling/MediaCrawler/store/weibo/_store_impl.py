@@ -21,15 +21,14 @@ import pathlib
 from typing import Dict
 
 import aiofiles
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 import config
 from base.base_crawler import AbstractStore
 from database.models import WeiboCreator, WeiboNote, WeiboNoteComment
 from tools import utils, words
 from tools.async_file_writer import AsyncFileWriter
-from database.db_session import get_session
+from database.write_buffer import buffered_upsert
+from database.hotness import calculate_hotness_score
 from var import crawler_type_var
 
 
@@ -111,24 +110,10 @@ class WeiboDbStoreImplement(AbstractStore):
         note_id = content_item.get("note_id")
         # 将note_id转换为整数（数据库字段类型是BigInteger）
         if isinstance(note_id, str):
-            note_id = int(note_id)
-            content_item["note_id"] = note_id
-
-        async with get_session() as session:
-            stmt = select(WeiboNote).where(WeiboNote.note_id == note_id)
-            res = await session.execute(stmt)
-            db_note = res.scalar_one_or_none()
-            if db_note:
-                db_note.last_modify_ts = utils.get_current_timestamp()
-                for key, value in content_item.items():
-                    if hasattr(db_note, key):
-                        setattr(db_note, key, value)
-            else:
-                content_item["add_ts"] = utils.get_current_timestamp()
-                content_item["last_modify_ts"] = utils.get_current_timestamp()
-                db_note = WeiboNote(**content_item)
-                session.add(db_note)
-            await session.commit()
+            content_item["note_id"] = int(note_id)
+        content_item["hotness_score"] = calculate_hotness_score(WeiboNote.__tablename__, content_item)
+        content_item["last_modify_ts"] = utils.get_current_timestamp()
+        await buffered_upsert(WeiboNote, ("note_id",), content_item, on_insert={"add_ts": utils.get_current_timestamp()})
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -139,33 +124,14 @@ class WeiboDbStoreImplement(AbstractStore):
         Returns:
 
         """
-        comment_id = comment_item.get("comment_id")
         # 将ID字段转换为整数（数据库字段类型是BigInteger）
-        if isinstance(comment_id, str):
-            comment_id = int(comment_id)
-            comment_item["comment_id"] = comment_id
-
-        note_id = comment_item.get("note_id")
-        if isinstance(note_id, str):
-            comment_item["note_id"] = int(note_id)
-
-        async with get_session() as session:
-            stmt = select(WeiboNoteComment).where(
-                WeiboNoteComment.comment_id == comment_id
-            )
-            res = await session.execute(stmt)
-            db_comment = res.scalar_one_or_none()
-            if db_comment:
-                db_comment.last_modify_ts = utils.get_current_timestamp()
-                for key, value in comment_item.items():
-                    if hasattr(db_comment, key):
-                        setattr(db_comment, key, value)
-            else:
-                comment_item["add_ts"] = utils.get_current_timestamp()
-                comment_item["last_modify_ts"] = utils.get_current_timestamp()
-                db_comment = WeiboNoteComment(**comment_item)
-                session.add(db_comment)
-            await session.commit()
+        for id_field in ("comment_id", "note_id"):
+            if isinstance(comment_item.get(id_field), str):
+                comment_item[id_field] = int(comment_item[id_field])
+        comment_item["last_modify_ts"] = utils.get_current_timestamp()
+        await buffered_upsert(
+            WeiboNoteComment, ("comment_id",), comment_item, on_insert={"add_ts": utils.get_current_timestamp()}
+        )
 
     async def store_creator(self, creator: Dict):
         """
@@ -176,22 +142,8 @@ class WeiboDbStoreImplement(AbstractStore):
         Returns:
 
         """
-        user_id = creator.get("user_id")
-        async with get_session() as session:
-            stmt = select(WeiboCreator).where(WeiboCreator.user_id == user_id)
-            res = await session.execute(stmt)
-            db_creator = res.scalar_one_or_none()
-            if db_creator:
-                db_creator.last_modify_ts = utils.get_current_timestamp()
-                for key, value in creator.items():
-                    if hasattr(db_creator, key):
-                        setattr(db_creator, key, value)
-            else:
-                creator["add_ts"] = utils.get_current_timestamp()
-                creator["last_modify_ts"] = utils.get_current_timestamp()
-                db_creator = WeiboCreator(**creator)
-                session.add(db_creator)
-            await session.commit()
+        creator["last_modify_ts"] = utils.get_current_timestamp()
+        await buffered_upsert(WeiboCreator, ("user_id",), creator, on_insert={"add_ts": utils.get_current_timestamp()})
 
 
 class WeiboJsonStoreImplement(AbstractStore):
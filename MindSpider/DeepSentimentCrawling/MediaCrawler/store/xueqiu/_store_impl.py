@@ -5,9 +5,8 @@ from typing import Dict
 
 import config
 from base.base_crawler import AbstractStore
-from database.db_session import get_session
+from database.write_buffer import buffered_upsert
 from database.models import XueqiuStatus, XueqiuComment, XueqiuCreator
-from sqlalchemy import select
 from tools import utils
 from tools.async_file_writer import AsyncFileWriter
 from var import crawler_type_var
@@ -53,67 +52,22 @@ class XueQiuJsonStoreImplement(AbstractStore):
 
 class XueQiuDbStoreImplement(AbstractStore):
     async def store_content(self, content_item: Dict):
-        status_id = content_item.get("status_id")
-        if not status_id:
+        if not content_item.get("status_id"):
             return
-
-        async with get_session() as session:
-            stmt = select(XueqiuStatus).where(XueqiuStatus.status_id == status_id)
-            res = await session.execute(stmt)
-            db_status = res.scalar_one_or_none()
-            if db_status:
-                db_status.last_modify_ts = utils.get_current_timestamp()
-                for key, value in content_item.items():
-                    if hasattr(db_status, key):
-                        setattr(db_status, key, value)
-            else:
-                content_item["add_ts"] = utils.get_current_timestamp()
-                content_item["last_modify_ts"] = utils.get_current_timestamp()
-                db_status = XueqiuStatus(**content_item)
-                session.add(db_status)
-            await session.commit()
+        content_item["last_modify_ts"] = utils.get_current_timestamp()
+        await buffered_upsert(XueqiuStatus, ("status_id",), content_item, on_insert={"add_ts": utils.get_current_timestamp()})
 
     async def store_comment(self, comment_item: Dict):
-        comment_id = comment_item.get("comment_id")
-        if not comment_id:
+        if not comment_item.get("comment_id"):
             return
-
-        async with get_session() as session:
-            stmt = select(XueqiuComment).where(XueqiuComment.comment_id == comment_id)
-            res = await session.execute(stmt)
-            db_comment = res.scalar_one_or_none()
-            if db_comment:
-                db_comment.last_modify_ts = utils.get_current_timestamp()
-                for key, value in comment_item.items():
-                    if hasattr(db_comment, key):
-                        setattr(db_comment, key, value)
-            else:
-                comment_item["add_ts"] = utils.get_current_timestamp()
-                comment_item["last_modify_ts"] = utils.get_current_timestamp()
-                db_comment = XueqiuComment(**comment_item)
-                session.add(db_comment)
-            await session.commit()
+        comment_item["last_modify_ts"] = utils.get_current_timestamp()
+        await buffered_upsert(XueqiuComment, ("comment_id",), comment_item, on_insert={"add_ts": utils.get_current_timestamp()})
 
     async def store_creator(self, creator: Dict):
-        user_id = creator.get("user_id")
-        if not user_id:
+        if not creator.get("user_id"):
             return
-
-        async with get_session() as session:
-            stmt = select(XueqiuCreator).where(XueqiuCreator.user_id == user_id)
-            res = await session.execute(stmt)
-            db_creator = res.scalar_one_or_none()
-            if db_creator:
-                db_creator.last_modify_ts = utils.get_current_timestamp()
-                for key, value in creator.items():
-                    if hasattr(db_creator, key):
-                        setattr(db_creator, key, value)
-            else:
-                creator["add_ts"] = utils.get_current_timestamp()
-                creator["last_modify_ts"] = utils.get_current_timestamp()
-                db_creator = XueqiuCreator(**creator)
-                session.add(db_creator)
-            await session.commit()
+        creator["last_modify_ts"] = utils.get_current_timestamp()
+        await buffered_upsert(XueqiuCreator, ("user_id",), creator, on_insert={"add_ts": utils.get_current_timestamp()})
 
 
 class XueQiuSqliteStoreImplement(XueQiuDbStoreImplement):
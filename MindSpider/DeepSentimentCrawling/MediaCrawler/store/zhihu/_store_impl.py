@@ -21,12 +21,11 @@ import pathlib
 from typing import Dict
 
 import aiofiles
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 import config
 from base.base_crawler import AbstractStore
-from database.db_session import get_session
+from database.write_buffer import buffered_upsert
+from database.hotness import calculate_hotness_score
 from database.models import ZhihuContent, ZhihuComment, ZhihuCreator
 from tools import utils, words
 from var import crawler_type_var
@@ -104,8 +103,6 @@ class ZhihuDbStoreImplement(AbstractStore):
         Args:
             content_item: content item dict
         """
-        content_id = content_item.get("content_id")
-
         # 将时间戳字段转换为字符串（数据库字段类型是String）
         if "created_time" in content_item and isinstance(
             content_item["created_time"], int
@@ -115,18 +112,8 @@ class ZhihuDbStoreImplement(AbstractStore):
             content_item["updated_time"], int
         ):
             content_item["updated_time"] = str(content_item["updated_time"])
-
-        async with get_session() as session:
-            stmt = select(ZhihuContent).where(ZhihuContent.content_id == content_id)
-            result = await session.execute(stmt)
-            existing_content = result.scalars().first()
-            if existing_content:
-                for key, value in content_item.items():
-                    setattr(existing_content, key, value)
-            else:
-                new_content = ZhihuContent(**content_item)
-                session.add(new_content)
-            await session.commit()
+        content_item["hotness_score"] = calculate_hotness_score(ZhihuContent.__tablename__, content_item)
+        await buffered_upsert(ZhihuContent, ("content_id",), content_item)
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -134,25 +121,12 @@ class ZhihuDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-
         # 将时间戳字段转换为字符串（数据库字段类型是String）
         if "publish_time" in comment_item and isinstance(
             comment_item["publish_time"], int
         ):
             comment_item["publish_time"] = str(comment_item["publish_time"])
-
-        async with get_session() as session:
-            stmt = select(ZhihuComment).where(ZhihuComment.comment_id == comment_id)
-            result = await session.execute(stmt)
-            existing_comment = result.scalars().first()
-            if existing_comment:
-                for key, value in comment_item.items():
-                    setattr(existing_comment, key, value)
-            else:
-                new_comment = ZhihuComment(**comment_item)
-                session.add(new_comment)
-            await session.commit()
+        await buffered_upsert(ZhihuComment, ("comment_id",), comment_item)
 
     async def store_creator(self, creator: Dict):
         """
@@ -160,18 +134,7 @@ class ZhihuDbStoreImplement(AbstractStore):
         Args:
             creator: creator dict
         """
-        user_id = creator.get("user_id")
-        async with get_session() as session:
-            stmt = select(ZhihuCreator).where(ZhihuCreator.user_id == user_id)
-            result = await session.execute(stmt)
-            existing_creator = result.scalars().first()
-            if existing_creator:
-                for key, value in creator.items():
-                    setattr(existing_creator, key, value)
-            else:
-                new_creator = ZhihuCreator(**creator)
-                session.add(new_creator)
-            await session.commit()
+        await buffered_upsert(ZhihuCreator, ("user_id",), creator)
 
 
 class ZhihuJsonStoreImplement(AbstractStore):
@@ -0,0 +1,113 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 自适应并发控制（tools/adaptive_concurrency.py）测试，限流响应来自本地 HTTP 服务
+
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tools.adaptive_concurrency import AdaptiveConcurrencyController
+from tools.http_client_pool import HttpClientPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        status = 461 if self.path.startswith("/captcha") else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _controller(**kwargs) -> AdaptiveConcurrencyController:
+    options = dict(initial_limit=1, max_limit=4, initial_delay=2.0, min_delay=0.5, max_delay=30.0, adaptive=True)
+    options.update(kwargs)
+    return AdaptiveConcurrencyController("test", **options)
+
+
+class TestAdaptiveConcurrency(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    async def test_additive_increase_while_healthy(self):
+        controller = _controller()
+        for _ in range(20):
+            controller.record(200, 0.1)
+        self.assertEqual(int(controller.limit), 4)
+        self.assertLess(controller.delay, 2.0)
+
+        # 延迟明显升高时不再提速
+        delay = controller.delay
+        for _ in range(20):
+            controller.record(200, 1.0)
+        self.assertEqual(controller.delay, delay)
+
+    async def test_throttled_responses_cut_once_per_burst(self):
+        controller = _controller(initial_limit=4)
+        pool = HttpClientPool()
+        pool.add_response_listener(lambda platform, proxy, status, elapsed: controller.record(status, elapsed))
+        try:
+            async with pool.client("xhs") as client:
+                await asyncio.gather(*(client.get(f"{self.url}/captcha") for _ in range(3)))
+        finally:
+            await pool.close()
+        self.assertEqual(controller.metrics["throttled"], 3)
+        self.assertEqual(controller.metrics["decreases"], 1)
+        self.assertEqual(int(controller.limit), 2)
+        self.assertEqual(controller.delay, 4.0)
+
+    async def test_slots_follow_current_limit(self):
+        controller = _controller(initial_limit=2)
+        running = peak = 0
+
+        async def task():
+            nonlocal running, peak
+            async with controller:
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(task() for _ in range(6)))
+        self.assertEqual(peak, 2)
+
+        controller.limit = 3
+        peak = 0
+        await asyncio.gather(*(task() for _ in range(6)))
+        self.assertEqual(peak, 3)
+
+    async def test_fixed_mode_keeps_limit_and_delay(self):
+        controller = _controller(initial_limit=2, adaptive=False)
+        for status in (200, 200, 429, 500, None):
+            controller.record(status, 0.1)
+        self.assertEqual((int(controller.limit), controller.delay), (2, 2.0))
+        self.assertEqual(controller.metrics["requests"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : AsyncFileWriter 的 JSONL 追加写入、JSON 数组转换与 CSV 持久句柄测试
+
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from tools.async_file_writer import AsyncFileWriter
+
+
+class TestAsyncFileWriter(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+        self.writer = AsyncFileWriter(platform="test", crawler_type="search")
+
+    async def asyncTearDown(self):
+        await AsyncFileWriter.close_all()
+        os.chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    async def test_jsonl_converted_to_json_array_on_close(self):
+        json_path = self.writer._get_file_path('json', 'contents')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump([{"id": 0}], f)
+
+        # 不同的 writer 实例共享同一个文件句柄
+        await self.writer.write_single_item_to_json({"id": 1, "title": "标题"}, "contents")
+        await AsyncFileWriter("test", "search").write_single_item_to_json({"id": 2}, "contents")
+        jsonl_path = self.writer._get_jsonl_path('contents')
+        self.assertEqual([{"id": 0}, {"id": 1, "title": "标题"}, {"id": 2}], await self.writer._read_items('contents'))
+
+        # 模拟崩溃留下的半行
+        with open(jsonl_path, 'a', encoding='utf-8') as f:
+            f.write('{"id": 3')
+        await AsyncFileWriter.close_all()
+
+        self.assertFalse(os.path.exists(jsonl_path))
+        with open(json_path, encoding='utf-8') as f:
+            self.assertEqual([{"id": 0}, {"id": 1, "title": "标题"}, {"id": 2}], json.load(f))
+
+    async def test_csv_keeps_header_of_existing_file(self):
+        await self.writer.write_to_csv({"a": 1, "b": 2}, "comments")
+        await self.writer.write_to_csv({"b": 4, "a": 3, "c": 5}, "comments")
+        await AsyncFileWriter.close_all()
+        await self.writer.write_to_csv({"a": 6}, "comments")
+        await AsyncFileWriter.close_all()
+
+        with open(self.writer._get_file_path('csv', 'comments'), encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual([["a", "b"], ["1", "2"], ["3", "4"], ["6", ""]], rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -42,6 +42,58 @@ class TestExpiringLocalCache(unittest.TestCase):
         time.sleep(12)
         self.assertIsNone(self.cache.get('key'))
 
+    def test_keys_glob(self):
+        self.cache.set('kuaidaili_1.1.1.1', 'a', 10)
+        self.cache.set('kuaidaili_2.2.2.2', 'b', 10)
+        self.cache.set('wandouhttp_3.3.3.3', 'c', 10)
+        self.cache.set('kuaidaili_old', 'd', 1)
+        time.sleep(1.1)
+        self.assertEqual(self.cache.keys('kuaidaili_*'), ['kuaidaili_1.1.1.1', 'kuaidaili_2.2.2.2'])
+        self.assertEqual(self.cache.keys('*_3.3.3.?'), ['wandouhttp_3.3.3.3'])
+        self.assertEqual(len(self.cache.keys('*')), 3)
+
+    def test_lru_eviction_and_stats(self):
+        cache = ExpiringLocalCache(cron_interval=10, max_entries=2)
+        cache.set('a', 1, 10)
+        cache.set('b', 2, 10)
+        cache.get('a')  # a 最近被访问，b 成为最久未使用
+        cache.set('c', 3, 10)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions'], stats['entries']), (3, 1, 1, 2))
+
+    def test_expired_entries_evicted_before_lru(self):
+        cache = ExpiringLocalCache(cron_interval=10, max_entries=2)
+        cache.set('a', 1, 10)
+        cache.set('b', 2, 1)
+        time.sleep(1.1)
+        cache.set('c', 3, 10)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.stats()['evictions'], 0)
+        self.assertEqual(cache.stats()['expirations'], 1)
+
+    def test_overwrite_keeps_new_expiry(self):
+        self.cache.set('key', 'old', 1)
+        self.cache.set('key', 'new', 10)
+        time.sleep(1.1)
+        self.cache._clear()
+        self.assertEqual(self.cache.get('key'), 'new')
+
+    def test_prefix_index_nested_keys_and_pruning(self):
+        for key in ('ab', 'a', 'abc', 'b', 'a*'):
+            self.cache.set(key, key, 10)
+        self.assertEqual(self.cache.keys('a*'), ['a', 'a*', 'ab', 'abc'])
+        self.assertEqual(self.cache.keys('ab'), ['ab'])
+        self.assertEqual(self.cache.keys('a[*]'), ['a*'])
+        self.cache.delete('ab')
+        self.assertEqual(self.cache.keys('ab*'), ['abc'])
+        for key in ('a', 'abc', 'b', 'a*'):
+            self.cache.delete(key)
+        # 删除所有键后前缀树中不残留空节点
+        self.assertEqual(self.cache._prefix_index._root, {})
+
     def tearDown(self):
         del self.cache
 
@@ -0,0 +1,81 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : HTTP 客户端连接池（tools/http_client_pool.py）测试，使用本地 HTTP 服务
+
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tools.http_client_pool import HttpClientPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = str(self.client_address[1]).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "sid=1; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpClientPool(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    async def asyncSetUp(self):
+        self.pool = HttpClientPool()
+
+    async def asyncTearDown(self):
+        await self.pool.close()
+
+    async def test_connection_is_reused(self):
+        ports = set()
+        for _ in range(3):
+            async with self.pool.client("xhs") as client:
+                response = await client.get(self.url)
+                ports.add(response.text)
+                # 响应中的 Set-Cookie 不应被带到后续请求
+                self.assertEqual(len(client.cookies), 0)
+        self.assertEqual(len(ports), 1)
+
+    async def test_rotate_retires_client_after_in_flight_request(self):
+        async with self.pool.client("xhs", proxy=None) as old_client:
+            await self.pool.rotate("xhs", "http://127.0.0.1:1")
+            # 仍在使用的客户端不会被立即关闭
+            self.assertFalse(old_client.is_closed)
+            await old_client.get(self.url)
+        self.assertTrue(old_client.is_closed)
+
+        async with self.pool.client("dy") as other_client:
+            await other_client.get(self.url)
+        await self.pool.close("dy")
+        self.assertTrue(other_client.is_closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 代理池并发验证与健康度选择测试，本地 HTTP 服务同时充当代理和 echo 服务
+
+import asyncio
+import gc
+import socket
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+from unittest.mock import patch
+
+import config
+from proxy.base_proxy import ProxyProvider
+from proxy import proxy_ip_pool
+from proxy.proxy_ip_pool import ProxyIpPool, create_ip_pool
+from proxy.types import IpInfoModel
+from tools.http_client_pool import get_http_client_pool
+
+
+def _make_handler(delay: float):
+    class _EchoHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, format, *args):
+            pass
+
+    return _EchoHandler
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _proxy(port: int) -> IpInfoModel:
+    return IpInfoModel(ip="127.0.0.1", port=port, user="", password="", expired_time_ts=None)
+
+
+class _StaticProvider(ProxyProvider):
+    def __init__(self, batches: List[List[IpInfoModel]]):
+        self.batches = batches
+        self.calls = 0
+
+    async def get_proxy(self, num: int) -> List[IpInfoModel]:
+        batch = self.batches[min(self.calls, len(self.batches) - 1)]
+        self.calls += 1
+        return list(batch)
+
+
+class TestProxyHealth(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.servers = {}
+        for name, delay in (("fast", 0), ("slow", 0.3), ("hang", 3)):
+            server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(delay))
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            cls.servers[name] = server
+        cls.ports = {name: server.server_address[1] for name, server in cls.servers.items()}
+        cls.ports["dead"] = _free_port()
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in cls.servers.values():
+            server.shutdown()
+            server.server_close()
+
+    def setUp(self):
+        self.timeout = config.IP_PROXY_VALIDATE_TIMEOUT
+        config.IP_PROXY_VALIDATE_TIMEOUT = 1.0
+
+    def tearDown(self):
+        config.IP_PROXY_VALIDATE_TIMEOUT = self.timeout
+
+    def make_pool(self, provider: ProxyProvider) -> ProxyIpPool:
+        return ProxyIpPool(ip_pool_count=4, enable_validate_ip=True, ip_provider=provider, valid_ip_url="http://echo.test/")
+
+    async def test_concurrent_validation_drops_bad_proxies(self):
+        provider = _StaticProvider([[_proxy(self.ports[name]) for name in ("fast", "slow", "hang", "dead")]])
+        pool = self.make_pool(provider)
+        started = time.monotonic()
+        await pool.load_proxies()
+        # 验证并发进行，总耗时约为单个超时而不是各代理耗时之和
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual({p.port for p in pool.proxy_list}, {self.ports["fast"], self.ports["slow"]})
+
+    async def test_selection_prefers_healthy_low_latency_proxy(self):
+        fast, slow = _proxy(self.ports["fast"]), _proxy(self.ports["slow"])
+        pool = self.make_pool(_StaticProvider([[fast, slow]]))
+        await pool.load_proxies()
+        for _ in range(5):
+            self.assertEqual((await pool.get_proxy()).port, fast.port)
+
+        for _ in range(config.IP_PROXY_MAX_CONSECUTIVE_FAILURES):
+            pool.report_result(f"http://127.0.0.1:{fast.port}", ok=False)
+        self.assertEqual([p.port for p in pool.proxy_list], [slow.port])
+        self.assertEqual((await pool.get_proxy()).port, slow.port)
+
+    async def test_background_refill_below_low_water_mark(self):
+        fast, slow = _proxy(self.ports["fast"]), _proxy(self.ports["slow"])
+        provider = _StaticProvider([[fast], [slow]])
+        pool = self.make_pool(provider)
+        await pool.load_proxies()
+        self.assertEqual((await pool.get_proxy()).port, fast.port)
+        await asyncio.wait_for(pool._refill_task, 5)
+        self.assertEqual(provider.calls, 2)
+        self.assertEqual({p.port for p in pool.proxy_list}, {fast.port, slow.port})
+
+    async def test_discarded_pool_unregisters_outcome_listener(self):
+        fast = _proxy(self.ports["fast"])
+        listeners = get_http_client_pool()._outcome_listeners
+        before = len(listeners)
+        with patch.dict(proxy_ip_pool.IpProxyProvider, {config.IP_PROXY_PROVIDER_NAME: _StaticProvider([[fast]])}):
+            pool = await create_ip_pool(1, enable_validate_ip=False)
+        self.assertEqual(len(listeners), before + 1)
+        # 连接池上报的请求结果仍会更新代理池的健康度
+        listeners[-1](f"http://127.0.0.1:{fast.port}", False, 0.1)
+        self.assertEqual(pool.health[f"127.0.0.1:{fast.port}"].consecutive_failures, 1)
+
+        # 代理池被丢弃后回调自动注销，不再被全局连接池持有
+        del pool
+        gc.collect()
+        self.assertEqual(len(listeners), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
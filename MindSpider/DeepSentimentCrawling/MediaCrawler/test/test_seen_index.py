@@ -0,0 +1,132 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 已抓取内容索引（database/seen_index.py）在 SQLite 上的行为测试
+
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database.models import Base, DouyinAweme, DouyinAwemeComment
+from database.seen_index import BloomFilter, CommentWatermark, SeenContentIndex
+from tools import utils
+
+HOUR_MS = 3600 * 1000
+
+
+class TestSeenContentIndex(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(self.tmp_dir.name, 'test.db')}")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[DouyinAweme.__table__, DouyinAwemeComment.__table__])
+            now = utils.get_current_timestamp()
+            await conn.execute(insert(DouyinAweme), [
+                {"aweme_id": 1, "last_modify_ts": now - HOUR_MS},
+                {"aweme_id": 2, "last_modify_ts": now - 48 * HOUR_MS},
+            ])
+            await conn.execute(insert(DouyinAwemeComment), [
+                {"comment_id": 10, "aweme_id": 1, "create_time": 1700000000},
+                {"comment_id": 11, "aweme_id": 1, "create_time": 1700000500},
+            ])
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def make_index(self) -> SeenContentIndex:
+        return SeenContentIndex(
+            "dy", DouyinAweme, "aweme_id", DouyinAwemeComment, "aweme_id",
+            engine=self.engine, index_dir=self.tmp_dir.name,
+        )
+
+    async def test_fresh_ids_skip_recent_and_keep_stale_or_unknown(self):
+        index = self.make_index()
+        await index.load()
+        # 1 近期抓取过；2 已过期；3 从未抓取
+        self.assertEqual(await index.fresh_ids(["1", "2", "3"]), {"1"})
+
+        index.mark("3")
+        self.assertEqual(await index.fresh_ids(["1", "2", "3"]), {"1", "3"})
+
+    async def test_index_file_round_trip(self):
+        index = self.make_index()
+        await index.load()
+        index.mark("4")
+        index.save()
+
+        reloaded = self.make_index()
+        await reloaded.load()
+        self.assertIn("4", reloaded._bloom)
+        self.assertIn("1", reloaded._bloom)
+        # 布隆过滤器命中但库中没有的 ID 仍需抓取
+        self.assertEqual(await reloaded.fresh_ids(["4"]), set())
+
+    async def test_comment_watermark(self):
+        index = self.make_index()
+        await index.load()
+        self.assertEqual(await index.comment_watermark("1"), 1700000500)
+        self.assertIsNone(await index.comment_watermark("2"))
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"id-{i}")
+        self.assertTrue(all(f"id-{i}" in bloom for i in range(1000)))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class TestCommentWatermark(unittest.TestCase):
+
+    def test_non_monotonic_pages_keep_paging(self):
+        # 按热度排序：第一页全是旧的热门评论，新评论在后面的页
+        pages = [
+            [{"create_time": 100}, {"create_time": 50}],
+            [{"create_time": 90}, {"create_time": 300}],
+            [{"create_time": 80}],
+        ]
+        watermark = CommentWatermark(since_ts=200, stale_pages=2)
+        collected = []
+        for page in pages:
+            collected.extend(watermark.filter(page))
+            if watermark.exhausted:
+                break
+        self.assertEqual(collected, [{"create_time": 300}])
+        self.assertFalse(watermark.exhausted)
+
+    def test_consecutive_stale_pages_stop(self):
+        watermark = CommentWatermark(since_ts=200, stale_pages=2)
+        self.assertEqual(watermark.filter([{"create_time": 100}]), [])
+        self.assertFalse(watermark.exhausted)
+        # 空页不计数
+        self.assertEqual(watermark.filter([]), [])
+        self.assertFalse(watermark.exhausted)
+        self.assertEqual(watermark.filter([{"create_time": 150}]), [])
+        self.assertTrue(watermark.exhausted)
+
+    def test_without_watermark_keeps_everything(self):
+        watermark = CommentWatermark(since_ts=None, stale_pages=1)
+        page = [{"create_time": 1}]
+        self.assertEqual(watermark.filter(page), page)
+        self.assertFalse(watermark.exhausted)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 数据库写后缓冲（database/write_buffer.py）在 SQLite 上的行为测试
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database.models import Base, BilibiliVideo, WeiboNoteComment
+from database.write_buffer import BulkUpsertBuffer
+
+
+class TestBulkUpsertBuffer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(self.tmp_dir.name, 'test.db')}")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[BilibiliVideo.__table__, WeiboNoteComment.__table__])
+        self.buffer = BulkUpsertBuffer(batch_size=3, flush_interval=0, engine=self.engine)
+
+    async def asyncTearDown(self):
+        await self.buffer.close()
+        await self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    async def fetch_all(self, stmt):
+        async with self.engine.connect() as conn:
+            return (await conn.execute(stmt)).all()
+
+    async def test_keyed_merge_without_unique_constraint(self):
+        # weibo_note_comment.comment_id 只有普通索引，走 IN 查询 + 批量 UPDATE/INSERT
+        await self.buffer.upsert(WeiboNoteComment, ("comment_id",), {"comment_id": "1", "content": "a"}, on_insert={"add_ts": 1})
+        await self.buffer.flush()
+
+        await self.buffer.upsert(WeiboNoteComment, ("comment_id",), {"comment_id": 1, "content": "a2"}, on_insert={"add_ts": 2})
+        await self.buffer.upsert(WeiboNoteComment, ("comment_id",), {"comment_id": 2, "content": "b"}, on_insert={"add_ts": 2})
+        await self.buffer.upsert(WeiboNoteComment, ("comment_id",), {"comment_id": 2, "content": "b2", "unknown": 1})
+        await self.buffer.upsert(WeiboNoteComment, ("comment_id",), {"comment_id": 3, "content": "c"}, insert=False)
+        await self.buffer.close()
+
+        rows = await self.fetch_all(
+            select(WeiboNoteComment.comment_id, WeiboNoteComment.content, WeiboNoteComment.add_ts)
+            .order_by(WeiboNoteComment.comment_id)
+        )
+        self.assertEqual([(1, "a2", 1), (2, "b2", 2)], [tuple(row) for row in rows])
+
+    async def test_native_upsert_with_unique_constraint(self):
+        # bilibili_video.video_id 有唯一约束，走 ON CONFLICT DO UPDATE，冲突时保留 add_ts
+        await self.buffer.upsert(BilibiliVideo, ("video_id",), {"video_id": 10, "title": "t1", "video_url": "v"}, on_insert={"add_ts": 1})
+        await self.buffer.flush()
+        await self.buffer.upsert(BilibiliVideo, ("video_id",), {"video_id": "10", "title": "t2", "video_url": "v"}, on_insert={"add_ts": 2})
+        await self.buffer.upsert(BilibiliVideo, ("video_id",), {"video_id": 11, "title": "u", "video_url": "v"}, on_insert={"add_ts": 2})
+        await self.buffer.flush()
+
+        rows = await self.fetch_all(select(BilibiliVideo.video_id, BilibiliVideo.title, BilibiliVideo.add_ts).order_by(BilibiliVideo.video_id))
+        self.assertEqual([(10, "t2", 1), (11, "u", 2)], [tuple(row) for row in rows])
+
+    async def test_flush_on_batch_size(self):
+        for comment_id in range(3):
+            await self.buffer.upsert(WeiboNoteComment, ("comment_id",), {"comment_id": comment_id})
+        self.assertEqual(0, self.buffer.pending_count)
+        count = await self.fetch_all(select(func.count()).select_from(WeiboNoteComment))
+        self.assertEqual(3, count[0][0])
+
+    async def test_upsert_not_blocked_by_write(self):
+        # 写库期间仍可加入数据；后一次刷新等前一次写完再写，同一业务键的新数据最后落库
+        write_started, release_write = asyncio.Event(), asyncio.Event()
+        original_write = self.buffer._write
+
+        async def slow_write(model, key_columns, rows):
+            if not write_started.is_set():
+                write_started.set()
+                await release_write.wait()
+            await original_write(model, key_columns, rows)
+
+        self.buffer._write = slow_write
+        await self.buffer.upsert(WeiboNoteComment, ("comment_id",), {"comment_id": 1, "content": "old"})
+        first_flush = asyncio.create_task(self.buffer.flush())
+        await write_started.wait()
+        try:
+            await asyncio.wait_for(
+                self.buffer.upsert(WeiboNoteComment, ("comment_id",), {"comment_id": 1, "content": "new"}), timeout=1
+            )
+            self.assertEqual(1, self.buffer.pending_count)
+            second_flush = asyncio.create_task(self.buffer.flush())
+            await asyncio.sleep(0.05)
+            self.assertFalse(second_flush.done())
+        finally:
+            # 断言失败时也放行写入，避免 asyncTearDown 中的 close() 一直等待
+            release_write.set()
+
+        await asyncio.gather(first_flush, second_flush)
+        rows = await self.fetch_all(select(WeiboNoteComment.comment_id, WeiboNoteComment.content))
+        self.assertEqual([(1, "new")], [tuple(row) for row in rows])
+
+if __name__ == '__main__':
+    unittest.main()
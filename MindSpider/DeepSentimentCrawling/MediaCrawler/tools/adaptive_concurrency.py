@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+自适应并发控制（AIMD）
+按 (平台, 代理) 维护并发上限和请求间隔：请求成功且延迟正常时加性提高并发、减小间隔，
+遇到连接错误、5xx 或 429/461 等限流/验证码状态码时乘性降低并发、加大间隔。
+控制器可直接替代 asyncio.Semaphore 使用（async with），delay 替代固定的 CRAWLER_MAX_SLEEP_SEC
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import config
+
+from . import utils
+
+# 延迟基线取请求延迟 EWMA 的最小值，EWMA 平滑系数
+LATENCY_EWMA_ALPHA = 0.2
+
+
+class AdaptiveConcurrencyController:
+    """单个 (平台, 代理) 的 AIMD 并发与间隔控制器"""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: Optional[int] = None,
+        max_limit: Optional[int] = None,
+        initial_delay: Optional[float] = None,
+        min_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        adaptive: Optional[bool] = None,
+    ):
+        """
+        :param name: 控制器名称，用于日志和指标
+        :param initial_limit: 初始并发上限，默认 MAX_CONCURRENCY_NUM
+        :param max_limit: 并发上限的最大值，默认 ADAPTIVE_MAX_CONCURRENCY
+        :param initial_delay: 初始请求间隔（秒），默认 CRAWLER_MAX_SLEEP_SEC
+        :param min_delay: 请求间隔下限，默认 ADAPTIVE_MIN_SLEEP_SEC
+        :param max_delay: 请求间隔上限，默认 ADAPTIVE_MAX_SLEEP_SEC
+        :param adaptive: 是否自适应调整，默认 ENABLE_ADAPTIVE_CONCURRENCY；关闭时等同固定信号量 + 固定间隔
+        """
+        self.name = name
+        self.max_limit = max(1, max_limit or config.ADAPTIVE_MAX_CONCURRENCY)
+        self.limit = float(min(self.max_limit, max(1, initial_limit or config.MAX_CONCURRENCY_NUM)))
+        self.min_delay = config.ADAPTIVE_MIN_SLEEP_SEC if min_delay is None else min_delay
+        self.max_delay = config.ADAPTIVE_MAX_SLEEP_SEC if max_delay is None else max_delay
+        self.delay = float(config.CRAWLER_MAX_SLEEP_SEC if initial_delay is None else initial_delay)
+        self.adaptive = config.ENABLE_ADAPTIVE_CONCURRENCY if adaptive is None else adaptive
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._successes_since_increase = 0
+        self._last_decrease = 0.0
+        self.latency_ewma: Optional[float] = None
+        self.latency_baseline: Optional[float] = None
+        self.metrics: Dict[str, int] = {"requests": 0, "successes": 0, "errors": 0, "throttled": 0, "increases": 0, "decreases": 0}
+
+    async def __aenter__(self) -> "AdaptiveConcurrencyController":
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif not waiter.cancelled():
+                    # 已被唤醒但被取消，把名额让给下一个等待者
+                    self._wake()
+                raise
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        available = int(self.limit) - self.in_flight
+        while available > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                available -= 1
+
+    async def pace(self) -> None:
+        """按当前间隔休眠，替代 asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)"""
+        await asyncio.sleep(self.delay)
+
+    def record(self, status_code: Optional[int], latency: float) -> None:
+        """
+        记录一次请求结果
+        :param status_code: HTTP 状态码，连接/超时等传输错误时为 None
+        :param latency: 请求耗时（秒）
+        """
+        self.metrics["requests"] += 1
+        if status_code is not None and status_code in config.ADAPTIVE_THROTTLE_STATUS_CODES:
+            self.metrics["throttled"] += 1
+            self._decrease(f"throttled with HTTP {status_code}")
+        elif status_code is None or status_code >= 500:
+            self.metrics["errors"] += 1
+            self._decrease("transport error" if status_code is None else f"HTTP {status_code}")
+        else:
+            self.metrics["successes"] += 1
+            self._on_success(latency)
+
+    def _on_success(self, latency: float) -> None:
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += LATENCY_EWMA_ALPHA * (latency - self.latency_ewma)
+        if self.latency_baseline is None or self.latency_ewma < self.latency_baseline:
+            self.latency_baseline = self.latency_ewma
+        if not self.adaptive or self.latency_ewma > self.latency_baseline * config.ADAPTIVE_LATENCY_TOLERANCE:
+            # 延迟明显升高说明对端开始排队，保持当前速率
+            self._successes_since_increase = 0
+            return
+
+        # 每完成约一轮并发（limit 个成功请求）加性增加一次
+        self._successes_since_increase += 1
+        if self._successes_since_increase < int(self.limit):
+            return
+        self._successes_since_increase = 0
+        if self.limit >= self.max_limit and self.delay <= self.min_delay:
+            return
+        self.limit = min(self.max_limit, self.limit + 1)
+        self.delay = max(self.min_delay, self.delay - config.ADAPTIVE_SLEEP_STEP_SEC)
+        self.metrics["increases"] += 1
+        self._wake()
+
+    def _decrease(self, reason: str) -> None:
+        self._successes_since_increase = 0
+        if not self.adaptive:
+            return
+        # 同一批并发请求的连续失败只降一次，冷却时间约为一个请求往返
+        now = time.monotonic()
+        if now - self._last_decrease < max(self.latency_ewma or 0.0, config.ADAPTIVE_DECREASE_COOLDOWN_SEC):
+            return
+        self._last_decrease = now
+        self.limit = max(1.0, self.limit * config.ADAPTIVE_DECREASE_FACTOR)
+        self.delay = min(self.max_delay, max(self.delay / config.ADAPTIVE_DECREASE_FACTOR, config.ADAPTIVE_SLEEP_STEP_SEC))
+        self.metrics["decreases"] += 1
+        utils.logger.warning(
+            f"[AdaptiveConcurrencyController] {self.name} {reason}, concurrency -> {int(self.limit)}, delay -> {self.delay:.2f}s"
+        )
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "concurrency": int(self.limit),
+            "delay": round(self.delay, 3),
+            "in_flight": self.in_flight,
+            "latency_ewma": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            **self.metrics,
+        }
+
+
+_controllers: Dict[Tuple[str, Optional[str]], AdaptiveConcurrencyController] = {}
+
+
+def get_concurrency_controller(platform: str, proxy: Optional[str] = None) -> AdaptiveConcurrencyController:
+    """
+    获取 (平台, 代理) 对应的控制器，不存在时创建
+    :param platform: 平台标识，与 HttpClientPool 的平台标识一致
+    :param proxy: httpx 代理地址
+    """
+    key = (platform, proxy)
+    controller = _controllers.get(key)
+    if controller is None:
+        name = platform if proxy is None else f"{platform}@{proxy.rsplit('@', 1)[-1]}"
+        controller = AdaptiveConcurrencyController(name)
+        _controllers[key] = controller
+    return controller
+
+
+def record_response(platform: str, proxy: Optional[str], status_code: Optional[int], latency: float) -> None:
+    """HttpClientPool 的响应回调：把请求结果记到对应控制器"""
+    get_concurrency_controller(platform, proxy).record(status_code, latency)
+
+
+def concurrency_stats() -> Dict[str, Dict[str, object]]:
+    """所有控制器的指标，键为控制器名称"""
+    return {controller.name: controller.stats() for controller in _controllers.values()}
+
+
+def log_concurrency_stats() -> None:
+    for name, stats in concurrency_stats().items():
+        utils.logger.info(f"[AdaptiveConcurrency] {name}: {stats}")
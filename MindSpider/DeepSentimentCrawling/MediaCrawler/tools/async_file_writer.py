@@ -1,17 +1,103 @@
 import asyncio
+import atexit
 import csv
 import json
 import os
 import pathlib
-from typing import Dict, List
-import aiofiles
+import time
+from typing import Dict, List, Optional, Set
 import config
 from tools.utils import utils
 from tools.words import AsyncWordCloudGenerator
 
+
+class _OpenFile:
+    """A persistent buffered handle shared by every AsyncFileWriter writing to the same path."""
+
+    def __init__(self, path: str, encoding: str, newline: Optional[str] = None):
+        self.path = path
+        self.handle = open(path, 'a', encoding=encoding, newline=newline)
+        self.last_flush = time.monotonic()
+        self.csv_writer: Optional[csv.DictWriter] = None
+
+    def maybe_flush(self):
+        if time.monotonic() - self.last_flush >= config.FILE_WRITER_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        self.handle.flush()
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        if not self.handle.closed:
+            self.handle.flush()
+            self.handle.close()
+
+
+# path -> open handle; store factories create a new writer per item, so handles must outlive writer instances
+_open_files: Dict[str, _OpenFile] = {}
+# JSONL files written by this process, converted to JSON arrays by close_all()
+_jsonl_paths: Set[str] = set()
+
+
+def _close_open_files():
+    for open_file in list(_open_files.values()):
+        try:
+            open_file.close()
+        except OSError as e:
+            utils.logger.error(f"[AsyncFileWriter] close {open_file.path} failed: {e}")
+    _open_files.clear()
+
+
+# Flush buffered rows even if the crawler exits without calling close_all()
+atexit.register(_close_open_files)
+
+
+def _read_jsonl(file_path: str) -> List[Dict]:
+    """Read a JSON Lines file, skipping a truncated trailing line left by a crash."""
+    items = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError:
+                utils.logger.warning(f"[AsyncFileWriter] skip invalid line {line_no} in {file_path}")
+    return items
+
+
+def _read_json_array(file_path: str) -> List[Dict]:
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        return []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError:
+            utils.logger.warning(f"[AsyncFileWriter] {file_path} is not valid JSON, ignored")
+            return []
+    return data if isinstance(data, list) else [data]
+
+
+def convert_jsonl_to_json(jsonl_path: str, json_path: str):
+    """
+    Merge a JSON Lines file into a JSON array file (appending to an existing array).
+    The array is written to a temp file and atomically renamed before the JSONL file is removed,
+    so a crash at any point leaves either the old or the new data in place.
+    """
+    items = _read_json_array(json_path) + _read_jsonl(jsonl_path)
+    tmp_path = f"{json_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(items, f, ensure_ascii=False, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, json_path)
+    os.remove(jsonl_path)
+
+
 class AsyncFileWriter:
     def __init__(self, platform: str, crawler_type: str):
-        self.lock = asyncio.Lock()
         self.platform = platform
         self.crawler_type = crawler_type
         self.wordcloud_generator = AsyncWordCloudGenerator() if config.ENABLE_GET_WORDCLOUD else None
@@ -22,35 +108,76 @@ class AsyncFileWriter:
         file_name = f"{self.crawler_type}_{item_type}_{utils.get_current_date()}.{file_type}"
         return f"{base_path}/{file_name}"
 
+    def _get_jsonl_path(self, item_type: str) -> str:
+        # JSONL files live next to the JSON array they are converted into
+        return f"{self._get_file_path('json', item_type)}l"
+
+    @staticmethod
+    def _get_open_file(file_path: str, encoding: str, newline: Optional[str] = None) -> _OpenFile:
+        open_file = _open_files.get(file_path)
+        if open_file is None or open_file.handle.closed:
+            # The date in the file name changed: rotate by closing handles of the same kind
+            suffix = os.path.splitext(file_path)[1]
+            prefix = file_path.rsplit('_', 1)[0]
+            for path in [p for p in _open_files if p.endswith(suffix) and p.rsplit('_', 1)[0] == prefix]:
+                _open_files.pop(path).close()
+            open_file = _OpenFile(file_path, encoding, newline)
+            _open_files[file_path] = open_file
+        return open_file
+
     async def write_to_csv(self, item: Dict, item_type: str):
         file_path = self._get_file_path('csv', item_type)
-        async with self.lock:
-            file_exists = os.path.exists(file_path)
-            async with aiofiles.open(file_path, 'a', newline='', encoding='utf-8-sig') as f:
-                writer = csv.DictWriter(f, fieldnames=item.keys())
-                if not file_exists or await f.tell() == 0:
-                    await writer.writeheader()
-                await writer.writerow(item)
+        open_file = self._get_open_file(file_path, encoding='utf-8-sig', newline='')
+        if open_file.csv_writer is None:
+            fieldnames = list(item.keys())
+            if open_file.handle.tell() > 0:
+                # Appending to a file from an earlier run: keep its header
+                with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+                    fieldnames = next(csv.reader(f), None) or fieldnames
+            open_file.csv_writer = csv.DictWriter(open_file.handle, fieldnames=fieldnames, extrasaction='ignore')
+            if open_file.handle.tell() == 0:
+                open_file.csv_writer.writeheader()
+        open_file.csv_writer.writerow(item)
+        open_file.maybe_flush()
 
     async def write_single_item_to_json(self, item: Dict, item_type: str):
-        file_path = self._get_file_path('json', item_type)
-        async with self.lock:
-            existing_data = []
-            if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                    try:
-                        content = await f.read()
-                        if content:
-                            existing_data = json.loads(content)
-                        if not isinstance(existing_data, list):
-                            existing_data = [existing_data]
-                    except json.JSONDecodeError:
-                        existing_data = []
-            
-            existing_data.append(item)
-
-            async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(existing_data, ensure_ascii=False, indent=4))
+        """Append one item to the JSON Lines file; converted to a JSON array by close_all()."""
+        jsonl_path = self._get_jsonl_path(item_type)
+        open_file = self._get_open_file(jsonl_path, encoding='utf-8')
+        _jsonl_paths.add(jsonl_path)
+        open_file.handle.write(json.dumps(item, ensure_ascii=False) + '\n')
+        open_file.maybe_flush()
+
+    @staticmethod
+    async def close_all():
+        """
+        Flush and close all open files, then convert JSONL files into JSON arrays
+        when SAVE_JSON_ARRAY_ON_CLOSE is enabled. Call once the crawler finishes.
+        """
+        _close_open_files()
+        jsonl_paths = sorted(_jsonl_paths)
+        _jsonl_paths.clear()
+        if not config.SAVE_JSON_ARRAY_ON_CLOSE:
+            return
+        for jsonl_path in jsonl_paths:
+            if not os.path.exists(jsonl_path):
+                continue
+            try:
+                await asyncio.to_thread(convert_jsonl_to_json, jsonl_path, jsonl_path[:-1])
+            except Exception as e:
+                utils.logger.error(f"[AsyncFileWriter.close_all] convert {jsonl_path} failed: {e}")
+
+    async def _read_items(self, item_type: str) -> List[Dict]:
+        """Read items written today, from the JSON array and any JSONL file not yet converted."""
+        json_path = self._get_file_path('json', item_type)
+        jsonl_path = self._get_jsonl_path(item_type)
+        items = _read_json_array(json_path)
+        if os.path.exists(jsonl_path):
+            open_file = _open_files.get(jsonl_path)
+            if open_file is not None:
+                open_file.flush()
+            items += _read_jsonl(jsonl_path)
+        return items
 
     async def generate_wordcloud_from_comments(self):
         """
@@ -64,22 +191,12 @@ class AsyncFileWriter:
             return
 
         try:
-            # Read comments from JSON file
-            comments_file_path = self._get_file_path('json', 'comments')
-            if not os.path.exists(comments_file_path) or os.path.getsize(comments_file_path) == 0:
-                utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] No comments file found at {comments_file_path}")
+            # Read comments from JSON / JSONL files
+            comments_data = await self._read_items('comments')
+            if not comments_data:
+                utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] No comments found for {self.platform}")
                 return
 
-            async with aiofiles.open(comments_file_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                if not content:
-                    utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Comments file is empty")
-                    return
-
-                comments_data = json.loads(content)
-                if not isinstance(comments_data, list):
-                    comments_data = [comments_data]
-
             # Filter comments data to only include 'content' field
             # Handle different comment data structures across platforms
             filtered_data = []
@@ -104,4 +221,4 @@ class AsyncFileWriter:
             utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Wordcloud generated successfully at {words_file_prefix}")
 
         except Exception as e:
-            utils.logger.error(f"[AsyncFileWriter.generate_wordcloud_from_comments] Error generating wordcloud: {e}")
\ No newline at end of file
+            utils.logger.error(f"[AsyncFileWriter.generate_wordcloud_from_comments] Error generating wordcloud: {e}")
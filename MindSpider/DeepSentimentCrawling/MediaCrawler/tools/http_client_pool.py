@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP 客户端连接池
+按 (平台, 代理, 客户端参数) 复用长连接的 httpx.AsyncClient，避免每次请求都重新建立 TCP/TLS 连接；
+代理轮换时淘汰旧代理的客户端，仍有请求在使用的客户端等请求结束后再关闭
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+import config
+
+from . import utils
+from .adaptive_concurrency import record_response
+
+PoolKey = Tuple[str, Optional[str], Tuple[Tuple[str, object], ...]]
+# (代理地址, 是否成功, 耗时秒数)
+OutcomeListener = Callable[[str, bool, float], None]
+# (平台, 代理地址, HTTP 状态码（传输错误时为 None）, 耗时秒数)
+ResponseListener = Callable[[str, Optional[str], Optional[int], float], None]
+
+_REQUEST_STARTED_KEY = "http_client_pool_started_at"
+
+
+class _PooledClient:
+    __slots__ = ("client", "in_use", "retired")
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.in_use = 0
+        self.retired = False
+
+
+class HttpClientPool:
+    """按平台和代理复用 httpx.AsyncClient 的连接池"""
+
+    def __init__(self) -> None:
+        self._clients: Dict[PoolKey, _PooledClient] = {}
+        # 每个平台当前使用的代理，代理变化时淘汰该平台的旧客户端
+        self._current_proxy: Dict[str, Optional[str]] = {}
+        self._http2_warned = False
+        self._outcome_listeners: List[OutcomeListener] = []
+        self._response_listeners: List[ResponseListener] = []
+
+    def add_outcome_listener(self, listener: OutcomeListener) -> None:
+        """
+        注册经过代理的请求结果回调（如代理池的健康度统计）
+        连接、超时等传输错误记为失败，收到响应（无论状态码）记为成功
+        """
+        self._outcome_listeners.append(listener)
+
+    def remove_outcome_listener(self, listener: OutcomeListener) -> None:
+        """注销请求结果回调，未注册时忽略"""
+        try:
+            self._outcome_listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def add_response_listener(self, listener: ResponseListener) -> None:
+        """
+        注册每个 HTTP 响应（含重定向的每一跳）的回调（如自适应并发控制），无论是否使用代理
+        传输错误时状态码为 None
+        """
+        self._response_listeners.append(listener)
+
+    @asynccontextmanager
+    async def client(self, platform: str, proxy: Optional[str] = None, **client_kwargs) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        获取复用的客户端，用法与 `async with httpx.AsyncClient(...) as client` 相同，但退出时不关闭连接
+        :param platform: 平台标识
+        :param proxy: httpx 代理地址
+        :param client_kwargs: 其他 AsyncClient 参数（如 follow_redirects），不同参数使用不同的客户端
+        """
+        if platform in self._current_proxy and self._current_proxy[platform] != proxy:
+            await self.rotate(platform, proxy)
+        self._current_proxy[platform] = proxy
+
+        key: PoolKey = (platform, proxy, tuple(sorted(client_kwargs.items())))
+        pooled = self._clients.get(key)
+        if pooled is None:
+            pooled = _PooledClient(self._create_client(platform, proxy, **client_kwargs))
+            self._clients[key] = pooled
+
+        pooled.in_use += 1
+        started = time.monotonic()
+        try:
+            yield pooled.client
+            self._notify(proxy, True, time.monotonic() - started)
+        except httpx.TransportError:
+            elapsed = time.monotonic() - started
+            self._notify(proxy, False, elapsed)
+            self._notify_response(platform, proxy, None, elapsed)
+            raise
+        finally:
+            pooled.in_use -= 1
+            if pooled.retired and pooled.in_use == 0:
+                await pooled.client.aclose()
+
+    async def rotate(self, platform: str, proxy: Optional[str]) -> None:
+        """
+        平台切换到新代理：淘汰使用其他代理的客户端
+        :param platform: 平台标识
+        :param proxy: 新的 httpx 代理地址
+        """
+        self._current_proxy[platform] = proxy
+        stale = [key for key in self._clients if key[0] == platform and key[1] != proxy]
+        await self._retire(stale)
+        if stale:
+            utils.logger.info(f"[HttpClientPool.rotate] {platform} switched proxy, {len(stale)} client(s) retired")
+
+    async def close(self, platform: Optional[str] = None) -> None:
+        """
+        关闭指定平台（为空时为全部平台）的客户端
+        :param platform: 平台标识
+        """
+        keys = [key for key in self._clients if platform is None or key[0] == platform]
+        await self._retire(keys)
+        if platform is None:
+            self._current_proxy.clear()
+        else:
+            self._current_proxy.pop(platform, None)
+
+    def _notify(self, proxy: Optional[str], ok: bool, elapsed: float) -> None:
+        if proxy is None:
+            return
+        for listener in list(self._outcome_listeners):
+            try:
+                listener(proxy, ok, elapsed)
+            except Exception as e:
+                utils.logger.error(f"[HttpClientPool._notify] outcome listener failed: {e}")
+
+    def _notify_response(self, platform: str, proxy: Optional[str], status_code: Optional[int], elapsed: float) -> None:
+        for listener in self._response_listeners:
+            try:
+                listener(platform, proxy, status_code, elapsed)
+            except Exception as e:
+                utils.logger.error(f"[HttpClientPool._notify_response] response listener failed: {e}")
+
+    @staticmethod
+    async def _on_request(request: httpx.Request) -> None:
+        request.extensions[_REQUEST_STARTED_KEY] = time.monotonic()
+
+    async def _on_response(self, platform: str, proxy: Optional[str], response: httpx.Response) -> None:
+        started = response.request.extensions.get(_REQUEST_STARTED_KEY)
+        elapsed = time.monotonic() - started if started is not None else 0.0
+        self._notify_response(platform, proxy, response.status_code, elapsed)
+
+    async def _retire(self, keys: List[PoolKey]) -> None:
+        for key in keys:
+            pooled = self._clients.pop(key)
+            pooled.retired = True
+            if pooled.in_use == 0:
+                await pooled.client.aclose()
+
+    def _create_client(self, platform: str, proxy: Optional[str], **client_kwargs) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=config.HTTP_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.HTTP_POOL_KEEPALIVE_EXPIRY,
+        )
+        # 各平台请求都自带 Cookie 请求头，客户端复用后不能再把响应里的 Set-Cookie 带到后续请求
+        cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+        event_hooks = {"request": [self._on_request], "response": [partial(self._on_response, platform, proxy)]}
+        return httpx.AsyncClient(
+            proxy=proxy, limits=limits, http2=self._http2_enabled(), cookies=cookies, event_hooks=event_hooks, **client_kwargs
+        )
+
+    def _http2_enabled(self) -> bool:
+        if not config.HTTP_ENABLE_HTTP2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            if not self._http2_warned:
+                utils.logger.warning("[HttpClientPool] HTTP_ENABLE_HTTP2 需要安装 httpx[http2]，已回退为 HTTP/1.1")
+                self._http2_warned = True
+            return False
+        return True
+
+
+_http_client_pool = HttpClientPool()
+# 各平台的请求结果驱动对应 (平台, 代理) 的自适应并发控制器
+_http_client_pool.add_response_listener(record_response)
+
+
+def get_http_client_pool() -> HttpClientPool:
+    return _http_client_pool
+
+
+async def close_http_clients() -> None:
+    """关闭所有复用的 HTTP 客户端，在爬虫结束、事件循环关闭前调用"""
+    await _http_client_pool.close()
@@ -19,7 +19,11 @@ PLATFORM_NAME_MAP = {
 
 
 def setup_platform_logger(platform: str) -> int:
-    """为指定平台创建日志文件并返回 handler id"""
+    """
+    为指定平台创建日志文件并返回 handler id
+
+    只记录通过 logger.bind(platform=platform) 输出的日志，多个平台并行爬取时互不混入
+    """
     logs_dir = PROJECT_ROOT / "logs"
     logs_dir.mkdir(exist_ok=True)
 
@@ -34,10 +38,12 @@ def setup_platform_logger(platform: str) -> int:
         encoding="utf-8",
         level="INFO",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+        filter=lambda record: record["extra"].get("platform") == platform,
     )
 
-    logger.info("=" * 60)
-    logger.info(f"平台 {platform} ({platform_name}) 的日志已启用")
-    logger.info(f"日志文件: {log_file}")
-    logger.info("=" * 60)
+    platform_logger = logger.bind(platform=platform)
+    platform_logger.info("=" * 60)
+    platform_logger.info(f"平台 {platform} ({platform_name}) 的日志已启用")
+    platform_logger.info(f"日志文件: {log_file}")
+    platform_logger.info("=" * 60)
     return handler_id
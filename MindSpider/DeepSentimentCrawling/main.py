@@ -9,7 +9,7 @@ import sys
 import argparse
 from datetime import date, datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 from loguru import logger
 
 # 添加项目根目录到路径
@@ -37,6 +37,7 @@ class DeepSentimentCrawling:
         max_keywords_per_platform: int = 50,
         max_notes_per_platform: int = 50,
         login_type: str = "qrcode",
+        max_workers: Optional[int] = None,
     ) -> Dict:
         """
         执行每日爬取任务
@@ -47,6 +48,7 @@ class DeepSentimentCrawling:
             max_keywords_per_platform: 每个平台最大关键词数量
             max_notes_per_platform: 每个平台最大爬取内容数量
             login_type: 登录方式
+            max_workers: 同时运行的平台数，默认使用配置 CRAWL_MAX_PARALLEL_PLATFORMS
 
         Returns:
             爬取结果统计
@@ -87,7 +89,7 @@ class DeepSentimentCrawling:
         # 3. 执行全平台关键词爬取
         print(f"\n🔄 开始全平台关键词爬取...")
         crawl_results = self.platform_crawler.run_multi_platform_crawl_by_keywords(
-            keywords, platforms, login_type, max_notes_per_platform
+            keywords, platforms, login_type, max_notes_per_platform, max_workers
         )
 
         # 4. 生成最终报告
@@ -247,6 +249,13 @@ def main():
         help="登录方式 (默认: qrcode)",
     )
 
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="多平台爬取时同时运行的平台数 (默认: 配置 CRAWL_MAX_PARALLEL_PLATFORMS)",
+    )
+
     # 功能参数
     parser.add_argument("--list-topics", action="store_true", help="列出最近的话题数据")
     parser.add_argument(
@@ -312,7 +321,12 @@ def main():
         platforms = args.platforms if args.platforms else None
         logger.info(f"开始多平台爬取: {platforms}")
         result = crawler.run_daily_crawling(
-            target_date, platforms, args.max_keywords, args.max_notes, args.login_type
+            target_date,
+            platforms,
+            args.max_keywords,
+            args.max_notes,
+            args.login_type,
+            args.max_workers,
         )
 
         if result["success"]:
@@ -10,6 +10,8 @@ import re
 import sys
 import subprocess
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -37,6 +39,8 @@ class PlatformCrawler:
         self.mediacrawler_path = Path(__file__).parent / "MediaCrawler"
         self.supported_platforms = SUPPORTED_PLATFORMS
         self.crawl_stats = {}
+        # 多个平台并行爬取时，各工作线程实时更新 crawl_stats
+        self._stats_lock = threading.Lock()
 
         # 确保MediaCrawler目录存在
         if not self.mediacrawler_path.exists():
@@ -180,6 +184,65 @@ class PlatformCrawler:
             logger.exception(f"创建基础配置失败: {e}")
             return False
 
+    def build_crawl_command(
+        self,
+        platform: str,
+        keywords: List[str],
+        login_type: str = "qrcode",
+        max_notes: int = 50,
+        crawler_type: str = "search",
+    ) -> List[str]:
+        """
+        构建MediaCrawler命令行，本次运行的配置全部通过命令行参数传入，
+        不再改写共享的 config/base_config.py，因此多个平台可以同时运行
+
+        Args:
+            platform: 平台名称
+            keywords: 关键词列表
+            login_type: 登录方式
+            max_notes: 最大爬取数量
+            crawler_type: 爬取类型
+
+        Returns:
+            命令参数列表
+        """
+        # 判断数据库类型，确定 save_data_option
+        db_dialect = (config.settings.DB_DIALECT or "mysql").lower()
+        is_postgresql = db_dialect in ("postgresql", "postgres")
+        save_data_option = "postgresql" if is_postgresql else "db"
+
+        sanitized_keywords = [
+            kw.replace('"', "").replace("'", "").strip() for kw in keywords
+        ]
+
+        cmd = [
+            sys.executable,
+            "main.py",
+            "--platform",
+            platform,
+            "--lt",
+            login_type,
+            "--type",
+            crawler_type,
+            "--keywords",
+            ",".join(kw for kw in sanitized_keywords if kw),
+            "--save_data_option",
+            save_data_option,
+            "--get_comment",
+            "true",
+            "--max_notes",
+            str(max_notes),
+            "--max_comments",
+            "20",
+        ]
+
+        # HEADLESS 支持 .env 开关，未设置时使用MediaCrawler配置文件中的值
+        headless_env = os.getenv("MEDIACRAWLER_HEADLESS")
+        if headless_env is not None:
+            env_lower = headless_env.strip().lower()
+            cmd += ["--headless", "true" if env_lower in ("1", "true", "yes", "on") else "false"]
+        return cmd
+
     def run_crawler(
         self,
         platform: str,
@@ -188,7 +251,7 @@ class PlatformCrawler:
         max_notes: int = 50,
     ) -> Dict:
         """
-        运行爬虫
+        运行爬虫（可在多个线程中对不同平台并行调用）
 
         Args:
             platform: 平台名称
@@ -206,42 +269,38 @@ class PlatformCrawler:
             raise ValueError("关键词列表不能为空")
 
         handler_id = setup_platform_logger(platform)
+        platform_logger = logger.bind(platform=platform)
 
         start_message = f"\n开始爬取平台: {platform}"
         start_message += f"\n关键词: {keywords[:5]}{'...' if len(keywords) > 5 else ''} (共{len(keywords)}个)"
-        logger.info(start_message)
+        platform_logger.info(start_message)
 
         start_time = datetime.now()
+        crawl_stats = {
+            "platform": platform,
+            "keywords_count": len(keywords),
+            "status": "running",
+            "duration_seconds": 0,
+            "start_time": start_time.isoformat(),
+            "end_time": None,
+            "return_code": None,
+            "success": False,
+            "notes_count": 0,
+            "comments_count": 0,
+            "errors_count": 0,
+        }
+        with self._stats_lock:
+            self.crawl_stats[platform] = crawl_stats
 
         try:
             # 配置数据库
             if not self.configure_mediacrawler_db():
-                return {"success": False, "error": "数据库配置失败"}
-
-            # 创建基础配置
-            if not self.create_base_config(platform, keywords, "search", max_notes):
-                return {"success": False, "error": "基础配置创建失败"}
-
-            # 判断数据库类型，确定 save_data_option
-            db_dialect = (config.settings.DB_DIALECT or "mysql").lower()
-            is_postgresql = db_dialect in ("postgresql", "postgres")
-            save_data_option = "postgresql" if is_postgresql else "db"
+                return self._finish_stats(crawl_stats, start_time, error="数据库配置失败")
 
             # 构建命令
-            cmd = [
-                sys.executable,
-                "main.py",
-                "--platform",
-                platform,
-                "--lt",
-                login_type,
-                "--type",
-                "search",
-                "--save_data_option",
-                save_data_option,
-            ]
+            cmd = self.build_crawl_command(platform, keywords, login_type, max_notes)
 
-            logger.info(f"执行命令: {' '.join(cmd)}")
+            platform_logger.info(f"执行命令: {' '.join(cmd)}")
 
             # 使用 Popen 实时捕获输出
             # 注意：不指定 text=True 和 encoding，以二进制模式读取
@@ -251,6 +310,7 @@ class PlatformCrawler:
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 bufsize=1,  # 行缓冲
+                env={**os.environ, "PYTHONUNBUFFERED": "1"},
             )
 
             # 实时读取并记录输出，智能处理编码
@@ -269,47 +329,81 @@ class PlatformCrawler:
                     decoded_line = line.decode("utf-8", errors="replace").rstrip()
 
                 if decoded_line:  # 跳过空行
-                    logger.info(f"[MediaCrawler] {decoded_line}")
+                    platform_logger.info(f"[MediaCrawler:{platform}] {decoded_line}")
+                    self._update_live_stats(crawl_stats, decoded_line)
 
             # 等待进程结束
             return_code = process.wait(timeout=3600)
-
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-
-            # 创建统计信息
-            crawl_stats = {
-                "platform": platform,
-                "keywords_count": len(keywords),
-                "duration_seconds": duration,
-                "start_time": start_time.isoformat(),
-                "end_time": end_time.isoformat(),
-                "return_code": return_code,
-                "success": return_code == 0,
-                "notes_count": 0,
-                "comments_count": 0,
-                "errors_count": 0,
-            }
-
-            # 保存统计信息
-            self.crawl_stats[platform] = crawl_stats
+            self._finish_stats(crawl_stats, start_time, return_code=return_code)
 
             if return_code == 0:
-                logger.info(f"✅ {platform} 爬取完成，耗时: {duration:.1f}秒")
+                platform_logger.info(f"✅ {platform} 爬取完成，耗时: {crawl_stats['duration_seconds']:.1f}秒")
             else:
-                logger.error(f"❌ {platform} 爬取失败，返回码: {return_code}")
+                platform_logger.error(f"❌ {platform} 爬取失败，返回码: {return_code}")
 
             return crawl_stats
 
         except subprocess.TimeoutExpired:
-            logger.exception(f"❌ {platform} 爬取超时")
-            return {"success": False, "error": "爬取超时", "platform": platform}
+            platform_logger.exception(f"❌ {platform} 爬取超时")
+            return self._finish_stats(crawl_stats, start_time, error="爬取超时")
         except Exception as e:
-            logger.exception(f"❌ {platform} 爬取异常: {e}")
-            return {"success": False, "error": str(e), "platform": platform}
+            platform_logger.exception(f"❌ {platform} 爬取异常: {e}")
+            return self._finish_stats(crawl_stats, start_time, error=str(e))
         finally:
             logger.remove(handler_id)
 
+    # MediaCrawler 的日志格式（tools/utils.py）：<时间> MediaCrawler <级别> (<文件>:<行号>) - <消息>
+    _ERROR_LOG_PATTERN = re.compile(r" (?:ERROR|CRITICAL) \(\S+:\d+\) - ")
+    # 存储层每写入一条内容/评论记录一行：[store.<平台>.update_<...>] ...；batch_* 为批量入口，不计数
+    _STORE_LOG_PATTERN = re.compile(r"\[store\.\w+\.(update_\w+)\]")
+    # 存储层中记录创作者信息的 update_* 函数
+    _CREATOR_STORE_FUNCS = {"update_up_info"}
+
+    def _update_live_stats(self, crawl_stats: Dict, line: str):
+        """根据MediaCrawler的一行输出实时更新统计"""
+        is_error = self._ERROR_LOG_PATTERN.search(line) is not None or line.startswith("Traceback")
+        match = None if is_error else self._STORE_LOG_PATTERN.search(line)
+        with self._stats_lock:
+            if is_error:
+                crawl_stats["errors_count"] += 1
+            elif match:
+                func_name = match.group(1)
+                if "comment" in func_name:
+                    crawl_stats["comments_count"] += 1
+                elif func_name not in self._CREATOR_STORE_FUNCS:
+                    crawl_stats["notes_count"] += 1
+
+    def _finish_stats(
+        self,
+        crawl_stats: Dict,
+        start_time: datetime,
+        return_code: Optional[int] = None,
+        error: Optional[str] = None,
+    ) -> Dict:
+        """记录平台爬取结束时的统计"""
+        end_time = datetime.now()
+        with self._stats_lock:
+            crawl_stats["end_time"] = end_time.isoformat()
+            crawl_stats["duration_seconds"] = (end_time - start_time).total_seconds()
+            crawl_stats["return_code"] = return_code
+            crawl_stats["success"] = error is None and return_code == 0
+            crawl_stats["status"] = "success" if crawl_stats["success"] else "failed"
+            if error is None and return_code != 0:
+                error = f"MediaCrawler 返回码: {return_code}"
+            if error is not None:
+                crawl_stats["error"] = error
+        return crawl_stats
+
+    def get_live_stats(self) -> Dict:
+        """获取各平台爬取统计的快照（运行中的平台为实时数据）"""
+        now = datetime.now()
+        with self._stats_lock:
+            snapshot = {platform: dict(stats) for platform, stats in self.crawl_stats.items()}
+        for stats in snapshot.values():
+            if stats.get("status") == "running":
+                stats["duration_seconds"] = (now - datetime.fromisoformat(stats["start_time"])).total_seconds()
+        return snapshot
+
     def _parse_crawl_output(
         self, output_lines: List[str], error_lines: List[str]
     ) -> Dict:
@@ -358,23 +452,31 @@ class PlatformCrawler:
         platforms: List[str],
         login_type: str = "qrcode",
         max_notes_per_keyword: int = 50,
+        max_workers: Optional[int] = None,
     ) -> Dict:
         """
         基于关键词的多平台爬取 - 每个关键词在所有平台上都进行爬取
 
+        各平台在独立的MediaCrawler进程中并行运行，同时运行的平台数受 max_workers 限制
+
         Args:
             keywords: 关键词列表
             platforms: 平台列表
             login_type: 登录方式
             max_notes_per_keyword: 每个关键词在每个平台的最大爬取数量
+            max_workers: 同时运行的平台数，默认使用配置 CRAWL_MAX_PARALLEL_PLATFORMS
 
         Returns:
             总体爬取统计
         """
+        if max_workers is None:
+            max_workers = config.settings.CRAWL_MAX_PARALLEL_PLATFORMS
+        max_workers = max(1, min(max_workers, len(platforms) or 1))
 
         start_message = f"\n🚀 开始全平台关键词爬取"
         start_message += f"\n   关键词数量: {len(keywords)}"
         start_message += f"\n   平台数量: {len(platforms)}"
+        start_message += f"\n   并行平台数: {max_workers}"
         start_message += f"\n   登录方式: {login_type}"
         start_message += (
             f"\n   每个关键词在每个平台的最大爬取数量: {max_notes_per_keyword}"
@@ -403,74 +505,27 @@ class PlatformCrawler:
                 "total_comments": 0,
             }
 
-        # 对每个平台一次性爬取所有关键词
-        for platform in platforms:
-            logger.info(f"\n📝 在 {platform} 平台爬取所有关键词")
-            logger.info(
-                f"   关键词: {', '.join(keywords[:5])}{'...' if len(keywords) > 5 else ''}"
-            )
-
-            try:
-                # 一次性传递所有关键词给平台
-                result = self.run_crawler(
-                    platform, keywords, login_type, max_notes_per_keyword
+        # 每个平台一次性爬取所有关键词，多个平台并行
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="platform-crawl") as executor:
+            futures = {}
+            for platform in platforms:
+                logger.info(f"\n📝 在 {platform} 平台爬取所有关键词")
+                logger.info(
+                    f"   关键词: {', '.join(keywords[:5])}{'...' if len(keywords) > 5 else ''}"
                 )
+                futures[executor.submit(
+                    self.run_crawler, platform, keywords, login_type, max_notes_per_keyword
+                )] = platform
 
-                if result.get("success"):
-                    total_stats["successful_tasks"] += len(keywords)
-                    total_stats["platform_summary"][platform]["successful_keywords"] = (
-                        len(keywords)
-                    )
-
-                    notes_count = result.get("notes_count", 0)
-                    comments_count = result.get("comments_count", 0)
-
-                    total_stats["total_notes"] += notes_count
-                    total_stats["total_comments"] += comments_count
-                    total_stats["platform_summary"][platform][
-                        "total_notes"
-                    ] = notes_count
-                    total_stats["platform_summary"][platform][
-                        "total_comments"
-                    ] = comments_count
-
-                    # 为每个关键词记录结果
-                    for keyword in keywords:
-                        if keyword not in total_stats["keyword_results"]:
-                            total_stats["keyword_results"][keyword] = {}
-                        total_stats["keyword_results"][keyword][platform] = result
-
-                    logger.info(
-                        f"   ✅ 成功: {notes_count} 条内容, {comments_count} 条评论"
-                    )
-                else:
-                    total_stats["failed_tasks"] += len(keywords)
-                    total_stats["platform_summary"][platform]["failed_keywords"] = len(
-                        keywords
-                    )
-
-                    # 为每个关键词记录失败结果
-                    for keyword in keywords:
-                        if keyword not in total_stats["keyword_results"]:
-                            total_stats["keyword_results"][keyword] = {}
-                        total_stats["keyword_results"][keyword][platform] = result
-
-                    logger.error(f"   ❌ 失败: {result.get('error', '未知错误')}")
-
-            except Exception as e:
-                total_stats["failed_tasks"] += len(keywords)
-                total_stats["platform_summary"][platform]["failed_keywords"] = len(
-                    keywords
-                )
-                error_result = {"success": False, "error": str(e)}
-
-                # 为每个关键词记录异常结果
-                for keyword in keywords:
-                    if keyword not in total_stats["keyword_results"]:
-                        total_stats["keyword_results"][keyword] = {}
-                    total_stats["keyword_results"][keyword][platform] = error_result
-
-                logger.error(f"   ❌ 异常: {e}")
+            for finished, future in enumerate(as_completed(futures), 1):
+                platform = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"   ❌ {platform} 异常: {e}")
+                    result = {"success": False, "error": str(e), "platform": platform}
+                self._merge_platform_result(total_stats, platform, keywords, result)
+                self._log_live_progress(finished, len(platforms))
 
         # 打印详细统计
         finish_message = f"\n📊 全平台关键词爬取完成!"
@@ -493,12 +548,52 @@ class PlatformCrawler:
 
         return total_stats
 
+    @staticmethod
+    def _merge_platform_result(total_stats: Dict, platform: str, keywords: List[str], result: Dict):
+        """将单个平台的爬取结果合并到总体统计"""
+        platform_summary = total_stats["platform_summary"][platform]
+
+        # 为每个关键词记录结果
+        for keyword in keywords:
+            total_stats["keyword_results"].setdefault(keyword, {})[platform] = result
+
+        if result.get("success"):
+            notes_count = result.get("notes_count", 0)
+            comments_count = result.get("comments_count", 0)
+
+            total_stats["successful_tasks"] += len(keywords)
+            total_stats["total_notes"] += notes_count
+            total_stats["total_comments"] += comments_count
+            platform_summary["successful_keywords"] = len(keywords)
+            platform_summary["total_notes"] = notes_count
+            platform_summary["total_comments"] = comments_count
+
+            logger.info(
+                f"   ✅ {platform} 成功: {notes_count} 条内容, {comments_count} 条评论"
+            )
+        else:
+            total_stats["failed_tasks"] += len(keywords)
+            platform_summary["failed_keywords"] = len(keywords)
+            logger.error(f"   ❌ {platform} 失败: {result.get('error', '未知错误')}")
+
+    def _log_live_progress(self, finished: int, total: int):
+        """输出各平台的实时进度"""
+        progress_message = f"\n⏱️ 平台进度: {finished}/{total} 已完成"
+        for platform, stats in self.get_live_stats().items():
+            progress_message += (
+                f"\n   {platform}: {stats.get('status', 'unknown')}, "
+                f"{stats.get('notes_count', 0)} 条内容, {stats.get('comments_count', 0)} 条评论, "
+                f"{stats.get('duration_seconds', 0):.1f}秒"
+            )
+        logger.info(progress_message)
+
     def get_crawl_statistics(self) -> Dict:
         """获取爬取统计信息"""
+        detailed_stats = self.get_live_stats()
         return {
-            "platforms_crawled": list(self.crawl_stats.keys()),
-            "total_platforms": len(self.crawl_stats),
-            "detailed_stats": self.crawl_stats,
+            "platforms_crawled": list(detailed_stats.keys()),
+            "total_platforms": len(detailed_stats),
+            "detailed_stats": detailed_stats,
         }
 
     def save_crawl_log(self, log_path: str = None):
@@ -508,7 +603,7 @@ class PlatformCrawler:
 
         try:
             with open(log_path, "w", encoding="utf-8") as f:
-                json.dump(self.crawl_stats, f, ensure_ascii=False, indent=2)
+                json.dump(self.get_live_stats(), f, ensure_ascii=False, indent=2)
             logger.info(f"爬取日志已保存到: {log_path}")
         except Exception as e:
             logger.exception(f"保存爬取日志失败: {e}")
@@ -25,6 +25,13 @@ class Settings(BaseSettings):
     MINDSPIDER_API_KEY: Optional[str] = Field(None, description="MINDSPIDER API密钥")
     MINDSPIDER_BASE_URL: Optional[str] = Field("https://api.deepseek.com", description="MINDSPIDER API基础URL，推荐deepseek-chat模型使用https://api.deepseek.com")
     MINDSPIDER_MODEL_NAME: Optional[str] = Field("deepseek-chat", description="MINDSPIDER API模型名称, 推荐deepseek-chat")
+    NEWS_FETCH_CONCURRENCY: int = Field(6, description="热点新闻并发获取的最大新闻源数")
+    NEWS_FETCH_TIMEOUT: float = Field(15.0, description="单个新闻源单次请求的超时时间（秒）")
+    NEWS_FETCH_RETRIES: int = Field(2, description="新闻源请求超时、连接失败、429或5xx时的重试次数")
+    NEWS_FETCH_RETRY_DELAY: float = Field(1.0, description="新闻源首次重试前的等待时间（秒），之后每次翻倍")
+    NEWS_FETCH_RETRY_MAX_DELAY: float = Field(30.0, description="新闻源单次重试等待的上限（秒），Retry-After 也不超过该值")
+    NEWS_HOST_MIN_INTERVAL: float = Field(0.1, description="对同一主机发起两次请求的最小间隔（秒）")
+    CRAWL_MAX_PARALLEL_PLATFORMS: int = Field(3, description="DeepSentimentCrawling 同时运行的平台爬虫进程数")
 
     class Config:
         env_file = ENV_FILE
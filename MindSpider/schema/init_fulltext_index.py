@@ -0,0 +1,132 @@
+"""
+MindSpider 话题全文索引迁移脚本（SQLAlchemy 2.x 异步引擎）
+
+为 InsightEngine 话题搜索涉及的内容表与评论表创建中文友好的全文索引，
+避免 `LIKE '%关键词%'` 对大表（尤其是评论表）的全表扫描：
+- MySQL：FULLTEXT 索引 + ngram 分词器，InsightEngine 检测到索引后改用 MATCH ... AGAINST 查询
+- PostgreSQL：pg_trgm 扩展 + GIN(gin_trgm_ops) 索引，原有 LIKE 查询即可直接走索引
+
+用法（在 MindSpider/schema 目录下执行）：
+    python init_fulltext_index.py            # 创建索引（已存在的会跳过）
+    python init_fulltext_index.py --drop     # 删除本脚本创建的索引
+
+数据模型定义位置：
+- MindSpider/schema/models_bigdata.py
+- MindSpider/schema/models_sa.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from typing import Dict, List
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from init_database import _build_database_url
+
+
+# 各表参与话题搜索的字段，需与 InsightEngine/tools/search.py 中的 search_configs 保持一致。
+# MySQL 的 MATCH(...) 要求列集合与某个 FULLTEXT 索引完全一致，因此每张表只建一个覆盖全部字段的索引。
+FULLTEXT_SEARCH_FIELDS: Dict[str, List[str]] = {
+    'bilibili_video': ['title', 'desc', 'source_keyword'],
+    'bilibili_video_comment': ['content'],
+    'douyin_aweme': ['title', 'desc', 'source_keyword'],
+    'douyin_aweme_comment': ['content'],
+    'kuaishou_video': ['title', 'desc', 'source_keyword'],
+    'kuaishou_video_comment': ['content'],
+    'weibo_note': ['content', 'source_keyword'],
+    'weibo_note_comment': ['content'],
+    'xhs_note': ['title', 'desc', 'tag_list', 'source_keyword'],
+    'xhs_note_comment': ['content'],
+    'zhihu_content': ['title', 'desc', 'content_text', 'source_keyword'],
+    'zhihu_comment': ['content'],
+    'tieba_note': ['title', 'desc', 'source_keyword'],
+    'tieba_comment': ['content'],
+    'daily_news': ['title'],
+}
+
+
+def fulltext_index_name(table: str) -> str:
+    return f"ft_{table}_topic"
+
+
+def trgm_index_name(table: str, field: str) -> str:
+    return f"trgm_{table}_{field}"
+
+
+async def _table_exists(conn: AsyncConnection, table: str) -> bool:
+    return await conn.run_sync(lambda sync_conn: sync_conn.dialect.has_table(sync_conn, table))
+
+
+async def _mysql_index_exists(conn: AsyncConnection, table: str, index_name: str) -> bool:
+    result = await conn.execute(
+        text(
+            "SELECT COUNT(*) FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND INDEX_NAME = :index_name"
+        ),
+        {"table": table, "index_name": index_name},
+    )
+    return result.scalar_one() > 0
+
+
+async def _migrate_mysql(conn: AsyncConnection, table: str, fields: List[str], drop: bool) -> None:
+    index_name = fulltext_index_name(table)
+    exists = await _mysql_index_exists(conn, table, index_name)
+    if drop:
+        if exists:
+            await conn.execute(text(f"ALTER TABLE `{table}` DROP INDEX `{index_name}`"))
+            logger.info(f"[init_fulltext_index] 已删除 {table}.{index_name}")
+        return
+    if exists:
+        logger.info(f"[init_fulltext_index] {table}.{index_name} 已存在，跳过")
+        return
+    columns = ", ".join(f"`{field}`" for field in fields)
+    # 大表上建索引耗时较长，逐表执行并记录日志
+    logger.info(f"[init_fulltext_index] 正在为 {table}({columns}) 创建 FULLTEXT ngram 索引...")
+    await conn.execute(text(f"ALTER TABLE `{table}` ADD FULLTEXT INDEX `{index_name}` ({columns}) WITH PARSER ngram"))
+
+
+async def _migrate_postgresql(conn: AsyncConnection, table: str, fields: List[str], drop: bool) -> None:
+    for field in fields:
+        index_name = trgm_index_name(table, field)
+        if drop:
+            await conn.execute(text(f'DROP INDEX IF EXISTS "{index_name}"'))
+            continue
+        logger.info(f"[init_fulltext_index] 正在为 {table}.{field} 创建 pg_trgm GIN 索引...")
+        await conn.execute(text(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table}" USING gin ("{field}" gin_trgm_ops)'))
+
+
+async def main(drop: bool = False) -> None:
+    engine = create_async_engine(_build_database_url(), pool_pre_ping=True, pool_recycle=1800)
+    dialect_name = engine.url.get_backend_name()
+
+    async with engine.begin() as conn:
+        if dialect_name == "postgresql" and not drop:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+    for table, fields in FULLTEXT_SEARCH_FIELDS.items():
+        # MySQL 的 DDL 会隐式提交，逐表使用独立事务，单表失败不影响其他表
+        try:
+            async with engine.begin() as conn:
+                if not await _table_exists(conn, table):
+                    logger.warning(f"[init_fulltext_index] 表 {table} 不存在，跳过")
+                    continue
+                if dialect_name == "postgresql":
+                    await _migrate_postgresql(conn, table, fields, drop)
+                else:
+                    await _migrate_mysql(conn, table, fields, drop)
+        except Exception as e:
+            logger.error(f"[init_fulltext_index] 处理表 {table} 失败: {e}")
+
+    await engine.dispose()
+    logger.info(f"[init_fulltext_index] 全文索引{'删除' if drop else '创建'}完成")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MindSpider话题搜索全文索引迁移工具")
+    parser.add_argument("--drop", action="store_true", help="删除本脚本创建的全文索引")
+    args = parser.parse_args()
+    asyncio.run(main(drop=args.drop))
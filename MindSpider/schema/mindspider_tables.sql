@@ -147,6 +147,23 @@ ALTER TABLE `zhihu_content`
 ADD COLUMN `topic_id` varchar(64) DEFAULT NULL COMMENT '关联的话题ID',
 ADD COLUMN `crawling_task_id` varchar(64) DEFAULT NULL COMMENT '关联的爬取任务ID';
 
+-- 为内容表添加预计算热度字段，由MediaCrawler存储层在写入时维护
+-- 权重调整后在MediaCrawler目录下执行 `python main.py --rebuild_hotness` 重算
+ALTER TABLE `xhs_note` ADD COLUMN `hotness_score` double DEFAULT NULL COMMENT '加权热度分值', ADD INDEX `ix_xhs_note_hotness_score` (`hotness_score`);
+ALTER TABLE `douyin_aweme` ADD COLUMN `hotness_score` double DEFAULT NULL COMMENT '加权热度分值', ADD INDEX `ix_douyin_aweme_hotness_score` (`hotness_score`);
+ALTER TABLE `kuaishou_video` ADD COLUMN `hotness_score` double DEFAULT NULL COMMENT '加权热度分值', ADD INDEX `ix_kuaishou_video_hotness_score` (`hotness_score`);
+ALTER TABLE `bilibili_video` ADD COLUMN `hotness_score` double DEFAULT NULL COMMENT '加权热度分值', ADD INDEX `ix_bilibili_video_hotness_score` (`hotness_score`);
+ALTER TABLE `weibo_note` ADD COLUMN `hotness_score` double DEFAULT NULL COMMENT '加权热度分值', ADD INDEX `ix_weibo_note_hotness_score` (`hotness_score`);
+ALTER TABLE `zhihu_content` ADD COLUMN `hotness_score` double DEFAULT NULL COMMENT '加权热度分值', ADD INDEX `ix_zhihu_content_hotness_score` (`hotness_score`);
+
+-- 回填已有数据的热度分值（表达式与 utils/hotness.py 的 hotness_sql 一致，由 tests/test_hotness.py 校验）
+UPDATE `xhs_note` SET `hotness_score` = (COALESCE(`liked_count` + 0.0, 0) * 1.0 + COALESCE(`comment_count` + 0.0, 0) * 5.0 + COALESCE(`share_count` + 0.0, 0) * 10.0 + COALESCE(`collected_count` + 0.0, 0) * 10.0) WHERE `hotness_score` IS NULL;
+UPDATE `douyin_aweme` SET `hotness_score` = (COALESCE(`liked_count` + 0.0, 0) * 1.0 + COALESCE(`comment_count` + 0.0, 0) * 5.0 + COALESCE(`share_count` + 0.0, 0) * 10.0 + COALESCE(`collected_count` + 0.0, 0) * 10.0) WHERE `hotness_score` IS NULL;
+UPDATE `kuaishou_video` SET `hotness_score` = (COALESCE(`liked_count` + 0.0, 0) * 1.0 + COALESCE(`viewd_count` + 0.0, 0) * 0.1) WHERE `hotness_score` IS NULL;
+UPDATE `bilibili_video` SET `hotness_score` = (COALESCE(`liked_count` + 0.0, 0) * 1.0 + COALESCE(`video_comment` + 0.0, 0) * 5.0 + COALESCE(`video_share_count` + 0.0, 0) * 10.0 + COALESCE(`video_favorite_count` + 0.0, 0) * 10.0 + COALESCE(`video_coin_count` + 0.0, 0) * 10.0 + COALESCE(`video_danmaku` + 0.0, 0) * 0.5 + COALESCE(`video_play_count` + 0.0, 0) * 0.1) WHERE `hotness_score` IS NULL;
+UPDATE `weibo_note` SET `hotness_score` = (COALESCE(`liked_count` + 0.0, 0) * 1.0 + COALESCE(`comments_count` + 0.0, 0) * 5.0 + COALESCE(`shared_count` + 0.0, 0) * 10.0) WHERE `hotness_score` IS NULL;
+UPDATE `zhihu_content` SET `hotness_score` = (COALESCE(`voteup_count` + 0.0, 0) * 1.0 + COALESCE(`comment_count` + 0.0, 0) * 5.0) WHERE `hotness_score` IS NULL;
+
 -- ===============================
 -- 创建视图用于数据分析
 -- ===============================
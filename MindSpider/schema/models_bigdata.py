@@ -10,7 +10,7 @@
 """
 
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Integer, String, BigInteger, Text, ForeignKey
+from sqlalchemy import Integer, String, BigInteger, Text, ForeignKey, Float
 
 # 使用 models_sa 中的 Base，确保所有表在同一个 metadata 中，外键引用可以正常工作
 from models_sa import Base
@@ -39,6 +39,7 @@ class BilibiliVideo(Base):
     video_comment: Mapped[str | None] = mapped_column(Text, nullable=True)
     video_cover_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     source_keyword: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
+    hotness_score: Mapped[float | None] = mapped_column(Float, index=True, nullable=True)
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("crawling_tasks.task_id", ondelete="SET NULL"), nullable=True)
 
@@ -136,6 +137,7 @@ class DouyinAweme(Base):
     music_download_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     note_download_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     source_keyword: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
+    hotness_score: Mapped[float | None] = mapped_column(Float, index=True, nullable=True)
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("crawling_tasks.task_id", ondelete="SET NULL"), nullable=True)
 
@@ -198,6 +200,7 @@ class KuaishouVideo(Base):
     video_cover_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     video_play_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     source_keyword: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
+    hotness_score: Mapped[float | None] = mapped_column(Float, index=True, nullable=True)
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("crawling_tasks.task_id", ondelete="SET NULL"), nullable=True)
 
@@ -235,6 +238,7 @@ class WeiboNote(Base):
     shared_count: Mapped[str | None] = mapped_column(Text, nullable=True)
     note_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     source_keyword: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
+    hotness_score: Mapped[float | None] = mapped_column(Float, index=True, nullable=True)
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("crawling_tasks.task_id", ondelete="SET NULL"), nullable=True)
 
@@ -317,6 +321,7 @@ class XhsNote(Base):
     note_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     source_keyword: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
     xsec_token: Mapped[str | None] = mapped_column(Text, nullable=True)
+    hotness_score: Mapped[float | None] = mapped_column(Float, index=True, nullable=True)
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("crawling_tasks.task_id", ondelete="SET NULL"), nullable=True)
 
@@ -421,6 +426,7 @@ class ZhihuContent(Base):
     user_url_token: Mapped[str | None] = mapped_column(Text, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    hotness_score: Mapped[float | None] = mapped_column(Float, index=True, nullable=True)
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("crawling_tasks.task_id", ondelete="SET NULL"), nullable=True)
 
@@ -8,7 +8,7 @@ import os
 import re
 import threading
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 
 from .llms import LLMClient
 from .nodes import (
@@ -22,6 +22,7 @@ from .nodes import (
 from .state import State
 from .tools import TavilyNewsAgency, TavilyResponse
 from .utils import Settings, format_search_results_for_prompt
+from utils.paragraph_executor import ParagraphExecutor, ParagraphProgress
 from loguru import logger
 
 class DeepSearchAgent:
@@ -201,31 +202,39 @@ class DeepSearchAgent:
             _message += f"\n  {i}. {paragraph.title}"
         logger.info(_message)
     
-    def _process_paragraphs(self):
-        """处理所有段落"""
-        total_paragraphs = len(self.state.paragraphs)
-        
-        for i in range(total_paragraphs):
-            # 检查停止信号
-            if self.stop_event and self.stop_event.is_set():
-                logger.info("检测到停止信号，中止段落处理")
-                from .llms.base import InterruptedError
-                raise InterruptedError("用户请求停止")
-            
-            logger.info(f"\n[步骤 2.{i+1}] 处理段落: {self.state.paragraphs[i].title}")
-            logger.info("-" * 50)
-            
-            # 初始搜索和总结
-            self._initial_search_and_summary(i)
-            
-            # 反思循环
-            self._reflection_loop(i)
-            
-            # 标记段落完成
-            self.state.paragraphs[i].research.mark_completed()
-            
-            progress = (i + 1) / total_paragraphs * 100
-            logger.info(f"段落处理完成 ({progress:.1f}%)")
+    def _process_paragraphs(self, on_progress: Optional[Callable[[ParagraphProgress], None]] = None):
+        """
+        处理所有段落，最多 MAX_PARALLEL_PARAGRAPHS 个段落并行
+
+        Args:
+            on_progress: 段落开始和完成时的进度回调，默认只记录日志
+        """
+        executor = ParagraphExecutor(
+            max_workers=self.config.MAX_PARALLEL_PARAGRAPHS,
+            stop_event=self.stop_event,
+            on_progress=on_progress or self._log_paragraph_progress,
+        )
+        executor.run(self._process_paragraph, len(self.state.paragraphs))
+
+    def _process_paragraph(self, paragraph_index: int):
+        """处理单个段落：初始搜索和总结、反思循环"""
+        logger.info(f"\n[步骤 2.{paragraph_index+1}] 处理段落: {self.state.paragraphs[paragraph_index].title}")
+        logger.info("-" * 50)
+        
+        # 初始搜索和总结
+        self._initial_search_and_summary(paragraph_index)
+        
+        # 反思循环
+        self._reflection_loop(paragraph_index)
+        
+        # 标记段落完成
+        self.state.paragraphs[paragraph_index].research.mark_completed()
+
+    @staticmethod
+    def _log_paragraph_progress(event: ParagraphProgress):
+        if event.status == "completed":
+            progress = event.completed / event.total * 100
+            logger.info(f"段落 {event.index + 1} 处理完成 ({progress:.1f}%)")
     
     def _initial_search_and_summary(self, paragraph_index: int):
         """执行初始搜索和总结"""
@@ -21,8 +21,8 @@ class BaseNode(ABC):
             llm_client: LLM客户端
             node_name: 节点名称
         """
-        self.llm_client = llm_client
         self.node_name = node_name or self.__class__.__name__
+        self.llm_client = llm_client.for_node(self.node_name)
 
     @abstractmethod
     def run(self, input_data: Any, **kwargs) -> Any:
@@ -103,6 +103,7 @@ class FirstSummaryNode(StateMutationNode):
             response = self.llm_client.invoke(
                 SYSTEM_PROMPT_FIRST_SUMMARY,
                 message,
+                stream=True,
             )
             
             # 处理响应
@@ -271,6 +272,7 @@ class ReflectionSummaryNode(StateMutationNode):
             response = self.llm_client.invoke(
                 SYSTEM_PROMPT_REFLECTION_SUMMARY,
                 message,
+                stream=True,
             )
             
             # 处理响应
@@ -34,6 +34,7 @@ if utils_dir not in sys.path:
     sys.path.append(utils_dir)
 
 from retry_helper import with_graceful_retry, SEARCH_API_RETRY_CONFIG
+from rate_limiter import rate_limited
 from dataclasses import dataclass, field
 
 # 运行前请确保已安装Tavily库: pip install tavily-python
@@ -42,6 +43,9 @@ try:
 except ImportError:
     raise ImportError("Tavily库未安装，请运行 `pip install tavily-python` 进行安装。")
 
+# TavilyClient 的服务地址，用作限流器的键
+TAVILY_API_URL = "https://api.tavily.com"
+
 # --- 1. 数据结构定义 ---
 
 @dataclass
@@ -103,7 +107,8 @@ class TavilyNewsAgency:
             try:
                 kwargs['topic'] = 'general'
                 api_params = {k: v for k, v in kwargs.items() if v is not None}
-                response_dict = self._client.search(**api_params)
+                with rate_limited(TAVILY_API_URL, stop_event=self.stop_event):
+                    response_dict = self._client.search(**api_params)
                 
                 search_results = [
                     SearchResult(
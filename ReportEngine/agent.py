@@ -7,7 +7,7 @@ import json
 import os
 from loguru import logger
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 
 from .llms import LLMClient
 from .nodes import TemplateSelectionNode, HTMLGenerationNode
@@ -185,6 +185,7 @@ class ReportAgent:
         forum_logs: str = "",
         custom_template: str = "",
         save_report: bool = True,
+        stream_callback: Optional[Callable[[str, Any], None]] = None,
     ) -> str:
         """
         生成综合报告
@@ -195,6 +196,7 @@ class ReportAgent:
             forum_logs: 论坛日志内容
             custom_template: 用户自定义模板（可选）
             save_report: 是否保存报告到文件
+            stream_callback: 可选，HTML流式生成时的回调，参数为已生成的HTML文本和 StreamStats
 
         Returns:
             最终HTML报告内容
@@ -214,7 +216,7 @@ class ReportAgent:
 
             # Step 2: 直接生成HTML报告
             html_report = self._generate_html_report(
-                query, reports, forum_logs, template_result
+                query, reports, forum_logs, template_result, stream_callback
             )
 
             # Step 3: 保存报告
@@ -278,6 +280,7 @@ class ReportAgent:
         reports: List[Any],
         forum_logs: str,
         template_result: Dict[str, Any],
+        stream_callback: Optional[Callable[[str, Any], None]] = None,
     ) -> str:
         """生成HTML报告"""
         logger.info("多轮生成HTML报告...")
@@ -302,7 +305,7 @@ class ReportAgent:
         }
 
         # 使用HTML生成节点生成报告
-        html_content = self.html_generation_node.run(html_input)
+        html_content = self.html_generation_node.run(html_input, on_chunk=stream_callback)
 
         # 更新状态
         self.state.html_content = html_content
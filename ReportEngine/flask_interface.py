@@ -24,6 +24,10 @@ report_agent = None
 current_task = None
 task_lock = threading.Lock()
 
+# HTML流式生成时按已输出字符数估算进度（50%~89%），以及进度接口返回的预览长度
+STREAM_EXPECTED_HTML_CHARS = 40000
+STREAM_PREVIEW_CHARS = 500
+
 
 def initialize_report_engine():
     """初始化Report Engine"""
@@ -51,6 +55,9 @@ class ReportTask:
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
         self.html_content = ""
+        self.generated_chars = 0  # 流式生成中已输出的HTML字符数
+        self.partial_preview = ""  # 已输出HTML的末尾片段
+        self.llm_stats = None  # 首token耗时、生成速度等流式统计
 
     def update_status(self, status: str, progress: int = None, error_message: str = ""):
         """更新任务状态"""
@@ -61,6 +68,16 @@ class ReportTask:
             self.error_message = error_message
         self.updated_at = datetime.now()
 
+    def update_stream(self, text: str, stats: Any = None):
+        """HTML流式生成回调：记录已输出内容并按长度推进进度"""
+        self.generated_chars = len(text)
+        self.partial_preview = text[-STREAM_PREVIEW_CHARS:]
+        if stats is not None:
+            self.llm_stats = stats.to_dict()
+        estimated = 50 + self.generated_chars * 40 // STREAM_EXPECTED_HTML_CHARS
+        self.progress = max(self.progress, min(89, estimated))
+        self.updated_at = datetime.now()
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
         return {
@@ -72,6 +89,9 @@ class ReportTask:
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
             "has_result": bool(self.html_content),
+            "generated_chars": self.generated_chars,
+            "partial_preview": self.partial_preview,
+            "llm_stats": self.llm_stats,
         }
 
 
@@ -173,6 +193,7 @@ def run_report_generation(task: ReportTask, query: str, custom_template: str = "
             forum_logs=content["forum_logs"],
             custom_template=custom_template,
             save_report=True,
+            stream_callback=task.update_stream,
         )
 
         task.update_status("running", 90)
@@ -40,6 +40,7 @@ class HTMLGenerationNode(StateMutationNode):
                 - insight_engine_report: InsightEngine报告内容
                 - forum_logs: 论坛日志内容
                 - selected_template: 选择的模板内容
+            on_chunk: 可选，流式输出回调，参数为已生成的HTML文本和 StreamStats
 
         Returns:
             生成的HTML内容
@@ -101,10 +102,13 @@ class HTMLGenerationNode(StateMutationNode):
 
             # 调用LLM生成HTML（设置大的 max_tokens 以支持长报告）
             # qwen-long 支持 32768 tokens 输出，充分利用其能力生成详细报告
+            # 流式接收，on_chunk 回调可在生成过程中拿到已输出的部分HTML
             response = self.llm_client.invoke(
                 SYSTEM_PROMPT_HTML_GENERATION,
                 message,
                 max_tokens=24000,  # qwen-long 的大输出，约 16800-19200 字中文
+                stream=True,
+                on_chunk=kwargs.get("on_chunk"),
             )
 
             # 处理响应（简化版）
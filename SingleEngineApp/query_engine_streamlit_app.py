@@ -32,6 +32,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from QueryEngine import DeepSearchAgent, Settings
 from config import settings
 from utils.github_issues import error_with_issue_link
+from utils.paragraph_executor import ParagraphProgress
 
 
 def main():
@@ -173,6 +174,7 @@ def main():
             QUERY_ENGINE_MODEL_NAME=model_name,
             TAVILY_API_KEY=tavily_key,
             MAX_REFLECTIONS=max_reflections,
+            MAX_PARALLEL_PARAGRAPHS=settings.MAX_PARALLEL_PARAGRAPHS,
             SEARCH_CONTENT_MAX_LENGTH=max_content_length,
             OUTPUT_DIR="query_engine_streamlit_reports"
         )
@@ -208,38 +210,19 @@ def _run_research_in_thread(query: str, config: Settings, stop_event: threading.
             logger.info("在生成报告结构后检测到停止信号")
             return
 
-        # 处理段落
-        total_paragraphs = len(agent.state.paragraphs)
-        for i in range(total_paragraphs):
-            # 检查停止信号
-            if stop_event.is_set():
-                result_container['task_result'] = {"status": "已停止", "progress": 0}
-                result_container['task_error'] = "用户请求停止"
-                logger.info(f"在处理段落 {i+1} 前检测到停止信号")
-                return
-            
+        # 处理段落（按 MAX_PARALLEL_PARAGRAPHS 并行，停止信号由执行器检查并抛出 InterruptedError）
+        def _on_paragraph_progress(event: ParagraphProgress):
+            status = f"完成段落 {event.completed}/{event.total}"
+            if event.running:
+                status += "，处理中: " + "、".join(f"段落 {i + 1}" for i in event.running)
             result_container['task_result'] = {
-                "status": f"处理段落 {i + 1}/{total_paragraphs}: {agent.state.paragraphs[i].title}",
-                "progress": 20 + int((i + 0.5) / total_paragraphs * 60)
+                "status": status,
+                "progress": 20 + int((event.completed + 0.5 * len(event.running)) / event.total * 60)
             }
+            if event.status == "completed":
+                logger.info(f"段落 {event.index + 1}/{event.total} 处理完成")
 
-            # 初始搜索和总结
-            logger.info(f"开始初始搜索和总结 - 段落 {i+1}")
-            agent._initial_search_and_summary(i)
-            logger.info(f"完成初始搜索和总结 - 段落 {i+1}")
-
-            # 反思循环
-            logger.info(f"开始反思循环 - 段落 {i+1}")
-            agent._reflection_loop(i)
-            logger.info(f"完成反思循环 - 段落 {i+1}")
-            
-            agent.state.paragraphs[i].research.mark_completed()
-
-            result_container['task_result'] = {
-                "status": f"完成段落 {i + 1}/{total_paragraphs}",
-                "progress": 20 + int((i + 1) / total_paragraphs * 60)
-            }
-            logger.info(f"段落 {i+1}/{total_paragraphs} 处理完成")
+        agent._process_paragraphs(on_progress=_on_paragraph_progress)
 
         # 生成最终报告
         result_container['task_result'] = {"status": "生成最终报告", "progress": 90}
@@ -17,6 +17,7 @@ from loguru import logger
 import importlib
 from pathlib import Path
 from MindSpider.main import MindSpider
+from utils.log_buffer import LogRingBuffer
 
 # 导入ReportEngine
 try:
@@ -48,6 +49,26 @@ os.environ["PYTHONUTF8"] = "1"
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 
+# 每个应用在内存中保留的最近日志行数，/api/output 与 /api/forum/log 只从缓冲区读取
+LOG_BUFFER_MAX_LINES = 5000
+log_buffers = {}
+log_buffers_lock = threading.Lock()
+
+
+def get_log_buffer(app_name):
+    """获取应用的日志环形缓冲区，首次访问时用已有日志文件的末尾初始化；forum日志写入时预解析为论坛消息"""
+    with log_buffers_lock:
+        buffer = log_buffers.get(app_name)
+        if buffer is None:
+            parser = parse_forum_log_line if app_name == "forum" else None
+            buffer = LogRingBuffer(max_entries=LOG_BUFFER_MAX_LINES, parser=parser)
+            try:
+                buffer.seed_from_file(LOG_DIR / f"{app_name}.log")
+            except Exception as e:
+                logger.warning(f"初始化{app_name}日志缓冲区失败: {e}")
+            log_buffers[app_name] = buffer
+        return buffer
+
 CONFIG_MODULE_NAME = "config"
 CONFIG_FILE_PATH = Path(__file__).resolve().parent / "config.py"
 CONFIG_KEYS = [
@@ -348,35 +369,41 @@ def stop_forum_engine():
         logger.exception(f"ForumEngine: 停止论坛失败: {e}")
 
 
+# 论坛对话区展示的发言来源：(消息类型, 显示名称)
+FORUM_SPEAKERS = {
+    "QUERY": ("agent", "Query Engine"),
+    "INSIGHT": ("agent", "Insight Engine"),
+    "MEDIA": ("agent", "Media Engine"),
+    "HOST": ("host", "Forum Host"),
+}
+
+
 def parse_forum_log_line(line):
-    """解析forum.log行内容，提取对话信息"""
+    """解析forum.log行内容，提取对话信息（前端对话区直接渲染该结果）"""
     import re
 
     # 匹配格式: [时间] [来源] 内容
-    pattern = r"\[(\d{2}:\d{2}:\d{2})\]\s*\[([A-Z]+)\]\s*(.*)"
+    pattern = r"\[(\d{2}:\d{2}:\d{2})\]\s*\[([^\]]+)\]\s*(.*)"
     match = re.match(pattern, line)
 
     if match:
         timestamp, source, content = match.groups()
+        speaker = FORUM_SPEAKERS.get(source.upper())
 
-        # 过滤掉系统消息和空内容
-        if source == "SYSTEM" or not content.strip():
+        # 只处理三个Engine和主持人的发言，过滤掉系统消息和空内容
+        if speaker is None or not content.strip() or "=== ForumEngine" in content:
             return None
 
-        # 只处理三个Engine的消息
-        if source not in ["QUERY", "INSIGHT", "MEDIA"]:
-            return None
-
-        # 根据来源确定消息类型和发送者
-        message_type = "agent"
-        sender = f"{source} Engine"
+        message_type, sender = speaker
+        # forum.log中换行被转义为\\n以保证每条记录占一行，这里还原
+        content = content.replace("\\n", "\n").replace("\\r", "")
 
         return {
             "type": message_type,
             "sender": sender,
-            "content": content.strip(),
+            "source": sender,
+            "content": content,
             "timestamp": timestamp,
-            "source": source,
         }
 
     return None
@@ -384,63 +411,37 @@ def parse_forum_log_line(line):
 
 # Forum日志监听器
 def monitor_forum_log():
-    """监听forum.log文件变化并推送到前端"""
-    import time
-    from pathlib import Path
-
-    forum_log_file = LOG_DIR / "forum.log"
-    last_position = 0
-    processed_lines = set()  # 用于跟踪已处理的行，避免重复
+    """监听forum.log文件变化，写入环形缓冲区并推送到前端"""
+    from ForumEngine.log_tailer import LogTailer
 
-    # 如果文件存在，获取初始位置
-    if forum_log_file.exists():
-        with open(forum_log_file, "r", encoding="utf-8", errors="ignore") as f:
-            # 初始化时读取所有现有行，避免重复处理
-            existing_lines = f.readlines()
-            for line in existing_lines:
-                line_hash = hash(line.strip())
-                processed_lines.add(line_hash)
-            last_position = f.tell()
+    tailer = LogTailer({"forum": LOG_DIR / "forum.log"})
+    # 以当前末尾为基线，已有内容由缓冲区初始化时读入
+    tailer.seek_to_end()
+    forum_buffer = get_log_buffer("forum")
 
     while True:
         try:
-            if forum_log_file.exists():
-                with open(forum_log_file, "r", encoding="utf-8", errors="ignore") as f:
-                    f.seek(last_position)
-                    new_lines = f.readlines()
-
-                    if new_lines:
-                        for line in new_lines:
-                            line = line.rstrip("\n\r")
-                            if line.strip():
-                                line_hash = hash(line.strip())
-
-                                # 避免重复处理同一行
-                                if line_hash in processed_lines:
-                                    continue
-
-                                processed_lines.add(line_hash)
-
-                                # 解析日志行并发送forum消息
-                                parsed_message = parse_forum_log_line(line)
-                                if parsed_message:
-                                    socketio.emit("forum_message", parsed_message)
-
-                                # 只有在控制台显示forum时才发送控制台消息
-                                timestamp = datetime.now().strftime("%H:%M:%S")
-                                formatted_line = f"[{timestamp}] {line}"
-                                socketio.emit(
-                                    "console_output",
-                                    {"app": "forum", "line": formatted_line},
-                                )
-
-                        last_position = f.tell()
-
-                        # 清理processed_lines集合，避免内存泄漏（保留最近1000行的哈希）
-                        if len(processed_lines) > 1000:
-                            processed_lines.clear()
-
-            time.sleep(1)  # 每秒检查一次
+            tailer.wait_for_change(timeout=1.0)
+            result = tailer.read("forum")
+            if result.truncated:
+                # forum.log在新一轮会话开始时会被清空重写，缓冲区同步清空（轮询方据此重置视图）并从头读取新内容
+                forum_buffer.clear()
+                tailer.rewind("forum")
+                result = tailer.read("forum")
+
+            for line in result.lines:
+                # 解析日志行并发送forum消息
+                parsed_message = forum_buffer.append(line)
+                if parsed_message:
+                    socketio.emit("forum_message", parsed_message)
+
+                # 只有在控制台显示forum时才发送控制台消息
+                timestamp = datetime.now().strftime("%H:%M:%S")
+                formatted_line = f"[{timestamp}] {line}"
+                socketio.emit(
+                    "console_output",
+                    {"app": "forum", "line": formatted_line},
+                )
         except Exception as e:
             logger.error(f"Forum日志监听错误: {e}")
             time.sleep(5)
@@ -498,7 +499,10 @@ output_queues = {
 
 
 def write_log_to_file(app_name, line):
-    """将日志写入文件"""
+    """将日志写入文件，并同步追加到内存环形缓冲区"""
+    # 先取缓冲区：首次创建时会用已有日志文件初始化，避免本行被重复读入
+    # forum缓冲区由monitor_forum_log追踪forum.log写入，这里不重复追加
+    buffer = get_log_buffer(app_name) if app_name != "forum" else None
     try:
         log_file_path = LOG_DIR / f"{app_name}.log"
         with open(log_file_path, "a", encoding="utf-8") as f:
@@ -507,24 +511,13 @@ def write_log_to_file(app_name, line):
     except Exception as e:
         logger.error(f"Error writing log for {app_name}: {e}")
 
+    if buffer is not None and line.strip():
+        buffer.append(line)
 
-def read_log_from_file(app_name, tail_lines=None):
-    """从文件读取日志"""
-    try:
-        log_file_path = LOG_DIR / f"{app_name}.log"
-        if not log_file_path.exists():
-            return []
 
-        with open(log_file_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            lines = [line.rstrip("\n\r") for line in lines if line.strip()]
-
-            if tail_lines:
-                return lines[-tail_lines:]
-            return lines
-    except Exception as e:
-        logger.exception(f"Error reading log for {app_name}: {e}")
-        return []
+def read_log_since(app_name):
+    """按请求参数 since 从环形缓冲区读取增量日志，不带 since 时返回缓冲区内全部内容"""
+    return get_log_buffer(app_name).since(request.args.get("since", type=int))
 
 
 def read_process_output(process, app_name):
@@ -615,6 +608,7 @@ def start_streamlit_app(app_name, script_path, port):
         log_file_path = LOG_DIR / f"{app_name}.log"
         if log_file_path.exists():
             log_file_path.unlink()
+        get_log_buffer(app_name).clear()
 
         # 创建启动日志
         start_msg = f"[{datetime.now().strftime('%H:%M:%S')}] 启动 {app_name} 应用..."
@@ -856,26 +850,20 @@ def get_output(app_name):
     if app_name not in processes:
         return jsonify({"success": False, "message": "未知应用"})
 
-    # 特殊处理Forum Engine
-    if app_name == "forum":
-        try:
-            forum_log_content = read_log_from_file("forum")
-            return jsonify(
-                {
-                    "success": True,
-                    "output": forum_log_content,
-                    "total_lines": len(forum_log_content),
-                }
-            )
-        except Exception as e:
-            return jsonify(
-                {"success": False, "message": f"读取forum日志失败: {str(e)}"}
-            )
-
-    # 从文件读取完整日志
-    output_lines = read_log_from_file(app_name)
+    try:
+        snapshot = read_log_since(app_name)
+    except Exception as e:
+        return jsonify({"success": False, "message": f"读取{app_name}日志失败: {str(e)}"})
 
-    return jsonify({"success": True, "output": output_lines})
+    return jsonify(
+        {
+            "success": True,
+            "output": snapshot["lines"],
+            "next_offset": snapshot["next_offset"],
+            "reset": snapshot["reset"],
+            "total_lines": len(snapshot["lines"]),
+        }
+    )
 
 
 @app.route("/api/test_log/<app_name>")
@@ -925,36 +913,24 @@ def stop_forum_monitoring_api():
 
 @app.route("/api/forum/log")
 def get_forum_log():
-    """获取ForumEngine的forum.log内容"""
+    """获取ForumEngine的forum.log内容，支持 ?since=<offset> 增量读取；partial_outputs 为各引擎正在流式生成的部分输出"""
     try:
-        forum_log_file = LOG_DIR / "forum.log"
-        if not forum_log_file.exists():
-            return jsonify(
-                {
-                    "success": True,
-                    "log_lines": [],
-                    "parsed_messages": [],
-                    "total_lines": 0,
-                }
-            )
-
-        with open(forum_log_file, "r", encoding="utf-8", errors="ignore") as f:
-            lines = f.readlines()
-            lines = [line.rstrip("\n\r") for line in lines if line.strip()]
-
-        # 解析每一行日志并提取对话信息
-        parsed_messages = []
-        for line in lines:
-            parsed_message = parse_forum_log_line(line)
-            if parsed_message:
-                parsed_messages.append(parsed_message)
+        snapshot = read_log_since("forum")
+        try:
+            from ForumEngine.monitor import get_partial_outputs
 
+            partial_outputs = get_partial_outputs()
+        except Exception:
+            partial_outputs = {}
         return jsonify(
             {
                 "success": True,
-                "log_lines": lines,
-                "parsed_messages": parsed_messages,
-                "total_lines": len(lines),
+                "log_lines": snapshot["lines"],
+                "parsed_messages": snapshot["parsed"],
+                "next_offset": snapshot["next_offset"],
+                "reset": snapshot["reset"],
+                "total_lines": len(snapshot["lines"]),
+                "partial_outputs": partial_outputs,
             }
         )
     except Exception as e:
@@ -10,7 +10,7 @@
 from pathlib import Path
 from pydantic_settings import BaseSettings
 from pydantic import Field, ConfigDict
-from typing import Optional
+from typing import Dict, Optional
 from loguru import logger
 
 
@@ -37,6 +37,9 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = Field("your_db_password", description="数据库密码")
     DB_NAME: str = Field("your_db_name", description="数据库名称")
     DB_CHARSET: str = Field("utf8mb4", description="数据库字符集，推荐utf8mb4，兼容emoji")
+    DB_QUERY_CONCURRENCY: int = Field(8, description="Insight Engine多表查询的最大并发数（同时也是连接池大小）")
+    DB_FULLTEXT_SEARCH: bool = Field(True, description="Insight Engine话题搜索是否使用全文索引（需先运行 MindSpider/schema/init_fulltext_index.py），无索引时自动回退LIKE")
+    BATCH_KEYWORD_SEARCH: bool = Field(True, description="Insight Engine多个优化关键词是否合并为每表一次查询（否则逐关键词查询）")
     
     # ======================= LLM 相关 =======================
     # Insight Agent（推荐Kimi，申请地址：https://platform.moonshot.cn/）
@@ -85,8 +88,29 @@ class Settings(BaseSettings):
     DEFAULT_SEARCH_TOPIC_ON_PLATFORM_LIMIT: int = Field(200, description="平台搜索话题最大数")
     MAX_SEARCH_RESULTS_FOR_LLM: int = Field(0, description="供LLM用搜索结果最大数")
     MAX_HIGH_CONFIDENCE_SENTIMENT_RESULTS: int = Field(0, description="高置信度情感分析最大数")
+    SENTIMENT_BATCH_SIZE: int = Field(32, description="情感分析每个推理微批的文本数")
+    SENTIMENT_MAX_LENGTH: int = Field(512, description="情感分析单条文本的最大token数，超出部分截断")
+    SENTIMENT_NUM_THREADS: int = Field(0, description="CPU推理时PyTorch/ONNX Runtime使用的线程数，0表示保持默认值")
+    SENTIMENT_BACKEND: str = Field("torch", description="情感分析推理后端：torch 或 onnx（仅CPU，需安装 onnx 与 onnxruntime，首次使用时自动导出并校验）")
+    SENTIMENT_ONNX_QUANTIZE: bool = Field(True, description="ONNX 后端是否使用动态INT8量化")
+    SENTIMENT_CACHE_SIZE: int = Field(10000, description="情感分析结果内存缓存（LRU）的最大条目数，0表示不使用内存缓存")
+    SENTIMENT_CACHE_PATH: Optional[str] = Field(None, description="情感分析结果SQLite磁盘缓存路径，如 cache/sentiment_cache.sqlite3，为空则不启用")
+    LLM_CACHE_MODE: str = Field("off", description="各Engine LLM响应缓存模式：off 关闭；on 命中即返回；record 总是调用模型并写入；replay 只读缓存、未命中报错，用于测试和基准的确定性回放")
+    LLM_CACHE_PATH: str = Field("cache/llm_cache.sqlite3", description="LLM响应缓存SQLite文件路径")
+    LLM_CACHE_TTL: int = Field(86400, description="LLM响应缓存有效期（秒），0表示不过期，replay模式忽略")
+    LLM_CACHE_MAX_ENTRIES: int = Field(20000, description="LLM响应缓存最多保留的条目数，超出时淘汰最久未访问的条目，0表示不限制")
+    RATE_LIMIT_ENABLED: bool = Field(True, description="是否按提供方限制LLM与搜索API的请求速率（每秒请求数、每分钟token数、并发请求数）")
+    RATE_LIMITS: Dict[str, Dict[str, float]] = Field(default_factory=dict, description='按提供方覆盖默认限额（JSON），提供方为 kimi/gemini/deepseek/qwen/tavily/bocha/default，如 {"kimi": {"requests_per_sec": 1, "tokens_per_min": 64000, "max_in_flight": 2}}')
+    LLM_HEDGE_ENABLED: bool = Field(False, description="是否启用各Engine LLM的对冲请求与备用模型路由：主接口超过首token耗时p95（不超过节点SLO）仍未返回内容时向备用接口发出同样的请求，先返回者胜出，另一方被取消；需同时配置 LLM_FALLBACK_*")
+    LLM_FALLBACK_API_KEY: Optional[str] = Field(None, description="对冲/故障转移使用的备用LLM API密钥，兼容OpenAI请求格式即可")
+    LLM_FALLBACK_BASE_URL: Optional[str] = Field(None, description="备用LLM接口BaseUrl")
+    LLM_FALLBACK_MODEL_NAME: Optional[str] = Field(None, description="备用LLM模型名称")
+    LLM_LATENCY_SLO: Dict[str, float] = Field(default_factory=dict, description='按节点类型覆盖默认的首token耗时SLO（秒，JSON），如 {"FirstSearchNode": 20, "HTMLGenerationNode": 120, "default": 60}')
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = Field(3, description="LLM接口连续失败或超出SLO多少次后熔断，熔断期间直接使用其他接口")
+    LLM_CIRCUIT_RESET_SEC: float = Field(60.0, description="LLM接口熔断后多久（秒）放行一次探测请求")
     MAX_REFLECTIONS: int = Field(3, description="最大反思次数")
     MAX_PARAGRAPHS: int = Field(6, description="最大段落数")
+    MAX_PARALLEL_PARAGRAPHS: int = Field(3, description="同时研究的最大段落数，1表示逐段顺序处理")
     SEARCH_TIMEOUT: int = Field(240, description="单次搜索请求超时")
     MAX_CONTENT_LENGTH: int = Field(500000, description="搜索最大内容长度")
     
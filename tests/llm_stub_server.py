@@ -0,0 +1,153 @@
+"""
+LLM测试共用的本地 OpenAI 兼容桩服务
+
+按请求中的 stream 参数返回完整 JSON 或逐块的 SSE，可配置响应头前/首块前延迟、失败状态码和usage
+（流式请求带 stream_options.include_usage 时在最后单独返回一块usage，与 OpenAI 一致），
+并记录命中次数、请求体以及客户端是否提前断开连接。
+LLMClient 以顶层模块名导入 utils 下的工具（llm_cache、llm_router 等），这里把 utils 目录加入路径，
+测试直接 `import llm_router` 即与客户端使用同一个模块，共享限流、熔断等进程内状态。
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+# 添加项目根目录与 utils 目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "utils"))
+
+from QueryEngine.llms import base as llm_client_module
+
+
+class StubChatServer:
+    """
+    本地 OpenAI 兼容的 /chat/completions 桩服务
+
+    chunks 为固定的文本块列表，或接收本次命中序号（从1开始）返回文本块列表的函数；
+    非流式请求返回所有文本块拼接的结果
+    """
+
+    def __init__(
+        self,
+        chunks: Union[Sequence[str], Callable[[int], Sequence[str]]],
+        model: str = "test-model",
+        usage: Optional[Dict[str, int]] = None,
+        chunk_interval: float = 0.0,
+    ):
+        self.chunks = chunks
+        self.model = model
+        self.usage = usage
+        self.chunk_interval = chunk_interval
+        # 返回响应头前的等待秒数（请求阻塞在 create() 中）与首块前的等待秒数
+        self.header_delay = 0.0
+        self.delay = 0.0
+        self.fail_status: Optional[int] = None
+        # 为 True 时以 400 拒绝带 stream_options 的请求，模拟不支持该参数的接口
+        self.reject_stream_options = False
+        self.hits = 0
+        self.requests: List[Dict[str, Any]] = []
+        self.aborted = threading.Event()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def start(self) -> "StubChatServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self):
+        """恢复默认行为并清空统计"""
+        with self._lock:
+            self.header_delay = 0.0
+            self.delay = 0.0
+            self.fail_status = None
+            self.reject_stream_options = False
+            self.hits = 0
+            self.requests.clear()
+            self.aborted.clear()
+
+    def __enter__(self) -> "StubChatServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _chunks_for(self, hit: int) -> List[str]:
+        return list(self.chunks(hit) if callable(self.chunks) else self.chunks)
+
+    def _make_handler(self):
+        stub = self
+
+        class _ChatHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.hits += 1
+                    hit = stub.hits
+                    stub.requests.append(request)
+                time.sleep(stub.header_delay)
+                if stub.fail_status:
+                    self._reply_json(stub.fail_status, {"error": {"message": "stub failure"}})
+                    return
+                if stub.reject_stream_options and "stream_options" in request:
+                    self._reply_json(400, {"error": {"message": "unknown parameter: stream_options"}})
+                    return
+                chunks = stub._chunks_for(hit)
+                if not request.get("stream"):
+                    self._reply_json(200, {
+                        "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": stub.model,
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": "".join(chunks)}}],
+                        **({"usage": stub.usage} if stub.usage else {}),
+                    })
+                    return
+                include_usage = bool((request.get("stream_options") or {}).get("include_usage"))
+                self._reply_stream(chunks, include_usage)
+
+            def _reply_json(self, status, payload):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _reply_stream(self, chunks, include_usage):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                self.wfile.flush()
+                time.sleep(stub.delay)
+                try:
+                    for content in chunks:
+                        self._write_chunk([{"index": 0, "delta": {"content": content}, "finish_reason": None}])
+                        time.sleep(stub.chunk_interval)
+                    if stub.usage and include_usage:
+                        self._write_chunk([], usage=stub.usage)
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    stub.aborted.set()
+                self.close_connection = True
+
+            def _write_chunk(self, choices, **extra):
+                chunk = {
+                    "id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": stub.model,
+                    "choices": choices, **extra,
+                }
+                self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            def log_message(self, format, *args):
+                pass
+
+        return _ChatHandler
@@ -0,0 +1,113 @@
+"""
+测试utils/hotness.py中的热度分值定义
+
+覆盖：
+1. 互动数的数值转换（空串、非数字、"1.2万"等带单位的计数）
+2. Python 计算的热度分值与 SQL 实时计算表达式在同一批数据上结果一致（SQLite 执行生成的表达式）
+3. InsightEngine 的 search_hot_content 回退公式使用同一权重表生成的表达式，hotness_score 为 NULL 的旧数据仍参与排序
+4. MindSpider/schema/mindspider_tables.sql 中回填已有数据的表达式与权重表一致
+"""
+
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.hotness import HOTNESS_FIELDS, calculate_hotness_score, hotness_sql, to_number
+from InsightEngine.tools import search
+from InsightEngine.tools.search import MediaCrawlerDB
+
+# 各种爬取到的互动数写法，同时作为 TEXT 列与原始类型写入
+COUNTER_VALUES = [None, "", "abc", "1.2万", "10万+", " 12", "1e3", ".5", "-3", "0x10", "1,024", 7, 3.5, 0]
+
+
+class TestToNumber:
+    """测试互动数的数值转换"""
+
+    @pytest.mark.parametrize("value, expected", [
+        (None, 0.0), ("", 0.0), ("abc", 0.0), ("1.2万", 1.2), ("10万+", 10.0), (" 12", 12.0),
+        ("1e3", 1000.0), (".5", 0.5), ("-3", -3.0), ("0x10", 0.0), ("1,024", 1.0), ("１２", 0.0),
+        (7, 7.0), (3.5, 3.5), (True, 0.0),
+    ])
+    def test_to_number(self, value, expected):
+        assert to_number(value) == expected
+
+    def test_unknown_table(self):
+        """不参与热度计算的表"""
+        assert calculate_hotness_score("daily_news", {"liked_count": 1}) is None
+        assert hotness_sql("daily_news") is None
+
+
+class TestHotnessSqlMatchesPython:
+    """测试 SQL 表达式与 Python 计算结果一致"""
+
+    @pytest.mark.parametrize("table", list(HOTNESS_FIELDS))
+    def test_same_score(self, table):
+        fields = [field for field, _ in HOTNESS_FIELDS[table]]
+        # 每行把同一个取值轮转到不同字段，覆盖所有字段与取值的组合
+        rows = [
+            {field: COUNTER_VALUES[(start + i) % len(COUNTER_VALUES)] for i, field in enumerate(fields)}
+            for start in range(len(COUNTER_VALUES))
+        ]
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute(f"CREATE TABLE `{table}` (row_id INTEGER, {', '.join(f'`{f}` TEXT' for f in fields)})")
+            conn.executemany(
+                f"INSERT INTO `{table}` VALUES (?, {', '.join('?' for _ in fields)})",
+                [(idx, *(row[f] if row[f] is None else str(row[f]) for f in fields)) for idx, row in enumerate(rows)],
+            )
+            sql_scores = dict(conn.execute(f"SELECT row_id, {hotness_sql(table)} FROM `{table}`").fetchall())
+        finally:
+            conn.close()
+
+        for idx, row in enumerate(rows):
+            assert sql_scores[idx] == pytest.approx(calculate_hotness_score(table, row)), row
+
+
+class TestSearchHotContentFormula:
+    """测试 InsightEngine 回退公式来源于同一权重表"""
+
+    def test_fallback_formula_uses_shared_weights(self, monkeypatch):
+        queries = []
+        monkeypatch.setattr(search.settings, "DB_DIALECT", "mysql")
+        monkeypatch.setattr(MediaCrawlerDB, "_get_table_columns", lambda self, table: [])
+        monkeypatch.setattr(MediaCrawlerDB, "_execute_query", lambda self, query, params=None: queries.append(query) or [])
+
+        MediaCrawlerDB().search_hot_content("week", limit=10)
+
+        assert len(queries) == 1
+        for table in HOTNESS_FIELDS:
+            assert f"{hotness_sql(table)} as hotness_score" in queries[0]
+
+    def test_null_scores_fall_back_to_formula(self, monkeypatch):
+        """已有 hotness_score 列时按索引读取已回填的行，NULL 行回退实时计算，不会因 NULL 排在最后而丢失"""
+        queries = []
+        monkeypatch.setattr(search.settings, "DB_DIALECT", "mysql")
+        monkeypatch.setattr(MediaCrawlerDB, "_get_table_columns", lambda self, table: ["hotness_score"])
+        monkeypatch.setattr(MediaCrawlerDB, "_execute_query", lambda self, query, params=None: queries.append(query) or [])
+
+        MediaCrawlerDB().search_hot_content("week", limit=10)
+
+        subqueries = queries[0].split(" ) UNION ALL ( ")
+        assert len(subqueries) == 2 * len(HOTNESS_FIELDS)
+        for table in HOTNESS_FIELDS:
+            stored, computed = [q for q in subqueries if f"FROM `{table}`" in q]
+            assert "`hotness_score` as hotness_score" in stored and "AND `hotness_score` IS NOT NULL" in stored
+            assert f"{hotness_sql(table)} as hotness_score" in computed and "AND `hotness_score` IS NULL" in computed
+
+
+class TestSchemaBackfill:
+    """测试建表脚本回填热度分值的表达式"""
+
+    def test_backfill_matches_weight_table(self):
+        sql = (project_root / "MindSpider" / "schema" / "mindspider_tables.sql").read_text(encoding="utf-8")
+        backfills = dict(re.findall(
+            r"^UPDATE `(\w+)` SET `hotness_score` = (.+) WHERE `hotness_score` IS NULL;$", sql, flags=re.MULTILINE
+        ))
+        assert backfills == {table: hotness_sql(table) for table in HOTNESS_FIELDS}
@@ -0,0 +1,146 @@
+"""
+测试InsightEngine/tools/search.py中的本地舆情数据库查询工具
+
+覆盖：
+1. FULLTEXT 索引信息只缓存成功的查询，查询失败时回退 LIKE 并在下次调用时重试
+2. 查询投影包含标题为空时回退使用的 desc、content_text 字段
+3. 查询投影由 MindSpider/schema 的 ORM 模型生成，用到的字段都能在模型上找到
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from InsightEngine.tools import search
+from InsightEngine.tools.search import MediaCrawlerDB, PROJECTED_COLUMNS, SchemaBase, TABLE_PROJECTIONS
+
+# MindSpider/schema/models_bigdata.py 中带有正文回退字段的内容表
+FALLBACK_COLUMNS = {
+    'bilibili_video': ['desc'],
+    'douyin_aweme': ['desc'],
+    'kuaishou_video': ['desc'],
+    'xhs_note': ['desc'],
+    'tieba_note': ['desc'],
+    'zhihu_content': ['desc', 'content_text'],
+}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """MySQL 方言、开启全文检索、清空进程内缓存的查询客户端"""
+    monkeypatch.setattr(search.settings, "DB_DIALECT", "mysql")
+    monkeypatch.setattr(search.settings, "DB_FULLTEXT_SEARCH", True)
+    monkeypatch.setattr(MediaCrawlerDB, "_fulltext_index_cache", None)
+    return MediaCrawlerDB()
+
+
+class TestFulltextIndexCache:
+    """测试全文索引信息的缓存"""
+
+    def test_failed_lookup_is_not_cached(self, db, monkeypatch):
+        """读取索引信息失败时本次回退 LIKE，恢复后重新读取并使用 MATCH ... AGAINST"""
+        calls = []
+
+        async def fake_fetch_all(query, params=None):
+            calls.append(query)
+            if len(calls) == 1:
+                raise ConnectionError("database is down")
+            return [
+                {"TABLE_NAME": "weibo_note", "INDEX_NAME": "ft_content", "COLUMN_NAME": "content"},
+                {"TABLE_NAME": "weibo_note", "INDEX_NAME": "ft_content", "COLUMN_NAME": "source_keyword"},
+            ]
+
+        monkeypatch.setattr(search, "fetch_all", fake_fetch_all)
+        fields = ["content", "source_keyword"]
+
+        clause, _ = db._build_topic_clause("weibo_note", fields, "武汉大学")
+        assert "LIKE" in clause and MediaCrawlerDB._fulltext_index_cache is None
+
+        clause, params = db._build_topic_clause("weibo_note", fields, "武汉大学")
+        assert clause.startswith("MATCH(`content`, `source_keyword`) AGAINST")
+        assert params == {"term": '"武汉大学"'}
+
+        # 成功读取后缓存，不再查询
+        db._build_topic_clause("weibo_note", fields, "樱花")
+        assert len(calls) == 2
+
+    def test_empty_lookup_is_cached(self, db, monkeypatch):
+        """成功读取但库中没有全文索引时缓存结果，不重复查询"""
+        calls = []
+
+        async def fake_fetch_all(query, params=None):
+            calls.append(query)
+            return []
+
+        monkeypatch.setattr(search, "fetch_all", fake_fetch_all)
+        for _ in range(3):
+            clause, _ = db._build_topic_clause("weibo_note", ["content"], "武汉大学")
+            assert "LIKE" in clause
+        assert len(calls) == 1
+
+
+class TestProjectionFallbackColumns:
+    """测试投影保留标题为空时的回退字段"""
+
+    def test_empty_title_falls_back_to_desc_and_content_text(self, db, monkeypatch):
+        """标题为空的内容按 desc、content_text 的顺序取正文，不因投影缺列而变成空串"""
+        monkeypatch.setattr(MediaCrawlerDB, "_fulltext_index_cache", {})
+        monkeypatch.setattr(MediaCrawlerDB, "_projection_cache", {})
+        # 实际表结构：投影字段之外还有 desc、content_text 等大字段
+        monkeypatch.setattr(
+            MediaCrawlerDB, "_get_table_columns",
+            lambda self, table: list(TABLE_PROJECTIONS[table]) + FALLBACK_COLUMNS.get(table, []) + ['image_list'],
+        )
+
+        def fake_execute_queries(self, queries):
+            results = []
+            for query, _ in queries:
+                table = re.search(r"FROM `(\w+)`", query).group(1)
+                selected = re.findall(r"`(\w+)`", query.split(" FROM ")[0])
+                row = {'title': '', 'desc': f'{table} desc', 'content_text': f'{table} text', 'image_list': 'img'}
+                if table == 'zhihu_content':
+                    row['desc'] = ''
+                results.append([{column: row.get(column) for column in selected}] if table in FALLBACK_COLUMNS else [])
+            return results
+
+        monkeypatch.setattr(MediaCrawlerDB, "_execute_queries", fake_execute_queries)
+        response = db.search_topic_globally("武汉大学")
+
+        contents = {r.source_table: r.title_or_content for r in response.results}
+        assert contents == {
+            'bilibili_video': 'bilibili_video desc',
+            'douyin_aweme': 'douyin_aweme desc',
+            'kuaishou_video': 'kuaishou_video desc',
+            'xhs_note': 'xhs_note desc',
+            'tieba_note': 'tieba_note desc',
+            'zhihu_content': 'zhihu_content text',
+        }
+        assert all('image_list' not in db._get_projection(table) for table in FALLBACK_COLUMNS)
+
+
+class TestProjectionsFromModels:
+    """测试查询投影与 ORM 模型保持一致"""
+
+    def test_projection_is_consumed_columns_of_model(self):
+        """每个表的投影恰为模型中被用到的列，大字段不在其中"""
+        for name, table in SchemaBase.metadata.tables.items():
+            model_columns = [column.name for column in table.columns]
+            assert list(TABLE_PROJECTIONS[name]) == [c for c in model_columns if c in PROJECTED_COLUMNS]
+        assert 'image_list' not in TABLE_PROJECTIONS['xhs_note'] and 'tag_list' not in TABLE_PROJECTIONS['xhs_note']
+
+    def test_consumed_columns_exist_on_models(self):
+        """模型字段改名后，结果转换中仍引用旧字段名时报错而不是静默丢列"""
+        model_columns = {column.name for table in SchemaBase.metadata.tables.values() for column in table.columns}
+        assert PROJECTED_COLUMNS - model_columns == set()
+
+    def test_searched_tables_have_projections(self):
+        """搜索用到的每个表都能由模型生成投影"""
+        for table in FALLBACK_COLUMNS.keys() | {'weibo_note', 'daily_news', 'bilibili_video_comment', 'zhihu_comment'}:
+            assert TABLE_PROJECTIONS[table]
+        assert {'title', 'desc', 'content_text'} <= set(TABLE_PROJECTIONS['zhihu_content'])
@@ -0,0 +1,103 @@
+"""
+测试utils/llm_cache.py中的LLM响应缓存
+
+覆盖：
+1. 缓存键对空白/换行差异不敏感，对模型和采样参数敏感
+2. TTL过期与按最近访问淘汰
+3. 回放模式忽略TTL、未命中时报错；录制模式总是调用模型
+4. 按节点统计命中率
+5. LLMClient 通过本地 OpenAI 兼容服务验证命中后不再请求模型
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.llm_stub_server import StubChatServer, llm_client_module
+
+import llm_cache
+from llm_cache import LLMCacheMiss, LLMResponseCache
+
+MESSAGES = [{"role": "system", "content": "你是分析师"}, {"role": "user", "content": "总结舆情"}]
+
+
+class TestLLMResponseCache:
+    """测试LLMResponseCache的键、过期、淘汰和模式语义"""
+
+    def test_key_normalization(self):
+        """行尾空白与换行风格不影响键，模型和采样参数影响键"""
+        noisy = [{"role": "system", "content": "你是分析师  \r\n"}, {"role": "user", "content": " 总结舆情\r\n"}]
+        key = LLMResponseCache.make_key("m", MESSAGES, {"temperature": 0.2})
+        assert LLMResponseCache.make_key("m", noisy, {"temperature": 0.2, "stream": False}) == key
+        assert LLMResponseCache.make_key("m2", MESSAGES, {"temperature": 0.2}) != key
+        assert LLMResponseCache.make_key("m", MESSAGES, {"temperature": 0.7}) != key
+
+    def test_ttl_and_lru_eviction(self, tmp_path, monkeypatch):
+        """过期条目视为未命中；超出上限时淘汰最久未访问的条目"""
+        clock = [1000.0]
+        monkeypatch.setattr(llm_cache.time, "time", lambda: clock[0])
+        cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"), ttl=60, max_entries=2)
+        cache.put("a", "m", "A")
+        cache.put("b", "m", "B")
+        clock[0] += 1
+        assert cache.get("a") == "A"
+        clock[0] += 1
+        cache.put("c", "m", "C")
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+
+        clock[0] += 120
+        assert cache.get("c") is None
+        cache.close()
+
+    def test_replay_and_record_modes(self, tmp_path):
+        """回放模式忽略TTL且未命中报错；录制模式不读缓存"""
+        path = str(tmp_path / "llm.sqlite3")
+        recorder = LLMResponseCache(path, mode="record")
+        recorder.put("a", "m", "A")
+        assert recorder.get("a") is None
+        recorder.close()
+
+        replay = LLMResponseCache(path, ttl=1e-6, mode="replay")
+        assert replay.get("a") == "A"
+        with pytest.raises(LLMCacheMiss):
+            replay.get("missing", node="ReflectionNode")
+        replay.put("b", "m", "B")
+        assert replay.stats()["entries"] == 1
+        replay.close()
+
+    def test_per_node_hit_rate(self, tmp_path):
+        """stats 中按节点给出命中率"""
+        cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+        cache.put("a", "m", "A")
+        cache.get("a", node="FirstSearchNode")
+        cache.get("b", node="FirstSearchNode")
+        cache.get("a", node="ReflectionNode")
+        stats = cache.stats()
+        assert stats["nodes"]["FirstSearchNode"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+        assert stats["nodes"]["ReflectionNode"]["hit_rate"] == 1.0
+        assert stats["hit_rate"] == round(2 / 3, 4)
+        cache.close()
+
+    def test_llm_client_serves_hits_without_calling_provider(self, tmp_path, monkeypatch):
+        """命中缓存时 LLMClient 不再请求模型服务，时间前缀不影响命中"""
+        cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+        monkeypatch.setattr(llm_client_module, "get_llm_cache", lambda: cache)
+        try:
+            with StubChatServer(lambda hit: [f"回答{hit}"]) as server:
+                client = llm_client_module.LLMClient("key", "test-model", server.base_url)
+                node_client = client.for_node("FirstSearchNode")
+
+                assert node_client.invoke("你是分析师", "总结舆情") == "回答1"
+                assert node_client.invoke("你是分析师", "总结舆情\n") == "回答1"
+                assert node_client.invoke("你是分析师", "总结舆情", temperature=0.9) == "回答2"
+                assert server.hits == 2
+                assert cache.stats()["nodes"]["FirstSearchNode"]["hits"] == 1
+                assert client.node_name is None
+        finally:
+            cache.close()
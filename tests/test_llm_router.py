@@ -0,0 +1,175 @@
+"""
+测试utils/llm_router.py中的LLM对冲请求、备用模型路由与熔断
+
+覆盖：
+1. 主接口首token过慢时按SLO发出对冲请求，备用接口胜出，主接口的连接被关闭
+2. 主接口正常时不发出对冲请求
+3. 对冲延迟取首token耗时 p95 并以节点SLO为上限
+4. 主接口连续失败后熔断并直接路由到备用接口，冷却期后放行探测请求
+5. 阻塞在响应头之前被取消的主接口请求立即归还限流并发名额
+6. 未发出的备用请求不占用其半开熔断器的探测机会
+7. 备用模型胜出时不以主模型的缓存键缓存结果
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from openai import OpenAI
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.llm_stub_server import StubChatServer, llm_client_module
+
+import llm_router
+import rate_limiter
+from llm_cache import LLMResponseCache
+
+
+class TestLLMRouter:
+    """测试对冲请求、故障转移与熔断"""
+
+    @classmethod
+    def setup_class(cls):
+        cls.servers = {
+            name: StubChatServer([f"来自{name}"] + ["。"] * 40, model=name, chunk_interval=0.01).start()
+            for name in ("primary", "fallback")
+        }
+        cls.urls = {name: server.base_url for name, server in cls.servers.items()}
+        rate_limiter.configure_rate_limits(enabled=False)
+
+    @classmethod
+    def teardown_class(cls):
+        for server in cls.servers.values():
+            server.stop()
+        rate_limiter.configure_rate_limits()
+        llm_router.configure_llm_router()
+
+    @pytest.fixture(autouse=True)
+    def _reset(self, monkeypatch):
+        monkeypatch.setattr(llm_client_module, "get_llm_cache", lambda: None)
+        for server in self.servers.values():
+            server.reset()
+
+    def _client(self, node="FirstSearchNode"):
+        client = llm_client_module.LLMClient("key", "primary-model", self.urls["primary"])
+        client.router = llm_router.HedgedRouter([
+            llm_router.LLMEndpoint("primary", client.client, "primary-model", self.urls["primary"]),
+            llm_router.LLMEndpoint(
+                "fallback", OpenAI(api_key="key", base_url=self.urls["fallback"], max_retries=0),
+                "fallback-model", self.urls["fallback"],
+            ),
+        ])
+        return client.for_node(node)
+
+    def test_hedge_to_fallback_when_primary_slow(self):
+        """主接口首token超过SLO时向备用接口对冲，备用先返回则胜出，主接口连接被关闭"""
+        llm_router.configure_llm_router(slo_overrides={"FirstSearchNode": 0.2})
+        self.servers["primary"].delay = 2.0
+        seen = []
+
+        started = time.monotonic()
+        result = self._client().invoke("系统", "问题", stream=True, on_chunk=lambda text, stats: seen.append(stats))
+
+        assert result.startswith("来自fallback")
+        assert time.monotonic() - started < 1.5
+        assert seen[-1].model == "fallback-model"
+        assert self.servers["fallback"].hits == 1
+        assert self.servers["primary"].aborted.wait(timeout=5)
+        stats = llm_router.llm_router_stats()
+        assert stats["127.0.0.1/primary-model"]["hedges"] == 1
+        assert stats["127.0.0.1/fallback-model"]["wins"] == 1
+
+    def test_no_hedge_when_primary_fast(self):
+        """主接口在对冲延迟内返回时不请求备用接口，非流式调用同样经路由返回完整文本"""
+        llm_router.configure_llm_router(slo_overrides={"FirstSearchNode": 1.0})
+        self.servers["primary"].delay = 0.05
+
+        result = self._client().invoke("系统", "问题")
+
+        assert result == "来自primary" + "。" * 40
+        assert self.servers["fallback"].hits == 0
+        assert llm_router.llm_router_stats()["127.0.0.1/primary-model"]["wins"] == 1
+
+    def test_hedge_delay_from_p95(self):
+        """样本不足时对冲延迟等于节点SLO，样本足够时取 p95 并以SLO为上限"""
+        llm_router.configure_llm_router(slo_overrides={"FirstSearchNode": 2.0, "ReflectionNode": 0.5})
+        router = self._client().router
+        primary = router.endpoints[0]
+        health = llm_router.get_endpoint_health(primary.base_url, primary.model)
+
+        assert router.hedge_delay(primary, "FirstSearchNode") == 2.0
+        for latency in [0.1 * i for i in range(1, 21)]:
+            health.add_latency(latency)
+        assert abs(router.hedge_delay(primary, "FirstSearchNode") - 1.9) < 1e-9
+        assert router.hedge_delay(primary, "ReflectionNode") == 0.5
+
+    def test_circuit_breaker_skips_degraded_provider(self):
+        """主接口连续失败时立即转到备用接口；熔断后不再请求主接口，冷却期后放行探测并恢复"""
+        llm_router.configure_llm_router(failure_threshold=2, reset_timeout=0.5)
+        self.servers["primary"].fail_status = 500
+        client = self._client()
+
+        for _ in range(2):
+            assert client.invoke("系统", "问题").startswith("来自fallback")
+        assert self.servers["primary"].hits == 2
+        assert llm_router.llm_router_stats()["127.0.0.1/primary-model"]["state"] == "open"
+
+        assert client.invoke("系统", "问题").startswith("来自fallback")
+        assert self.servers["primary"].hits == 2
+
+        time.sleep(0.6)
+        self.servers["primary"].fail_status = None
+        assert client.invoke("系统", "问题").startswith("来自primary")
+        assert self.servers["primary"].hits == 3
+        assert llm_router.llm_router_stats()["127.0.0.1/primary-model"]["state"] == "closed"
+
+    def test_cancelled_attempt_releases_rate_limit_slot(self):
+        """主接口阻塞在返回响应头之前，备用胜出后主接口的并发名额立即归还，后续请求不必等待"""
+        llm_router.configure_llm_router(slo_overrides={"FirstSearchNode": 0.2})
+        rate_limiter.configure_rate_limits(overrides={"default": {"requests_per_sec": 0, "max_in_flight": 1}})
+        try:
+            self.servers["primary"].header_delay = 3.0
+            assert self._client().invoke("系统", "问题").startswith("来自fallback")
+
+            limiter = rate_limiter.get_rate_limiter(self.urls["primary"], "primary-model")
+            assert limiter.in_flight == 0
+            started = time.monotonic()
+            with limiter.acquire():
+                pass
+            assert time.monotonic() - started < 0.5
+        finally:
+            rate_limiter.configure_rate_limits(enabled=False)
+
+    def test_unlaunched_fallback_keeps_half_open_probe(self):
+        """主接口正常返回时不调用备用接口熔断器的 allow()，其半开探测机会留给真正的备用请求"""
+        llm_router.configure_llm_router(failure_threshold=1, reset_timeout=1.0)
+        client = self._client()
+        fallback = client.router.endpoints[1]
+        breaker = llm_router.get_endpoint_health(fallback.base_url, fallback.model).breaker
+        breaker.record(False)
+        time.sleep(1.1)
+        assert breaker.state == "half_open"
+
+        assert client.invoke("系统", "问题").startswith("来自primary")
+        assert self.servers["fallback"].hits == 0
+        assert breaker.allow()
+
+    def test_fallback_output_not_cached_under_primary(self, tmp_path, monkeypatch):
+        """备用模型生成的结果不写入缓存，主模型生成的结果正常缓存"""
+        llm_router.configure_llm_router(slo_overrides={"FirstSearchNode": 0.2})
+        cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+        monkeypatch.setattr(llm_client_module, "get_llm_cache", lambda: cache)
+        try:
+            self.servers["primary"].delay = 2.0
+            assert self._client().invoke("系统", "问题").startswith("来自fallback")
+            assert cache.stats()["entries"] == 0
+
+            self.servers["primary"].delay = 0.0
+            assert self._client().invoke("系统", "问题").startswith("来自primary")
+            assert cache.stats()["entries"] == 1
+        finally:
+            cache.close()
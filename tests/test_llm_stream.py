@@ -0,0 +1,120 @@
+"""
+测试utils/llm_stream.py中的LLM流式输出工具及 LLMClient 的流式调用
+
+覆盖：
+1. 流式调用通过本地 OpenAI 兼容SSE服务逐块接收，on_chunk 按间隔收到逐步增长的文本，结束时收到全文
+2. 首token耗时与生成速度统计，请求要求返回usage并优先使用；接口拒绝 stream_options 时去掉后重试
+3. 进度日志行可被解析为部分输出
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.llm_stub_server import StubChatServer, llm_client_module
+
+from llm_stream import STREAM_PROGRESS_MARKER, StreamAssembler, StreamStats, parse_stream_progress
+
+CHUNKS = ["<html>", "<body>", "舆情报告", "</body>", "</html>"]
+
+
+class TestLLMStream:
+    """测试流式调用与进度统计"""
+
+    @classmethod
+    def setup_class(cls):
+        # 首块前等待 0.2 秒，请求要求时最后返回usage
+        cls.server = StubChatServer(
+            CHUNKS, usage={"prompt_tokens": 10, "completion_tokens": 12, "total_tokens": 22}, chunk_interval=0.02,
+        ).start()
+        cls.server.delay = 0.2
+        cls.base_url = cls.server.base_url
+
+    @classmethod
+    def teardown_class(cls):
+        cls.server.stop()
+
+    @pytest.fixture(autouse=True)
+    def _no_llm_cache(self, monkeypatch):
+        monkeypatch.setattr(llm_client_module, "get_llm_cache", lambda: None)
+        self.server.reset()
+        self.server.delay = 0.2
+
+    def test_stream_invoke_assembles_chunks(self):
+        """stream=True 时返回完整文本，on_chunk 逐块收到增长的文本和统计"""
+        client = llm_client_module.LLMClient("key", "test-model", self.base_url).for_node("HTMLGenerationNode")
+        seen = []
+
+        result = client.invoke("系统", "生成报告", stream=True, on_chunk=lambda text, stats: seen.append((text, stats)))
+
+        assert result == "".join(CHUNKS)
+        assert self.server.requests[-1]["stream"] is True
+        assert self.server.requests[-1]["stream_options"] == {"include_usage": True}
+        # 首块到达时立即回调，之后在回调间隔内的块合并到结束时的一次回调
+        assert [text for text, _ in seen] == [CHUNKS[0], "".join(CHUNKS)]
+        stats = seen[-1][1]
+        assert stats.node == "HTMLGenerationNode"
+        assert stats.ttft >= 0.2
+        assert stats.tokens == 12
+        assert stats.tokens_per_sec > 0
+
+    def test_stream_invoke_generator_yields_deltas(self):
+        """stream_invoke 逐块产出文本增量，传入的 stats 在结束后可读"""
+        client = llm_client_module.LLMClient("key", "test-model", self.base_url)
+        stats = StreamStats("test-model")
+
+        assert list(client.stream_invoke("系统", "生成报告", stats=stats)) == CHUNKS
+        assert stats.chunks == len(CHUNKS)
+        assert stats.duration >= stats.ttft > 0
+
+    def test_stream_retries_without_stream_options_when_rejected(self):
+        """接口拒绝 stream_options 时去掉后重试，之后的请求不再携带；无usage时以块数近似token数"""
+        self.server.reject_stream_options = True
+        client = llm_client_module.LLMClient("key", "no-usage-model", self.base_url)
+        stats = StreamStats("no-usage-model")
+
+        assert list(client.stream_invoke("系统", "生成报告", stats=stats)) == CHUNKS
+        assert stats.completion_tokens is None
+        assert stats.tokens == len(CHUNKS)
+        assert list(client.stream_invoke("系统", "生成报告")) == CHUNKS
+        assert ["stream_options" in request for request in self.server.requests] == [True, False, False]
+
+    def test_assembler_callback_interval(self):
+        """callback_interval<=0 时每块回调；有间隔时结束前补一次全文回调"""
+        every_chunk = []
+        assembler = StreamAssembler(StreamStats("m"), lambda text, stats: every_chunk.append(text),
+                                    log_interval=0, callback_interval=0)
+        for chunk in CHUNKS:
+            assembler.feed(chunk)
+        assembler.finish()
+        assert every_chunk == ["".join(CHUNKS[:i + 1]) for i in range(len(CHUNKS))]
+
+        throttled = []
+        assembler = StreamAssembler(StreamStats("m"), lambda text, stats: throttled.append(text),
+                                    log_interval=0, callback_interval=60)
+        for chunk in CHUNKS:
+            assembler.feed(chunk)
+        assert throttled == [CHUNKS[0]]
+        assert assembler.finish() == "".join(CHUNKS)
+        assert throttled == [CHUNKS[0], "".join(CHUNKS)]
+
+    def test_progress_line_round_trip(self):
+        """进度日志行可解析回部分输出，非进度行返回 None"""
+        stats = StreamStats("test-model", "FirstSummaryNode")
+        assembler = StreamAssembler(stats, log_interval=0)
+        for chunk in CHUNKS:
+            assembler.feed(chunk)
+        payload = {**stats.to_dict(), "preview": assembler.text, "done": False}
+        line = f"2025-01-01 10:00:00.000 | INFO | llm_stream:_log_progress:120 - [FirstSummaryNode] {STREAM_PROGRESS_MARKER} " \
+               f"{json.dumps(payload, ensure_ascii=False)}"
+
+        parsed = parse_stream_progress(line)
+        assert parsed["node"] == "FirstSummaryNode"
+        assert parsed["preview"] == "".join(CHUNKS)
+        assert parse_stream_progress("[FirstSummaryNode] 正在生成首次段落总结") is None
@@ -0,0 +1,69 @@
+"""
+测试utils/log_buffer.py中的日志环形缓冲区
+
+覆盖：
+1. 基于游标的增量读取
+2. 超出容量时丢弃最早的行并报告丢失行数
+3. 清空或服务重启后游标要求重置视图
+4. 写入时预解析的结果随行缓存
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.log_buffer import LogRingBuffer
+
+
+class TestLogRingBuffer:
+    """测试LogRingBuffer的游标语义"""
+
+    def test_incremental_reads(self):
+        """携带上次的next_offset只返回新增的行"""
+        buffer = LogRingBuffer(max_entries=10)
+        buffer.extend(['a', 'b'])
+        snapshot = buffer.since()
+        assert snapshot['lines'] == ['a', 'b'] and snapshot['next_offset'] == 2
+
+        buffer.append('c')
+        snapshot = buffer.since(snapshot['next_offset'])
+        assert snapshot['lines'] == ['c'] and not snapshot['reset']
+        assert buffer.since(snapshot['next_offset'])['lines'] == []
+
+    def test_bounded_size(self):
+        """超出容量后只保留最近的行，落后的游标得到剩余内容与丢失行数"""
+        buffer = LogRingBuffer(max_entries=3)
+        buffer.extend([str(i) for i in range(5)])
+        assert len(buffer) == 3
+
+        snapshot = buffer.since(1)
+        assert snapshot['lines'] == ['2', '3', '4']
+        assert snapshot['dropped'] == 1
+
+    def test_clear_and_stale_cursor_reset(self):
+        """清空后旧游标与来自其他进程的游标都要求重置视图"""
+        buffer = LogRingBuffer(max_entries=10)
+        buffer.extend(['old1', 'old2'])
+        buffer.clear()
+        buffer.append('new')
+
+        snapshot = buffer.since(1)
+        assert snapshot['reset'] and snapshot['lines'] == ['new']
+        assert buffer.since()['lines'] == ['new']
+        assert buffer.since(100)['reset']
+        assert not buffer.since(snapshot['next_offset'])['reset']
+
+    def test_parsed_entries_and_seed(self, tmp_path):
+        """预解析结果只保留非空项；从已有日志文件初始化"""
+        log_file = tmp_path / 'forum.log'
+        log_file.write_text('[10:00:00] [QUERY] hi\n\nnoise\n', encoding='utf-8')
+        buffer = LogRingBuffer(max_entries=10, parser=lambda line: {'line': line} if '[QUERY]' in line else None)
+        buffer.seed_from_file(log_file)
+
+        snapshot = buffer.since()
+        assert snapshot['lines'] == ['[10:00:00] [QUERY] hi', 'noise']
+        assert snapshot['parsed'] == [{'line': '[10:00:00] [QUERY] hi'}]
+        assert buffer.append('[10:00:01] [QUERY] again') == {'line': '[10:00:01] [QUERY] again'}
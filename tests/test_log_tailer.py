@@ -0,0 +1,106 @@
+"""
+测试ForumEngine/log_tailer.py中的日志增量读取器
+
+覆盖：
+1. 以文件末尾为基线，只读取新增的完整行
+2. 未写完的行留到下次读取
+3. 日志被清空或替换时报告截断并重置基线，可回到开头重新读取
+4. 日志写入后能被事件唤醒（inotify可用时）
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from ForumEngine.log_tailer import LogTailer
+
+
+class TestLogTailer:
+    """测试LogTailer的增量读取行为"""
+
+    def setup_method(self, method):
+        self.tailers = []
+
+    def teardown_method(self, method):
+        for tailer in self.tailers:
+            tailer.close()
+
+    def _make_tailer(self, log_file: Path, **kwargs) -> LogTailer:
+        tailer = LogTailer({'insight': log_file}, **kwargs)
+        self.tailers.append(tailer)
+        tailer.seek_to_end()
+        return tailer
+
+    def test_reads_only_new_complete_lines(self, tmp_path):
+        """基线之前的内容不读取，未写完的行等待换行后再返回"""
+        log_file = tmp_path / 'insight.log'
+        log_file.write_text('old line\n', encoding='utf-8')
+        tailer = self._make_tailer(log_file)
+
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write('第一行\n\n第二')
+        result = tailer.read('insight')
+        assert result.grew and not result.truncated
+        assert result.lines == ['第一行']
+
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write('行\n')
+        assert tailer.read('insight').lines == ['第二行']
+        assert not tailer.read('insight').grew
+
+    def test_truncation_and_replacement(self, tmp_path):
+        """清空或替换日志时报告截断，之后从新的末尾继续读取"""
+        log_file = tmp_path / 'insight.log'
+        log_file.write_text('a\nb\n', encoding='utf-8')
+        tailer = self._make_tailer(log_file)
+
+        log_file.write_text('', encoding='utf-8')
+        assert tailer.read('insight').truncated
+
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write('c\n')
+        assert tailer.read('insight').lines == ['c']
+
+        replacement = tmp_path / 'insight.log.new'
+        replacement.write_text('rotated\n', encoding='utf-8')
+        replacement.replace(log_file)
+        assert tailer.read('insight').truncated
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write('d\n')
+        assert tailer.read('insight').lines == ['d']
+
+        tailer.rewind('insight')
+        assert tailer.read('insight').lines == ['rotated', 'd']
+
+    def test_missing_file_is_read_from_start_once_created(self, tmp_path):
+        """启动时不存在的日志，创建后从头读取"""
+        log_file = tmp_path / 'insight.log'
+        tailer = self._make_tailer(log_file, use_inotify=False)
+        assert tailer.read('insight').lines == []
+
+        log_file.write_text('first\n', encoding='utf-8')
+        assert tailer.read('insight').lines == ['first']
+
+    def test_wait_for_change_wakes_on_write(self, tmp_path):
+        """inotify可用时写入后应在超时前被唤醒"""
+        log_file = tmp_path / 'insight.log'
+        log_file.write_text('', encoding='utf-8')
+        tailer = self._make_tailer(log_file)
+        if not tailer.event_driven:
+            return
+
+        def append_later():
+            time.sleep(0.1)
+            with open(log_file, 'a', encoding='utf-8') as f:
+                f.write('event\n')
+
+        threading.Thread(target=append_later).start()
+        started = time.monotonic()
+        assert tailer.wait_for_change(timeout=5.0)
+        assert time.monotonic() - started < 2.0
+        assert tailer.read('insight').lines == ['event']
@@ -170,6 +170,20 @@ class TestLogMonitor:
         assert len(result) > 0
         assert any("混合格式内容" in content for content in result)
     
+    def test_stream_progress_lines_update_partial_output(self):
+        """流式生成进度行只更新部分输出，不作为发言捕获"""
+        lines = [
+            '2025-01-01 10:00:00.000 | INFO     | llm_stream:_log_progress:120 - [FirstSummaryNode] [流式进度] '
+            '{"node": "FirstSummaryNode", "chars": 42, "ttft": 1.2, "preview": "{\\"paragraph_latest_state\\": \\"部分总结内容", "done": false}',
+            '2025-01-01 10:00:05.000 | INFO     | llm_stream:finish:110 - [FirstSummaryNode] 流式生成完成 - 首token耗时: 1.20s, '
+            '总耗时: 5.00s, 输出: 420 字符/300 tokens, 速度: 78.9 tokens/s',
+        ]
+        result = self.monitor.process_lines_for_json(lines, "query")
+        assert result == []
+        partial = self.monitor.get_partial_outputs()["query"]
+        assert partial["chars"] == 42
+        assert "部分总结内容" in partial["preview"]
+    
     def test_is_valuable_content(self):
         """测试有价值内容的判断"""
         # 包含"清理后的输出"应该是有价值的
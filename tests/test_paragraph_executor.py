@@ -0,0 +1,89 @@
+"""
+测试utils/paragraph_executor.py中的段落并行执行器
+
+覆盖：
+1. 并行执行时总耗时接近最慢段落，结果按段落索引写回
+2. 每个段落开始和完成时的进度事件
+3. stop_event 置位后不再启动新段落并抛出 InterruptedError
+4. 段落失败时异常传给调用方，未开始的段落被取消
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils import paragraph_executor
+from utils.paragraph_executor import ParagraphExecutor
+
+# 与执行器抛出的是同一个 retry_helper.InterruptedError
+StopError = paragraph_executor.InterruptedError
+
+
+class TestParagraphExecutor:
+    """测试ParagraphExecutor的并发、进度与停止语义"""
+
+    def test_parallel_run_keeps_paragraph_order(self):
+        """6个段落并行处理，耗时接近单个段落，结果按索引落位"""
+        results = [None] * 6
+
+        def process(index):
+            time.sleep(0.2)
+            results[index] = f"段落{index}"
+
+        started = time.monotonic()
+        ParagraphExecutor(max_workers=6).run(process, 6)
+        assert time.monotonic() - started < 0.6
+        assert results == [f"段落{i}" for i in range(6)]
+
+    def test_progress_events(self):
+        """每个段落各有一次 running 和 completed 事件，完成数单调递增"""
+        events = []
+        lock = threading.Lock()
+
+        def on_progress(event):
+            with lock:
+                events.append(event)
+
+        ParagraphExecutor(max_workers=2, on_progress=on_progress).run(lambda index: time.sleep(0.05), 4)
+
+        assert sorted(e.index for e in events if e.status == "running") == [0, 1, 2, 3]
+        completed = [e.completed for e in events if e.status == "completed"]
+        assert completed == [1, 2, 3, 4]
+        assert all(len(e.running) <= 2 for e in events)
+
+    def test_stop_event_prevents_new_paragraphs(self):
+        """处理中置位停止事件后，剩余段落不再开始"""
+        stop_event = threading.Event()
+        processed = []
+
+        def process(index):
+            processed.append(index)
+            stop_event.set()
+
+        with pytest.raises(StopError):
+            ParagraphExecutor(max_workers=1, stop_event=stop_event).run(process, 3)
+        assert processed == [0]
+        # 停止信号使用 retry_helper 中的异常类型，调用方可与 LLM 客户端的中断一并处理
+        assert StopError.__module__.split(".")[-1] == "retry_helper"
+
+    def test_failure_propagates_and_cancels_pending(self):
+        """段落异常抛给调用方，排队中的段落不再执行"""
+        processed = []
+
+        def process(index):
+            processed.append(index)
+            if index == 0:
+                raise ValueError("搜索失败")
+            time.sleep(0.2)
+
+        with pytest.raises(ValueError, match="搜索失败"):
+            ParagraphExecutor(max_workers=2).run(process, 6)
+        time.sleep(0.3)
+        assert len(processed) < 6
@@ -0,0 +1,205 @@
+"""
+测试MindSpider/DeepSentimentCrawling/platform_crawler.py中的多平台并行爬取
+
+覆盖：
+1. build_crawl_command 通过命令行参数传入本次运行的配置
+2. 多平台并行运行时同时运行的平台数受 max_workers 限制
+3. 端到端运行 MediaCrawler 子进程（用小脚本代替），实时统计与平台独立日志（写入临时目录）
+4. _merge_platform_result 合并成功/失败平台的结果
+5. _update_live_stats 按 MediaCrawler 的实际日志格式统计内容、评论与错误
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录与 DeepSentimentCrawling 目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "MindSpider" / "DeepSentimentCrawling"))
+
+import logging_utils
+import platform_crawler
+from platform_crawler import PlatformCrawler
+
+
+@pytest.fixture
+def crawler(tmp_path, monkeypatch):
+    """平台日志写入临时目录，数据库类型固定为 MySQL"""
+    monkeypatch.setattr(logging_utils, "PROJECT_ROOT", tmp_path)
+    monkeypatch.setattr(platform_crawler.config.settings, "DB_DIALECT", "mysql")
+    monkeypatch.delenv("MEDIACRAWLER_HEADLESS", raising=False)
+    return PlatformCrawler()
+
+
+def _new_total_stats(platforms):
+    return {
+        "total_keywords": 0,
+        "total_platforms": len(platforms),
+        "total_tasks": 0,
+        "successful_tasks": 0,
+        "failed_tasks": 0,
+        "total_notes": 0,
+        "total_comments": 0,
+        "keyword_results": {},
+        "platform_summary": {
+            platform: {"successful_keywords": 0, "failed_keywords": 0, "total_notes": 0, "total_comments": 0}
+            for platform in platforms
+        },
+    }
+
+
+class TestBuildCrawlCommand:
+    """测试MediaCrawler命令行的构建"""
+
+    def test_run_config_passed_as_arguments(self, crawler):
+        """关键词、平台、数量等配置全部作为命令行参数传入"""
+        cmd = crawler.build_crawl_command("xhs", ['武汉"大学', " 樱花 ", ""], login_type="cookie", max_notes=30)
+        assert cmd[:2] == [sys.executable, "main.py"]
+        args = dict(zip(cmd[2::2], cmd[3::2]))
+        assert args == {
+            "--platform": "xhs",
+            "--lt": "cookie",
+            "--type": "search",
+            "--keywords": "武汉大学,樱花",
+            "--save_data_option": "db",
+            "--get_comment": "true",
+            "--max_notes": "30",
+            "--max_comments": "20",
+        }
+
+    def test_postgresql_and_headless(self, crawler, monkeypatch):
+        """PostgreSQL 数据库与 MEDIACRAWLER_HEADLESS 开关"""
+        monkeypatch.setattr(platform_crawler.config.settings, "DB_DIALECT", "postgres")
+        monkeypatch.setenv("MEDIACRAWLER_HEADLESS", "off")
+        cmd = crawler.build_crawl_command("dy", ["a"])
+        args = dict(zip(cmd[2::2], cmd[3::2]))
+        assert args["--save_data_option"] == "postgresql"
+        assert args["--headless"] == "false"
+
+    def test_does_not_touch_base_config(self, crawler):
+        """不再改写共享的 base_config.py"""
+        base_config = crawler.mediacrawler_path / "config" / "base_config.py"
+        before = base_config.read_bytes()
+        crawler.build_crawl_command("xhs", ["a"])
+        assert base_config.read_bytes() == before
+
+
+class TestParallelCrawl:
+    """测试多平台并行爬取"""
+
+    def test_max_workers_limits_running_platforms(self, crawler, monkeypatch):
+        """同时运行的平台数不超过 max_workers，所有平台的结果都被合并"""
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+
+        def fake_run_crawler(platform, keywords, login_type, max_notes):
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.2)
+            with lock:
+                running["now"] -= 1
+            if platform == "ks":
+                raise RuntimeError("boom")
+            return {"platform": platform, "success": True, "notes_count": 2, "comments_count": 3}
+
+        monkeypatch.setattr(crawler, "run_crawler", fake_run_crawler)
+        stats = crawler.run_multi_platform_crawl_by_keywords(
+            ["k1", "k2"], ["xhs", "dy", "ks", "bili"], max_workers=2
+        )
+
+        assert running["peak"] == 2
+        assert stats["successful_tasks"] == 6
+        assert stats["failed_tasks"] == 2
+        assert stats["total_notes"] == 6
+        assert stats["platform_summary"]["ks"]["failed_keywords"] == 2
+        assert stats["keyword_results"]["k1"]["ks"]["error"] == "boom"
+
+    def test_subprocess_stats_and_platform_logs(self, crawler, monkeypatch, tmp_path):
+        """并行运行子进程，按输出实时统计，各平台日志写入独立文件互不混入"""
+        script = (
+            "import sys, time\n"
+            "platform = sys.argv[1]\n"
+            "prefix = '2025-01-01 10:00:00 MediaCrawler'\n"
+            "print(f'{prefix} INFO (store.py:1) - [store.{platform}.update_note] note 1', flush=True)\n"
+            "print(f'{prefix} INFO (store.py:1) - [store.{platform}.update_note] note 2', flush=True)\n"
+            "print(f'{prefix} INFO (store.py:1) - [store.{platform}.update_note_comment] comment 1', flush=True)\n"
+            "time.sleep(0.2)\n"
+            "sys.exit(0 if platform == 'xhs' else 3)\n"
+        )
+        monkeypatch.setattr(
+            crawler, "build_crawl_command",
+            lambda platform, *args, **kwargs: [sys.executable, "-c", script, platform],
+        )
+
+        stats = crawler.run_multi_platform_crawl_by_keywords(["k"], ["xhs", "dy"], max_workers=2)
+
+        assert stats["successful_tasks"] == 1
+        assert stats["total_notes"] == 2
+        assert stats["total_comments"] == 1
+        live = crawler.get_live_stats()
+        assert live["dy"]["status"] == "failed"
+        assert live["dy"]["return_code"] == 3
+        assert live["dy"]["notes_count"] == 2
+
+        xhs_log = (tmp_path / "logs" / "xiaohongshu.log").read_text(encoding="utf-8")
+        dy_log = (tmp_path / "logs" / "douyin.log").read_text(encoding="utf-8")
+        assert "[MediaCrawler:xhs]" in xhs_log and "[MediaCrawler:dy]" not in xhs_log
+        assert "[MediaCrawler:dy]" in dy_log and "[MediaCrawler:xhs]" not in dy_log
+
+
+class TestUpdateLiveStats:
+    """测试按MediaCrawler输出实时统计"""
+
+    PREFIX = "2025-01-01 10:00:00 MediaCrawler"
+
+    def test_counts_per_item_store_lines(self, crawler):
+        """只统计逐条写入的 update_* 存储日志，批量入口、创作者与错误日志不计为内容或评论"""
+        lines = [
+            f"{self.PREFIX} INFO (__init__.py:175) - [store.douyin.update_douyin_aweme] douyin aweme id:1",
+            f"{self.PREFIX} INFO (__init__.py:214) - [store.douyin.update_dy_aweme_comment] douyin aweme comment: 2",
+            f"{self.PREFIX} INFO (__init__.py:76) - [store.kuaishou.batch_update_ks_video_comments] video_id:3",
+            f"{self.PREFIX} INFO (__init__.py:109) - [store.kuaishou.update_ks_video_comment] Kuaishou video comment: 4",
+            f"{self.PREFIX} INFO (__init__.py:102) - [store.bilibili.update_up_info] bilibili user_id:5",
+            f"{self.PREFIX} INFO (__init__.py:236) - [store.douyin.save_creator] creator:6",
+            f"{self.PREFIX} ERROR (__init__.py:189) - [store.douyin.update_dy_aweme_comment] comment_aweme_id: 7 != aweme_id: 8",
+            f"{self.PREFIX} ERROR (core.py:42) - [DouYinCrawler.search] search failed",
+            f"{self.PREFIX} INFO (core.py:50) - [DouYinCrawler.search] ERROR | not a log level",
+            "Traceback (most recent call last):",
+        ]
+        stats = {"notes_count": 0, "comments_count": 0, "errors_count": 0}
+        for line in lines:
+            crawler._update_live_stats(stats, line)
+
+        assert stats == {"notes_count": 1, "comments_count": 2, "errors_count": 3}
+
+
+class TestMergePlatformResult:
+    """测试单个平台结果的合并"""
+
+    def test_merge_success_and_failure(self):
+        """成功平台累加数量，失败平台记为所有关键词失败"""
+        total_stats = _new_total_stats(["xhs", "dy"])
+        keywords = ["k1", "k2", "k3"]
+
+        PlatformCrawler._merge_platform_result(
+            total_stats, "xhs", keywords, {"success": True, "notes_count": 5, "comments_count": 7}
+        )
+        PlatformCrawler._merge_platform_result(
+            total_stats, "dy", keywords, {"success": False, "error": "登录失败"}
+        )
+
+        assert total_stats["successful_tasks"] == 3
+        assert total_stats["failed_tasks"] == 3
+        assert total_stats["total_notes"] == 5
+        assert total_stats["total_comments"] == 7
+        assert total_stats["platform_summary"]["xhs"] == {
+            "successful_keywords": 3, "failed_keywords": 0, "total_notes": 5, "total_comments": 7,
+        }
+        assert total_stats["platform_summary"]["dy"]["failed_keywords"] == 3
+        assert set(total_stats["keyword_results"]["k2"]) == {"xhs", "dy"}
+        assert total_stats["keyword_results"]["k2"]["dy"]["error"] == "登录失败"
@@ -0,0 +1,190 @@
+"""
+测试utils/rate_limiter.py中的按提供方限流器及 utils/retry_helper.py 的 Retry-After 处理
+
+覆盖：
+1. 每秒请求数与每分钟token数的令牌桶限速
+2. 多线程下同时进行的请求数不超过上限
+3. 本地服务返回 429 + Retry-After 时暂停同一提供方的所有请求，重试按 Retry-After 等待，过长的 Retry-After 被截断
+4. 除超时/限流外的 4xx 不重试
+5. 按 BaseUrl/模型识别提供方，同一键共用一个限流器，RATE_LIMITS 覆盖默认限额
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+# 添加 utils 目录到路径，与 LLMClient 一样以顶层模块名导入，rate_limiter 与测试使用同一个 retry_helper
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "utils"))
+
+import rate_limiter
+import retry_helper
+from rate_limiter import ProviderRateLimiter, RateLimit
+
+
+class _FakeProviderHandler(BaseHTTPRequestHandler):
+    """/slow 处理 0.1 秒并统计并发数；/throttle 首次返回 429 + Retry-After，/throttle-long 的 Retry-After 为1小时；
+    /bad 总是返回 400"""
+
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+    hits = {}
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.hits[self.path] = cls.hits.get(self.path, 0) + 1
+            hit = cls.hits[self.path]
+        if self.path == "/slow":
+            with cls.lock:
+                cls.running += 1
+                cls.peak = max(cls.peak, cls.running)
+            time.sleep(0.1)
+            with cls.lock:
+                cls.running -= 1
+            self._reply(200)
+        elif self.path == "/throttle":
+            self._reply(429 if hit == 1 else 200, {"Retry-After": "1"} if hit == 1 else None)
+        elif self.path == "/throttle-long":
+            self._reply(429 if hit == 1 else 200, {"Retry-After": "3600"} if hit == 1 else None)
+        else:
+            self._reply(400)
+
+    def _reply(self, status, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestRateLimiter:
+    """测试ProviderRateLimiter的限速、并发与Retry-After语义"""
+
+    @classmethod
+    def setup_class(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeProviderHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def teardown_class(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        rate_limiter.configure_rate_limits()
+
+    def test_requests_per_sec(self):
+        """10 rps 下先放行1秒额度的突发（10个），之后按 0.1 秒间隔放行"""
+        limiter = ProviderRateLimiter("test", RateLimit(requests_per_sec=10))
+        started = time.monotonic()
+        for _ in range(15):
+            with limiter.acquire():
+                pass
+        assert 0.45 <= time.monotonic() - started < 1.0
+
+    def test_tokens_per_min(self):
+        """预扣超出每分钟token额度时等待补充，实际用量低于预估时退还"""
+        limiter = ProviderRateLimiter("test", RateLimit(tokens_per_min=6000))
+        with limiter.acquire(tokens=6000) as lease:
+            lease.report_tokens(5970)
+        started = time.monotonic()
+        with limiter.acquire(tokens=50):
+            pass
+        assert 0.15 <= time.monotonic() - started < 0.5
+
+    def test_max_in_flight_across_threads(self):
+        """8个线程并发请求本地服务，同时进行的请求数不超过2"""
+        limiter = ProviderRateLimiter("test", RateLimit(max_in_flight=2))
+        _FakeProviderHandler.peak = 0
+
+        def call():
+            with limiter.acquire():
+                requests.get(f"{self.url}/slow", timeout=5)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: call(), range(8)))
+        assert _FakeProviderHandler.peak == 2
+        assert limiter.stats()["requests"] == 8
+        assert limiter.in_flight == 0
+
+    def test_retry_after_pauses_provider(self):
+        """429 + Retry-After 暂停同一提供方，重试按 Retry-After 等待后成功"""
+        limiter = ProviderRateLimiter("test", RateLimit(max_in_flight=4))
+        config = retry_helper.RetryConfig(max_retries=2, initial_delay=10.0, max_delay=10.0)
+
+        @retry_helper.with_retry(config)
+        def call():
+            with limiter.acquire():
+                response = requests.get(f"{self.url}/throttle", timeout=5)
+                response.raise_for_status()
+                return response.status_code
+
+        started = time.monotonic()
+        assert call() == 200
+        assert 0.9 <= time.monotonic() - started < 5
+        assert limiter.stats()["throttled"] == 1
+
+        # 暂停期间其他线程的请求同样被推迟
+        limiter.pause(0.3)
+        started = time.monotonic()
+        with limiter.acquire():
+            pass
+        assert time.monotonic() - started >= 0.25
+
+    def test_long_retry_after_is_capped(self, monkeypatch):
+        """Retry-After 超过 max_delay 时按 max_delay 等待，提供方暂停不超过 MAX_THROTTLE_PAUSE_SEC"""
+        monkeypatch.setattr(rate_limiter, "MAX_THROTTLE_PAUSE_SEC", 0.3)
+        limiter = ProviderRateLimiter("test", RateLimit(max_in_flight=4))
+        config = retry_helper.RetryConfig(max_retries=2, initial_delay=0.1, max_delay=0.5)
+
+        @retry_helper.with_retry(config)
+        def call():
+            with limiter.acquire():
+                response = requests.get(f"{self.url}/throttle-long", timeout=5)
+                response.raise_for_status()
+                return response.status_code
+
+        started = time.monotonic()
+        assert call() == 200
+        assert time.monotonic() - started < 2
+        assert limiter.stats()["throttled"] == 1
+
+    def test_client_errors_are_not_retried(self):
+        """400 属于请求本身的问题，不重试"""
+        config = retry_helper.RetryConfig(max_retries=3, initial_delay=0.01)
+        _FakeProviderHandler.hits.pop("/bad", None)
+
+        @retry_helper.with_retry(config)
+        def call():
+            requests.get(f"{self.url}/bad", timeout=5).raise_for_status()
+
+        with pytest.raises(requests.HTTPError):
+            call()
+        assert _FakeProviderHandler.hits["/bad"] == 1
+
+    def test_provider_registry_and_overrides(self):
+        """同一 BaseUrl/模型共用限流器；聚合平台按模型名识别提供方；RATE_LIMITS 覆盖默认值；关闭时返回 None"""
+        rate_limiter.configure_rate_limits(overrides={"gemini": {"max_in_flight": 1}})
+        kimi = rate_limiter.get_rate_limiter("https://api.moonshot.cn/v1", "kimi-k2-0711-preview")
+        assert kimi is rate_limiter.get_rate_limiter("https://api.moonshot.cn/v1", "kimi-k2-0711-preview")
+        assert kimi.name.startswith("kimi:")
+        gemini = rate_limiter.get_rate_limiter("https://aihubmix.com/v1", "gemini-2.5-pro")
+        assert gemini.name.startswith("gemini:")
+        assert gemini.limit.max_in_flight == 1
+        assert rate_limiter.detect_provider("https://api.tavily.com") == "tavily"
+        assert rate_limiter.detect_provider("https://api.bochaai.com/v1/ai-search") == "bocha"
+
+        rate_limiter.configure_rate_limits(enabled=False)
+        with rate_limiter.rate_limited("https://api.deepseek.com", "deepseek-chat") as lease:
+            assert lease is None
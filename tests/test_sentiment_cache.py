@@ -0,0 +1,51 @@
+"""
+测试InsightEngine/tools/sentiment_cache.py中的情感分析结果缓存
+
+覆盖：
+1. 模型标识参与缓存键
+2. 内存层LRU淘汰与命中统计
+3. SQLite磁盘层在重建实例后仍可命中
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from InsightEngine.tools.sentiment_cache import SentimentCache
+
+
+class TestSentimentCache:
+    """测试SentimentCache的两级缓存行为"""
+
+    def test_key_depends_on_model_identity(self):
+        """相同文本在不同模型标识下应得到不同的键"""
+        assert SentimentCache.make_key("好评", "model-a") == SentimentCache.make_key("好评", "model-a")
+        assert SentimentCache.make_key("好评", "model-a") != SentimentCache.make_key("好评", "model-b")
+
+    def test_lru_eviction_and_stats(self):
+        """超过容量时淘汰最久未使用的条目，并正确统计命中"""
+        cache = SentimentCache(max_entries=2)
+        cache.put_many({"a": [1.0], "b": [2.0]})
+        assert cache.get_many(["a"]) == {"a": [1.0]}  # a 变为最近使用
+        cache.put_many({"c": [3.0]})
+
+        assert cache.get_many(["a", "b", "c"]) == {"a": [1.0], "c": [3.0]}
+        stats = cache.stats()
+        assert stats["hits"] == 3
+        assert stats["misses"] == 1
+        assert stats["memory_entries"] == 2
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """磁盘层中的结果在新实例中可以命中并回填内存层"""
+        db_path = str(tmp_path / "cache" / "sentiment.sqlite3")
+        SentimentCache(max_entries=10, db_path=db_path).put_many({"k": [0.1, 0.9]})
+
+        cache = SentimentCache(max_entries=10, db_path=db_path)
+        assert cache.get_many(["k", "missing"]) == {"k": [0.1, 0.9]}
+        assert cache.stats()["memory_entries"] == 1
+
+        cache.clear()
+        assert cache.get_many(["k"]) == {}
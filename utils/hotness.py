@@ -0,0 +1,86 @@
+"""
+内容热度分值（hotness_score）的统一定义
+MediaCrawler 存储层在 upsert 内容时用 calculate_hotness_score 写入 hotness_score 列，
+InsightEngine 的 search_hot_content 对尚未维护该列的表回退为 hotness_sql 生成的实时计算表达式，
+两处共用这里唯一的一张权重表；互动数的转换与 SQL 中 `列 + 0.0` 的隐式数值转换一致
+（取字符串开头的数字部分，空串/非数字为 0），修改权重后在 MediaCrawler 目录下运行
+`python main.py --rebuild_hotness` 重算已有数据
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 权重定义
+W_LIKE = 1.0
+W_COMMENT = 5.0
+W_SHARE = 10.0  # 分享/转发/收藏/投币等高价值互动
+W_VIEW = 0.1
+W_DANMAKU = 0.5
+
+# 各内容表参与热度计算的 (字段, 权重)
+HOTNESS_FIELDS: Dict[str, List[Tuple[str, float]]] = {
+    "bilibili_video": [
+        ("liked_count", W_LIKE), ("video_comment", W_COMMENT), ("video_share_count", W_SHARE),
+        ("video_favorite_count", W_SHARE), ("video_coin_count", W_SHARE),
+        ("video_danmaku", W_DANMAKU), ("video_play_count", W_VIEW),
+    ],
+    "douyin_aweme": [
+        ("liked_count", W_LIKE), ("comment_count", W_COMMENT),
+        ("share_count", W_SHARE), ("collected_count", W_SHARE),
+    ],
+    "weibo_note": [("liked_count", W_LIKE), ("comments_count", W_COMMENT), ("shared_count", W_SHARE)],
+    "xhs_note": [
+        ("liked_count", W_LIKE), ("comment_count", W_COMMENT),
+        ("share_count", W_SHARE), ("collected_count", W_SHARE),
+    ],
+    "kuaishou_video": [("liked_count", W_LIKE), ("viewd_count", W_VIEW)],
+    "zhihu_content": [("voteup_count", W_LIKE), ("comment_count", W_COMMENT)],
+}
+
+# 与 MySQL/SQLite 字符串转数值的规则一致：跳过前导空白，取最长的十进制数字前缀（可带符号、小数和指数）
+_NUMBER_PREFIX = re.compile(r"\s*([+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)", re.ASCII)
+
+
+def to_number(value) -> float:
+    """
+    将互动数转换为数值，与 SQL 中 COALESCE(列 + 0.0, 0) 的结果一致：
+    NULL、空串与非数字为 0，"1.2万"、"10万+" 等取开头的数字部分
+    """
+    if value is None or isinstance(value, bool):
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER_PREFIX.match(str(value))
+    return float(match.group(1)) if match else 0.0
+
+
+def calculate_hotness_score(table_name: str, item: Dict) -> Optional[float]:
+    """
+    计算一条内容的热度分值
+    Args:
+        table_name: 内容表名
+        item: 内容数据（字段名与表字段一致）
+
+    Returns:
+        热度分值；不参与热度计算的表返回 None
+    """
+    fields = HOTNESS_FIELDS.get(table_name)
+    if fields is None:
+        return None
+    return sum(to_number(item.get(field)) * weight for field, weight in fields)
+
+
+def hotness_sql(table_name: str, quote: Callable[[str], str] = lambda field: f"`{field}`") -> Optional[str]:
+    """
+    生成按同一权重实时计算热度分值的 SQL 表达式
+    Args:
+        table_name: 内容表名
+        quote: 字段名的引用方式，默认 MySQL 反引号
+
+    Returns:
+        SQL 表达式；不参与热度计算的表返回 None
+    """
+    fields = HOTNESS_FIELDS.get(table_name)
+    if fields is None:
+        return None
+    return "(" + " + ".join(f"COALESCE({quote(field)} + 0.0, 0) * {weight}" for field, weight in fields) + ")"
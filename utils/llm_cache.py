@@ -0,0 +1,215 @@
+"""
+LLM响应缓存
+以“模型 + 规范化后的消息 + 采样参数”的哈希为键缓存各 Engine 的 LLMClient 调用结果，
+存储为带TTL、条目数有上限（按最近访问淘汰）的SQLite文件，默认关闭。
+
+模式（LLM_CACHE_MODE）：
+- off: 不使用缓存
+- on: 命中且未过期时直接返回，未命中时调用模型并写入
+- record: 总是调用模型并写入，用于录制一次完整运行
+- replay: 只读缓存且忽略TTL，未命中时抛出 LLMCacheMiss，用于测试和基准的确定性回放
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+CACHE_MODES = ("off", "on", "record", "replay")
+
+# 参与缓存键计算的采样参数
+CACHE_PARAM_KEYS = ("temperature", "top_p", "presence_penalty", "frequency_penalty", "max_tokens")
+
+
+class LLMCacheMiss(Exception):
+    """回放模式下缓存未命中"""
+
+
+class LLMResponseCache:
+    """SQLite 持久化的LLM响应缓存，线程安全"""
+
+    def __init__(self, db_path: str, ttl: float = 0, max_entries: int = 0, mode: str = "on"):
+        """
+        Args:
+            db_path: SQLite 缓存文件路径
+            ttl: 条目有效期（秒），<=0 表示不过期；回放模式忽略
+            max_entries: 最多保留的条目数，<=0 表示不限制
+            mode: on / record / replay
+        """
+        if mode not in CACHE_MODES or mode == "off":
+            raise ValueError(f"不支持的LLM缓存模式: {mode}")
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.mode = mode
+        self._node_stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def normalize_text(text: Optional[str]) -> str:
+        """统一换行并去掉行尾与首尾空白，避免格式差异导致缓存失效"""
+        if not text:
+            return ""
+        lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        return "\n".join(line.rstrip() for line in lines).strip()
+
+    @classmethod
+    def make_key(cls, model: str, messages: List[Dict[str, str]], params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        计算缓存键
+
+        Args:
+            model: 模型名称
+            messages: 对话消息（不含调用时才加入的当前时间前缀）
+            params: 采样参数，只取 CACHE_PARAM_KEYS 中且不为 None 的项
+        """
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": message.get("role", ""), "content": cls.normalize_text(message.get("content"))}
+                for message in messages
+            ],
+            "params": {
+                key: value for key, value in (params or {}).items()
+                if key in CACHE_PARAM_KEYS and value is not None
+            },
+        }
+        serialized = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    @property
+    def reads(self) -> bool:
+        """当前模式是否从缓存读取"""
+        return self.mode in ("on", "replay")
+
+    def get(self, key: str, node: Optional[str] = None) -> Optional[str]:
+        """
+        查询缓存并记录该节点的命中情况
+
+        Raises:
+            LLMCacheMiss: 回放模式下未命中
+        """
+        if not self.reads:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.mode != "replay" and self.ttl > 0 and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is not None:
+                self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            self._count(node, "hits" if row is not None else "misses")
+
+        if row is None and self.mode == "replay":
+            raise LLMCacheMiss(f"LLM缓存回放未命中: node={node or 'unknown'}, key={key[:12]}")
+        return row[0] if row is not None else None
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """写入缓存，超出条目上限时淘汰最久未访问的条目；回放模式不写入"""
+        if self.mode == "replay" or not response:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now),
+            )
+            if self.max_entries > 0:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key NOT IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def _count(self, node: Optional[str], field: str) -> None:
+        """累加节点命中统计，调用方需持有锁"""
+        stats = self._node_stats.setdefault(node or "unknown", {"hits": 0, "misses": 0})
+        stats[field] += 1
+
+    def clear(self) -> None:
+        """清空缓存并重置命中统计"""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self._node_stats.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计信息，nodes 中为各节点的命中率"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            nodes = {}
+            for node, counts in self._node_stats.items():
+                lookups = counts["hits"] + counts["misses"]
+                nodes[node] = {**counts, "hit_rate": round(counts["hits"] / lookups, 4) if lookups else 0.0}
+            hits = sum(counts["hits"] for counts in self._node_stats.values())
+            lookups = hits + sum(counts["misses"] for counts in self._node_stats.values())
+            return {
+                "mode": self.mode,
+                "hits": hits,
+                "misses": lookups - hits,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "disk_path": self.db_path,
+                "nodes": nodes,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_loaded = False
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    按项目根目录 config.py 中的 LLM_CACHE_* 配置获取全局缓存实例，未启用时返回 None
+    """
+    global _cache, _cache_loaded
+    if _cache_loaded:
+        return _cache
+    with _cache_lock:
+        if _cache_loaded:
+            return _cache
+        try:
+            from config import settings
+            mode = (settings.LLM_CACHE_MODE or "off").lower()
+            if mode != "off":
+                _cache = LLMResponseCache(
+                    settings.LLM_CACHE_PATH,
+                    ttl=settings.LLM_CACHE_TTL,
+                    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                    mode=mode,
+                )
+                logger.info(f"LLM响应缓存已启用: mode={mode}, path={settings.LLM_CACHE_PATH}")
+        except Exception as e:
+            logger.warning(f"LLM响应缓存初始化失败，将直接调用模型: {e}")
+            _cache = None
+        _cache_loaded = True
+        return _cache
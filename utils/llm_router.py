@@ -0,0 +1,433 @@
+"""
+LLM对冲请求与备用模型路由
+主提供方响应过慢时，在按该提供方首token耗时 p95 推算的延迟（不超过节点的延迟SLO）后，
+向备用的 OpenAI 兼容接口发出同样的请求，先返回内容的一方胜出，另一方被取消并立即归还限流并发名额；
+连续失败或超出SLO的提供方由熔断器暂时跳过，直接路由到备用接口。
+对冲请求总是以流式接收，胜负按首个文本块判定。
+在根目录 config.py 中配置 LLM_HEDGE_ENABLED 与 LLM_FALLBACK_* 后生效，默认关闭
+"""
+
+import math
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from loguru import logger
+
+try:
+    from retry_helper import InterruptedError
+    from llm_stream import StreamStats, create_completion_stream, iter_completion_stream
+    from rate_limiter import estimate_tokens, rate_limited
+except ImportError:
+    from utils.retry_helper import InterruptedError
+    from utils.llm_stream import StreamStats, create_completion_stream, iter_completion_stream
+    from utils.rate_limiter import estimate_tokens, rate_limited
+
+
+# 各节点类型的首token耗时SLO（秒），超出即发出对冲请求并计入熔断；可用 LLM_LATENCY_SLO 按节点名覆盖
+DEFAULT_NODE_SLO: Dict[str, float] = {
+    "FirstSearchNode": 30.0,
+    "ReflectionNode": 30.0,
+    "ReportStructureNode": 30.0,
+    "TemplateSelectionNode": 30.0,
+    "FirstSummaryNode": 60.0,
+    "ReflectionSummaryNode": 60.0,
+    "ReportFormattingNode": 60.0,
+    "HTMLGenerationNode": 90.0,
+    "default": 60.0,
+}
+
+# 对冲延迟取 p95 所需的最少样本数，样本不足时直接使用SLO
+MIN_LATENCY_SAMPLES = 5
+LATENCY_WINDOW_SIZE = 100
+
+# 等待结果时检查停止信号的间隔（秒）
+POLL_INTERVAL = 0.5
+
+
+@dataclass
+class LLMEndpoint:
+    """一个可调用的 OpenAI 兼容接口"""
+    name: str
+    client: Any
+    model: str
+    base_url: Optional[str] = None
+
+
+class CircuitBreaker:
+    """
+    熔断器：连续失败达到阈值后打开，冷却期内跳过该提供方；
+    冷却期结束后放行一次探测请求，成功则关闭，失败则重新计时
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self._opened_at >= self.reset_timeout else "open"
+
+    def allow(self) -> bool:
+        """是否放行请求；半开状态下放行一次探测并重新计时，避免并发请求同时打到故障提供方"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record(self, ok: bool):
+        with self._lock:
+            if ok:
+                self.failures = 0
+                self._opened_at = None
+                return
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class EndpointHealth:
+    """单个 (主机, 模型) 的首token耗时窗口与熔断器，所有 Engine 共享"""
+
+    def __init__(self, name: str, breaker: CircuitBreaker):
+        self.name = name
+        self.breaker = breaker
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW_SIZE)
+        self.metrics: Dict[str, int] = {"requests": 0, "wins": 0, "hedges": 0, "failures": 0, "slow": 0}
+        self._lock = threading.Lock()
+
+    def add_latency(self, seconds: float):
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """首token耗时的 p 分位数（0-1），样本不足 MIN_LATENCY_SAMPLES 时返回 None"""
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(math.ceil(p * len(samples))) - 1)]
+
+    def count(self, metric: str):
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.percentile(0.95)
+        with self._lock:
+            return {
+                **self.metrics,
+                "state": self.breaker.state,
+                "p95_ttft": round(p95, 3) if p95 is not None else None,
+                "samples": len(self.latencies),
+            }
+
+
+_health: Dict[Tuple[str, str], EndpointHealth] = {}
+_health_lock = threading.Lock()
+_settings_loaded = False
+_failure_threshold = 3
+_reset_timeout = 60.0
+_slo_overrides: Dict[str, float] = {}
+
+
+def _load_settings():
+    """读取根目录 config.py 中的熔断与SLO配置，调用方需持有锁"""
+    global _settings_loaded, _failure_threshold, _reset_timeout, _slo_overrides
+    if _settings_loaded:
+        return
+    try:
+        from config import settings
+        _failure_threshold = int(getattr(settings, "LLM_CIRCUIT_FAILURE_THRESHOLD", 3))
+        _reset_timeout = float(getattr(settings, "LLM_CIRCUIT_RESET_SEC", 60.0))
+        _slo_overrides = dict(getattr(settings, "LLM_LATENCY_SLO", None) or {})
+    except Exception as e:
+        logger.warning(f"读取LLM路由配置失败，使用默认值: {e}")
+    _settings_loaded = True
+
+
+def configure_llm_router(failure_threshold: int = 3, reset_timeout: float = 60.0,
+                         slo_overrides: Optional[Dict[str, float]] = None):
+    """以代码方式设置熔断与SLO配置（测试或脚本使用），并清空已记录的耗时和熔断状态"""
+    global _settings_loaded, _failure_threshold, _reset_timeout, _slo_overrides
+    with _health_lock:
+        _failure_threshold = failure_threshold
+        _reset_timeout = reset_timeout
+        _slo_overrides = dict(slo_overrides or {})
+        _settings_loaded = True
+        _health.clear()
+
+
+def get_endpoint_health(base_url: Optional[str], model: str) -> EndpointHealth:
+    host = (urlparse(base_url).hostname or base_url) if base_url else "api.openai.com"
+    key = (host, model)
+    with _health_lock:
+        _load_settings()
+        health = _health.get(key)
+        if health is None:
+            health = EndpointHealth(f"{host}/{model}", CircuitBreaker(_failure_threshold, _reset_timeout))
+            _health[key] = health
+        return health
+
+
+def get_node_slo(node: Optional[str]) -> float:
+    """节点类型的首token耗时SLO（秒）"""
+    with _health_lock:
+        _load_settings()
+        overrides = _slo_overrides
+    for table in (overrides, DEFAULT_NODE_SLO):
+        if node and node in table:
+            return float(table[node])
+    return float(overrides.get("default", DEFAULT_NODE_SLO["default"]))
+
+
+def llm_router_stats() -> Dict[str, Dict[str, Any]]:
+    """各接口的请求/胜出/对冲/失败次数、熔断状态与首token耗时 p95"""
+    return {health.name: health.stats() for health in list(_health.values())}
+
+
+class _Attempt:
+    """发往单个接口的一次请求"""
+
+    def __init__(self, endpoint: LLMEndpoint, health: EndpointHealth):
+        self.endpoint = endpoint
+        self.health = health
+        self.cancel = threading.Event()
+        self.started = time.monotonic()
+        self.finished = False
+        self.lease = None
+
+    def abort(self):
+        """
+        取消请求并归还限流并发名额；阻塞在首字节前的网络读取无法从其他线程打断，
+        后台线程会在读取返回或超时后自行退出，不再占用名额
+        """
+        self.cancel.set()
+        lease = self.lease
+        if lease is not None:
+            lease.release()
+
+
+class HedgedRouter:
+    """按顺序排列的多个接口（第一个为主接口），对单次调用做对冲、故障转移和熔断"""
+
+    def __init__(self, endpoints: List[LLMEndpoint]):
+        if not endpoints:
+            raise ValueError("HedgedRouter 至少需要一个接口")
+        self.endpoints = endpoints
+
+    def hedge_delay(self, endpoint: LLMEndpoint, node: Optional[str]) -> float:
+        """发出对冲请求前的等待时间：接口首token耗时的 p95，不超过节点SLO；样本不足时等于SLO"""
+        slo = get_node_slo(node)
+        p95 = get_endpoint_health(endpoint.base_url, endpoint.model).percentile(0.95)
+        return slo if p95 is None else min(p95, slo)
+
+    def stream(
+        self,
+        messages: List[Dict[str, str]],
+        extra_params: Dict[str, Any],
+        timeout: float,
+        stats: StreamStats,
+        stop_event: Optional[threading.Event] = None,
+    ) -> Iterator[str]:
+        """
+        流式调用，逐块产出胜出接口的文本增量，并把胜出接口的统计写入 stats
+
+        Args:
+            messages: 对话消息
+            extra_params: 采样参数
+            timeout: 单次请求超时
+            stats: 本次调用的统计信息，stats.node 决定使用的SLO
+            stop_event: 停止事件，置位时取消所有请求并抛出 InterruptedError
+        """
+        node = stats.node
+        pending = deque(self.endpoints)
+        events: "queue.Queue[Tuple[_Attempt, str, Any]]" = queue.Queue()
+        attempts: List[_Attempt] = []
+        winner: Optional[_Attempt] = None
+        errors: List[Exception] = []
+
+        def start(endpoint: LLMEndpoint):
+            health = get_endpoint_health(endpoint.base_url, endpoint.model)
+            health.count("requests")
+            attempt = _Attempt(endpoint, health)
+            attempts.append(attempt)
+            threading.Thread(
+                target=self._run_attempt,
+                args=(attempt, messages, extra_params, timeout, stop_event, events),
+                name=f"llm-hedge-{endpoint.name}",
+                daemon=True,
+            ).start()
+
+        def launch() -> bool:
+            """按顺序发往下一个熔断器放行的接口；只对真正发出的请求调用 allow()，避免占用半开接口的探测机会"""
+            while pending:
+                endpoint = pending.popleft()
+                if get_endpoint_health(endpoint.base_url, endpoint.model).breaker.allow():
+                    start(endpoint)
+                    return True
+            return False
+
+        if not launch():
+            logger.warning("所有LLM接口均处于熔断状态，仍按原顺序尝试")
+            pending.extend(self.endpoints[1:])
+            start(self.endpoints[0])
+        delay = self.hedge_delay(attempts[0].endpoint, node)
+        hedge_at = time.monotonic() + delay
+        try:
+            while True:
+                if stop_event and stop_event.is_set():
+                    raise InterruptedError("用户请求停止")
+                wait = POLL_INTERVAL
+                if winner is None and pending:
+                    wait = min(wait, max(0.0, hedge_at - time.monotonic()))
+                try:
+                    attempt, kind, payload = events.get(timeout=wait)
+                except queue.Empty:
+                    if winner is None and pending and time.monotonic() >= hedge_at:
+                        slow = attempts[-1]
+                        if launch():
+                            hedge = attempts[-1].endpoint
+                            logger.warning(
+                                f"[{node or stats.model}] {slow.health.name} 超过 {delay:.1f}s 未返回内容，"
+                                f"向 {hedge.model}@{hedge.base_url or 'default'} 发送对冲请求"
+                            )
+                            slow.health.count("hedges")
+                            hedge_at = time.monotonic() + delay
+                    continue
+
+                if winner is not None and attempt is not winner:
+                    continue
+                if kind == "error":
+                    attempt.finished = True
+                    attempt.health.count("failures")
+                    attempt.health.breaker.record(False)
+                    if attempt is winner or isinstance(payload, InterruptedError):
+                        raise payload
+                    logger.warning(f"[{node or stats.model}] {attempt.health.name} 请求失败: {payload}")
+                    errors.append(payload)
+                    if launch():
+                        hedge_at = time.monotonic() + delay
+                    elif all(a.finished for a in attempts):
+                        raise errors[0]
+                    continue
+
+                if winner is None:
+                    winner = attempt
+                    self._settle(winner, attempts, node)
+                    stats.model = winner.endpoint.model
+                    stats.ttft = time.monotonic() - stats.started
+                if kind == "done":
+                    stats.completion_tokens = payload.completion_tokens
+                    stats.duration = time.monotonic() - stats.started
+                    return
+                stats.chunks += 1
+                stats.output_chars += len(payload)
+                yield payload
+        finally:
+            for attempt in attempts:
+                attempt.abort()
+
+    def _settle(self, winner: _Attempt, attempts: List[_Attempt], node: Optional[str]):
+        """记录胜出接口的首token耗时，取消其余请求；耗时超出SLO的接口计入熔断"""
+        slo = get_node_slo(node)
+        now = time.monotonic()
+        latency = now - winner.started
+        winner.health.add_latency(latency)
+        winner.health.count("wins")
+        if latency > slo:
+            winner.health.count("slow")
+        winner.health.breaker.record(latency <= slo)
+        for attempt in attempts:
+            if attempt is winner or attempt.finished:
+                continue
+            attempt.abort()
+            elapsed = now - attempt.started
+            # 被取消的请求只知道耗时不少于 elapsed，超出SLO时按慢请求计入
+            if elapsed > slo:
+                attempt.health.add_latency(elapsed)
+                attempt.health.count("slow")
+                attempt.health.breaker.record(False)
+            logger.info(f"[{node or winner.endpoint.model}] {winner.health.name} 先返回，取消 {attempt.health.name} 的请求")
+
+    @staticmethod
+    def _run_attempt(
+        attempt: _Attempt,
+        messages: List[Dict[str, str]],
+        extra_params: Dict[str, Any],
+        timeout: float,
+        stop_event: Optional[threading.Event],
+        events: "queue.Queue[Tuple[_Attempt, str, Any]]",
+    ):
+        """
+        在后台线程中请求单个接口，文本块、结束和异常都放入 events；
+        被取消时限流名额已由 abort() 归还，连接在请求返回或收到下一块数据时关闭
+        """
+        endpoint = attempt.endpoint
+        stats = StreamStats(endpoint.model)
+        prompt_tokens = estimate_tokens(*(message["content"] for message in messages))
+        try:
+            with rate_limited(endpoint.base_url, endpoint.model, prompt_tokens, stop_event) as lease:
+                attempt.lease = lease
+                # 等待限流期间可能已被取消，此时 abort() 还拿不到 lease
+                if attempt.cancel.is_set():
+                    return
+                response = create_completion_stream(endpoint.client, endpoint.model, messages, timeout, **extra_params)
+                try:
+                    if attempt.cancel.is_set():
+                        return
+                    for delta in iter_completion_stream(response, stats):
+                        if attempt.cancel.is_set():
+                            return
+                        events.put((attempt, "chunk", delta))
+                finally:
+                    response.close()
+                    if lease:
+                        lease.report_tokens(prompt_tokens + stats.tokens)
+            events.put((attempt, "done", stats))
+        except Exception as e:
+            if not attempt.cancel.is_set():
+                events.put((attempt, "error", e))
+
+
+def build_llm_router(client: Any, base_url: Optional[str], model: str) -> Optional[HedgedRouter]:
+    """
+    按根目录 config.py 为 LLMClient 创建路由：主接口为客户端自身，备用接口为 LLM_FALLBACK_*；
+    未启用或未配置备用接口时返回 None，调用方直接请求主接口
+    """
+    try:
+        from config import settings
+    except Exception:
+        return None
+    if not getattr(settings, "LLM_HEDGE_ENABLED", False):
+        return None
+    fallback_key = getattr(settings, "LLM_FALLBACK_API_KEY", None)
+    fallback_model = getattr(settings, "LLM_FALLBACK_MODEL_NAME", None)
+    fallback_url = getattr(settings, "LLM_FALLBACK_BASE_URL", None)
+    if not fallback_key or not fallback_model:
+        logger.warning("已启用LLM对冲请求，但未配置 LLM_FALLBACK_API_KEY/LLM_FALLBACK_MODEL_NAME，保持单接口调用")
+        return None
+    if fallback_url == base_url and fallback_model == model:
+        return None
+
+    from openai import OpenAI
+
+    client_kwargs: Dict[str, Any] = {"api_key": fallback_key, "max_retries": 0}
+    if fallback_url:
+        client_kwargs["base_url"] = fallback_url
+    return HedgedRouter([
+        LLMEndpoint("primary", client, model, base_url),
+        LLMEndpoint("fallback", OpenAI(**client_kwargs), fallback_model, fallback_url),
+    ])
@@ -0,0 +1,199 @@
+"""
+LLM流式输出工具
+各 Engine 的 LLMClient 以 stream=True 调用时逐块接收模型输出：
+记录首token耗时（TTFT）与生成速度，按时间间隔把进度和输出末尾预览写入日志，
+ForumEngine 的 LogMonitor 和 Report Engine 的进度接口据此在生成过程中展示部分输出
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from loguru import logger
+
+# 进度日志行标记，格式：[节点名] [流式进度] {"chars": ..., "preview": ..., "done": false}
+STREAM_PROGRESS_MARKER = "[流式进度]"
+
+# 进度日志的最小间隔（秒）与预览长度（字符）
+STREAM_LOG_INTERVAL = 2.0
+STREAM_PREVIEW_CHARS = 200
+
+# 拒绝 stream_options 参数的 (BaseUrl, 模型)，之后的流式请求不再要求返回usage
+_usage_unsupported: Set[Tuple[str, str]] = set()
+_usage_unsupported_lock = threading.Lock()
+
+
+@dataclass
+class StreamStats:
+    """单次流式调用的统计信息"""
+    model: str
+    node: Optional[str] = None
+    started: float = field(default_factory=time.monotonic)
+    ttft: Optional[float] = None              # 首token耗时（秒）
+    duration: float = 0.0                     # 总耗时（秒）
+    chunks: int = 0                           # 收到的非空文本块数
+    output_chars: int = 0
+    completion_tokens: Optional[int] = None   # 服务端返回的usage，未返回时为None
+
+    @property
+    def tokens(self) -> int:
+        """输出token数；服务端未返回usage时以文本块数近似（OpenAI兼容接口通常每块约一个token）"""
+        return self.completion_tokens if self.completion_tokens is not None else self.chunks
+
+    @property
+    def tokens_per_sec(self) -> float:
+        """首token之后的生成速度"""
+        elapsed = self.duration or (time.monotonic() - self.started)
+        generation_time = elapsed - (self.ttft or 0.0)
+        return self.tokens / generation_time if generation_time > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "node": self.node,
+            "model": self.model,
+            "ttft": round(self.ttft, 3) if self.ttft is not None else None,
+            "duration": round(self.duration, 3),
+            "chars": self.output_chars,
+            "tokens": self.tokens,
+            "tokens_per_sec": round(self.tokens_per_sec, 2),
+        }
+
+
+def create_completion_stream(client: Any, model: str, messages: Any, timeout: float, **extra_params) -> Any:
+    """
+    以 stream=True 调用 chat.completions.create，并通过 stream_options 要求在最后一块返回usage；
+    接口以 400/422 拒绝该参数时去掉它重试，重试成功后记住该接口不支持，之后直接以普通流式请求
+
+    Args:
+        client: OpenAI SDK 客户端
+        model: 模型名
+        messages: 对话消息
+        timeout: 请求超时
+        extra_params: 其他采样参数
+    """
+    key = (str(getattr(client, "base_url", "")), model)
+    with _usage_unsupported_lock:
+        request_usage = key not in _usage_unsupported
+    if request_usage:
+        try:
+            return client.chat.completions.create(
+                model=model, messages=messages, timeout=timeout, stream=True,
+                stream_options={"include_usage": True}, **extra_params,
+            )
+        except Exception as e:
+            if getattr(e, "status_code", None) not in (400, 422):
+                raise
+            logger.info(f"{model} 的流式请求不接受 stream_options，去掉后重试: {e}")
+    response = client.chat.completions.create(
+        model=model, messages=messages, timeout=timeout, stream=True, **extra_params,
+    )
+    if request_usage:
+        with _usage_unsupported_lock:
+            _usage_unsupported.add(key)
+    return response
+
+
+def iter_completion_stream(response: Iterable[Any], stats: StreamStats) -> Iterator[str]:
+    """
+    遍历 chat.completions.create(stream=True) 的返回，逐块产出文本增量并更新统计
+
+    Args:
+        response: OpenAI SDK 的流式响应
+        stats: 本次调用的统计信息，started 应为发起请求的时间
+    """
+    for chunk in response:
+        usage = getattr(chunk, "usage", None)
+        if usage is not None and getattr(usage, "completion_tokens", None):
+            stats.completion_tokens = usage.completion_tokens
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        content = getattr(delta, "content", None) if delta is not None else None
+        if not content:
+            continue
+        if stats.ttft is None:
+            stats.ttft = time.monotonic() - stats.started
+        stats.chunks += 1
+        stats.output_chars += len(content)
+        yield content
+    stats.duration = time.monotonic() - stats.started
+
+
+class StreamAssembler:
+    """拼接流式文本块，按间隔转发给回调并输出进度日志"""
+
+    def __init__(self, stats: StreamStats, on_chunk: Optional[Callable[[str, StreamStats], None]] = None,
+                 log_interval: float = STREAM_LOG_INTERVAL, callback_interval: float = STREAM_LOG_INTERVAL):
+        """
+        Args:
+            stats: 本次调用的统计信息
+            on_chunk: 进度回调，参数为已拼接的完整文本和统计信息；首块到达时、之后每隔 callback_interval 秒
+                      以及结束时各调用一次，避免长输出每块都拼接全文
+            log_interval: 进度日志的最小间隔（秒），<=0 表示不输出进度日志
+            callback_interval: 回调的最小间隔（秒），<=0 表示每块都回调
+        """
+        self.stats = stats
+        self.on_chunk = on_chunk
+        self.log_interval = log_interval
+        self.callback_interval = callback_interval
+        self._parts = []
+        self._last_log = time.monotonic()
+        self._last_callback: Optional[float] = None
+        self._callback_pending = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def feed(self, delta: str):
+        self._parts.append(delta)
+        now = time.monotonic()
+        if self.on_chunk is not None:
+            self._callback_pending = True
+            if self._last_callback is None or now - self._last_callback >= self.callback_interval:
+                self._last_callback = now
+                self._notify()
+        if self.log_interval > 0 and now - self._last_log >= self.log_interval:
+            self._last_log = now
+            self._log_progress(done=False)
+
+    def _notify(self):
+        self._callback_pending = False
+        try:
+            self.on_chunk(self.text, self.stats)
+        except Exception as e:
+            logger.warning(f"流式输出回调失败: {e}")
+
+    def finish(self) -> str:
+        """结束拼接，输出最终进度和耗时统计，返回完整文本"""
+        if not self.stats.duration:
+            self.stats.duration = time.monotonic() - self.stats.started
+        if self._callback_pending:
+            self._notify()
+        if self.log_interval > 0:
+            self._log_progress(done=True)
+        ttft = f"{self.stats.ttft:.2f}s" if self.stats.ttft is not None else "-"
+        logger.info(
+            f"[{self.stats.node or self.stats.model}] 流式生成完成 - 首token耗时: {ttft}, "
+            f"总耗时: {self.stats.duration:.2f}s, 输出: {self.stats.output_chars} 字符/{self.stats.tokens} tokens, "
+            f"速度: {self.stats.tokens_per_sec:.1f} tokens/s"
+        )
+        return self.text
+
+    def _log_progress(self, done: bool):
+        payload = self.stats.to_dict()
+        payload["preview"] = self.text[-STREAM_PREVIEW_CHARS:]
+        payload["done"] = done
+        logger.info(f"[{self.stats.node or self.stats.model}] {STREAM_PROGRESS_MARKER} {json.dumps(payload, ensure_ascii=False)}")
+
+
+def parse_stream_progress(line: str) -> Optional[Dict[str, Any]]:
+    """从日志行中解析流式进度，非进度行或解析失败时返回 None"""
+    if STREAM_PROGRESS_MARKER not in line:
+        return None
+    try:
+        return json.loads(line.split(STREAM_PROGRESS_MARKER, 1)[1].strip())
+    except (ValueError, IndexError):
+        return None
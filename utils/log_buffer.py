@@ -0,0 +1,90 @@
+"""
+日志环形缓冲区
+为 /api/output 与 /api/forum/log 提供基于游标的增量读取：
+每行日志分配单调递增的序号，内存中只保留最近的有限条目（可附带预解析结果），
+轮询方携带上次返回的 next_offset 即可只取增量，请求开销不再随日志文件大小增长
+"""
+
+import threading
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+class LogRingBuffer:
+    """有界、线程安全的日志环形缓冲区"""
+
+    def __init__(self, max_entries: int = 5000, parser: Optional[Callable[[str], Any]] = None):
+        """
+        Args:
+            max_entries: 最多保留的日志行数，超出后丢弃最早的行
+            parser: 写入时对每行做一次预解析（如论坛消息解析），结果随行一起缓存
+        """
+        self.max_entries = max_entries
+        self.parser = parser
+        self._entries: deque = deque(maxlen=max_entries)
+        self._next_offset = 0  # 下一行将获得的序号
+        self._reset_offset = 0  # 最近一次清空时的序号，早于它的游标需要重置视图
+        self._lock = threading.Lock()
+
+    def append(self, line: str) -> Any:
+        """追加一行日志，返回该行的预解析结果（未设置 parser 时为 None）"""
+        parsed = self.parser(line) if self.parser else None
+        with self._lock:
+            self._entries.append((self._next_offset, line, parsed))
+            self._next_offset += 1
+        return parsed
+
+    def extend(self, lines: List[str]) -> None:
+        for line in lines:
+            self.append(line)
+
+    def clear(self) -> None:
+        """清空缓冲区（日志被清空或应用重启时调用），序号继续递增以便游标识别重置"""
+        with self._lock:
+            self._entries.clear()
+            # 跳过一个序号，使清空前拿到的游标（<= 原next_offset）都早于重置点
+            self._next_offset += 1
+            self._reset_offset = self._next_offset
+
+    def seed_from_file(self, path: Path) -> None:
+        """用已有日志文件的末尾若干行初始化缓冲区（只在缓冲区首次创建时调用一次）"""
+        if not path.exists():
+            return
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            tail = deque((line.strip() for line in f if line.strip()), maxlen=self.max_entries)
+        self.extend(list(tail))
+
+    def since(self, offset: Optional[int] = None) -> Dict[str, Any]:
+        """
+        读取序号 >= offset 的日志
+
+        Args:
+            offset: 上次返回的 next_offset；为空时返回缓冲区内全部内容
+
+        Returns:
+            lines: 日志行；parsed: 非空的预解析结果；next_offset: 下次轮询使用的游标；
+            reset: 游标早于最近一次清空或不属于当前进程（如服务重启），调用方应清空已显示内容；
+            dropped: 因缓冲区容量有限而未能返回的行数
+        """
+        with self._lock:
+            next_offset = self._next_offset
+            reset = offset is not None and (offset < self._reset_offset or offset > next_offset)
+            if offset is None or reset:
+                offset = self._reset_offset
+            first_offset = self._entries[0][0] if self._entries else next_offset
+            start = max(offset - first_offset, 0)
+            entries = list(islice(self._entries, start, None))
+
+        return {
+            "lines": [line for _, line, _ in entries],
+            "parsed": [parsed for _, _, parsed in entries if parsed],
+            "next_offset": next_offset,
+            "reset": reset,
+            "dropped": max(first_offset - offset, 0),
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,103 @@
+"""
+段落并行研究执行器
+各 Engine 的 DeepSearchAgent 中段落在生成最终报告前相互独立，
+用有界线程池并行执行每个段落的"初始搜索+总结+反思循环"，总耗时接近最慢的段落而不是所有段落之和。
+段落结果按索引写回 State，顺序不受完成先后影响；stop_event 置位后不再启动新段落
+"""
+
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from loguru import logger
+
+try:
+    from retry_helper import InterruptedError
+except ImportError:
+    from utils.retry_helper import InterruptedError
+
+
+@dataclass
+class ParagraphProgress:
+    """单个段落的进度事件"""
+    index: int              # 段落索引（从0开始）
+    total: int              # 段落总数
+    status: str             # "running" / "completed"
+    completed: int          # 已完成的段落数
+    running: List[int]      # 正在处理的段落索引
+
+
+class ParagraphExecutor:
+    """有界线程池段落执行器"""
+
+    def __init__(self, max_workers: int = 1, stop_event: Optional[threading.Event] = None,
+                 on_progress: Optional[Callable[[ParagraphProgress], None]] = None):
+        """
+        Args:
+            max_workers: 同时处理的最大段落数，<=1 时按顺序逐段处理
+            stop_event: 停止事件，置位后不再启动新段落并抛出 InterruptedError
+            on_progress: 段落开始和完成时的进度回调（在工作线程中调用）
+        """
+        self.max_workers = max(1, max_workers or 1)
+        self.stop_event = stop_event
+        self.on_progress = on_progress
+        self._lock = threading.Lock()
+        self._running: List[int] = []
+        self._completed = 0
+
+    def run(self, process: Callable[[int], None], total: int):
+        """
+        处理所有段落，任一段落失败时不再启动剩余段落并抛出该异常
+
+        Args:
+            process: 处理单个段落的函数，参数为段落索引
+            total: 段落总数
+        """
+        self._running = []
+        self._completed = 0
+        if self.max_workers == 1 or total <= 1:
+            for index in range(total):
+                self._run_one(process, index, total)
+            return
+
+        workers = min(self.max_workers, total)
+        logger.info(f"并行处理 {total} 个段落，最大并发 {workers}")
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="paragraph")
+        futures = [executor.submit(self._run_one, process, index, total) for index in range(total)]
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in futures:
+            if future in done and future.exception() is not None:
+                # 未开始的段落直接取消，正在处理的段落会在下一次检查 stop_event 或 LLM 调用结束后退出
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise future.exception()
+        executor.shutdown(wait=True)
+
+    def _check_stop(self):
+        if self.stop_event and self.stop_event.is_set():
+            logger.info("检测到停止信号，中止段落处理")
+            raise InterruptedError("用户请求停止")
+
+    def _run_one(self, process: Callable[[int], None], index: int, total: int):
+        self._check_stop()
+        with self._lock:
+            self._running.append(index)
+            event = ParagraphProgress(index, total, "running", self._completed, sorted(self._running))
+        self._report(event)
+        try:
+            process(index)
+        finally:
+            with self._lock:
+                self._running.remove(index)
+        with self._lock:
+            self._completed += 1
+            event = ParagraphProgress(index, total, "completed", self._completed, sorted(self._running))
+        self._report(event)
+
+    def _report(self, event: ParagraphProgress):
+        if self.on_progress is None:
+            return
+        try:
+            self.on_progress(event)
+        except Exception as e:
+            logger.warning(f"段落进度回调失败: {e}")
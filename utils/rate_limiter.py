@@ -0,0 +1,319 @@
+"""
+按提供方的限流器
+各 Engine 的 LLM 调用与 Tavily/Bocha 搜索在段落并行、多引擎同时运行时共享同一个进程内的限流器，
+按 (BaseUrl 主机, 模型) 分别限制每秒请求数、每分钟token数和同时进行的请求数，
+服务端返回 429 时按 Retry-After 暂停该提供方的所有请求，避免限流错误连锁放大。
+限额默认值见 DEFAULT_PROVIDER_LIMITS，可用根目录 config.py 的 RATE_LIMITS 按提供方覆盖
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+from loguru import logger
+
+try:
+    from retry_helper import InterruptedError, get_retry_after, get_status_code, interruptible_sleep
+except ImportError:
+    from utils.retry_helper import InterruptedError, get_retry_after, get_status_code, interruptible_sleep
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """单个提供方的限额，0 表示不限制"""
+    requests_per_sec: float = 0
+    tokens_per_min: float = 0
+    max_in_flight: int = 0
+
+
+# 各提供方的保守默认限额（按常见的入门级账户档位取值），实际额度更高时可通过 RATE_LIMITS 调大
+DEFAULT_PROVIDER_LIMITS: Dict[str, RateLimit] = {
+    "kimi": RateLimit(requests_per_sec=3, tokens_per_min=1_000_000, max_in_flight=4),
+    "gemini": RateLimit(requests_per_sec=2, tokens_per_min=1_000_000, max_in_flight=4),
+    "deepseek": RateLimit(requests_per_sec=5, max_in_flight=8),
+    "qwen": RateLimit(requests_per_sec=5, tokens_per_min=500_000, max_in_flight=4),
+    "tavily": RateLimit(requests_per_sec=1.5, max_in_flight=4),
+    "bocha": RateLimit(requests_per_sec=5, max_in_flight=4),
+    "default": RateLimit(requests_per_sec=5, max_in_flight=8),
+}
+
+# 按 BaseUrl 主机识别提供方，主机无法识别时（如聚合平台）再按模型名识别
+PROVIDER_HOST_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ("moonshot", "kimi"),
+    ("generativelanguage.googleapis.com", "gemini"),
+    ("deepseek", "deepseek"),
+    ("dashscope", "qwen"),
+    ("tavily", "tavily"),
+    ("bochaai", "bocha"),
+)
+PROVIDER_MODEL_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ("kimi", "kimi"),
+    ("moonshot", "kimi"),
+    ("gemini", "gemini"),
+    ("deepseek", "deepseek"),
+    ("qwen", "qwen"),
+)
+
+# 服务端返回 429 但未给出 Retry-After 时暂停的秒数
+DEFAULT_THROTTLE_PAUSE_SEC = 5.0
+# 单次暂停的上限（与 RetryConfig 默认的 max_delay 一致），避免过长或错误的 Retry-After 卡住所有请求
+MAX_THROTTLE_PAUSE_SEC = 60.0
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """粗略估算文本的token数（约1.5字符/token），用于请求发出前预扣每分钟token额度"""
+    return int(math.ceil(sum(len(text) for text in texts if text) / 1.5))
+
+
+def detect_provider(base_url: Optional[str], model: Optional[str] = None) -> str:
+    """根据 BaseUrl 与模型名识别提供方，无法识别时返回 default"""
+    host = (urlparse(base_url).hostname or base_url or "").lower() if base_url else ""
+    for pattern, provider in PROVIDER_HOST_PATTERNS:
+        if pattern in host:
+            return provider
+    model_name = (model or "").lower()
+    for pattern, provider in PROVIDER_MODEL_PATTERNS:
+        if pattern in model_name:
+            return provider
+    return "default"
+
+
+class TokenBucket:
+    """令牌桶，预约制：额度不足时直接记账为负并返回需要等待的时间，先到先得"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: 每秒补充的令牌数
+            capacity: 桶容量（允许的突发量）
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """预扣 amount 个令牌，返回需要等待的秒数"""
+        with self._lock:
+            self._refill()
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def adjust(self, amount: float):
+        """按实际用量补扣（amount>0）或退还（amount<0）令牌"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class RateLimitLease:
+    """一次已放行的请求，请求完成后可上报实际token用量"""
+
+    def __init__(self, limiter: "ProviderRateLimiter", reserved_tokens: int):
+        self.limiter = limiter
+        self.reserved_tokens = reserved_tokens
+        self.released = False
+
+    def release(self):
+        """提前归还并发名额（如对冲中被取消、但仍阻塞在网络读取上的请求），可重复调用"""
+        self.limiter._release(self)
+
+    def report_tokens(self, actual_tokens: Optional[int]):
+        """上报本次请求实际消耗的token数（输入+输出），与预扣数的差额计入每分钟token额度"""
+        if actual_tokens is None or self.limiter.token_bucket is None:
+            return
+        self.limiter.token_bucket.adjust(actual_tokens - self.reserved_tokens)
+        self.reserved_tokens = actual_tokens
+
+
+class ProviderRateLimiter:
+    """单个 (提供方主机, 模型) 的限流器，线程安全"""
+
+    def __init__(self, name: str, limit: RateLimit):
+        self.name = name
+        self.limit = limit
+        self.request_bucket = (
+            TokenBucket(limit.requests_per_sec, max(1.0, limit.requests_per_sec))
+            if limit.requests_per_sec > 0 else None
+        )
+        self.token_bucket = (
+            TokenBucket(limit.tokens_per_min / 60, limit.tokens_per_min)
+            if limit.tokens_per_min > 0 else None
+        )
+        self._slots = threading.BoundedSemaphore(int(limit.max_in_flight)) if limit.max_in_flight > 0 else None
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self.in_flight = 0
+        self.metrics: Dict[str, float] = {"requests": 0, "throttled": 0, "wait_seconds": 0.0}
+
+    def pause(self, seconds: float):
+        """暂停该提供方的所有新请求 seconds 秒（收到 429/Retry-After 时调用），最长 MAX_THROTTLE_PAUSE_SEC 秒"""
+        seconds = min(seconds, MAX_THROTTLE_PAUSE_SEC)
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self.metrics["throttled"] += 1
+        logger.warning(f"[RateLimiter] {self.name} 被限流，暂停 {seconds:.1f} 秒")
+
+    def _acquire_slot(self, stop_event: Optional[threading.Event]):
+        if self._slots is None:
+            return
+        while not self._slots.acquire(timeout=0.5):
+            if stop_event and stop_event.is_set():
+                raise InterruptedError("用户请求停止")
+
+    @contextmanager
+    def acquire(self, tokens: int = 0, stop_event: Optional[threading.Event] = None) -> Iterator[RateLimitLease]:
+        """
+        等待额度后放行一次请求，请求结束（含异常）时释放并发名额
+
+        Args:
+            tokens: 预估的token数，用于每分钟token限额
+            stop_event: 停止事件，等待期间置位时抛出 InterruptedError
+        """
+        started = time.monotonic()
+        self._acquire_slot(stop_event)
+        try:
+            waits = [self._paused_until - time.monotonic()]
+            if self.request_bucket is not None:
+                waits.append(self.request_bucket.reserve(1))
+            if self.token_bucket is not None and tokens > 0:
+                waits.append(self.token_bucket.reserve(min(tokens, self.token_bucket.capacity)))
+            wait = max(waits)
+            if wait > 0:
+                interruptible_sleep(wait, stop_event=stop_event)
+            # 等待期间可能又收到了 Retry-After
+            remaining = self._paused_until - time.monotonic()
+            if remaining > 0:
+                interruptible_sleep(remaining, stop_event=stop_event)
+        except BaseException:
+            if self._slots is not None:
+                self._slots.release()
+            raise
+
+        with self._lock:
+            self.in_flight += 1
+            self.metrics["requests"] += 1
+            self.metrics["wait_seconds"] += time.monotonic() - started
+        lease = RateLimitLease(self, tokens)
+        try:
+            yield lease
+        except Exception as e:
+            if get_status_code(e) == 429:
+                retry_after = get_retry_after(e)
+                self.pause(retry_after if retry_after is not None else DEFAULT_THROTTLE_PAUSE_SEC)
+            raise
+        finally:
+            self._release(lease)
+
+    def _release(self, lease: RateLimitLease):
+        with self._lock:
+            if lease.released:
+                return
+            lease.released = True
+            self.in_flight -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests_per_sec": self.limit.requests_per_sec,
+                "tokens_per_min": self.limit.tokens_per_min,
+                "max_in_flight": self.limit.max_in_flight,
+                "in_flight": self.in_flight,
+                "requests": self.metrics["requests"],
+                "throttled": self.metrics["throttled"],
+                "wait_seconds": round(self.metrics["wait_seconds"], 3),
+            }
+
+
+_limiters: Dict[Tuple[str, str], ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+_settings_loaded = False
+_enabled = True
+_overrides: Dict[str, Dict[str, float]] = {}
+
+
+def _load_settings():
+    """读取根目录 config.py 中的 RATE_LIMIT_ENABLED 与 RATE_LIMITS，调用方需持有锁"""
+    global _settings_loaded, _enabled, _overrides
+    if _settings_loaded:
+        return
+    try:
+        from config import settings
+        _enabled = bool(getattr(settings, "RATE_LIMIT_ENABLED", True))
+        _overrides = dict(getattr(settings, "RATE_LIMITS", None) or {})
+    except Exception as e:
+        logger.warning(f"读取限流配置失败，使用默认限额: {e}")
+    _settings_loaded = True
+
+
+def configure_rate_limits(enabled: bool = True, overrides: Optional[Dict[str, Dict[str, float]]] = None):
+    """以代码方式设置限流配置（测试或脚本使用），并清空已创建的限流器"""
+    global _settings_loaded, _enabled, _overrides
+    with _limiters_lock:
+        _enabled = enabled
+        _overrides = dict(overrides or {})
+        _settings_loaded = True
+        _limiters.clear()
+
+
+def get_rate_limiter(base_url: Optional[str], model: Optional[str] = None) -> Optional[ProviderRateLimiter]:
+    """
+    获取 (BaseUrl 主机, 模型) 对应的限流器，不存在时按提供方限额创建；限流关闭时返回 None
+    """
+    host = (urlparse(base_url).hostname or base_url) if base_url else "api.openai.com"
+    key = (host, model or "")
+    limiter = _limiters.get(key)
+    if limiter is not None:
+        return limiter
+    with _limiters_lock:
+        _load_settings()
+        if not _enabled:
+            return None
+        limiter = _limiters.get(key)
+        if limiter is None:
+            provider = detect_provider(base_url, model)
+            limit = DEFAULT_PROVIDER_LIMITS.get(provider, DEFAULT_PROVIDER_LIMITS["default"])
+            override = _overrides.get(provider)
+            if override:
+                limit = replace(limit, **{k: v for k, v in override.items() if k in RateLimit.__dataclass_fields__})
+            name = f"{provider}:{host}" + (f"/{model}" if model else "")
+            limiter = ProviderRateLimiter(name, limit)
+            _limiters[key] = limiter
+        return limiter
+
+
+@contextmanager
+def rate_limited(base_url: Optional[str], model: Optional[str] = None, tokens: int = 0,
+                 stop_event: Optional[threading.Event] = None) -> Iterator[Optional[RateLimitLease]]:
+    """
+    在限流器放行后执行代码块，限流关闭时直接执行
+
+    用法：
+        with rate_limited(self.base_url, self.model_name, estimate_tokens(prompt)) as lease:
+            response = client.chat.completions.create(...)
+            if lease and response.usage:
+                lease.report_tokens(response.usage.total_tokens)
+    """
+    limiter = get_rate_limiter(base_url, model)
+    if limiter is None:
+        yield None
+        return
+    with limiter.acquire(tokens, stop_event=stop_event) as lease:
+        yield lease
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """所有限流器的指标，键为限流器名称"""
+    return {limiter.name: limiter.stats() for limiter in list(_limiters.values())}
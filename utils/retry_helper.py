@@ -5,11 +5,16 @@
 
 import time
 import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from functools import wraps
 from typing import Callable, Any, Optional
 import requests
 from loguru import logger
 
+# 4xx 中仍值得重试的状态码（超时、冲突、限流），其余 4xx 属于请求本身的问题，重试无意义
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429}
+
 
 # 配置日志
 class RetryConfig:
@@ -98,6 +103,10 @@ def with_retry(
                 except config.retry_on_exceptions as e:
                     last_exception = e
 
+                    if not is_retryable_exception(e):
+                        logger.error(f"函数 {func.__name__} 遇到不可重试的异常: {str(e)}")
+                        raise e
+
                     if attempt == config.max_retries:
                         # 最后一次尝试也失败了
                         logger.error(
@@ -106,11 +115,14 @@ def with_retry(
                         logger.error(f"最终错误: {str(e)}")
                         raise e
 
-                    # 计算延迟时间
+                    # 计算延迟时间，服务端给出 Retry-After 时以其为准，但不超过 max_delay
                     delay = min(
                         config.initial_delay * (config.backoff_factor**attempt),
                         config.max_delay,
                     )
+                    retry_after = get_retry_after(e)
+                    if retry_after is not None:
+                        delay = min(retry_after, config.max_delay)
 
                     logger.warning(
                         f"函数 {func.__name__} 第 {attempt + 1} 次尝试失败: {str(e)}"
@@ -172,6 +184,57 @@ class InterruptedError(Exception):
     pass
 
 
+def get_status_code(exc: BaseException) -> Optional[int]:
+    """
+    提取异常对应的HTTP状态码（OpenAI SDK 的 APIStatusError、requests 的 HTTPError 等）
+
+    Returns:
+        状态码，无法判断时返回 None
+    """
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def get_retry_after(exc: BaseException) -> Optional[float]:
+    """
+    从异常携带的响应头中读取服务端要求的等待时间（retry-after-ms 或 Retry-After 秒数/HTTP日期）
+
+    Returns:
+        等待秒数，响应中没有该信息时返回 None
+    """
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            return max(0.0, float(retry_after_ms) / 1000)
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            retry_at = parsedate_to_datetime(retry_after)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def is_retryable_exception(exc: BaseException) -> bool:
+    """
+    判断异常是否值得重试：用户中断与除超时/限流外的 4xx 错误（参数错误、鉴权失败等）不重试
+    """
+    if isinstance(exc, InterruptedError):
+        return False
+    status = get_status_code(exc)
+    if status is not None and 400 <= status < 500 and status not in RETRYABLE_STATUS_CODES:
+        return False
+    return True
+
+
 def interruptible_sleep(
     duration: float,
     check_interval: float = 0.5,
@@ -249,6 +312,13 @@ def with_graceful_retry(
                 except config.retry_on_exceptions as e:
                     last_exception = e
 
+                    if not is_retryable_exception(e):
+                        logger.warning(
+                            f"非关键API {func.__name__} 遇到不可重试的异常: {str(e)}"
+                        )
+                        logger.info(f"返回默认值以保证系统继续运行: {default_return}")
+                        return default_return
+
                     if attempt == config.max_retries:
                         # 最后一次尝试也失败了，返回默认值而不抛出异常
                         logger.warning(
@@ -258,11 +328,14 @@ def with_graceful_retry(
                         logger.info(f"返回默认值以保证系统继续运行: {default_return}")
                         return default_return
 
-                    # 计算延迟时间
+                    # 计算延迟时间，服务端给出 Retry-After 时以其为准，但不超过 max_delay
                     delay = min(
                         config.initial_delay * (config.backoff_factor**attempt),
                         config.max_delay,
                     )
+                    retry_after = get_retry_after(e)
+                    if retry_after is not None:
+                        delay = min(retry_after, config.max_delay)
 
                     logger.warning(
                         f"非关键API {func.__name__} 第 {attempt + 1} 次尝试失败: {str(e)}"